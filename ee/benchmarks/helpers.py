@@ -3,8 +3,8 @@ import sys
 from contextlib import contextmanager
 from functools import wraps
 from os.path import dirname
+from unittest.mock import patch
 
-from django.utils.timezone import now
 
 os.environ["POSTHOG_DB_NAME"] = "posthog_test"
 os.environ["DJANGO_SETTINGS_MODULE"] = "posthog.settings"
@@ -71,9 +71,10 @@ def benchmark_clickhouse(fn):
 @contextmanager
 def no_materialized_columns():
     "Allows running a function without any materialized columns being used in query"
-    get_enabled_materialized_columns._cache = {
-        ("events",): (now(), {}),
-        ("person",): (now(), {}),
-    }
-    yield
-    get_enabled_materialized_columns._cache = {}
+    get_enabled_materialized_columns.clear()
+    with (
+        patch.object(get_enabled_materialized_columns, "_read_columns", return_value={}),
+        patch.object(get_enabled_materialized_columns, "_read_registry", return_value=None),
+    ):
+        yield
+    get_enabled_materialized_columns.clear()
@@ -0,0 +1,237 @@
+"""
+Ranks properties to materialize by what reading them out of their JSON column costs the queries that use them.
+
+The HogQL printer records every property it had to read with JSON extraction (see `HogQLContext.unmaterialized_properties`),
+and `execute_hogql_query` tags the query with them, so they end up in the `log_comment` of its `system.query_log` entries.
+The advisor aggregates those entries per property, and weighs each property by the bytes its queries read and how often
+they ran against the cost of backfilling it.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional, cast
+
+import structlog
+from django.utils.timezone import now
+
+from ee.clickhouse.materialized_columns.analyze import Suggestion
+from ee.clickhouse.materialized_columns.columns import (
+    SHORT_TABLE_COLUMN_NAME,
+    ShardedTableInfo,
+    get_materialized_columns,
+    tables,
+)
+from ee.settings import (
+    MATERIALIZE_COLUMNS_ANALYSIS_PERIOD_HOURS,
+    MATERIALIZE_COLUMNS_BACKFILL_PERIOD_DAYS,
+    MATERIALIZE_COLUMNS_MAX_AT_ONCE,
+)
+from posthog.client import sync_execute
+from posthog.models.property import PropertyName, TableColumn, TableWithProperties
+from posthog.settings import CLICKHOUSE_CLUSTER, CLICKHOUSE_DATABASE
+
+logger = structlog.get_logger(__name__)
+
+# Properties read by fewer queries than this over the analysis period aren't worth a column
+MATERIALIZE_COLUMNS_MINIMUM_QUERY_COUNT = 10
+
+UNMATERIALIZED_PROPERTY_ACCESS_SQL = """
+SELECT
+    table_name,
+    table_column,
+    property_name,
+    count() AS query_count,
+    uniqExact(team_id) AS team_count,
+    topK(5)(team_id) AS top_team_ids,
+    sum(read_bytes) AS read_bytes,
+    sumIf(read_bytes, only_property_from_column) AS avoidable_read_bytes,
+    sum(query_duration_ms) AS query_duration_ms,
+    countIf(exception_code IN (159, 160)) AS timeouts -- TIMEOUT EXCEEDED, TOO SLOW
+FROM (
+    SELECT
+        JSONExtractInt(log_comment, 'team_id') AS team_id,
+        read_bytes,
+        query_duration_ms,
+        exception_code,
+        JSONExtract(log_comment, 'unmaterialized_properties', 'Array(Tuple(String, String, String))') AS properties,
+        arrayJoin(properties) AS accessed_property,
+        accessed_property.1 AS table_name,
+        accessed_property.2 AS table_column,
+        accessed_property.3 AS property_name,
+        -- Materializing a property only spares the query from reading the JSON column if nothing else is extracted from it
+        length(arrayFilter(p -> p.1 = table_name AND p.2 = table_column, properties)) = 1 AS only_property_from_column
+    FROM clusterAllReplicas(%(cluster)s, system, query_log)
+    WHERE
+        event_date >= toDate(now() - toIntervalHour(%(since_hours_ago)s))
+        AND query_start_time > now() - toIntervalHour(%(since_hours_ago)s)
+        AND type > 1
+        AND is_initial_query
+        AND JSONHas(log_comment, 'unmaterialized_properties')
+        {team_id_filter}
+)
+GROUP BY table_name, table_column, property_name
+HAVING query_count >= %(min_query_count)s
+ORDER BY avoidable_read_bytes DESC
+"""
+
+COLUMN_SIZES_SQL = """
+SELECT
+    column,
+    sum(column_data_compressed_bytes) AS column_bytes,
+    sumIf(column_data_compressed_bytes, partition >= %(backfill_partition)s) AS backfill_bytes
+FROM {parts_columns}
+WHERE database = %(database)s AND table = %(table)s AND active
+GROUP BY column
+"""
+
+
+@dataclass
+class ColumnSizes:
+    table_bytes: int
+    column_bytes: dict[str, int] = field(default_factory=dict)
+    backfill_bytes: dict[str, int] = field(default_factory=dict)
+
+    def share_of_table(self, column: str) -> float:
+        return self.column_bytes.get(column, 0) / self.table_bytes if self.table_bytes else 0.0
+
+
+@dataclass
+class MaterializationCandidate:
+    table: TableWithProperties
+    table_column: TableColumn
+    property_name: PropertyName
+    query_count: int
+    team_count: int
+    top_team_ids: list[int]
+    read_bytes: int
+    avoidable_read_bytes: int
+    query_duration_ms: int
+    timeouts: int
+    # Compressed bytes of the JSON column that the backfill has to read and extract the property from
+    backfill_bytes: int
+    # Bytes the queries of the analysis period would not have read, had the property been materialized
+    expected_saved_bytes: int
+    analysis_period_hours: int
+
+    @property
+    def suggestion(self) -> Suggestion:
+        return self.table, self.table_column, self.property_name
+
+    @property
+    def expected_saved_bytes_per_day(self) -> float:
+        return self.expected_saved_bytes * 24 / self.analysis_period_hours
+
+    @property
+    def payback_days(self) -> Optional[float]:
+        "How many days of savings it takes to make up for the bytes read by the backfill"
+        if self.expected_saved_bytes_per_day == 0:
+            return None
+        return self.backfill_bytes / self.expected_saved_bytes_per_day
+
+
+def advise_materialized_columns(
+    since_hours_ago: int = MATERIALIZE_COLUMNS_ANALYSIS_PERIOD_HOURS,
+    backfill_period_days: int = MATERIALIZE_COLUMNS_BACKFILL_PERIOD_DAYS,
+    team_id: Optional[int] = None,
+    min_query_count: int = MATERIALIZE_COLUMNS_MINIMUM_QUERY_COUNT,
+    maximum: int = MATERIALIZE_COLUMNS_MAX_AT_ONCE,
+) -> list[MaterializationCandidate]:
+    """
+    Returns the properties worth materializing, ranked by the bytes materializing them would have saved.
+
+    A query that extracts a property from a JSON column reads the whole column. Only queries that extract no other
+    property from the same column would be spared from reading it, and those are expected to save the share of their
+    read bytes that the column makes up of the table.
+    """
+    rows = sync_execute(
+        UNMATERIALIZED_PROPERTY_ACCESS_SQL.format(
+            team_id_filter="AND JSONExtractInt(log_comment, 'team_id') = %(team_id)s" if team_id else ""
+        ),
+        {
+            "cluster": CLICKHOUSE_CLUSTER,
+            "since_hours_ago": since_hours_ago,
+            "min_query_count": min_query_count,
+            "team_id": team_id,
+        },
+    )
+
+    column_sizes: dict[str, ColumnSizes] = {}
+    materialized_columns: dict[str, set] = {}
+    candidates: list[MaterializationCandidate] = []
+    for (
+        table,
+        table_column,
+        property_name,
+        query_count,
+        team_count,
+        top_team_ids,
+        read_bytes,
+        avoidable_read_bytes,
+        query_duration_ms,
+        timeouts,
+    ) in rows:
+        if table not in tables or table_column not in SHORT_TABLE_COLUMN_NAME:
+            continue
+        if table not in column_sizes:
+            column_sizes[table] = get_column_sizes(table, backfill_period_days)
+            materialized_columns[table] = set(get_materialized_columns(table))
+        # The column may have been materialized since the queries ran
+        if (property_name, table_column) in materialized_columns[table]:
+            continue
+
+        sizes = column_sizes[table]
+        candidates.append(
+            MaterializationCandidate(
+                table=cast(TableWithProperties, table),
+                table_column=cast(TableColumn, table_column),
+                property_name=property_name,
+                query_count=query_count,
+                team_count=team_count,
+                top_team_ids=list(top_team_ids),
+                read_bytes=read_bytes,
+                avoidable_read_bytes=avoidable_read_bytes,
+                query_duration_ms=query_duration_ms,
+                timeouts=timeouts,
+                backfill_bytes=sizes.backfill_bytes.get(table_column, 0),
+                expected_saved_bytes=int(avoidable_read_bytes * sizes.share_of_table(table_column)),
+                analysis_period_hours=since_hours_ago,
+            )
+        )
+
+    candidates.sort(key=lambda candidate: (candidate.expected_saved_bytes, candidate.timeouts), reverse=True)
+    logger.info("Ranked properties to materialize", candidates=len(candidates), team_id=team_id)
+    return candidates[:maximum]
+
+
+def get_column_sizes(table: TableWithProperties, backfill_period_days: int) -> ColumnSizes:
+    "Compressed sizes of the columns of `table`, and how much of each a backfill of `backfill_period_days` would read"
+    table_info = tables[table]
+    if isinstance(table_info, ShardedTableInfo):
+        # One replica per shard, as every shard holds a different part of the data
+        parts_columns = "cluster(%(cluster)s, system, parts_columns)"
+    else:
+        parts_columns = "system.parts_columns"
+
+    if table == "events":
+        # Events are partitioned by month, which is as fine-grained as the estimate gets
+        backfill_partition = (now() - timedelta(days=backfill_period_days)).strftime("%Y%m")
+    else:
+        # Backfills of other tables aren't limited to a period
+        backfill_partition = ""
+
+    rows = sync_execute(
+        COLUMN_SIZES_SQL.format(parts_columns=parts_columns),
+        {
+            "cluster": CLICKHOUSE_CLUSTER,
+            "database": CLICKHOUSE_DATABASE,
+            "table": table_info.data_table,
+            "backfill_partition": backfill_partition,
+        },
+    )
+    return ColumnSizes(
+        table_bytes=sum(column_bytes for _, column_bytes, _ in rows),
+        column_bytes={column: column_bytes for column, column_bytes, _ in rows},
+        backfill_bytes={column: backfill_bytes for column, _, backfill_bytes in rows}
+        if backfill_period_days > 0
+        else {},
+    )
@@ -13,7 +13,11 @@ from django.utils.timezone import now
 from posthog.clickhouse.client.connection import default_client
 from posthog.clickhouse.cluster import ClickhouseCluster, ConnectionInfo, FuturesMap, HostInfo
 from posthog.clickhouse.kafka_engine import trim_quotes_expr
-from posthog.clickhouse.materialized_columns import ColumnName, TablesWithMaterializedColumns
+from posthog.clickhouse.materialized_columns import (
+    ColumnName,
+    TablesWithMaterializedColumns,
+    publish_enabled_materialized_columns,
+)
 from posthog.client import sync_execute
 from posthog.models.event.sql import EVENTS_DATA_TABLE
 from posthog.models.instance_setting import get_instance_setting
@@ -255,6 +259,7 @@ def materialize(
             ).execute
         ).result()
 
+    _publish_materialized_columns(table)
     return column.name
 
 
@@ -287,6 +292,7 @@ def update_column_is_disabled(table: TablesWithMaterializedColumns, column_name:
             ),
         ).execute
     ).result()
+    _publish_materialized_columns(table)
 
 
 @dataclass
@@ -331,6 +337,12 @@ def drop_column(table: TablesWithMaterializedColumns, column_name: str) -> None:
             try_drop_index=True,
         ).execute,
     ).result()
+    _publish_materialized_columns(table)
+
+
+def _publish_materialized_columns(table: TablesWithMaterializedColumns) -> None:
+    # Lets every process pick up the change right away, instead of querying from disabled or dropped columns
+    publish_enabled_materialized_columns(table, get_materialized_columns(table, exclude_disabled_columns=True))
 
 
 @dataclass
@@ -0,0 +1,108 @@
+import json
+
+from ee.clickhouse.materialized_columns.advisor import advise_materialized_columns
+from ee.clickhouse.materialized_columns.columns import materialize
+from posthog.client import sync_execute
+from posthog.test.base import (
+    BaseTest,
+    ClickhouseTestMixin,
+    _create_event,
+    cleanup_materialized_columns,
+    flush_persons_and_events,
+)
+
+
+class TestMaterializedColumnsAdvisor(ClickhouseTestMixin, BaseTest):
+    def setUp(self):
+        super().setUp()
+        sync_execute("SYSTEM FLUSH LOGS")
+        sync_execute("TRUNCATE TABLE system.query_log")
+        # The savings are estimated from the share of the table that the JSON column makes up
+        for index in range(10):
+            _create_event(
+                team=self.team,
+                event="$pageview",
+                distinct_id=f"user_{index}",
+                properties={"big_prop": "x" * 100},
+                person_properties={"email": f"user_{index}@posthog.com"},
+            )
+        flush_persons_and_events()
+
+    def tearDown(self):
+        cleanup_materialized_columns()
+        super().tearDown()
+
+    def _log_query(self, unmaterialized_properties, team_id=2, read_bytes=40_000_000_000, exception_code=0):
+        log_comment = json.dumps({"team_id": team_id, "unmaterialized_properties": unmaterialized_properties})
+        sync_execute(
+            """
+            INSERT INTO system.query_log (
+                query, event_date, query_start_time, type, is_initial_query, log_comment, exception_code, read_bytes
+            ) VALUES (
+                'SELECT 1', today(), now(), 2, 1, %(log_comment)s, %(exception_code)s, %(read_bytes)s
+            )
+            """,
+            {"log_comment": log_comment, "exception_code": exception_code, "read_bytes": read_bytes},
+        )
+
+    def test_ranks_properties_by_avoidable_read_bytes(self):
+        for team_id in (2, 2, 3):
+            self._log_query([["events", "properties", "big_prop"]], team_id=team_id)
+        self._log_query([["events", "person_properties", "email"]], read_bytes=1_000_000_000, exception_code=159)
+        for _ in range(5):
+            # Neither saves anything on its own, as the query still has to read the column for the other
+            self._log_query([["events", "properties", "shared_a"], ["events", "properties", "shared_b"]])
+        self._log_query([["groups", "group_properties", "industry"]])
+        materialize("events", "already")
+        self._log_query([["events", "properties", "already"]])
+
+        candidates = advise_materialized_columns(min_query_count=1)
+
+        self.assertEqual(
+            [candidate.property_name for candidate in candidates[:2]],
+            ["big_prop", "email"],
+        )
+        self.assertEqual(
+            {candidate.suggestion for candidate in candidates},
+            {
+                ("events", "properties", "big_prop"),
+                ("events", "person_properties", "email"),
+                ("events", "properties", "shared_a"),
+                ("events", "properties", "shared_b"),
+            },
+        )
+
+        big_prop = candidates[0]
+        self.assertEqual(big_prop.query_count, 3)
+        self.assertEqual(big_prop.team_count, 2)
+        self.assertEqual(big_prop.top_team_ids[0], 2)
+        self.assertEqual(big_prop.read_bytes, 120_000_000_000)
+        self.assertEqual(big_prop.avoidable_read_bytes, 120_000_000_000)
+        self.assertGreater(big_prop.expected_saved_bytes, 0)
+        self.assertLess(big_prop.expected_saved_bytes, big_prop.avoidable_read_bytes)
+        self.assertEqual(candidates[1].timeouts, 1)
+
+        shared = [candidate for candidate in candidates if candidate.property_name.startswith("shared")]
+        self.assertEqual([candidate.avoidable_read_bytes for candidate in shared], [0, 0])
+        self.assertEqual([candidate.expected_saved_bytes for candidate in shared], [0, 0])
+
+    def test_filters_by_team_and_query_count(self):
+        for _ in range(3):
+            self._log_query([["events", "properties", "frequent"]], team_id=2)
+        self._log_query([["events", "properties", "rare"]], team_id=2)
+        for _ in range(3):
+            self._log_query([["events", "properties", "other_team"]], team_id=3)
+
+        candidates = advise_materialized_columns(team_id=2, min_query_count=2)
+
+        self.assertEqual([candidate.property_name for candidate in candidates], ["frequent"])
+
+    def test_estimates_backfill_cost(self):
+        self._log_query([["events", "properties", "big_prop"]])
+
+        [without_backfill] = advise_materialized_columns(min_query_count=1, backfill_period_days=0)
+        [with_backfill] = advise_materialized_columns(min_query_count=1, backfill_period_days=30)
+
+        self.assertEqual(without_backfill.backfill_bytes, 0)
+        self.assertGreater(with_backfill.backfill_bytes, 0)
+        self.assertIsNotNone(with_backfill.payback_days)
@@ -14,7 +14,11 @@ from ee.clickhouse.materialized_columns.columns import (
     materialize,
     update_column_is_disabled,
 )
-from posthog.clickhouse.materialized_columns import TablesWithMaterializedColumns, get_enabled_materialized_columns
+from posthog.clickhouse.materialized_columns import (
+    EnabledMaterializedColumns,
+    TablesWithMaterializedColumns,
+    get_enabled_materialized_columns,
+)
 from posthog.client import sync_execute
 from posthog.conftest import create_clickhouse_tables
 from posthog.constants import GROUP_TYPES_LIMIT
@@ -72,6 +76,7 @@ class TestMaterializedColumnDetails(TestCase):
 class TestMaterializedColumns(ClickhouseTestMixin, BaseTest):
     def setUp(self):
         self.recreate_database()
+        get_enabled_materialized_columns.clear()
         return super().setUp()
 
     def tearDown(self):
@@ -110,22 +115,58 @@ class TestMaterializedColumns(ClickhouseTestMixin, BaseTest):
 
             materialize("events", "abc", create_minmax_index=True)
 
+            # The process making the change doesn't wait for the next version check
             self.assertCountEqual(
                 [
                     property_name
                     for property_name, _ in get_enabled_materialized_columns("events", use_cache=True).keys()
                 ],
-                ["$foo", "$bar", *EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS],
+                ["$foo", "$bar", "abc", *EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS],
             )
 
-        with freeze_time("2020-01-04T14:00:01Z"):
-            self.assertCountEqual(
-                [
-                    property_name
-                    for property_name, _ in get_enabled_materialized_columns("events", use_cache=True).keys()
-                ],
-                ["$foo", "$bar", "abc", *EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS],
+    def test_caching_picks_up_changes_from_other_processes(self):
+        other_process = EnabledMaterializedColumns()
+
+        def enabled_properties() -> list[PropertyName]:
+            return [property_name for property_name, _ in other_process("events", use_cache=True).keys()]
+
+        with freeze_time("2020-01-04T13:01:01Z") as frozen_time:
+            self.assertCountEqual(enabled_properties(), EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS)
+
+            column_name = materialize("events", "$foo", create_minmax_index=True)
+            assert column_name is not None
+            # Until the next version check, the cached columns are used
+            self.assertCountEqual(enabled_properties(), EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS)
+
+            with patch.object(other_process, "_read_columns", wraps=other_process._read_columns) as read_columns:
+                frozen_time.tick(timedelta(seconds=2))
+                self.assertCountEqual(enabled_properties(), ["$foo", *EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS])
+
+                update_column_is_disabled("events", column_name, is_disabled=True)
+                frozen_time.tick(timedelta(seconds=2))
+                self.assertCountEqual(enabled_properties(), EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS)
+
+                update_column_is_disabled("events", column_name, is_disabled=False)
+                frozen_time.tick(timedelta(seconds=2))
+                self.assertCountEqual(enabled_properties(), ["$foo", *EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS])
+
+                drop_column("events", column_name)
+                frozen_time.tick(timedelta(seconds=2))
+                self.assertCountEqual(enabled_properties(), EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS)
+
+                # The published columns are read from redis rather than ClickHouse
+                read_columns.assert_not_called()
+
+            # Columns changed without publishing them are still picked up by the periodic reload
+            materialize_without_publishing = patch(
+                "ee.clickhouse.materialized_columns.columns.publish_enabled_materialized_columns"
             )
+            with materialize_without_publishing:
+                materialize("events", "$bar", create_minmax_index=True)
+            frozen_time.tick(timedelta(minutes=10))
+            self.assertCountEqual(enabled_properties(), EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS)
+            frozen_time.tick(timedelta(minutes=10))
+            self.assertCountEqual(enabled_properties(), ["$bar", *EVENTS_TABLE_DEFAULT_MATERIALIZED_COLUMNS])
 
     @patch("secrets.choice", return_value="X")
     def test_materialized_column_naming(self, mock_choice):
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 from django.utils import timezone
 from freezegun import freeze_time
@@ -1370,3 +1371,79 @@ class TestCohort(ClickhouseTestMixin, BaseTest):
         # Should have p1 in this cohort even if version is different
         results = self._get_cohortpeople(cohort1)
         self.assertEqual(len(results), 1)
+
+    def _create_persons_for_incremental_recalculation(self):
+        with freeze_time((datetime.now() - timedelta(days=3)).strftime("%Y-%m-%d")):
+            p1 = Person.objects.create(team_id=self.team.pk, distinct_ids=["1"], properties={"$some_prop": "something"})
+            p2 = Person.objects.create(team_id=self.team.pk, distinct_ids=["2"], properties={"$some_prop": "something"})
+            p3 = Person.objects.create(team_id=self.team.pk, distinct_ids=["3"], properties={"$some_prop": "another"})
+            cohort1 = Cohort.objects.create(
+                team=self.team,
+                groups=[{"properties": [{"key": "$some_prop", "value": "something", "type": "person"}]}],
+                name="cohort1",
+            )
+        cohort1.calculate_people_ch(pending_version=0)
+
+        with freeze_time((datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d")):
+            p2.version = 1
+            p2.properties = {"$some_prop": "another"}
+            p2.save()
+            p3.version = 1
+            p3.properties = {"$some_prop": "something"}
+            p3.save()
+
+        return cohort1, p1, p2, p3
+
+    def test_incremental_recalculation_writes_only_changes(self):
+        cohort1, p1, p2, p3 = self._create_persons_for_incremental_recalculation()
+
+        cohort1.calculate_people_ch(pending_version=1)
+        cohort1.refresh_from_db()
+
+        self.assertEqual(cohort1.version, 0)
+        self.assertEqual(cohort1.count, 2)
+        self.assertEqual(sorted(row[0] for row in self._get_cohortpeople(cohort1)), sorted([p1.uuid, p3.uuid]))
+        # p1 hasn't changed, so isn't written again
+        rows = sync_execute(
+            "SELECT person_id, sign, version FROM cohortpeople WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s",
+            {"team_id": self.team.pk, "cohort_id": cohort1.pk},
+        )
+        self.assertEqual(sorted(rows), sorted([(p1.uuid, 1, 0), (p3.uuid, 1, 0)]))
+
+    def test_incremental_recalculation_falls_back_to_new_version(self):
+        cohort1, p1, p2, p3 = self._create_persons_for_incremental_recalculation()
+
+        with self.settings(COHORT_INCREMENTAL_RECALCULATION_MAX_CHANGES=1):
+            cohort1.calculate_people_ch(pending_version=1)
+        cohort1.refresh_from_db()
+
+        self.assertEqual(cohort1.version, 1)
+        self.assertEqual(cohort1.count, 2)
+        self.assertEqual(sorted(row[0] for row in self._get_cohortpeople(cohort1)), sorted([p1.uuid, p3.uuid]))
+
+    @patch("posthog.models.cohort.util.COHORT_DELETE_PERSONS_CHUNK_SIZE", 1)
+    def test_incremental_recalculation_deletes_in_chunks(self):
+        cohort1, p1, p2, p3 = self._create_persons_for_incremental_recalculation()
+        with freeze_time((datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d")):
+            p1.version = 1
+            p1.properties = {"$some_prop": "another"}
+            p1.save()
+
+        cohort1.calculate_people_ch(pending_version=1)
+        cohort1.refresh_from_db()
+
+        self.assertEqual(cohort1.version, 0)
+        self.assertEqual(cohort1.count, 1)
+        self.assertEqual([row[0] for row in self._get_cohortpeople(cohort1)], [p3.uuid])
+
+    @patch("posthog.models.cohort.util.DELETE_COHORTPEOPLE_BY_PERSON_IDS", "NOT A QUERY %(person_ids)s")
+    def test_incremental_recalculation_falls_back_to_new_version_on_error(self):
+        cohort1, p1, p2, p3 = self._create_persons_for_incremental_recalculation()
+
+        cohort1.calculate_people_ch(pending_version=1)
+        cohort1.refresh_from_db()
+
+        self.assertEqual(cohort1.version, 1)
+        self.assertEqual(cohort1.count, 2)
+        self.assertEqual(cohort1.errors_calculating, 0)
+        self.assertEqual(sorted(row[0] for row in self._get_cohortpeople(cohort1)), sorted([p1.uuid, p3.uuid]))
@@ -0,0 +1,95 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from ee.clickhouse.materialized_columns.advisor import (
+    MATERIALIZE_COLUMNS_MINIMUM_QUERY_COUNT,
+    advise_materialized_columns,
+)
+from ee.clickhouse.materialized_columns.analyze import logger, materialize_properties_task
+from posthog.settings import (
+    MATERIALIZE_COLUMNS_ANALYSIS_PERIOD_HOURS,
+    MATERIALIZE_COLUMNS_BACKFILL_PERIOD_DAYS,
+    MATERIALIZE_COLUMNS_MAX_AT_ONCE,
+)
+
+
+class Command(BaseCommand):
+    help = """
+        Report which properties HogQL queries read with JSON extraction would be worth materializing, ranked by
+        the bytes materializing them would have saved against what backfilling them costs. Nothing is changed
+        unless --materialize is passed.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--materialize", action="store_true", help="Materialize the reported properties instead of a dry run"
+        )
+        parser.add_argument(
+            "--analyze-period",
+            type=int,
+            default=MATERIALIZE_COLUMNS_ANALYSIS_PERIOD_HOURS,
+            help="How many hours of queries to analyze. Same as MATERIALIZE_COLUMNS_ANALYSIS_PERIOD_HOURS env variable.",
+        )
+        parser.add_argument(
+            "--analyze-team-id",
+            type=int,
+            default=None,
+            help="Analyze queries only for a specific team_id",
+        )
+        parser.add_argument(
+            "--backfill-period",
+            type=int,
+            default=MATERIALIZE_COLUMNS_BACKFILL_PERIOD_DAYS,
+            help="How many days worth of data to backfill. 0 to disable. Same as MATERIALIZE_COLUMNS_BACKFILL_PERIOD_DAYS env variable.",
+        )
+        parser.add_argument(
+            "--min-queries",
+            type=int,
+            default=MATERIALIZE_COLUMNS_MINIMUM_QUERY_COUNT,
+            help="Minimum number of queries reading a property before it's considered",
+        )
+        parser.add_argument(
+            "--max-columns",
+            type=int,
+            default=MATERIALIZE_COLUMNS_MAX_AT_ONCE,
+            help="Max number of columns to report. Same as MATERIALIZE_COLUMNS_MAX_AT_ONCE env variable.",
+        )
+
+    def handle(self, *args, **options):
+        logger.setLevel(logging.INFO)
+
+        candidates = advise_materialized_columns(
+            since_hours_ago=options["analyze_period"],
+            backfill_period_days=options["backfill_period"],
+            team_id=options["analyze_team_id"],
+            min_query_count=options["min_queries"],
+            maximum=options["max_columns"],
+        )
+        if not candidates:
+            self.stdout.write("Found no properties worth materializing.")
+            return
+
+        for rank, candidate in enumerate(candidates, start=1):
+            payback = f"{candidate.payback_days:.1f} days" if candidate.payback_days is not None else "never"
+            self.stdout.write(
+                f"{rank}. {candidate.table}.{candidate.table_column}['{candidate.property_name}']: "
+                f"saves ~{_gigabytes(candidate.expected_saved_bytes_per_day)} read per day, "
+                f"backfill reads {_gigabytes(candidate.backfill_bytes)}, pays back in {payback}. "
+                f"{candidate.query_count} queries from {candidate.team_count} teams "
+                f"(most from {', '.join(map(str, candidate.top_team_ids))}) read {_gigabytes(candidate.read_bytes)} "
+                f"in {candidate.query_duration_ms / 1000:.0f} s, {candidate.timeouts} timed out"
+            )
+
+        if options["materialize"]:
+            materialize_properties_task(
+                columns_to_materialize=[candidate.suggestion for candidate in candidates],
+                maximum=options["max_columns"],
+                backfill_period_days=options["backfill_period"],
+            )
+        else:
+            logger.warn("Dry run: pass --materialize to materialize these properties")
+
+
+def _gigabytes(num_bytes: float) -> str:
+    return f"{num_bytes / 1_000_000_000:.2f} GB"
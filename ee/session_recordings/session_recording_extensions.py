@@ -6,6 +6,12 @@ from django.utils import timezone
 from prometheus_client import Histogram, Counter
 
 from posthog import settings
+from posthog.session_recordings.compaction import (
+    COMPACTED_DATA_FILE,
+    COMPACTED_INDEX_FILE,
+    compact_blobs,
+    decode_blob,
+)
 from posthog.session_recordings.models.session_recording import SessionRecording
 from posthog.storage import object_storage
 
@@ -36,8 +42,22 @@ RECORDING_PERSIST_START_COUNTER = Counter(
     "Count of session recordings that were persisted",
 )
 
+SNAPSHOT_COMPACTION_TIME_HISTOGRAM = Histogram(
+    "snapshot_compaction_time_seconds",
+    "We compact persisted recording snapshots into a single indexed file, how long does that take?",
+)
+
+SNAPSHOT_COMPACTION_COUNTER = Counter(
+    "snapshot_compaction",
+    "Count of persisted session recordings we attempted to compact, by outcome",
+    labelnames=["outcome"],
+)
+
 MINIMUM_AGE_FOR_RECORDING = timedelta(hours=24)
 
+# recordings with only a few blobs load quickly enough without a compacted copy
+MINIMUM_BLOBS_FOR_COMPACTION = 10
+
 
 class InvalidRecordingForPersisting(Exception):
     pass
@@ -84,6 +104,13 @@ def persist_recording(recording_id: str, team_id: int) -> None:
         recording.object_storage_path = target_prefix
         recording.save()
         SNAPSHOT_PERSIST_SUCCESS_COUNTER.inc()
+
+        try:
+            compact_recording(recording)
+        except Exception:
+            # the recording is persisted and playable from its blobs, compaction only makes it load faster
+            SNAPSHOT_COMPACTION_COUNTER.labels(outcome="failure").inc()
+            logger.exception("Compacting a persisted recording failed", recording_id=recording_id, team_id=team_id)
         return
     else:
         SNAPSHOT_PERSIST_FAILURE_COUNTER.inc()
@@ -95,3 +122,40 @@ def persist_recording(recording_id: str, team_id: int) -> None:
             source_prefix=source_prefix,
         )
         raise InvalidRecordingForPersisting("Could not persist recording: " + recording_id)
+
+
+def _blob_start_timestamp(blob_key: str) -> int:
+    # Keys end like 1619712000-1619712060, possibly with an extension
+    return int(blob_key.rsplit("/", 1)[-1].split(".")[0].split("-")[0])
+
+
+def compact_recording(recording: SessionRecording) -> None:
+    """
+    Merges a persisted recording's blobs into a single chunked file with a timestamp to byte offset index,
+    so that the player can start from any point of a long recording without downloading all of it.
+    """
+    if not recording.object_storage_path:
+        return
+
+    blob_keys = object_storage.list_objects(recording.object_storage_path)
+    if not blob_keys or len(blob_keys) < MINIMUM_BLOBS_FOR_COMPACTION:
+        SNAPSHOT_COMPACTION_COUNTER.labels(outcome="skipped").inc()
+        return
+
+    blobs: list[bytes] = []
+    for blob_key in sorted(blob_keys, key=_blob_start_timestamp):
+        content = object_storage.read_bytes(blob_key)
+        if content is None:
+            # a partial compacted file would silently drop part of the recording
+            raise InvalidRecordingForPersisting(f"Could not read blob {blob_key} to compact it")
+        blobs.append(decode_blob(content))
+
+    with SNAPSHOT_COMPACTION_TIME_HISTOGRAM.time():
+        compacted, index = compact_blobs(blobs)
+
+    compacted_prefix = recording.build_compacted_storage_path()
+    object_storage.write(f"{compacted_prefix}/{COMPACTED_DATA_FILE}", compacted)
+    # the index is written last, readers only use the compacted file once its index exists
+    object_storage.write(f"{compacted_prefix}/{COMPACTED_INDEX_FILE}", index.to_json())
+
+    SNAPSHOT_COMPACTION_COUNTER.labels(outcome="success").inc()
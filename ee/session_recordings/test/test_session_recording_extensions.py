@@ -1,3 +1,5 @@
+import gzip
+import json
 from datetime import timedelta, datetime, UTC
 from secrets import token_urlsafe
 from uuid import uuid4
@@ -7,8 +9,10 @@ from botocore.config import Config
 from freezegun import freeze_time
 
 from ee.session_recordings.session_recording_extensions import (
+    compact_recording,
     persist_recording,
 )
+from posthog.session_recordings.compaction import CompactedIndex, decode_chunk
 from posthog.session_recordings.models.session_recording import SessionRecording
 from posthog.session_recordings.queries.test.session_replay_sql import (
     produce_replay_summary,
@@ -19,7 +23,7 @@ from posthog.settings import (
     OBJECT_STORAGE_SECRET_ACCESS_KEY,
     OBJECT_STORAGE_BUCKET,
 )
-from posthog.storage.object_storage import write, list_objects, object_storage_client
+from posthog.storage.object_storage import write, list_objects, object_storage_client, read_bytes
 from posthog.test.base import APIBaseTest, ClickhouseTestMixin
 
 long_url = f"https://app.posthog.com/my-url?token={token_urlsafe(600)}"
@@ -132,3 +136,29 @@ class TestSessionRecordingExtensions(ClickhouseTestMixin, APIBaseTest):
                 f"{recording.build_blob_lts_storage_path('2023-08-01')}/b",
                 f"{recording.build_blob_lts_storage_path('2023-08-01')}/c",
             ]
+
+    def test_compacts_persisted_recording(self):
+        session_id = f"test_compacts_persisted_recording-s1-{uuid4()}"
+        blob_path = f"{TEST_BUCKET}/team_id/{self.team.pk}/session_id/{session_id}/data"
+        lines = []
+        for index in range(10):
+            timestamp = 1682608337071 + index * 1000
+            line = json.dumps({"window_id": "w", "data": [{"type": 3, "timestamp": timestamp}]}).encode() + b"\n"
+            lines.append(line)
+            write(f"{blob_path}/{timestamp}-{timestamp}", gzip.compress(line))
+
+        recording = SessionRecording.objects.create(
+            team=self.team, session_id=session_id, storage_version="2023-08-01", object_storage_path=blob_path
+        )
+        compact_recording(recording)
+
+        compacted_prefix = recording.build_compacted_storage_path()
+        assert compacted_prefix == f"{TEST_BUCKET}/team_id/{self.team.pk}/session_id/{session_id}/compacted"
+        index = CompactedIndex.from_json(read_bytes(f"{compacted_prefix}/index.json") or b"")
+        assert len(index.chunks) == 1
+        assert (index.start_timestamp, index.end_timestamp) == (1682608337071, 1682608346071)
+
+        compacted = read_bytes(f"{compacted_prefix}/data", byte_range=index.chunks[0].byte_range) or b""
+        assert decode_chunk(compacted) == b"".join(lines)
+        # listing the recording's blobs doesn't include the compacted files
+        assert len(list_objects(blob_path) or []) == 10
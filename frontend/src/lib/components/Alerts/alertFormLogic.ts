@@ -68,8 +68,11 @@ export const alertFormLogic = kea<alertFormLogicType>([
                     insight: props.insightId,
                 }
 
-                // absolute value alert can only have absolute threshold
-                if (payload.condition.type === AlertConditionType.ABSOLUTE_VALUE) {
+                // absolute value and anomaly alerts can only have absolute thresholds
+                if (
+                    payload.condition.type === AlertConditionType.ABSOLUTE_VALUE ||
+                    payload.condition.type === AlertConditionType.ANOMALY
+                ) {
                     payload.threshold.configuration.type = InsightThresholdType.ABSOLUTE
                 }
 
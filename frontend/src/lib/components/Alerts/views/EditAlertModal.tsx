@@ -97,6 +97,8 @@ export function EditAlertModal({
     const { alertSeries, isNonTimeSeriesDisplay, isBreakdownValid, formula } = useValues(trendsLogic)
 
     const creatingNewAlert = alertForm.id === undefined
+    // anomaly bounds are how many standard deviations below or above the usual value the insight may go
+    const isAnomalyCondition = alertForm.condition.type === AlertConditionType.ANOMALY
 
     return (
         <LemonModal onClose={onClose} isOpen={isOpen} width={600} simple title="">
@@ -203,13 +205,20 @@ export function EditAlertModal({
                                                                 isNonTimeSeriesDisplay &&
                                                                 'This condition is only supported for time series trends',
                                                         },
+                                                        {
+                                                            label: 'deviates (std. dev.)',
+                                                            value: AlertConditionType.ANOMALY,
+                                                            disabledReason:
+                                                                isNonTimeSeriesDisplay &&
+                                                                'This condition is only supported for time series trends',
+                                                        },
                                                     ]}
                                                 />
                                             </LemonField>
                                         </Group>
                                     </div>
                                     <div className="flex gap-4 items-center">
-                                        <div>less than</div>
+                                        <div>{isAnomalyCondition ? 'more than' : 'less than'}</div>
                                         <LemonField name="lower">
                                             <LemonInput
                                                 type="number"
@@ -240,7 +249,9 @@ export function EditAlertModal({
                                                 }
                                             />
                                         </LemonField>
-                                        <div>or more than</div>
+                                        <div>
+                                            {isAnomalyCondition ? 'std. dev. below or more than' : 'or more than'}
+                                        </div>
                                         <LemonField name="upper">
                                             <LemonInput
                                                 type="number"
@@ -271,7 +282,9 @@ export function EditAlertModal({
                                                 }
                                             />
                                         </LemonField>
-                                        {alertForm.condition.type !== AlertConditionType.ABSOLUTE_VALUE && (
+                                        {isAnomalyCondition && <div>std. dev. above the usual value</div>}
+                                        {(alertForm.condition.type === AlertConditionType.RELATIVE_INCREASE ||
+                                            alertForm.condition.type === AlertConditionType.RELATIVE_DECREASE) && (
                                             <Group name={['threshold', 'configuration']}>
                                                 <LemonField name="type">
                                                     <LemonSegmentedButton
@@ -239,6 +239,10 @@ export interface HogQLQueryModifiers {
     propertyGroupsMode?: 'enabled' | 'disabled' | 'optimized'
     useMaterializedViews?: boolean
     customChannelTypeRules?: CustomChannelRule[]
+    useErrorTrackingSearchIndex?: boolean
+    useErrorTrackingIssueStats?: boolean
+    useReplayEventSummary?: boolean
+    profileQueries?: boolean
 }
 
 export interface DataWarehouseEventsModifier {
@@ -543,6 +547,8 @@ export interface EventsQueryResponse extends AnalyticsQueryResponseBase<any[][]>
     hasMore?: boolean
     limit?: integer
     offset?: integer
+    /** Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking */
+    nextCursor?: string
 }
 
 export type CachedEventsQueryResponse = CachedQueryResponse<EventsQueryResponse>
@@ -578,6 +584,10 @@ export interface EventsQuery extends DataNode<EventsQueryResponse> {
      * Number of rows to skip before returning rows
      */
     offset?: integer
+    /**
+     * Cursor returned as `nextCursor` by the previous page. Takes precedence over `offset`
+     */
+    cursor?: string
     /**
      * Show events matching a given action
      */
@@ -1732,6 +1742,8 @@ export interface ActorsQueryResponse extends AnalyticsQueryResponseBase<any[][]>
     limit: integer
     offset: integer
     missing_actors_count?: integer
+    /** Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking */
+    nextCursor?: string
 }
 
 export type CachedActorsQueryResponse = CachedQueryResponse<ActorsQueryResponse>
@@ -1748,6 +1760,10 @@ export interface ActorsQuery extends DataNode<ActorsQueryResponse> {
     orderBy?: string[]
     limit?: integer
     offset?: integer
+    /** Cursor returned as `nextCursor` by the previous page. Takes precedence over `offset` */
+    cursor?: string
+    /** Only return these person properties on hydrated persons. Returns all properties by default */
+    personProperties?: string[]
 }
 
 export interface TimelineEntry {
@@ -2382,6 +2398,7 @@ export enum AlertConditionType {
     ABSOLUTE_VALUE = 'absolute_value', // default alert, checks absolute value of current interval
     RELATIVE_INCREASE = 'relative_increase', // checks increase in value during current interval compared to previous interval
     RELATIVE_DECREASE = 'relative_decrease', // checks decrease in value during current interval compared to previous interval
+    ANOMALY = 'anomaly', // checks how many standard deviations the previous interval is from its seasonal baseline
 }
 
 export interface AlertCondition {
@@ -54,7 +54,7 @@ export const featureFlagReleaseConditionsLogic = kea<featureFlagReleaseCondition
         }),
         setAffectedUsers: (index: number, count?: number) => ({ index, count }),
         setTotalUsers: (count: number) => ({ count }),
-        calculateBlastRadius: true,
+        calculateBlastRadius: (estimate: boolean = false) => ({ estimate }),
     }),
     reducers(({ props }) => ({
         filters: [
@@ -161,6 +161,8 @@ export const featureFlagReleaseConditionsLogic = kea<featureFlagReleaseCondition
                 {
                     condition: { properties: newProperties },
                     group_type_index: values.filters?.aggregation_group_type_index ?? null,
+                    // estimated from a sample of persons, as this runs on every edit of the condition
+                    estimate: true,
                 }
             )
             actions.setAffectedUsers(index, response.users_affected)
@@ -177,9 +179,9 @@ export const featureFlagReleaseConditionsLogic = kea<featureFlagReleaseCondition
             })
         },
         setAggregationGroupTypeIndex: () => {
-            actions.calculateBlastRadius()
+            actions.calculateBlastRadius(true)
         },
-        calculateBlastRadius: async () => {
+        calculateBlastRadius: async ({ estimate }) => {
             const usersAffected: Promise<UserBlastRadiusType>[] = []
 
             values.filters?.groups?.forEach((condition, index) => {
@@ -196,6 +198,7 @@ export const featureFlagReleaseConditionsLogic = kea<featureFlagReleaseCondition
                         {
                             condition: { properties: [] },
                             group_type_index: values.filters?.aggregation_group_type_index ?? null,
+                            estimate,
                         }
                     )
 
@@ -206,6 +209,7 @@ export const featureFlagReleaseConditionsLogic = kea<featureFlagReleaseCondition
                         {
                             condition,
                             group_type_index: values.filters?.aggregation_group_type_index ?? null,
+                            estimate,
                         }
                     )
 
@@ -330,6 +334,7 @@ export const featureFlagReleaseConditionsLogic = kea<featureFlagReleaseCondition
     })),
     afterMount(({ props, actions }) => {
         if (!props.readOnly) {
+            // exact counts for the saved conditions, edits to them get estimates
             actions.calculateBlastRadius()
         }
     }),
@@ -217,6 +217,16 @@ describe('the feature flag release conditions logic', () => {
                     affectedUsers: { 0: 248 },
                     totalUsers: 2000,
                 })
+            // the saved conditions get exact counts, edits to them get estimates
+            expect(api.create).toHaveBeenNthCalledWith(
+                1,
+                expect.stringContaining('user_blast_radius'),
+                expect.objectContaining({ estimate: false })
+            )
+            expect(api.create).toHaveBeenLastCalledWith(
+                expect.stringContaining('user_blast_radius'),
+                expect.objectContaining({ estimate: true })
+            )
 
             // Add another condition set
             await expectLogic(logic, () => {
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from django.db.models import QuerySet, Q, deletion
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import (
@@ -52,7 +53,14 @@ from posthog.models.feature_flag import (
     get_user_blast_radius,
 )
 from posthog.models.feature_flag.flag_analytics import increment_request_count
-from posthog.models.feature_flag.flag_matching import check_flag_evaluation_query_is_ok
+from posthog.models.feature_flag.flag_matching import (
+    check_flag_evaluation_query_is_ok,
+    get_feature_flags_for_distinct_ids,
+)
+from posthog.models.feature_flag.user_blast_radius import (
+    can_estimate_user_blast_radius,
+    estimate_user_blast_radius,
+)
 from posthog.models.feedback.survey import Survey
 from posthog.models.group_type_mapping import GroupTypeMapping
 from posthog.models.property import Property
@@ -72,6 +80,8 @@ BEHAVIOURAL_COHORT_FOUND_ERROR_CODE = "behavioral_cohort_found"
 
 MAX_PROPERTY_VALUES = 1000
 
+BULK_EVALUATION_MAX_DISTINCT_IDS = 10_000
+
 
 class FeatureFlagThrottle(BurstRateThrottle):
     # Throttle class that's scoped just to the local evaluation endpoint.
@@ -769,6 +779,45 @@ class FeatureFlagViewSet(
 
         return Response(flags_with_evaluation_reasons)
 
+    @action(
+        methods=["POST"], detail=False, throttle_classes=[FeatureFlagThrottle], required_scopes=["feature_flag:read"]
+    )
+    def bulk_evaluation(self, request: request.Request, **kwargs):
+        distinct_ids = request.data.get("distinct_ids")
+        groups = request.data.get("groups") or {}
+
+        if (
+            not isinstance(distinct_ids, list)
+            or not distinct_ids
+            or not all(isinstance(distinct_id, str) for distinct_id in distinct_ids)
+        ):
+            raise exceptions.ValidationError(detail="distinct_ids must be a non-empty list of strings")
+        if len(distinct_ids) > BULK_EVALUATION_MAX_DISTINCT_IDS:
+            raise exceptions.ValidationError(
+                detail=f"At most {BULK_EVALUATION_MAX_DISTINCT_IDS} distinct_ids can be evaluated at once"
+            )
+        if not isinstance(groups, dict):
+            raise exceptions.ValidationError(detail="groups must be an object of group type to group key")
+
+        def stream_flags():
+            for distinct_id, flags, _, payloads, errors in get_feature_flags_for_distinct_ids(
+                self.team_id, distinct_ids, groups
+            ):
+                yield (
+                    json.dumps(
+                        {
+                            "distinct_id": distinct_id,
+                            "featureFlags": flags,
+                            "featureFlagPayloads": payloads,
+                            "errorsWhileComputingFlags": errors,
+                        }
+                    )
+                    + "\n"
+                )
+
+        # One line of JSON per distinct id, sent as soon as its batch is evaluated
+        return StreamingHttpResponse(stream_flags(), content_type="application/x-ndjson")
+
     @action(methods=["POST"], detail=False)
     def user_blast_radius(self, request: request.Request, **kwargs):
         if "condition" not in request.data:
@@ -777,6 +826,23 @@ class FeatureFlagViewSet(
         condition = request.data.get("condition") or {}
         group_type_index = request.data.get("group_type_index", None)
 
+        # Estimates are cheap enough to recompute on every change to the condition while it's being edited
+        if (
+            request.data.get("estimate")
+            and group_type_index is None
+            and can_estimate_user_blast_radius(self.team, condition)
+        ):
+            estimate = estimate_user_blast_radius(self.team, condition, request.data.get("feature_flag_key") or "")
+            return Response(
+                {
+                    "users_affected": estimate.users_affected,
+                    "users_rolled_out": estimate.users_rolled_out,
+                    "total_users": estimate.total_users,
+                    "sample_size": estimate.sample_size,
+                    "estimated": True,
+                }
+            )
+
         # TODO: Handle distinct_id and $group_key properties, which are not currently supported
         users_affected, total_users = get_user_blast_radius(self.team, condition, group_type_index)
 
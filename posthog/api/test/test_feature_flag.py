@@ -4202,6 +4202,71 @@ class TestFeatureFlag(APIBaseTest, ClickhouseTestMixin):
         )
 
 
+class TestBulkEvaluation(APIBaseTest):
+    def test_bulk_evaluation_streams_flags_per_distinct_id(self):
+        Person.objects.create(team=self.team, distinct_ids=["example_id"], properties={"email": "tim@posthog.com"})
+        Person.objects.create(team=self.team, distinct_ids=["other_id"], properties={"email": "tim@example.com"})
+        FeatureFlag.objects.create(
+            team=self.team,
+            key="email-flag",
+            created_by=self.user,
+            filters={
+                "groups": [{"properties": [{"key": "email", "value": "posthog.com", "operator": "icontains"}]}],
+                "payloads": {"true": {"color": "blue"}},
+            },
+        )
+
+        response = self.client.post(
+            f"/api/projects/{self.team.id}/feature_flags/bulk_evaluation",
+            {"distinct_ids": ["example_id", "other_id", "unknown_id"]},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(
+            lines,
+            [
+                {
+                    "distinct_id": "example_id",
+                    "featureFlags": {"email-flag": True},
+                    "featureFlagPayloads": {"email-flag": {"color": "blue"}},
+                    "errorsWhileComputingFlags": False,
+                },
+                {
+                    "distinct_id": "other_id",
+                    "featureFlags": {"email-flag": False},
+                    "featureFlagPayloads": {},
+                    "errorsWhileComputingFlags": False,
+                },
+                {
+                    "distinct_id": "unknown_id",
+                    "featureFlags": {"email-flag": False},
+                    "featureFlagPayloads": {},
+                    "errorsWhileComputingFlags": False,
+                },
+            ],
+        )
+
+    def test_bulk_evaluation_validates_input(self):
+        for data in [{}, {"distinct_ids": []}, {"distinct_ids": "example_id"}, {"distinct_ids": [1]}]:
+            response = self.client.post(f"/api/projects/{self.team.id}/feature_flags/bulk_evaluation", data)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, data)
+
+        response = self.client.post(
+            f"/api/projects/{self.team.id}/feature_flags/bulk_evaluation",
+            {"distinct_ids": ["example_id"], "groups": ["organization"]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with patch("posthog.api.feature_flag.BULK_EVALUATION_MAX_DISTINCT_IDS", 2):
+            response = self.client.post(
+                f"/api/projects/{self.team.id}/feature_flags/bulk_evaluation",
+                {"distinct_ids": ["a", "b", "c"]},
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class TestCohortGenerationForFeatureFlag(APIBaseTest, ClickhouseTestMixin):
     def test_creating_static_cohort_with_deleted_flag(self):
         FeatureFlag.objects.create(
@@ -4688,6 +4753,61 @@ class TestBlastRadius(ClickhouseTestMixin, APIBaseTest):
         response_json = response.json()
         self.assertDictContainsSubset({"users_affected": 4, "total_users": 10}, response_json)
 
+    def test_user_blast_radius_estimate(self):
+        for i in range(10):
+            _create_person(
+                team_id=self.team.pk,
+                distinct_ids=[f"person{i}"],
+                properties={"group": f"{i}"} if i < 8 else {},
+            )
+        condition = {
+            "properties": [
+                {"key": "group", "type": "person", "value": ["0", "1", "2", "3"], "operator": "exact"},
+                {"key": "group", "type": "person", "value": "9", "operator": "is_not"},
+            ],
+            "rollout_percentage": 50,
+        }
+
+        response = self.client.post(
+            f"/api/projects/{self.team.id}/feature_flags/user_blast_radius",
+            {"condition": condition, "estimate": True, "feature_flag_key": "some-flag"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_json = response.json()
+        # every person is in the sample, so the estimate is exact
+        self.assertDictContainsSubset(
+            {"users_affected": 4, "total_users": 10, "sample_size": 10, "estimated": True}, response_json
+        )
+        self.assertLessEqual(response_json["users_rolled_out"], 4)
+
+        # the sample is reused, so persons created since don't change the estimate
+        _create_person(team_id=self.team.pk, distinct_ids=["person10"], properties={"group": "0"})
+        with patch("posthog.models.feature_flag.user_blast_radius.sync_execute") as sync_execute:
+            response = self.client.post(
+                f"/api/projects/{self.team.id}/feature_flags/user_blast_radius",
+                {"condition": condition, "estimate": True, "feature_flag_key": "some-flag"},
+            )
+        sync_execute.assert_not_called()
+        self.assertEqual(response.json()["sample_size"], 10)
+
+    def test_user_blast_radius_estimate_falls_back_for_cohorts(self):
+        _create_person(team_id=self.team.pk, distinct_ids=["person1"], properties={"group": "1"})
+        cohort = Cohort.objects.create(
+            team=self.team, groups=[{"properties": [{"key": "group", "value": "1", "type": "person"}]}]
+        )
+
+        response = self.client.post(
+            f"/api/projects/{self.team.id}/feature_flags/user_blast_radius",
+            {
+                "condition": {"properties": [{"key": "id", "type": "cohort", "value": cohort.pk}]},
+                "estimate": True,
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("estimated", response.json())
+
     @freeze_time("2024-01-11")
     def test_user_blast_radius_with_relative_date_filters(self):
         for i in range(8):
@@ -1,13 +1,61 @@
-from datetime import timedelta
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
 
-from posthog.cache_utils import cache_for
+import structlog
+from django.utils.timezone import now
+
+from posthog import redis
 from posthog.models.property import PropertyName, TableColumn, TableWithProperties
-from posthog.settings import EE_AVAILABLE
+from posthog.settings import EE_AVAILABLE, TEST
 
+logger = structlog.get_logger(__name__)
 
 ColumnName = str
 TablesWithMaterializedColumns = TableWithProperties
 
+# Columns are reloaded from ClickHouse this often even without a version bump, e.g. for columns changed by hand
+MATERIALIZED_COLUMNS_CACHE_TIME = timedelta(minutes=15)
+# How often each process asks redis whether the columns of a table have changed
+MATERIALIZED_COLUMNS_VERSION_CHECK_INTERVAL = timedelta(seconds=1)
+
+
+def materialized_columns_version_key(table: TablesWithMaterializedColumns) -> str:
+    return f"materialized_columns_version/{table}"
+
+
+def materialized_columns_registry_key(table: TablesWithMaterializedColumns) -> str:
+    return f"materialized_columns/{table}"
+
+
+def publish_enabled_materialized_columns(
+    table: TablesWithMaterializedColumns, columns: dict[tuple[PropertyName, TableColumn], ColumnName]
+) -> None:
+    """
+    Stores the enabled materialized columns of `table` in redis under a new version, so that every process picks them
+    up within a second without having to query ClickHouse. Call this after any change to the columns of the table.
+    """
+    try:
+        client = redis.get_client()
+        version = client.incr(materialized_columns_version_key(table))
+        client.set(
+            materialized_columns_registry_key(table),
+            json.dumps(
+                {
+                    "version": version,
+                    "columns": [
+                        [property_name, table_column, name] for (property_name, table_column), name in columns.items()
+                    ],
+                }
+            ),
+        )
+    except Exception as e:
+        # The change still reaches other processes when they next reload from ClickHouse
+        logger.warning("materialized_columns_publish_failed", table=table, error=str(e))
+    get_enabled_materialized_columns.clear(table)
+
+
 if EE_AVAILABLE:
     from ee.clickhouse.materialized_columns.columns import get_materialized_columns
 else:
@@ -19,8 +67,89 @@ else:
         return {}
 
 
-@cache_for(timedelta(minutes=15))
-def get_enabled_materialized_columns(
-    table: TablesWithMaterializedColumns,
-) -> dict[tuple[PropertyName, TableColumn], ColumnName]:
-    return get_materialized_columns(table, exclude_disabled_columns=True)
+@dataclass
+class CachedMaterializedColumns:
+    columns: dict[tuple[PropertyName, TableColumn], ColumnName]
+    version: Optional[int]
+    loaded_at: datetime
+    checked_at: datetime
+
+
+class EnabledMaterializedColumns:
+    """
+    Per-process cache of the enabled materialized columns of each table.
+
+    Changes to the columns bump a version in redis, which is checked at most every
+    `MATERIALIZED_COLUMNS_VERSION_CHECK_INTERVAL`. On a new version the columns are read from redis, so querying
+    `system.columns` is left to the periodic reload and to processes finding no published columns.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[TablesWithMaterializedColumns, CachedMaterializedColumns] = {}
+
+    def __call__(
+        self, table: TablesWithMaterializedColumns, use_cache: bool = not TEST
+    ) -> dict[tuple[PropertyName, TableColumn], ColumnName]:
+        if not use_cache:
+            return get_materialized_columns(table, exclude_disabled_columns=True)
+
+        current_time = now()
+        cached = self._cache.get(table)
+        if cached is None or current_time - cached.loaded_at > MATERIALIZED_COLUMNS_CACHE_TIME:
+            cached = self._load(table, self._get_version(table), from_registry=cached is None)
+        elif current_time - cached.checked_at > MATERIALIZED_COLUMNS_VERSION_CHECK_INTERVAL:
+            cached.checked_at = current_time
+            version = self._get_version(table)
+            if version != cached.version:
+                cached = self._load(table, version, from_registry=True)
+        return cached.columns
+
+    def clear(self, table: Optional[TablesWithMaterializedColumns] = None) -> None:
+        if table is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(table, None)
+
+    def _load(
+        self, table: TablesWithMaterializedColumns, version: Optional[int], from_registry: bool
+    ) -> CachedMaterializedColumns:
+        columns = self._read_registry(table, version) if from_registry and version is not None else None
+        if columns is None:
+            columns = self._read_columns(table)
+        current_time = now()
+        cached = CachedMaterializedColumns(
+            columns=columns, version=version, loaded_at=current_time, checked_at=current_time
+        )
+        self._cache[table] = cached
+        return cached
+
+    def _read_columns(self, table: TablesWithMaterializedColumns) -> dict[tuple[PropertyName, TableColumn], ColumnName]:
+        return get_materialized_columns(table, exclude_disabled_columns=True)
+
+    def _read_registry(
+        self, table: TablesWithMaterializedColumns, version: int
+    ) -> Optional[dict[tuple[PropertyName, TableColumn], ColumnName]]:
+        try:
+            registry = redis.get_client().get(materialized_columns_registry_key(table))
+        except Exception as e:
+            logger.warning("materialized_columns_registry_read_failed", table=table, error=str(e))
+            return None
+        if registry is None:
+            return None
+        registry = json.loads(registry)
+        # A newer version may have been published in between, which the next check picks up
+        if registry["version"] < version:
+            return None
+        return {(property_name, table_column): name for property_name, table_column, name in registry["columns"]}
+
+    def _get_version(self, table: TablesWithMaterializedColumns) -> Optional[int]:
+        try:
+            version = redis.get_client().get(materialized_columns_version_key(table))
+        except Exception as e:
+            # Without redis, columns are only reloaded every MATERIALIZED_COLUMNS_CACHE_TIME
+            logger.warning("materialized_columns_version_read_failed", table=table, error=str(e))
+            return None
+        return int(version) if version is not None else None
+
+
+get_enabled_materialized_columns = EnabledMaterializedColumns()
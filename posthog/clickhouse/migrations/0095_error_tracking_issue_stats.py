@@ -0,0 +1,14 @@
+from posthog.clickhouse.client.migration_tools import run_sql_with_exceptions
+from posthog.models.error_tracking.sql import (
+    DISTRIBUTED_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
+    ERROR_TRACKING_ISSUE_STATS_MV_SQL,
+    ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
+    WRITABLE_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
+)
+
+operations = [
+    run_sql_with_exceptions(WRITABLE_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL),
+    run_sql_with_exceptions(DISTRIBUTED_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL),
+    run_sql_with_exceptions(ERROR_TRACKING_ISSUE_STATS_TABLE_SQL),
+    run_sql_with_exceptions(ERROR_TRACKING_ISSUE_STATS_MV_SQL),
+]
@@ -0,0 +1,176 @@
+"""
+Profiles the ClickHouse queries issued while calculating a query, using ClickHouse's own query log.
+
+Every query issued inside `profile_queries()` is tagged with a `profile_id`, which ends up in the `log_comment`
+of its `system.query_log` entries (including queries issued from other threads that copy the query tags).
+Once the calculation is done, the log entries are fetched back and turned into timings and explain lines,
+so that the time spent in ClickHouse can be read next to the HogQL timings of the same request.
+"""
+
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+import structlog
+
+from posthog.clickhouse.client import sync_execute
+from posthog.clickhouse.query_tagging import get_query_tag_value, get_query_tags, tag_queries
+from posthog.schema import QueryTiming
+from posthog.settings import CLICKHOUSE_CLUSTER
+
+logger = structlog.get_logger(__name__)
+
+# The query log is flushed in the background, so entries can show up a few seconds after the query has finished
+QUERY_PROFILE_MAX_WAIT_SECONDS = 10.0
+QUERY_PROFILE_POLL_INTERVAL_SECONDS = 0.5
+
+PROFILE_EVENT_TIME_UNITS = {"Microseconds": 1_000_000, "Milliseconds": 1_000, "Nanoseconds": 1_000_000_000}
+
+QUERY_PROFILE_SQL = """
+SELECT
+    query_id,
+    argMax(type, toInt8(type)) AS type,
+    max(query_duration_ms) AS query_duration_ms,
+    max(read_rows) AS read_rows,
+    max(read_bytes) AS read_bytes,
+    max(result_rows) AS result_rows,
+    max(memory_usage) AS memory_usage,
+    argMax(exception, toInt8(type)) AS exception,
+    argMax(ProfileEvents, toInt8(type)) AS profile_events,
+    min(query_start_time_microseconds) AS query_start_time
+FROM clusterAllReplicas(%(cluster)s, system, query_log)
+WHERE
+    JSONExtractString(log_comment, 'profile_id') = %(profile_id)s AND
+    event_date >= yesterday() AND
+    is_initial_query
+GROUP BY query_id
+ORDER BY query_start_time
+"""
+
+
+@dataclass
+class ClickHouseQueryProfile:
+    query_id: str
+    finished: bool
+    query_duration_ms: int
+    read_rows: int
+    read_bytes: int
+    result_rows: int
+    memory_usage: int
+    exception: str
+    profile_events: dict[str, int]
+
+    @property
+    def selected_parts(self) -> tuple[int, int]:
+        return self.profile_events.get("SelectedParts", 0), self.profile_events.get("SelectedPartsTotal", 0)
+
+    @property
+    def selected_marks(self) -> tuple[int, int]:
+        return self.profile_events.get("SelectedMarks", 0), self.profile_events.get("SelectedMarksTotal", 0)
+
+    def timings(self) -> list[QueryTiming]:
+        key = f"./clickhouse/{self.query_id}"
+        timings = [QueryTiming(k=key, t=self.query_duration_ms / 1000)]
+        for event, value in sorted(self.profile_events.items()):
+            for unit, per_second in PROFILE_EVENT_TIME_UNITS.items():
+                if event.endswith(unit) and value > 0:
+                    timings.append(QueryTiming(k=f"{key}/{event}", t=value / per_second))
+        return timings
+
+    def explain(self) -> str:
+        parts, parts_total = self.selected_parts
+        marks, marks_total = self.selected_marks
+        line = (
+            f"{self.query_id}: {self.query_duration_ms} ms, read {self.read_rows} rows ({self.read_bytes} bytes), "
+            f"returned {self.result_rows} rows, memory {self.memory_usage} bytes, "
+            f"selected {parts}/{parts_total} parts and {marks}/{marks_total} marks"
+        )
+        if not self.finished:
+            line += ", not finished"
+        if self.exception:
+            line += f", exception: {self.exception}"
+        return line
+
+
+@dataclass
+class QueryProfile:
+    profile_id: str
+    queries: list[ClickHouseQueryProfile] = field(default_factory=list)
+
+    def timings(self) -> list[QueryTiming]:
+        return [timing for query in self.queries for timing in query.timings()]
+
+    def explain(self) -> list[str]:
+        return [query.explain() for query in self.queries]
+
+    def fetch(
+        self,
+        max_wait_seconds: float = QUERY_PROFILE_MAX_WAIT_SECONDS,
+        poll_interval_seconds: float = QUERY_PROFILE_POLL_INTERVAL_SECONDS,
+    ) -> "QueryProfile":
+        """
+        Loads the query log entries of the profiled queries, waiting until every query that was logged as started
+        has also been logged as finished (or failed), or until `max_wait_seconds` have passed.
+        """
+        try:
+            sync_execute("SYSTEM FLUSH LOGS")
+        except Exception as e:
+            # Not every user is allowed to flush the logs, in which case we wait for the periodic flush
+            logger.warning("query_profile_flush_logs_failed", error=str(e))
+
+        deadline = time.monotonic() + max_wait_seconds
+        while True:
+            self.queries = _fetch_query_profiles(self.profile_id)
+            if (self.queries and all(query.finished for query in self.queries)) or time.monotonic() >= deadline:
+                return self
+            time.sleep(poll_interval_seconds)
+
+
+def _fetch_query_profiles(profile_id: str) -> list[ClickHouseQueryProfile]:
+    rows = sync_execute(QUERY_PROFILE_SQL, {"profile_id": profile_id, "cluster": CLICKHOUSE_CLUSTER})
+    return [
+        ClickHouseQueryProfile(
+            query_id=query_id,
+            finished=type != "QueryStart",
+            query_duration_ms=query_duration_ms,
+            read_rows=read_rows,
+            read_bytes=read_bytes,
+            result_rows=result_rows,
+            memory_usage=memory_usage,
+            exception=exception,
+            profile_events=dict(profile_events),
+        )
+        for (
+            query_id,
+            type,
+            query_duration_ms,
+            read_rows,
+            read_bytes,
+            result_rows,
+            memory_usage,
+            exception,
+            profile_events,
+            _,
+        ) in rows
+    ]
+
+
+@contextmanager
+def profile_queries() -> Iterator[Optional[QueryProfile]]:
+    """
+    Tags the ClickHouse queries issued inside the block for profiling. Yields None when an outer block is
+    already profiling, as its profile will include these queries.
+    """
+    if get_query_tag_value("profile_id") is not None:
+        yield None
+        return
+
+    profile = QueryProfile(profile_id=str(uuid.uuid4()))
+    tag_queries(profile_id=profile.profile_id)
+    try:
+        yield profile
+    finally:
+        get_query_tags().pop("profile_id", None)
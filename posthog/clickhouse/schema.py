@@ -92,6 +92,14 @@ from posthog.models.error_tracking.sql import (
     ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE_SQL,
     ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_MV_SQL,
     KAFKA_ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE_SQL,
+    ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL,
+    WRITABLE_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL,
+    DISTRIBUTED_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL,
+    ERROR_TRACKING_ISSUE_SEARCH_MV_SQL,
+    ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
+    WRITABLE_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
+    DISTRIBUTED_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
+    ERROR_TRACKING_ISSUE_STATS_MV_SQL,
 )
 from posthog.models.person_overrides.sql import (
     PERSON_OVERRIDES_CREATE_TABLE_SQL,
@@ -126,6 +134,12 @@ from posthog.session_recordings.sql.session_replay_event_sql import (
     KAFKA_SESSION_REPLAY_EVENTS_TABLE_SQL,
     DISTRIBUTED_SESSION_REPLAY_EVENTS_TABLE_SQL,
 )
+from posthog.session_recordings.sql.session_replay_event_summary_sql import (
+    SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL,
+    WRITABLE_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL,
+    DISTRIBUTED_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL,
+    SESSION_REPLAY_EVENT_SUMMARY_MV_SQL,
+)
 
 CREATE_MERGETREE_TABLE_QUERIES = (
     LOG_ENTRIES_TABLE_SQL,
@@ -141,6 +155,8 @@ CREATE_MERGETREE_TABLE_QUERIES = (
     PERSON_DISTINCT_ID2_TABLE_SQL,
     PERSON_DISTINCT_ID_OVERRIDES_TABLE_SQL,
     ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE_SQL,
+    ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL,
+    ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
     PLUGIN_LOG_ENTRIES_TABLE_SQL,
     SESSION_RECORDING_EVENTS_TABLE_SQL,
     INGESTION_WARNINGS_DATA_TABLE_SQL,
@@ -148,6 +164,7 @@ CREATE_MERGETREE_TABLE_QUERIES = (
     APP_METRICS2_DATA_TABLE_SQL,
     PERFORMANCE_EVENTS_TABLE_SQL,
     SESSION_REPLAY_EVENTS_TABLE_SQL,
+    SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL,
     CHANNEL_DEFINITION_TABLE_SQL,
     SESSIONS_TABLE_SQL,
     RAW_SESSIONS_TABLE_SQL,
@@ -165,12 +182,18 @@ CREATE_DISTRIBUTED_TABLE_QUERIES = (
     WRITABLE_PERFORMANCE_EVENTS_TABLE_SQL,
     DISTRIBUTED_PERFORMANCE_EVENTS_TABLE_SQL,
     DISTRIBUTED_SESSION_REPLAY_EVENTS_TABLE_SQL,
+    WRITABLE_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL,
+    DISTRIBUTED_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL,
     WRITABLE_SESSIONS_TABLE_SQL,
     WRITABLE_RAW_SESSIONS_TABLE_SQL,
     DISTRIBUTED_SESSIONS_TABLE_SQL,
     DISTRIBUTED_RAW_SESSIONS_TABLE_SQL,
     WRITABLE_HEATMAPS_TABLE_SQL,
     DISTRIBUTED_HEATMAPS_TABLE_SQL,
+    WRITABLE_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL,
+    DISTRIBUTED_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL,
+    WRITABLE_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
+    DISTRIBUTED_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
 )
 CREATE_KAFKA_TABLE_QUERIES = (
     KAFKA_LOG_ENTRIES_TABLE_SQL,
@@ -205,6 +228,8 @@ CREATE_MV_TABLE_QUERIES = (
     PERSON_DISTINCT_ID2_MV_SQL,
     PERSON_DISTINCT_ID_OVERRIDES_MV_SQL,
     ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_MV_SQL,
+    ERROR_TRACKING_ISSUE_SEARCH_MV_SQL,
+    ERROR_TRACKING_ISSUE_STATS_MV_SQL,
     PLUGIN_LOG_ENTRIES_TABLE_MV_SQL,
     SESSION_RECORDING_EVENTS_TABLE_MV_SQL,
     INGESTION_WARNINGS_MV_TABLE_SQL,
@@ -212,6 +237,7 @@ CREATE_MV_TABLE_QUERIES = (
     APP_METRICS2_MV_TABLE_SQL,
     PERFORMANCE_EVENTS_TABLE_MV_SQL,
     SESSION_REPLAY_EVENTS_TABLE_MV_SQL,
+    SESSION_REPLAY_EVENT_SUMMARY_MV_SQL,
     SESSIONS_TABLE_MV_SQL,
     RAW_SESSIONS_TABLE_MV_SQL,
     HEATMAPS_TABLE_MV_SQL,
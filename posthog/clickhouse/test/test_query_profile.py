@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from posthog.clickhouse.query_profile import ClickHouseQueryProfile, QueryProfile, profile_queries
+from posthog.clickhouse.query_tagging import get_query_tag_value, reset_query_tags
+from posthog.schema import QueryTiming
+
+
+def _query_log_row(query_id: str, type: str = "QueryFinish") -> tuple:
+    profile_events = {
+        "RealTimeMicroseconds": 2_500_000,
+        "DiskReadElapsedMicroseconds": 0,
+        "SelectedParts": 3,
+        "SelectedPartsTotal": 12,
+        "SelectedMarks": 40,
+        "SelectedMarksTotal": 900,
+    }
+    return (query_id, type, 1200, 1000, 64000, 10, 2048, "", profile_events, None)
+
+
+def test_clickhouse_query_profile_timings_and_explain():
+    query = ClickHouseQueryProfile(
+        query_id="1_abc",
+        finished=True,
+        query_duration_ms=1200,
+        read_rows=1000,
+        read_bytes=64000,
+        result_rows=10,
+        memory_usage=2048,
+        exception="",
+        profile_events=dict(_query_log_row("1_abc")[8]),
+    )
+
+    assert query.timings() == [
+        QueryTiming(k="./clickhouse/1_abc", t=1.2),
+        QueryTiming(k="./clickhouse/1_abc/RealTimeMicroseconds", t=2.5),
+    ]
+    assert query.explain() == (
+        "1_abc: 1200 ms, read 1000 rows (64000 bytes), returned 10 rows, memory 2048 bytes, "
+        "selected 3/12 parts and 40/900 marks"
+    )
+
+
+def test_profile_queries_tags_queries_once():
+    reset_query_tags()
+
+    with profile_queries() as profile:
+        assert profile is not None
+        assert get_query_tag_value("profile_id") == profile.profile_id
+
+        with profile_queries() as nested_profile:
+            assert nested_profile is None
+            assert get_query_tag_value("profile_id") == profile.profile_id
+
+    assert get_query_tag_value("profile_id") is None
+
+
+@patch("posthog.clickhouse.query_profile.time.sleep")
+@patch("posthog.clickhouse.query_profile.sync_execute")
+def test_query_profile_fetch_waits_for_queries_to_finish(sync_execute, sleep):
+    sync_execute.side_effect = [
+        [],  # SYSTEM FLUSH LOGS
+        [],
+        [_query_log_row("1_a"), _query_log_row("1_b", type="QueryStart")],
+        [_query_log_row("1_a"), _query_log_row("1_b")],
+    ]
+
+    profile = QueryProfile(profile_id="profile").fetch()
+
+    assert [query.query_id for query in profile.queries] == ["1_a", "1_b"]
+    assert all(query.finished for query in profile.queries)
+    assert sleep.call_count == 2
+    assert sync_execute.call_args[0][1]["profile_id"] == "profile"
+
+
+@patch("posthog.clickhouse.query_profile.sync_execute")
+def test_query_profile_fetch_gives_up_after_waiting(sync_execute):
+    sync_execute.side_effect = [Exception("Not enough privileges"), [_query_log_row("1_a", type="QueryStart")]]
+
+    profile = QueryProfile(profile_id="profile").fetch(max_wait_seconds=0)
+
+    assert profile.explain()[0].endswith(", not finished")
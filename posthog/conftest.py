@@ -61,7 +61,11 @@ def reset_clickhouse_tables():
     from posthog.models.app_metrics.sql import TRUNCATE_APP_METRICS_TABLE_SQL
     from posthog.models.channel_type.sql import TRUNCATE_CHANNEL_DEFINITION_TABLE_SQL
     from posthog.models.cohort.sql import TRUNCATE_COHORTPEOPLE_TABLE_SQL
-    from posthog.models.error_tracking.sql import TRUNCATE_ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE_SQL
+    from posthog.models.error_tracking.sql import (
+        TRUNCATE_ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE_SQL,
+        TRUNCATE_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL,
+        TRUNCATE_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL,
+    )
     from posthog.models.event.sql import TRUNCATE_EVENTS_TABLE_SQL, TRUNCATE_EVENTS_RECENT_TABLE_SQL
     from posthog.models.group.sql import TRUNCATE_GROUPS_TABLE_SQL
     from posthog.models.performance.sql import TRUNCATE_PERFORMANCE_EVENTS_TABLE_SQL
@@ -76,6 +80,9 @@ def reset_clickhouse_tables():
     from posthog.session_recordings.sql.session_recording_event_sql import (
         TRUNCATE_SESSION_RECORDING_EVENTS_TABLE_SQL,
     )
+    from posthog.session_recordings.sql.session_replay_event_summary_sql import (
+        TRUNCATE_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL,
+    )
 
     # REMEMBER TO ADD ANY NEW CLICKHOUSE TABLES TO THIS ARRAY!
     TABLES_TO_CREATE_DROP = [
@@ -87,7 +94,10 @@ def reset_clickhouse_tables():
         TRUNCATE_PERSON_DISTINCT_ID_OVERRIDES_TABLE_SQL,
         TRUNCATE_PERSON_STATIC_COHORT_TABLE_SQL,
         TRUNCATE_ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE_SQL,
+        TRUNCATE_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL(),
+        TRUNCATE_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL(),
         TRUNCATE_SESSION_RECORDING_EVENTS_TABLE_SQL(),
+        TRUNCATE_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL(),
         TRUNCATE_PLUGIN_LOG_ENTRIES_TABLE_SQL,
         TRUNCATE_COHORTPEOPLE_TABLE_SQL,
         TRUNCATE_DEAD_LETTER_QUEUE_TABLE_SQL,
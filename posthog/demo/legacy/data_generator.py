@@ -37,18 +37,27 @@ class DataGenerator:
             for person, distinct_id in zip(self.people, self.distinct_ids)
         ]
         PersonDistinctId.objects.bulk_create(pids)
-        from posthog.models.person.util import create_person, create_person_distinct_id
-
-        for person in self.people:
-            create_person(
+        from posthog.models.person.util import (
+            create_person_distinct_ids,
+            create_persons,
+            person_ch_row,
+            person_distinct_id_ch_row,
+        )
+
+        create_persons(
+            person_ch_row(
                 uuid=str(person.uuid),
                 team_id=person.team.pk,
                 properties=person.properties,
                 is_identified=person.is_identified,
                 version=0,
             )
-        for pid in pids:
-            create_person_distinct_id(pid.team.pk, pid.distinct_id, str(pid.person.uuid))  # use dummy number for id
+            for person in self.people
+        )
+        create_person_distinct_ids(
+            person_distinct_id_ch_row(pid.team.pk, pid.distinct_id, str(pid.person.uuid))  # use dummy number for id
+            for pid in pids
+        )
 
     def make_person(self, index):
         return Person(team=self.team, properties={"is_demo": True})
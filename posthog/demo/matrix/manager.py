@@ -1,7 +1,8 @@
 import datetime as dt
 import json
-from time import sleep
-from typing import Any, Literal, Optional, cast
+from collections.abc import Iterable
+from time import monotonic, sleep
+from typing import Any, Literal, Optional, Union, cast
 
 from django.conf import settings
 from django.core import exceptions
@@ -22,9 +23,99 @@ from posthog.models import (
 )
 from posthog.models.utils import UUIDT
 
-from .matrix import Matrix
+from .matrix import Matrix, SimulatedPerson
 from .models import SimEvent, SimPerson
 
+# How many events to buffer before inserting them into ClickHouse in one go, when streaming simulation results
+DEFAULT_EVENT_BATCH_SIZE = 50_000
+
+
+class SimEventWriter:
+    """Inserts simulated events into ClickHouse directly, in bulk inserts of at most `batch_size` events."""
+
+    team_id: int
+    batch_size: int
+    print_steps: bool
+    events_written: int
+
+    _buffer: list[dict[str, Any]]
+    _started_at: float
+
+    def __init__(self, team_id: int, *, batch_size: int = DEFAULT_EVENT_BATCH_SIZE, print_steps: bool = False):
+        self.team_id = team_id
+        self.batch_size = batch_size
+        self.print_steps = print_steps
+        self.events_written = 0
+        self._buffer = []
+        self._started_at = monotonic()
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events_written / max(monotonic() - self._started_at, 1e-9)
+
+    def write(self, events: Iterable[SimEvent]):
+        for event in events:
+            self._buffer.append(self._to_row(event))
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        from posthog.models.event.sql import BULK_INSERT_EVENT_SQL
+
+        sync_execute(BULK_INSERT_EVENT_SQL(), self._buffer)
+        self.events_written += len(self._buffer)
+        self._buffer = []
+        if self.print_steps:
+            print(f"Saved {self.events_written} events ({self.events_per_second:.0f} events/s)...")
+
+    def _to_row(self, event: SimEvent) -> dict[str, Any]:
+        from posthog.models.event.util import ZERO_DATE
+
+        zero_date = ZERO_DATE.replace(tzinfo=dt.UTC)
+        timestamp = event.timestamp.astimezone(dt.UTC)
+        return {
+            "uuid": UUIDT(unix_time_ms=int(event.timestamp.timestamp() * 1000)),
+            "event": event.event,
+            "properties": json.dumps(event.properties),
+            "timestamp": timestamp,
+            "team_id": self.team_id,
+            "distinct_id": str(event.distinct_id),
+            "elements_chain": "",
+            "person_id": event.person_id,
+            "person_properties": json.dumps(event.person_properties),
+            "person_created_at": event.person_created_at or zero_date,
+            **{
+                f"group{index}_properties": json.dumps(properties) if properties is not None else ""
+                for index, properties in enumerate(
+                    (
+                        event.group0_properties,
+                        event.group1_properties,
+                        event.group2_properties,
+                        event.group3_properties,
+                        event.group4_properties,
+                    )
+                )
+            },
+            **{
+                f"group{index}_created_at": created_at or zero_date
+                for index, created_at in enumerate(
+                    (
+                        event.group0_created_at,
+                        event.group1_created_at,
+                        event.group2_created_at,
+                        event.group3_created_at,
+                        event.group4_created_at,
+                    )
+                )
+            },
+            "person_mode": "full",
+            "created_at": timestamp,
+            "_timestamp": dt.datetime.now(dt.UTC),
+            "_offset": 0,
+        }
+
 
 class MatrixManager:
     # ID of the team under which demo data will be pre-saved
@@ -33,14 +124,27 @@ class MatrixManager:
     matrix: Matrix
     use_pre_save: bool
     print_steps: bool
+    # If set, clusters are simulated across this many processes, and their events are streamed into ClickHouse
+    workers: Optional[int]
+    event_batch_size: int
 
     _persons_created: int
     _person_distinct_ids_created: int
 
-    def __init__(self, matrix: Matrix, *, use_pre_save: bool = False, print_steps: bool = False):
+    def __init__(
+        self,
+        matrix: Matrix,
+        *,
+        use_pre_save: bool = False,
+        print_steps: bool = False,
+        workers: Optional[int] = None,
+        event_batch_size: int = DEFAULT_EVENT_BATCH_SIZE,
+    ):
         self.matrix = matrix
         self.use_pre_save = use_pre_save
         self.print_steps = print_steps
+        self.workers = workers
+        self.event_batch_size = event_batch_size
         self._persons_created = 0
         self._person_distinct_ids_created = 0
 
@@ -94,10 +198,13 @@ class MatrixManager:
             return (existing_user.organization, existing_user.team, existing_user)
 
     def reset_master(self):
-        if self.matrix.is_complete is None:
-            self.matrix.simulate()
         master_team = self._prepare_master_team(ensure_blank_slate=True)
-        self._save_analytics_data(master_team)
+        if self.workers is not None and self.matrix.is_complete is None:
+            self._simulate_and_save_analytics_data(master_team)
+        else:
+            if self.matrix.is_complete is None:
+                self.matrix.simulate()
+            self._save_analytics_data(master_team)
         self._sleep_until_person_data_in_clickhouse(self.MASTER_TEAM_ID)
 
     @staticmethod
@@ -118,7 +225,11 @@ class MatrixManager:
             source_team = self._prepare_master_team()
         else:
             source_team = team
-        if does_clickhouse_data_need_saving:
+        if does_clickhouse_data_need_saving and self.workers is not None and self.matrix.is_complete is None:
+            if self.print_steps:
+                print(f"Simulating and saving data across {self.workers} workers...")
+            self._simulate_and_save_analytics_data(source_team)
+        elif does_clickhouse_data_need_saving:
             if self.matrix.is_complete is None:
                 if self.print_steps:
                     print(f"Simulating data...")
@@ -146,7 +257,30 @@ class MatrixManager:
         print(f"Demo data ready for team ID {team.pk}.")
 
     def _save_analytics_data(self, data_team: Team):
-        sim_persons = self.matrix.people
+        self._save_sim_groups(data_team)
+        for sim_person in self.matrix.people:
+            self._save_sim_person(data_team, sim_person)
+        # We need to wait a bit for data just queued into Kafka to show up in CH
+        self._sleep_until_person_data_in_clickhouse(data_team.pk)
+
+    def _simulate_and_save_analytics_data(self, data_team: Team):
+        """Simulate clusters in parallel, saving each cluster's people and events as soon as it's been simulated."""
+        assert self.workers is not None
+        event_writer = SimEventWriter(data_team.pk, batch_size=self.event_batch_size, print_steps=self.print_steps)
+        for simulated_cluster in self.matrix.simulate_in_parallel(self.workers):
+            for sim_person in simulated_cluster.people:
+                self._save_sim_person(data_team, sim_person, event_writer=event_writer)
+        event_writer.flush()
+        # Groups are only complete once all clusters have been simulated
+        self._save_sim_groups(data_team)
+        if self.print_steps:
+            print(
+                f"Saved {event_writer.events_written} events at {event_writer.events_per_second:.0f} events/s "
+                f"across {self.workers} workers."
+            )
+        self._sleep_until_person_data_in_clickhouse(data_team.pk)
+
+    def _save_sim_groups(self, data_team: Team):
         bulk_group_type_mappings = []
         if len(self.matrix.groups.keys()) + self.matrix.group_type_index_offset > 5:
             raise ValueError("Too many group types! The maximum for a project is 5.")
@@ -172,10 +306,6 @@ class MatrixManager:
             GroupTypeMapping.objects.bulk_create(bulk_group_type_mappings)
         except IntegrityError as e:
             print(f"SKIPPING GROUP TYPE MAPPING CREATION: {e}")
-        for sim_person in sim_persons:
-            self._save_sim_person(data_team, sim_person)
-        # We need to wait a bit for data just queued into Kafka to show up in CH
-        self._sleep_until_person_data_in_clickhouse(data_team.pk)
 
     @classmethod
     def _prepare_master_team(cls, *, ensure_blank_slate: bool = False) -> Team:
@@ -295,12 +425,19 @@ class MatrixManager:
         except IntegrityError as e:
             print(f"SKIPPING GROUP CREATION: {e}")
 
-    def _save_sim_person(self, team: Team, subject: SimPerson):
+    def _save_sim_person(
+        self,
+        team: Team,
+        subject: Union[SimPerson, SimulatedPerson],
+        *,
+        event_writer: Optional[SimEventWriter] = None,
+    ):
         # We only want to save directly if there are past events
         if subject.past_events:
             from posthog.models.person.util import (
                 create_person,
-                create_person_distinct_id,
+                create_person_distinct_ids,
+                person_distinct_id_ch_row,
             )
 
             create_person(
@@ -311,13 +448,18 @@ class MatrixManager:
             )
             self._persons_created += 1
             self._person_distinct_ids_created += len(subject.distinct_ids_at_now)
-            for distinct_id in subject.distinct_ids_at_now:
-                create_person_distinct_id(
+            create_person_distinct_ids(
+                person_distinct_id_ch_row(
                     team_id=team.pk,
                     distinct_id=str(distinct_id),
                     person_id=str(subject.in_posthog_id),
                 )
-            self._save_past_sim_events(team, subject.past_events)
+                for distinct_id in subject.distinct_ids_at_now
+            )
+            if event_writer is not None:
+                event_writer.write(subject.past_events)
+            else:
+                self._save_past_sim_events(team, subject.past_events)
         # We only want to queue future events if there are any
         if subject.future_events and self.matrix.end > self.matrix.now:
             self._save_future_sim_events(team, subject.future_events)
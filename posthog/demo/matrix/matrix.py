@@ -1,6 +1,11 @@
 import datetime as dt
+import multiprocessing
 from abc import ABC, abstractmethod
 from collections import defaultdict, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
 from typing import (
     Any,
     Optional,
@@ -17,7 +22,28 @@ from posthog.demo.matrix.randomization import PropertiesProvider
 from posthog.models import Team, User
 from posthog.models.utils import UUIDT, uuid7
 
-from .models import Effect, SimPerson, SimServerClient
+from .models import Effect, Properties, SimEvent, SimPerson, SimServerClient
+
+
+@dataclass
+class SimulatedPerson:
+    """The state of a person at the end of the simulation, as handed over from a worker process."""
+
+    in_posthog_id: Optional[UUIDT]
+    distinct_ids_at_now: set[str]
+    properties_at_now: Properties
+    past_events: list[SimEvent]
+    future_events: list[SimEvent]
+
+
+@dataclass
+class SimulatedCluster:
+    """The results of simulating a single cluster in isolation."""
+
+    index: int
+    people: list[SimulatedPerson]
+    # Groups touched by this cluster, with group types in the order the cluster first used them
+    groups: dict[str, dict[str, dict[str, Any]]]
 
 
 class Cluster(ABC):
@@ -212,6 +238,7 @@ class Matrix(ABC):
     is_complete: Optional[bool]
     server_client: SimServerClient
 
+    seed: Optional[str]
     random: mimesis.random.Random
     properties_provider: PropertiesProvider
     person_provider: mimesis.Person
@@ -238,6 +265,7 @@ class Matrix(ABC):
         self.start = (now - dt.timedelta(days=days_past)).replace(hour=0, minute=0, second=0, microsecond=0)
         self.end = (now + dt.timedelta(days=days_future)).replace(hour=0, minute=0, second=0, microsecond=0)
         self.group_type_index_offset = group_type_index_offset
+        self.seed = seed
         # We initialize random data providers here and pass it down as a performance measure
         # Provider initialization is a bit intensive, as it loads some JSON data,
         # so doing it at cluster or person level could be overly taxing
@@ -273,6 +301,97 @@ class Matrix(ABC):
             cluster.simulate()
         self.is_complete = True
 
+    def simulate_in_parallel(self, workers: int) -> Iterator[SimulatedCluster]:
+        """Simulate clusters across a pool of worker processes, yielding each cluster's results in cluster order.
+
+        Unlike in `simulate()`, each cluster draws from its own random stream, seeded with the matrix seed
+        and the cluster index, so the results for a given seed are the same regardless of the number of workers.
+        Results are yielded as soon as they're ready, with at most `2 * workers` clusters in flight at a time,
+        so the whole dataset never has to fit in memory. The people of `self.clusters` are not simulated in place.
+        """
+        if self.is_complete is not None:
+            raise RuntimeError("Simulation can only be started once!")
+        self.is_complete = False
+        if workers <= 1:
+            for cluster in self.clusters:
+                yield self._merge_simulated_cluster(self._simulate_cluster_in_isolation(cluster.index))
+        else:
+            # Forking, so that workers inherit the matrix (and Django setup) as-is instead of pickling it
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_set_worker_matrix,
+                initargs=(self,),
+            ) as executor:
+                cluster_indexes = iter(range(len(self.clusters)))
+                in_flight: deque[Future[SimulatedCluster]] = deque(
+                    executor.submit(_simulate_cluster_in_worker, index)
+                    for index in islice(cluster_indexes, workers * 2)
+                )
+                while in_flight:
+                    simulated_cluster = in_flight.popleft().result()
+                    for index in islice(cluster_indexes, 1):
+                        in_flight.append(executor.submit(_simulate_cluster_in_worker, index))
+                    yield self._merge_simulated_cluster(simulated_cluster)
+        self.is_complete = True
+
+    def _simulate_cluster_in_isolation(self, index: int) -> SimulatedCluster:
+        cluster = self.clusters[index]
+        cluster_seed = f"{self.seed}-{index}" if self.seed is not None else None
+        self.random.seed(cluster_seed)
+        for provider in (
+            self.properties_provider,
+            self.person_provider,
+            self.numeric_provider,
+            self.address_provider,
+            self.internet_provider,
+            self.datetime_provider,
+            self.finance_provider,
+            self.file_provider,
+        ):
+            provider.reseed(cluster_seed)
+        # UUIDT series are per-process state, which would otherwise depend on what the process simulated before
+        UUIDT.current_series_per_ms.clear()
+        # Group type indexes are assigned in order of first use, so each cluster starts from a clean slate
+        merged_groups, self.groups = self.groups, defaultdict(lambda: defaultdict(dict))
+        try:
+            cluster.simulate()
+        finally:
+            cluster_groups, self.groups = self.groups, merged_groups
+        people = [person for row in cluster.people_matrix for person in row]
+        simulated_cluster = SimulatedCluster(
+            index=index,
+            people=[
+                SimulatedPerson(
+                    in_posthog_id=person.in_posthog_id,
+                    distinct_ids_at_now=person.distinct_ids_at_now,
+                    properties_at_now=person.properties_at_now,
+                    past_events=person.past_events,
+                    future_events=person.future_events,
+                )
+                for person in people
+            ],
+            groups={group_type: dict(groups) for group_type, groups in cluster_groups.items()},
+        )
+        # The events have been handed over, don't hold on to them for the rest of the simulation
+        for person in people:
+            person.past_events, person.future_events = [], []
+        return simulated_cluster
+
+    def _merge_simulated_cluster(self, simulated_cluster: SimulatedCluster) -> SimulatedCluster:
+        for cluster_group_type_index, (group_type, groups) in enumerate(simulated_cluster.groups.items()):
+            group_type_index = self._get_group_type_index(group_type)
+            if group_type_index is None:
+                group_type_index = len(self.groups) + self.group_type_index_offset
+            if group_type_index != cluster_group_type_index + self.group_type_index_offset:
+                raise ValueError(
+                    f"Cluster {simulated_cluster.index} used group type {group_type} in a different order than "
+                    "previous clusters, so its events can't be simulated in parallel."
+                )
+            for group_key, set_properties in groups.items():
+                self._update_group(group_type, group_key, set_properties)
+        return simulated_cluster
+
     def _update_group(self, group_type: str, group_key: str, set_properties: dict[str, Any]):
         if len(self.groups) == GROUP_TYPES_LIMIT and group_type not in self.groups:
             raise Exception(f"Cannot add group type {group_type} to simulation, limit of {GROUP_TYPES_LIMIT} reached!")
@@ -283,3 +402,17 @@ class Matrix(ABC):
             return list(self.groups.keys()).index(group_type) + self.group_type_index_offset
         except ValueError:
             return None
+
+
+# The matrix being simulated by the current worker process, inherited from the parent on fork
+_worker_matrix: Optional[Matrix] = None
+
+
+def _set_worker_matrix(matrix: Matrix):
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def _simulate_cluster_in_worker(index: int) -> SimulatedCluster:
+    assert _worker_matrix is not None
+    return _worker_matrix._simulate_cluster_in_isolation(index)
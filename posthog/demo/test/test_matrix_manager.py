@@ -8,6 +8,7 @@ from posthog.client import sync_execute
 from posthog.demo.matrix.manager import MatrixManager
 from posthog.demo.matrix.matrix import Cluster, Matrix
 from posthog.demo.matrix.models import SimPerson, SimSessionIntent
+from posthog.models import GroupTypeMapping
 from posthog.test.base import ClickhouseDestroyTablesMixin
 
 
@@ -107,3 +108,38 @@ class TestMatrixManager(ClickhouseDestroyTablesMixin):
             )[0][0]
             >= 3
         )
+
+    def test_run_on_team_with_workers(self):
+        matrix = DummyMatrix(
+            n_clusters=3,
+            now=dt.datetime(2020, 1, 1, 0, 0, 0, 0, tzinfo=ZoneInfo("UTC")),
+            days_future=0,
+        )
+        manager = MatrixManager(matrix, workers=2, event_batch_size=2)
+
+        manager.run_on_team(self.team, self.user)
+
+        # At least one event for each cluster
+        assert (
+            sync_execute(
+                "SELECT count() FROM events WHERE team_id = %(team_id)s",
+                {"team_id": self.team.pk},
+            )[0][0]
+            >= 3
+        )
+        assert list(GroupTypeMapping.objects.filter(team=self.team).values_list("group_type", flat=True)) == ["company"]
+
+    def test_simulate_in_parallel_does_not_depend_on_worker_count(self):
+        def simulate(workers: int):
+            matrix = DummyMatrix(
+                "seed",
+                n_clusters=3,
+                now=dt.datetime(2020, 1, 1, 0, 0, 0, 0, tzinfo=ZoneInfo("UTC")),
+                days_future=0,
+            )
+            return [
+                [(person.in_posthog_id, person.distinct_ids_at_now, person.past_events) for person in cluster.people]
+                for cluster in matrix.simulate_in_parallel(workers)
+            ]
+
+        assert simulate(1) == simulate(3)
@@ -54,6 +54,8 @@ class HogQLContext:
     debug: bool = False
 
     property_swapper: Optional["PropertySwapper"] = None
+    # Properties read by JSON extraction for lack of a materialized column, as (table, table column, property name)
+    unmaterialized_properties: set[tuple[str, str, str]] = field(default_factory=set)
 
     def add_value(self, value: Any) -> str:
         key = f"hogql_val_{len(self.values)}"
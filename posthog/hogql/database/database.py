@@ -30,6 +30,10 @@ from posthog.hogql.database.models import (
 )
 from posthog.hogql.database.schema.channel_type import create_initial_channel_type, create_initial_domain_type
 from posthog.hogql.database.schema.cohort_people import CohortPeople, RawCohortPeople
+from posthog.hogql.database.schema.error_tracking_issues import (
+    ErrorTrackingIssueSearchTable,
+    ErrorTrackingIssueStatsTable,
+)
 from posthog.hogql.database.schema.events import EventsTable
 from posthog.hogql.database.schema.groups import GroupsTable, RawGroupsTable
 from posthog.hogql.database.schema.heatmaps import HeatmapsTable
@@ -54,6 +58,7 @@ from posthog.hogql.database.schema.persons import (
     join_with_persons_table,
 )
 from posthog.hogql.database.schema.session_replay_events import (
+    RawSessionReplayEventSummaryTable,
     RawSessionReplayEventsTable,
     SessionReplayEventsTable,
     join_replay_table_to_sessions_table_v2,
@@ -114,12 +119,15 @@ class Database(BaseModel):
     heatmaps: HeatmapsTable = HeatmapsTable()
 
     raw_session_replay_events: RawSessionReplayEventsTable = RawSessionReplayEventsTable()
+    raw_session_replay_event_summary: RawSessionReplayEventSummaryTable = RawSessionReplayEventSummaryTable()
     raw_person_distinct_ids: RawPersonDistinctIdsTable = RawPersonDistinctIdsTable()
     raw_persons: RawPersonsTable = RawPersonsTable()
     raw_groups: RawGroupsTable = RawGroupsTable()
     raw_cohort_people: RawCohortPeople = RawCohortPeople()
     raw_person_distinct_id_overrides: RawPersonDistinctIdOverridesTable = RawPersonDistinctIdOverridesTable()
     raw_sessions: Union[RawSessionsTableV1, RawSessionsTableV2] = RawSessionsTableV1()
+    raw_error_tracking_issue_search: ErrorTrackingIssueSearchTable = ErrorTrackingIssueSearchTable()
+    raw_error_tracking_issue_stats: ErrorTrackingIssueStatsTable = ErrorTrackingIssueStatsTable()
 
     # system tables
     numbers: NumbersTable = NumbersTable()
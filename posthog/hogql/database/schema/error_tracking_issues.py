@@ -0,0 +1,43 @@
+from posthog.hogql.database.models import (
+    DatabaseField,
+    DateTimeDatabaseField,
+    FieldOrTable,
+    IntegerDatabaseField,
+    StringDatabaseField,
+    Table,
+)
+
+
+class ErrorTrackingIssueSearchTable(Table):
+    fields: dict[str, FieldOrTable] = {
+        "team_id": IntegerDatabaseField(name="team_id"),
+        "issue_id": StringDatabaseField(name="issue_id"),
+        "search_text": StringDatabaseField(name="search_text"),
+        "last_seen": DateTimeDatabaseField(name="last_seen"),
+    }
+
+    def to_printed_clickhouse(self, context):
+        return "error_tracking_issue_search"
+
+    def to_printed_hogql(self):
+        return "error_tracking_issue_search"
+
+
+class ErrorTrackingIssueStatsTable(Table):
+    fields: dict[str, FieldOrTable] = {
+        "team_id": IntegerDatabaseField(name="team_id"),
+        "issue_id": StringDatabaseField(name="issue_id"),
+        "hour": DateTimeDatabaseField(name="hour"),
+        # the uniq fields are AggregateFunction states, they need to be merged with uniqMerge
+        "occurrences": DatabaseField(name="occurrences"),
+        "sessions": DatabaseField(name="sessions"),
+        "users": DatabaseField(name="users"),
+        "first_seen": DateTimeDatabaseField(name="first_seen"),
+        "last_seen": DateTimeDatabaseField(name="last_seen"),
+    }
+
+    def to_printed_clickhouse(self, context):
+        return "error_tracking_issue_stats"
+
+    def to_printed_hogql(self):
+        return "error_tracking_issue_stats"
@@ -226,6 +226,25 @@ class RawSessionReplayEventsTable(Table):
         return "raw_session_replay_events"
 
 
+class RawSessionReplayEventSummaryTable(Table):
+    fields: dict[str, FieldOrTable] = {
+        "team_id": IntegerDatabaseField(name="team_id"),
+        "session_id": StringDatabaseField(name="session_id"),
+        "hour": DateTimeDatabaseField(name="hour"),
+        # partially aggregated, merge with groupUniqArrayArray
+        "event_names": DatabaseField(name="event_names"),
+        "event_count": IntegerDatabaseField(name="event_count"),
+        "first_timestamp": DateTimeDatabaseField(name="first_timestamp"),
+        "last_timestamp": DateTimeDatabaseField(name="last_timestamp"),
+    }
+
+    def to_printed_clickhouse(self, context):
+        return "session_replay_event_summary"
+
+    def to_printed_hogql(self):
+        return "raw_session_replay_event_summary"
+
+
 def select_from_session_replay_events_table(requested_fields: dict[str, list[str | int]]):
     from posthog.hogql import ast
 
@@ -1,6 +1,7 @@
 from typing import Optional, TypeVar
 
 import dataclasses
+from datetime import datetime
 from dateutil.parser import isoparse
 
 from posthog.hogql import ast
@@ -25,6 +26,13 @@ def replace_filters(node: T, filters: Optional[HogQLFilters], team: Team) -> T:
     return ReplaceFilters(filters, team).visit(node)
 
 
+def parse_filters_date(date: str, team: Team) -> datetime:
+    try:
+        return isoparse(date).replace(tzinfo=team.timezone_info)
+    except ValueError:
+        return relative_date_parse(date, team.timezone_info)
+
+
 class ReplaceFilters(CloningVisitor):
     def __init__(self, filters: Optional[HogQLFilters], team: Team = None):
         super().__init__()
@@ -95,10 +103,7 @@ class ReplaceFilters(CloningVisitor):
 
             dateTo = self.filters.dateRange.date_to if self.filters.dateRange else None
             if dateTo is not None:
-                try:
-                    parsed_date = isoparse(dateTo).replace(tzinfo=self.team.timezone_info)
-                except ValueError:
-                    parsed_date = relative_date_parse(dateTo, self.team.timezone_info)
+                parsed_date = parse_filters_date(dateTo, self.team)
                 exprs.append(
                     ast.CompareOperation(
                         op=ast.CompareOperationOp.Lt,
@@ -110,10 +115,7 @@ class ReplaceFilters(CloningVisitor):
             # limit to the last 30d by default
             dateFrom = self.filters.dateRange.date_from if self.filters.dateRange else None
             if dateFrom is not None and dateFrom != "all":
-                try:
-                    parsed_date = isoparse(dateFrom).replace(tzinfo=self.team.timezone_info)
-                except ValueError:
-                    parsed_date = relative_date_parse(dateFrom, self.team.timezone_info)
+                parsed_date = parse_filters_date(dateFrom, self.team)
                 exprs.append(
                     ast.CompareOperation(
                         op=ast.CompareOperationOp.GtEq,
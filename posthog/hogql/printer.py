@@ -1327,6 +1327,7 @@ class _Printer(Visitor):
                     self._print_identifier(materialized_column),
                 )
 
+            has_property_group_column = False
             if self.context.modifiers.propertyGroupsMode in (
                 PropertyGroupsMode.ENABLED,
                 PropertyGroupsMode.OPTIMIZED,
@@ -1337,11 +1338,15 @@ class _Printer(Visitor):
                 for property_group_column in property_groups.get_property_group_columns(
                     table_name, field_name, property_name
                 ):
+                    has_property_group_column = True
                     yield PrintableMaterializedPropertyGroupItem(
                         self.visit(field_type.table_type),
                         self._print_identifier(property_group_column),
                         self.context.add_value(property_name),
                     )
+
+            if not materialized_column and not has_property_group_column:
+                self._record_unmaterialized_property(table_name, field_name, property_name)
         elif (
             self.context.within_non_hogql_query
             and (isinstance(table, ast.SelectQueryAliasType) and table.alias == "events__pdi__person")
@@ -1354,6 +1359,10 @@ class _Printer(Visitor):
                 materialized_column = self._get_materialized_column("person", property_name, "properties")
             if materialized_column:
                 yield PrintableMaterializedColumn(None, self._print_identifier(materialized_column))
+            elif self.context.modifiers.personsOnEventsMode != PersonsOnEventsMode.DISABLED:
+                self._record_unmaterialized_property("events", "person_properties", property_name)
+            else:
+                self._record_unmaterialized_property("person", "properties", property_name)
 
     def visit_property_type(self, type: ast.PropertyType):
         if type.joined_subquery is not None and type.joined_subquery_field_name is not None:
@@ -1515,6 +1524,11 @@ class _Printer(Visitor):
         materialized_columns = get_enabled_materialized_columns(cast(TablesWithMaterializedColumns, table_name))
         return materialized_columns.get((property_name, field_name), None)
 
+    def _record_unmaterialized_property(self, table_name: str, field_name: str, property_name: PropertyName) -> None:
+        # Collected for the materialized column advisor, which ranks these by how much the queries reading them cost
+        if self.dialect == "clickhouse" and table_name in ("events", "person"):
+            self.context.unmaterialized_properties.add((table_name, field_name, property_name))
+
     def _get_timezone(self) -> str:
         return self.context.database.get_timezone() if self.context.database else "UTC"
 
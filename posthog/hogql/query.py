@@ -168,6 +168,7 @@ def execute_hogql_query(
                 enable_select_queries=True,
                 timings=timings,
                 modifiers=query_modifiers,
+                unmaterialized_properties=set(),
             )
             clickhouse_sql = print_ast(
                 select_query,
@@ -196,6 +197,7 @@ def execute_hogql_query(
                 has_json_operations="JSONExtract" in clickhouse_sql or "JSONHas" in clickhouse_sql,
                 timings=timings_dict,
                 modifiers={k: v for k, v in modifiers.model_dump().items() if v is not None} if modifiers else {},
+                unmaterialized_properties=sorted(clickhouse_context.unmaterialized_properties),
             )
 
             try:
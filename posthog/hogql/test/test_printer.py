@@ -522,6 +522,25 @@ class TestPrinter(BaseTest):
                 "nullIf(nullIf(events.mat_foo, ''), 'null')",
             )
 
+    def test_unmaterialized_properties_are_recorded(self):
+        with override_settings(PERSON_ON_EVENTS_OVERRIDE=True):
+            context = HogQLContext(team_id=self.team.pk)
+            self._expr("properties.nomat.json", context)
+            self._expr("person.properties.email", context)
+            self.assertEqual(
+                context.unmaterialized_properties,
+                {("events", "properties", "nomat"), ("events", "person_properties", "email")},
+            )
+
+        with materialized("events", "foo"):
+            context = HogQLContext(team_id=self.team.pk)
+            self._expr("properties.foo", context)
+            self.assertEqual(context.unmaterialized_properties, set())
+
+        context = HogQLContext(team_id=self.team.pk)
+        self._expr("properties.nomat", context, dialect="hogql")
+        self.assertEqual(context.unmaterialized_properties, set())
+
     def _test_property_group_comparison(
         self,
         input_expression: str,
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from typing import cast, Literal, Optional
 
 from django.db import connection
@@ -12,6 +13,11 @@ from posthog.schema import ActorsQuery
 
 import orjson as json
 
+# Persons are read from Postgres in batches of this size when enriching actors
+ACTOR_HYDRATION_BATCH_SIZE = 1000
+# Some persons have tens of thousands of distinct ids, far more than is useful to return with them
+MAX_DISTINCT_IDS_PER_PERSON = 1000
+
 
 class ActorStrategy:
     field: str
@@ -45,48 +51,85 @@ class PersonStrategy(ActorStrategy):
     origin_id = "id"
 
     # This is hand written instead of using the ORM because the ORM was blowing up the memory on exports and taking forever
-    def get_actors(self, actor_ids, order_by: str = "") -> dict[str, dict]:
-        # If actor queries start quietly dying again, this might need batching at some point
-        # but currently works with 800,000 persondistinctid entries (May 24, 2024)
-        persons_query = """SELECT posthog_person.id, posthog_person.uuid, posthog_person.properties, posthog_person.is_identified, posthog_person.created_at
+    def get_actors(
+        self,
+        actor_ids,
+        order_by: str = "",
+        properties: Optional[list[str]] = None,
+        distinct_id_limit: Optional[int] = MAX_DISTINCT_IDS_PER_PERSON,
+    ) -> dict[str, dict]:
+        return dict(
+            self.iter_actors(actor_ids, order_by=order_by, properties=properties, distinct_id_limit=distinct_id_limit)
+        )
+
+    def iter_actors(
+        self,
+        actor_ids,
+        order_by: str = "",
+        properties: Optional[list[str]] = None,
+        distinct_id_limit: Optional[int] = MAX_DISTINCT_IDS_PER_PERSON,
+    ) -> Iterator[tuple[str, dict]]:
+        """
+        Yields persons from Postgres, reading them through a server-side cursor in batches of
+        `ACTOR_HYDRATION_BATCH_SIZE` and fetching distinct ids batch by batch, so a large page of actors is never
+        loaded into memory all at once. `properties` (by default the query's `personProperties`) projects the
+        returned person properties to the given keys.
+        """
+        if properties is None:
+            properties = self.query.personProperties
+        if properties is not None:
+            properties_column = """COALESCE(
+                (SELECT jsonb_object_agg(key, value) FROM jsonb_each(posthog_person.properties) WHERE key = ANY(%(properties)s)),
+                '{}'::jsonb
+            )"""
+        else:
+            properties_column = "posthog_person.properties"
+        persons_query = f"""SELECT posthog_person.id, posthog_person.uuid, {properties_column}, posthog_person.is_identified, posthog_person.created_at
             FROM posthog_person
             WHERE posthog_person.uuid = ANY(%(uuids)s)
             AND posthog_person.team_id = %(team_id)s"""
         if order_by:
             persons_query += f" ORDER BY {order_by}"
-        with connection.cursor() as cursor:
-            cursor.execute(
+
+        with connection.chunked_cursor() as persons_cursor:
+            persons_cursor.execute(
                 persons_query,
-                {"uuids": list(actor_ids), "team_id": self.team.pk},
+                {"uuids": list(actor_ids), "team_id": self.team.pk, "properties": properties},
             )
-            people = cursor.fetchall()
+            while people := persons_cursor.fetchmany(ACTOR_HYDRATION_BATCH_SIZE):
+                person_id_to_distinct_ids = self._get_distinct_ids([person[0] for person in people], distinct_id_limit)
+                for person in people:
+                    yield (
+                        str(person[1]),
+                        {
+                            "id": person[1],
+                            "properties": json.loads(person[2]),
+                            "is_identified": person[3],
+                            "created_at": person[4],
+                            "distinct_ids": person_id_to_distinct_ids.get(person[0], []),
+                        },
+                    )
+
+    def _get_distinct_ids(self, person_ids: list[int], distinct_id_limit: Optional[int]) -> dict[int, list[str]]:
+        # `LIMIT NULL` is the same as no limit
+        with connection.cursor() as cursor:
             cursor.execute(
-                """SELECT posthog_persondistinctid.person_id, posthog_persondistinctid.distinct_id
-            FROM posthog_persondistinctid
-            WHERE posthog_persondistinctid.person_id = ANY(%(people_ids)s)
-            AND posthog_persondistinctid.team_id = %(team_id)s""",
-                {"people_ids": [x[0] for x in people], "team_id": self.team.pk},
+                """SELECT people.id, pdi.distinct_id
+            FROM unnest(%(people_ids)s::bigint[]) AS people(id)
+            CROSS JOIN LATERAL (
+                SELECT posthog_persondistinctid.distinct_id
+                FROM posthog_persondistinctid
+                WHERE posthog_persondistinctid.person_id = people.id
+                AND posthog_persondistinctid.team_id = %(team_id)s
+                ORDER BY posthog_persondistinctid.id
+                LIMIT %(limit)s
+            ) AS pdi""",
+                {"people_ids": person_ids, "team_id": self.team.pk, "limit": distinct_id_limit},
             )
-            distinct_ids = cursor.fetchall()
-
-        person_id_to_raw_person_and_set: dict[int, tuple] = {person[0]: (person, []) for person in people}
-
-        for pdid in distinct_ids:
-            person_id_to_raw_person_and_set[pdid[0]][1].append(pdid[1])
-        del distinct_ids
-
-        person_uuid_to_person = {
-            str(person[1]): {
-                "id": person[1],
-                "properties": json.loads(person[2]),
-                "is_identified": person[3],
-                "created_at": person[4],
-                "distinct_ids": distinct_ids,
-            }
-            for person, distinct_ids in person_id_to_raw_person_and_set.values()
-        }
-
-        return person_uuid_to_person
+            person_id_to_distinct_ids: dict[int, list[str]] = {}
+            for person_id, distinct_id in cursor.fetchall():
+                person_id_to_distinct_ids.setdefault(person_id, []).append(distinct_id)
+        return person_id_to_distinct_ids
 
     def input_columns(self) -> list[str]:
         return ["person", "id", "created_at", "person.$delete"]
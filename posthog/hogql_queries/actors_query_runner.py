@@ -1,16 +1,20 @@
 import itertools
 from typing import Optional
-from collections.abc import Sequence, Iterator
 
 from posthog.hogql import ast
 from posthog.hogql.constants import HogQLGlobalSettings
 from posthog.hogql.parser import parse_expr, parse_order_expr
 from posthog.hogql.property import has_aggregation
 from posthog.hogql.resolver_utils import extract_select_queries
-from posthog.hogql_queries.actor_strategies import ActorStrategy, PersonStrategy, GroupStrategy
+from posthog.hogql_queries.actor_strategies import (
+    ACTOR_HYDRATION_BATCH_SIZE,
+    ActorStrategy,
+    PersonStrategy,
+    GroupStrategy,
+)
 from posthog.hogql_queries.insights.funnels.funnels_query_runner import FunnelsQueryRunner
 from posthog.hogql_queries.insights.insight_actors_query_runner import InsightActorsQueryRunner
-from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator
+from posthog.hogql_queries.insights.paginators import HogQLCursorPaginator
 from posthog.hogql_queries.query_runner import QueryRunner, get_query_runner
 from posthog.schema import (
     ActorsQuery,
@@ -27,8 +31,14 @@ class ActorsQueryRunner(QueryRunner):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.paginator = HogQLHasMorePaginator.from_limit_context(
-            limit_context=self.limit_context, limit=self.query.limit, offset=self.query.offset
+        # Seeking is only possible when listing persons straight from their table, not from a source query
+        self.paginator = HogQLCursorPaginator.from_limit_context(
+            limit_context=self.limit_context,
+            limit=self.query.limit,
+            offset=self.query.offset,
+            cursor=self.query.cursor,
+            sort_keys=[["created_at"]] if not self.query.source else [],
+            tiebreaker=[PersonStrategy.origin_id] if not self.query.source else None,
         )
         self.source_query_runner: Optional[QueryRunner] = None
 
@@ -61,25 +71,31 @@ class ActorsQueryRunner(QueryRunner):
         self,
         results,
         actor_column_index,
-        actors_lookup,
         recordings_column_index: Optional[int],
         recordings_lookup: Optional[dict[str, list[dict]]],
-    ) -> list:
+    ) -> tuple[list, int]:
         enriched = []
+        missing_actors_count = 0
+
+        # Hydrate actors a batch of rows at a time, so only one batch of actors is looked up and held at once
+        for batch_start in range(0, len(results), ACTOR_HYDRATION_BATCH_SIZE):
+            batch = results[batch_start : batch_start + ACTOR_HYDRATION_BATCH_SIZE]
+            actors_lookup = self.strategy.get_actors(row[actor_column_index] for row in batch)
+            missing_actors_count += len(batch) - len(actors_lookup)
+
+            for result in batch:
+                new_row = list(result)
+                actor_id = str(result[actor_column_index])
+                actor = actors_lookup.get(actor_id)
+                new_row[actor_column_index] = actor if actor else {"id": actor_id}
+                if recordings_column_index is not None and recordings_lookup is not None:
+                    new_row[recordings_column_index] = (
+                        self._get_recordings(result[recordings_column_index], recordings_lookup) or []
+                    )
 
-        for result in results:
-            new_row = list(result)
-            actor_id = str(result[actor_column_index])
-            actor = actors_lookup.get(actor_id)
-            new_row[actor_column_index] = actor if actor else {"id": actor_id}
-            if recordings_column_index is not None and recordings_lookup is not None:
-                new_row[recordings_column_index] = (
-                    self._get_recordings(result[recordings_column_index], recordings_lookup) or []
-                )
-
-            enriched.append(new_row)
+                enriched.append(new_row)
 
-        return enriched
+        return enriched, missing_actors_count
 
     def prepare_recordings(
         self, column_name: str, input_columns: list[str]
@@ -110,19 +126,14 @@ class ActorsQueryRunner(QueryRunner):
         )
         input_columns = self.input_columns()
         missing_actors_count = None
-        results: Sequence[list] | Iterator[list] = self.paginator.results
+        results: list = self.paginator.results
 
         enrich_columns = filter(lambda column: column in ("person", "group", "actor"), input_columns)
         for column_name in enrich_columns:
             actor_column_index = input_columns.index(column_name)
-            actor_ids = (row[actor_column_index] for row in self.paginator.results)
-            actors_lookup = self.strategy.get_actors(actor_ids)
-
             recordings_column_index, recordings_lookup = self.prepare_recordings(column_name, input_columns)
-
-            missing_actors_count = len(self.paginator.results) - len(actors_lookup)
-            results = self._enrich_with_actors(
-                results, actor_column_index, actors_lookup, recordings_column_index, recordings_lookup
+            results, missing_actors_count = self._enrich_with_actors(
+                results, actor_column_index, recordings_column_index, recordings_lookup
             )
 
         return ActorsQueryResponse(
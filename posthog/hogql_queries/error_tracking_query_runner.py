@@ -1,8 +1,12 @@
 import re
+from datetime import datetime
+from typing import Optional
+
 import structlog
 
 from posthog.hogql import ast
 from posthog.hogql.constants import LimitContext
+from posthog.hogql.filters import parse_filters_date
 from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator
 from posthog.hogql_queries.query_runner import QueryRunner
 from posthog.schema import (
@@ -32,6 +36,9 @@ class ErrorTrackingQueryRunner(QueryRunner):
         )
 
     def to_query(self) -> ast.SelectQuery:
+        if self.use_issue_stats:
+            return self.issue_stats_query()
+
         return ast.SelectQuery(
             select=self.select(),
             select_from=ast.JoinExpr(table=ast.Field(chain=["events"])),
@@ -85,52 +92,135 @@ class ErrorTrackingQueryRunner(QueryRunner):
             )
 
         if self.query.searchQuery:
-            # TODO: Refine this so it only searches the frames inside $exception_list
-            # TODO: We'd eventually need a more efficient searching strategy
-            # TODO: Add fuzzy search support
-
-            # first parse the search query to split it into words, except for quoted strings
-            # then search for each word in the exception properties
-            tokens = search_tokenizer(self.query.searchQuery)
-            and_exprs: list[ast.Expr] = []
-
-            if len(tokens) > 10:
-                raise ValueError("Too many search tokens")
-
-            for token in tokens:
-                if not token:
-                    continue
-
-                or_exprs: list[ast.Expr] = []
-
-                props_to_search = [
-                    "$exception_list",
-                    "$exception_type",
-                    "$exception_message",
-                ]
-                for prop in props_to_search:
-                    or_exprs.append(
-                        ast.CompareOperation(
-                            op=ast.CompareOperationOp.Gt,
-                            left=ast.Call(
-                                name="position",
-                                args=[
-                                    ast.Call(name="lower", args=[ast.Field(chain=["properties", prop])]),
-                                    ast.Call(name="lower", args=[ast.Constant(value=token)]),
-                                ],
-                            ),
-                            right=ast.Constant(value=0),
+            if self.modifiers.useErrorTrackingSearchIndex:
+                if self.search_tokens:
+                    exprs.append(
+                        self.search_index_expr(
+                            self.search_tokens,
+                            ast.Call(name="toString", args=[ast.Field(chain=["properties", "$exception_issue_id"])]),
                         )
                     )
+            else:
+                exprs.append(self.search_raw_expr(self.search_tokens))
+
+        return ast.And(exprs=exprs)
+
+    def search_raw_expr(self, tokens: list[str]) -> ast.Expr:
+        # TODO: Refine this so it only searches the frames inside $exception_list
+        # TODO: Add fuzzy search support
+        and_exprs: list[ast.Expr] = []
 
-                and_exprs.append(
-                    ast.Or(
-                        exprs=or_exprs,
+        for token in tokens:
+            or_exprs: list[ast.Expr] = []
+
+            props_to_search = [
+                "$exception_list",
+                "$exception_type",
+                "$exception_message",
+            ]
+            for prop in props_to_search:
+                or_exprs.append(
+                    ast.CompareOperation(
+                        op=ast.CompareOperationOp.Gt,
+                        left=ast.Call(
+                            name="position",
+                            args=[
+                                ast.Call(name="lower", args=[ast.Field(chain=["properties", prop])]),
+                                ast.Call(name="lower", args=[ast.Constant(value=token)]),
+                            ],
+                        ),
+                        right=ast.Constant(value=0),
                     )
                 )
-            exprs.append(ast.And(exprs=and_exprs))
 
-        return ast.And(exprs=exprs)
+            and_exprs.append(
+                ast.Or(
+                    exprs=or_exprs,
+                )
+            )
+
+        return ast.And(exprs=and_exprs)
+
+    def search_index_expr(self, tokens: list[str], issue_id: ast.Expr) -> ast.Expr:
+        # Matches issues by their normalized search text, instead of scanning the raw exception properties of
+        # every event. An issue matches if any of its distinct exceptions contains all the tokens.
+        search_text_exprs: list[ast.Expr] = [
+            ast.CompareOperation(
+                op=ast.CompareOperationOp.Like,
+                left=ast.Field(chain=["search_text"]),
+                right=ast.Constant(value=f"%{escape_like_pattern(normalize_search_token(token))}%"),
+            )
+            for token in tokens
+        ]
+        if self.date_from is not None:
+            search_text_exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.GtEq,
+                    left=ast.Field(chain=["last_seen"]),
+                    right=ast.Constant(value=self.date_from),
+                )
+            )
+
+        return ast.CompareOperation(
+            op=ast.CompareOperationOp.In,
+            left=issue_id,
+            right=ast.SelectQuery(
+                select=[ast.Call(name="toString", args=[ast.Field(chain=["issue_id"])])],
+                select_from=ast.JoinExpr(table=ast.Field(chain=["raw_error_tracking_issue_search"])),
+                where=ast.And(exprs=search_text_exprs),
+                distinct=True,
+            ),
+        )
+
+    def issue_stats_query(self) -> ast.SelectQuery:
+        # Reads the hourly per-issue aggregates instead of grouping every $exception event. The date range is
+        # matched at hour granularity, and the uniq counts are approximate.
+        issue_id = ast.Call(name="toString", args=[ast.Field(chain=["issue_id"])])
+
+        exprs: list[ast.Expr] = []
+        if self.date_from is not None:
+            exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.GtEq,
+                    left=ast.Field(chain=["hour"]),
+                    right=ast.Call(name="toStartOfHour", args=[ast.Constant(value=self.date_from)]),
+                )
+            )
+        if self.date_to is not None:
+            exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.Lt,
+                    left=ast.Field(chain=["hour"]),
+                    right=ast.Constant(value=self.date_to),
+                )
+            )
+        if self.query.issueId:
+            exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.Eq,
+                    left=issue_id,
+                    right=ast.Constant(value=self.query.issueId),
+                )
+            )
+        if self.search_tokens:
+            exprs.append(self.search_index_expr(self.search_tokens, issue_id))
+
+        return ast.SelectQuery(
+            select=[
+                ast.Alias(
+                    alias="occurrences", expr=ast.Call(name="uniqMerge", args=[ast.Field(chain=["occurrences"])])
+                ),
+                ast.Alias(alias="sessions", expr=ast.Call(name="uniqMerge", args=[ast.Field(chain=["sessions"])])),
+                ast.Alias(alias="users", expr=ast.Call(name="uniqMerge", args=[ast.Field(chain=["users"])])),
+                ast.Alias(alias="last_seen", expr=ast.Call(name="max", args=[ast.Field(chain=["last_seen"])])),
+                ast.Alias(alias="first_seen", expr=ast.Call(name="min", args=[ast.Field(chain=["first_seen"])])),
+                ast.Alias(alias="id", expr=issue_id),
+            ],
+            select_from=ast.JoinExpr(table=ast.Field(chain=["raw_error_tracking_issue_stats"])),
+            where=ast.And(exprs=exprs) if exprs else None,
+            order_by=self.order_by,
+            group_by=[ast.Field(chain=["issue_id"])],
+        )
 
     def calculate(self):
         query_result = self.paginator.execute_hogql_query(
@@ -192,6 +282,48 @@ class ErrorTrackingQueryRunner(QueryRunner):
             else None
         )
 
+    @cached_property
+    def search_tokens(self) -> list[str]:
+        if not self.query.searchQuery:
+            return []
+
+        # first parse the search query to split it into words, except for quoted strings
+        # then search for each word in the exception properties
+        tokens = [token for token in search_tokenizer(self.query.searchQuery) if token]
+
+        if len(tokens) > 10:
+            raise ValueError("Too many search tokens")
+
+        return tokens
+
+    @cached_property
+    def use_issue_stats(self) -> bool:
+        # The per-issue aggregates only know about issue ids and timestamps, so anything filtering on other event
+        # properties has to go through the raw events
+        if not self.modifiers.useErrorTrackingIssueStats:
+            return False
+        if self.query.select or self.properties:
+            return False
+        if self.query.filterTestAccounts and self.team.test_account_filters:
+            return False
+        if self.query.searchQuery and not self.modifiers.useErrorTrackingSearchIndex:
+            return False
+        return True
+
+    @cached_property
+    def date_from(self) -> Optional[datetime]:
+        date_from = self.query.dateRange.date_from
+        if date_from is None or date_from == "all":
+            return None
+        return parse_filters_date(date_from, self.team)
+
+    @cached_property
+    def date_to(self) -> Optional[datetime]:
+        date_to = self.query.dateRange.date_to
+        if date_to is None:
+            return None
+        return parse_filters_date(date_to, self.team)
+
     @cached_property
     def properties(self):
         return self.query.filterGroup.values[0].values if self.query.filterGroup else None
@@ -221,3 +353,13 @@ def search_tokenizer(query: str) -> list[str]:
     pattern = r'"[^"]*"|\'[^\']*\'|\S+'
     tokens = re.findall(pattern, query)
     return [token.strip("'\"") for token in tokens]
+
+
+def normalize_search_token(token: str) -> str:
+    # Mirrors the normalization of `search_text` in the error tracking issue search table,
+    # see `error_tracking_search_text_expr`
+    return re.sub(r"\s+", " ", token.strip().lower())
+
+
+def escape_like_pattern(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
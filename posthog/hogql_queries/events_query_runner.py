@@ -12,7 +12,7 @@ from posthog.hogql.ast import Alias
 from posthog.hogql.parser import parse_expr, parse_order_expr
 from posthog.hogql.property import action_to_expr, has_aggregation, property_to_expr
 from posthog.hogql.timings import HogQLTimings
-from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator
+from posthog.hogql_queries.insights.paginators import HogQLCursorPaginator
 from posthog.hogql_queries.query_runner import QueryRunner
 from posthog.models import Action, Person
 from posthog.models.element import chain_to_elements
@@ -41,8 +41,13 @@ class EventsQueryRunner(QueryRunner):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.paginator = HogQLHasMorePaginator.from_limit_context(
-            limit_context=self.limit_context, limit=self.query.limit, offset=self.query.offset
+        self.paginator = HogQLCursorPaginator.from_limit_context(
+            limit_context=self.limit_context,
+            limit=self.query.limit,
+            offset=self.query.offset,
+            cursor=self.query.cursor,
+            sort_keys=[["timestamp"]],
+            tiebreaker=["uuid"],
         )
 
     def select_cols(self) -> tuple[list[str], list[ast.Expr]]:
@@ -1,4 +1,8 @@
-from typing import Any, Optional, cast
+import base64
+import json
+from datetime import datetime
+from typing import Any, Literal, Optional, cast
+from uuid import UUID
 
 from posthog.hogql import ast
 from posthog.hogql.constants import (
@@ -7,6 +11,7 @@ from posthog.hogql.constants import (
     LimitContext,
     DEFAULT_RETURNED_ROWS,
 )
+from posthog.hogql.errors import QueryError
 from posthog.hogql.query import execute_hogql_query
 from posthog.schema import HogQLQueryResponse
 
@@ -28,12 +33,12 @@ class HogQLHasMorePaginator:
 
     @classmethod
     def from_limit_context(
-        cls, *, limit_context: LimitContext, limit: Optional[int] = None, offset: Optional[int] = None
+        cls, *, limit_context: LimitContext, limit: Optional[int] = None, offset: Optional[int] = None, **kwargs
     ) -> "HogQLHasMorePaginator":
         max_rows = get_max_limit_for_context(limit_context)
         default_rows = get_default_limit_for_context(limit_context)
         limit = min(max_rows, default_rows if (limit is None or limit <= 0) else limit)
-        return cls(limit=limit, offset=offset, limit_context=limit_context)
+        return cls(limit=limit, offset=offset, limit_context=limit_context, **kwargs)
 
     def paginate(self, query: ast.SelectQuery) -> ast.SelectQuery:
         query.limit = ast.Constant(value=self.limit + 1)
@@ -79,3 +84,161 @@ class HogQLHasMorePaginator:
             "limit": self.limit,
             "offset": self.offset,
         }
+
+
+CURSOR_COLUMN_PREFIX = "__cursor_"
+
+
+def encode_cursor(values: list[Any]) -> str:
+    payload: list[list[Any]] = []
+    for value in values:
+        if isinstance(value, datetime):
+            payload.append(["datetime", value.isoformat()])
+        elif isinstance(value, UUID):
+            payload.append(["uuid", str(value)])
+        else:
+            payload.append(["value", value])
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values: list[Any] = []
+        for kind, value in payload:
+            if kind == "datetime":
+                values.append(datetime.fromisoformat(value))
+            elif kind == "uuid":
+                values.append(UUID(value))
+            elif kind == "value" and (value is None or isinstance(value, str | int | float)):
+                values.append(value)
+            else:
+                raise ValueError(kind)
+    except (ValueError, TypeError, UnicodeError):
+        raise QueryError("Invalid pagination cursor")
+    return values
+
+
+class HogQLCursorPaginator(HogQLHasMorePaginator):
+    """
+    Paginator that seeks past the last returned row instead of skipping `offset` rows.
+
+    When the query is ordered only by `sort_keys` fields in a single direction, the ordering is made total with the
+    `tiebreaker` field, the sort key of each row is selected alongside the requested columns, and the key of the last
+    row is returned as an opaque `nextCursor`. Passing that cursor back (instead of an offset) adds a
+    `(keys) < (cursor)` predicate, so ClickHouse doesn't have to read and discard every row of the previous pages.
+    Any other ordering falls back to LIMIT/OFFSET pagination.
+    """
+
+    def __init__(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        sort_keys: Optional[list[list[str | int]]] = None,
+        tiebreaker: Optional[list[str | int]] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.cursor = cursor
+        self.sort_keys = sort_keys or []
+        self.tiebreaker = tiebreaker
+        self.cursor_chains: Optional[list[list[str | int]]] = None
+
+    def _keyset_order(self, query: ast.SelectQuery) -> Optional[tuple[list[list[str | int]], Literal["ASC", "DESC"]]]:
+        if self.tiebreaker is None or query.group_by or query.distinct or not query.order_by:
+            return None
+
+        directions = {order_expr.order for order_expr in query.order_by}
+        if len(directions) != 1:
+            return None
+
+        chains: list[list[str | int]] = []
+        for order_expr in query.order_by:
+            if not isinstance(order_expr.expr, ast.Field) or order_expr.expr.chain not in [
+                *self.sort_keys,
+                self.tiebreaker,
+            ]:
+                return None
+            chains.append(order_expr.expr.chain)
+
+        if self.tiebreaker not in chains:
+            chains.append(self.tiebreaker)
+        return chains, directions.pop()
+
+    def paginate(self, query: ast.SelectQuery) -> ast.SelectQuery:
+        keyset_order = self._keyset_order(query)
+        if keyset_order is None:
+            if self.cursor:
+                raise QueryError("Cursor pagination is not supported for this ordering")
+            return super().paginate(query)
+
+        chains, direction = keyset_order
+        self.cursor_chains = chains
+        query.order_by = [ast.OrderExpr(expr=ast.Field(chain=chain), order=direction) for chain in chains]
+        query.select = [
+            *query.select,
+            *(
+                ast.Alias(alias=f"{CURSOR_COLUMN_PREFIX}{index}", expr=ast.Field(chain=chain))
+                for index, chain in enumerate(chains)
+            ),
+        ]
+
+        if self.cursor:
+            # The cursor already points past the skipped rows
+            self.offset = 0
+            values = decode_cursor(self.cursor)
+            if len(values) != len(chains):
+                raise QueryError("Invalid pagination cursor")
+            op = ast.CompareOperationOp.Lt if direction == "DESC" else ast.CompareOperationOp.Gt
+            bound_op = ast.CompareOperationOp.LtEq if direction == "DESC" else ast.CompareOperationOp.GtEq
+            seek_exprs: list[ast.Expr] = [
+                # The bound on the leading key alone lets ClickHouse prune parts and granules
+                ast.CompareOperation(op=bound_op, left=ast.Field(chain=chains[0]), right=ast.Constant(value=values[0])),
+                ast.CompareOperation(
+                    op=op,
+                    left=ast.Tuple(exprs=[ast.Field(chain=chain) for chain in chains]),
+                    right=ast.Tuple(exprs=[ast.Constant(value=value) for value in values]),
+                ),
+            ]
+            query.where = ast.And(exprs=[query.where, *seek_exprs]) if query.where else ast.And(exprs=seek_exprs)
+
+        query.limit = ast.Constant(value=self.limit + 1)
+        query.offset = ast.Constant(value=self.offset)
+        return query
+
+    def trim_results(self) -> list[Any]:
+        results = super().trim_results()
+        if self.cursor_chains is None:
+            return results
+
+        key_count = len(self.cursor_chains)
+        return [list(row[:-key_count]) for row in results]
+
+    def execute_hogql_query(
+        self,
+        query: ast.SelectQuery,
+        *,
+        query_type: str,
+        **kwargs,
+    ) -> HogQLQueryResponse:
+        response = super().execute_hogql_query(query, query_type=query_type, **kwargs)
+        if self.cursor_chains is not None:
+            key_count = len(self.cursor_chains)
+            if response.columns:
+                response.columns = response.columns[:-key_count]
+            if response.types:
+                response.types = response.types[:-key_count]
+        return response
+
+    def next_cursor(self) -> Optional[str]:
+        if self.cursor_chains is None or not self.has_more() or not self.response or not self.response.results:
+            return None
+
+        last_row = self.response.results[self.limit - 1]
+        return encode_cursor(list(last_row[-len(self.cursor_chains) :]))
+
+    def response_params(self):
+        return {
+            **super().response_params(),
+            "nextCursor": self.next_cursor(),
+        }
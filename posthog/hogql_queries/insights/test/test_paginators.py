@@ -1,5 +1,7 @@
+from datetime import UTC, datetime
 from typing import cast
 from unittest.mock import MagicMock, patch
+from uuid import UUID
 
 from posthog.hogql.ast import SelectQuery
 from posthog.hogql.constants import (
@@ -8,8 +10,9 @@ from posthog.hogql.constants import (
     get_max_limit_for_context,
     MAX_SELECT_RETURNED_ROWS,
 )
+from posthog.hogql.errors import QueryError
 from posthog.hogql.parser import parse_select
-from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator
+from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator, decode_cursor, encode_cursor
 from posthog.hogql_queries.actors_query_runner import ActorsQueryRunner
 from posthog.models.utils import UUIDT
 from posthog.schema import (
@@ -136,6 +139,50 @@ class TestHogQLHasMorePaginator(ClickhouseTestMixin, APIBaseTest):
         self.assertEqual(len(response.results), 5)
         self.assertFalse(response.hasMore)
 
+    def test_persons_query_cursor(self):
+        """Test following the cursor returns the same rows as offset pagination."""
+        select = ["properties.email", "created_at"]
+        expected = self._create_runner(ActorsQuery(select=select, limit=10)).calculate().results
+
+        results: list = []
+        cursor = None
+        for _ in range(4):
+            runner = self._create_runner(ActorsQuery(select=select, limit=3, cursor=cursor))
+            response = runner.calculate()
+            self.assertEqual(response.columns, select)
+            self.assertEqual(runner.paginator.cursor_chains, [["created_at"], ["id"]])
+            results.extend(response.results)
+            cursor = response.nextCursor
+            self.assertEqual(response.hasMore, cursor is not None)
+            if cursor is None:
+                break
+
+        self.assertEqual(results, expected)
+        self.assertEqual(len(results), 10)
+
+    def test_persons_query_cursor_falls_back_to_offset(self):
+        """Test arbitrary orderings keep using offset pagination."""
+        runner = self._create_runner(
+            ActorsQuery(select=["properties.email"], orderBy=["properties.email DESC"], limit=1, offset=2)
+        )
+        response = runner.calculate()
+        self.assertIsNone(runner.paginator.cursor_chains)
+        self.assertEqual(response.results, [[f"jacob7@{self.random_uuid}.posthog.com"]])
+        self.assertIsNone(response.nextCursor)
+
+        runner = self._create_runner(
+            ActorsQuery(select=["properties.email"], orderBy=["properties.email DESC"], limit=1, cursor="invalid")
+        )
+        with self.assertRaises(QueryError):
+            runner.calculate()
+
+    def test_encode_decode_cursor(self):
+        values = [datetime(2024, 1, 1, 12, tzinfo=UTC), UUID("01917c9d-dc0c-0000-9f3e-cc4e8f2df2a5"), "id", 5]
+        self.assertEqual(decode_cursor(encode_cursor(values)), values)
+
+        with self.assertRaises(QueryError):
+            decode_cursor("not a cursor")
+
     def test_response_params_consistency(self):
         """Test consistency of response_params method."""
         paginator = HogQLHasMorePaginator(limit=5, offset=10)
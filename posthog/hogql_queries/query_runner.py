@@ -1,15 +1,18 @@
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from datetime import UTC, datetime, timedelta
 from enum import StrEnum
 from typing import Any, Generic, Optional, TypeGuard, TypeVar, Union, cast
 
 import structlog
+from django.conf import settings
 from prometheus_client import Counter
 from pydantic import BaseModel, ConfigDict
 from sentry_sdk import capture_exception, get_traceparent, push_scope, set_tag
 
 from posthog.caching.utils import ThresholdMode, cache_target_age, is_stale, last_refresh_from_cached_result
 from posthog.clickhouse.client.execute_async import QueryNotFoundError, enqueue_process_query_task, get_query_status
+from posthog.clickhouse.query_profile import profile_queries
 from posthog.clickhouse.query_tagging import get_query_tag_value, tag_queries
 from posthog.hogql import ast
 from posthog.hogql.constants import LimitContext
@@ -425,6 +428,14 @@ def get_query_runner(
     raise ValueError(f"Can't get a runner for an unknown query kind: {kind}")
 
 
+def can_profile_queries(user: Optional[User]) -> bool:
+    """
+    Profiling bypasses the cache and flushes the query log of every replica, so outside of development
+    the `profileQueries` modifier is only honoured for staff.
+    """
+    return settings.DEBUG or settings.TEST or (user is not None and user.is_staff)
+
+
 def get_query_runner_or_none(
     query: dict[str, Any] | RunnableQueryNode | BaseModel,
     team: Team,
@@ -623,6 +634,9 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
         insight_id: Optional[int] = None,
         dashboard_id: Optional[int] = None,
     ) -> CR | CacheMissResponse | QueryStatusResponse:
+        if self.modifiers.profileQueries and not can_profile_queries(user):
+            self.modifiers = self.modifiers.model_copy(update={"profileQueries": None})
+
         cache_key = self.get_cache_key()
 
         tag_queries(cache_key=cache_key)
@@ -652,7 +666,7 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
                     refresh_requested=True, cache_manager=cache_manager, user=user
                 )
             )
-        elif execution_mode != ExecutionMode.CALCULATE_BLOCKING_ALWAYS:
+        elif execution_mode != ExecutionMode.CALCULATE_BLOCKING_ALWAYS and not self.modifiers.profileQueries:
             # Let's look in the cache first
             results = self.handle_cache_and_async_logic(
                 execution_mode=execution_mode, cache_manager=cache_manager, user=user
@@ -669,8 +683,11 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
             self.modifiers = create_default_modifiers_for_user(user, self.team, self.modifiers)
             self.modifiers.useMaterializedViews = True
 
+        with profile_queries() if self.modifiers.profileQueries else nullcontext() as profile:
+            response = self.calculate()
+
         fresh_response_dict = {
-            **self.calculate().model_dump(),
+            **response.model_dump(),
             "is_cached": False,
             "last_refresh": last_refresh,
             "next_allowed_client_refresh": last_refresh + self._refresh_frequency(),
@@ -680,11 +697,17 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
         }
         if get_query_tag_value("trigger"):
             fresh_response_dict["calculation_trigger"] = get_query_tag_value("trigger")
+        if profile is not None:
+            # Merge what ClickHouse recorded for each query into the timings of the calculation
+            profile.fetch()
+            fresh_response_dict["timings"] = [*(fresh_response_dict.get("timings") or []), *profile.timings()]
+            if "explain" in CachedResponse.model_fields:
+                fresh_response_dict["explain"] = [*(fresh_response_dict.get("explain") or []), *profile.explain()]
         fresh_response = CachedResponse(**fresh_response_dict)
 
-        # Don't cache debug queries with errors and export queries
+        # Don't cache debug queries with errors, export queries and profiled queries
         has_error: Optional[list] = fresh_response_dict.get("error", None)
-        if (has_error is None or len(has_error) == 0) and self.limit_context != LimitContext.EXPORT:
+        if (has_error is None or len(has_error) == 0) and self.limit_context != LimitContext.EXPORT and profile is None:
             cache_manager.set_cache_data(
                 response=fresh_response_dict,
                 # This would be a possible place to decide to not ever keep this cache warm
@@ -1,9 +1,13 @@
+from unittest.mock import patch
+
 import pytest
 
 from posthog.hogql import ast
 from posthog.hogql.test.utils import pretty_print_in_tests
 from posthog.hogql.visitor import clear_locations
+from posthog.hogql_queries.actor_strategies import PersonStrategy
 from posthog.hogql_queries.actors_query_runner import ActorsQueryRunner
+from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator
 from posthog.models.utils import UUIDT
 from posthog.schema import (
     ActorsQuery,
@@ -86,6 +90,29 @@ class TestActorsQueryRunner(ClickhouseTestMixin, APIBaseTest):
         assert response.results[0][0].get("properties").get("random_uuid") == self.random_uuid
         assert len(response.results[0][0].get("distinct_ids")) > 0
 
+    @patch("posthog.hogql_queries.actor_strategies.ACTOR_HYDRATION_BATCH_SIZE", 3)
+    @patch("posthog.hogql_queries.actors_query_runner.ACTOR_HYDRATION_BATCH_SIZE", 4)
+    def test_persons_query_hydrates_in_batches(self):
+        self.random_uuid = self._create_random_persons()
+        runner = self._create_runner(ActorsQuery(personProperties=["email", "unknown"]))
+
+        response = runner.calculate()
+
+        assert len(response.results) == 10
+        assert response.missing_actors_count == 0
+        assert [row[0]["id"] for row in response.results] == [row[1] for row in response.results]
+        for row in response.results:
+            assert set(row[0]["properties"].keys()) == {"email"}
+            assert len(row[0]["distinct_ids"]) == 1
+
+    def test_person_strategy_caps_distinct_ids(self):
+        person = _create_person(team=self.team, distinct_ids=["a", "b", "c"], properties={"email": "a@b.c"})
+        flush_persons_and_events()
+        strategy = PersonStrategy(team=self.team, query=ActorsQuery(), paginator=HogQLHasMorePaginator())
+
+        assert strategy.get_actors([person.uuid])[str(person.uuid)]["distinct_ids"] == ["a", "b", "c"]
+        assert strategy.get_actors([person.uuid], distinct_id_limit=2)[str(person.uuid)]["distinct_ids"] == ["a", "b"]
+
     def test_persons_query_properties(self):
         self.random_uuid = self._create_random_persons()
         runner = self._create_runner(
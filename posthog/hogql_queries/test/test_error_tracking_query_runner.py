@@ -1,9 +1,15 @@
 from unittest import TestCase
 from freezegun import freeze_time
 
-from posthog.hogql_queries.error_tracking_query_runner import ErrorTrackingQueryRunner, search_tokenizer
+from posthog.hogql_queries.error_tracking_query_runner import (
+    ErrorTrackingQueryRunner,
+    escape_like_pattern,
+    normalize_search_token,
+    search_tokenizer,
+)
 from posthog.schema import (
     ErrorTrackingQuery,
+    HogQLQueryModifiers,
     DateRange,
     FilterLogicalOperator,
     PropertyGroupFilter,
@@ -405,6 +411,126 @@ class TestErrorTrackingQueryRunner(ClickhouseTestMixin, APIBaseTest):
         self.assertEqual(results[0]["sessions"], 1)
         self.assertEqual(results[0]["users"], 1)
 
+    def test_search_query_with_search_index(self):
+        with freeze_time("2022-01-10 12:11:00"):
+            self.create_events_and_issue(
+                issue_id="01936e81-b0ce-7b56-8497-791e505b0d0c",
+                distinct_ids=[self.distinct_id_one, self.distinct_id_two],
+                exception_list=[
+                    {
+                        "type": "DatabaseNotFoundX",
+                        "value": "this is the same error message",
+                        "stacktrace": {"frames": SAMPLE_STACK_TRACE},
+                    }
+                ],
+            )
+            self.create_events_and_issue(
+                issue_id="01936e81-f5ce-79b1-99f1-f0e9675fcfef",
+                distinct_ids=[self.distinct_id_two],
+                exception_list=[{"type": "DatabaseNotFoundY", "value": "this is the same error message"}],
+            )
+            self.create_events_and_issue(
+                issue_id="01936e82-241e-7e27-b47d-6659c54eb0be",
+                distinct_ids=[self.distinct_id_two],
+                exception_list=[{"type": "xyz", "value": "this is the same error message"}],
+            )
+            flush_persons_and_events()
+
+        runner = ErrorTrackingQueryRunner(
+            team=self.team,
+            query=ErrorTrackingQuery(
+                kind="ErrorTrackingQuery",
+                issueId=None,
+                dateRange=DateRange(date_from="2022-01-10", date_to="2022-01-11"),
+                filterTestAccounts=True,
+                searchQuery="databasenot",
+            ),
+            modifiers=HogQLQueryModifiers(useErrorTrackingSearchIndex=True),
+        )
+
+        results = sorted(self._calculate(runner)["results"], key=lambda x: x["id"])
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["id"], "01936e81-b0ce-7b56-8497-791e505b0d0c")
+        self.assertEqual(results[0]["occurrences"], 2)
+        self.assertEqual(results[0]["users"], 2)
+        self.assertEqual(results[1]["id"], "01936e81-f5ce-79b1-99f1-f0e9675fcfef")
+        self.assertEqual(results[1]["occurrences"], 1)
+
+        runner = ErrorTrackingQueryRunner(
+            team=self.team,
+            query=ErrorTrackingQuery(
+                kind="ErrorTrackingQuery",
+                issueId=None,
+                dateRange=DateRange(date_from="2022-01-10", date_to="2022-01-11"),
+                filterTestAccounts=True,
+                searchQuery="databasenotfoundX clickhouse/client/execute.py",
+            ),
+            modifiers=HogQLQueryModifiers(useErrorTrackingSearchIndex=True),
+        )
+
+        results = self._calculate(runner)["results"]
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["id"], "01936e81-b0ce-7b56-8497-791e505b0d0c")
+
+    def test_issue_stats(self):
+        query = ErrorTrackingQuery(
+            kind="ErrorTrackingQuery",
+            dateRange=DateRange(date_from="2020-01-10", date_to="2020-01-11"),
+            order="occurrences",
+        )
+
+        runner = ErrorTrackingQueryRunner(
+            team=self.team, query=query, modifiers=HogQLQueryModifiers(useErrorTrackingIssueStats=True)
+        )
+        self.assertTrue(runner.use_issue_stats)
+        stats_results = self._calculate(runner)["results"]
+
+        raw_results = self._calculate(ErrorTrackingQueryRunner(team=self.team, query=query))["results"]
+
+        self.assertEqual(len(stats_results), 3)
+        self.assertEqual(stats_results[0]["id"], self.issue_one)
+        self.assertEqual(stats_results[0]["occurrences"], 2)
+        self.assertEqual(stats_results[0]["users"], 2)
+        self.assertEqual(
+            sorted((r["id"], r["occurrences"], r["sessions"], r["users"]) for r in stats_results),
+            sorted((r["id"], r["occurrences"], r["sessions"], r["users"]) for r in raw_results),
+        )
+
+    def test_issue_stats_falls_back_to_events_for_property_filters(self):
+        runner = ErrorTrackingQueryRunner(
+            team=self.team,
+            query=ErrorTrackingQuery(
+                kind="ErrorTrackingQuery",
+                dateRange=DateRange(),
+                filterGroup=PropertyGroupFilter(
+                    type=FilterLogicalOperator.AND_,
+                    values=[
+                        PropertyGroupFilterValue(
+                            type=FilterLogicalOperator.OR_,
+                            values=[
+                                PersonPropertyFilter(
+                                    key="email",
+                                    value="email@posthog.com",
+                                    operator=PropertyOperator.EXACT,
+                                ),
+                            ],
+                        )
+                    ],
+                ),
+            ),
+            modifiers=HogQLQueryModifiers(useErrorTrackingIssueStats=True),
+        )
+        self.assertFalse(runner.use_issue_stats)
+
+        runner = ErrorTrackingQueryRunner(
+            team=self.team,
+            query=ErrorTrackingQuery(kind="ErrorTrackingQuery", dateRange=DateRange(), searchQuery="databasenot"),
+            modifiers=HogQLQueryModifiers(useErrorTrackingIssueStats=True),
+        )
+        self.assertFalse(runner.use_issue_stats)
+
     def test_only_returns_exception_events(self):
         with freeze_time("2020-01-10 12:11:00"):
             _create_event(
@@ -568,3 +694,10 @@ class TestSearchTokenizer(TestCase):
             with self.subTest(case=case):
                 tokens = search_tokenizer(case)
                 self.assertEqual(tokens, output)
+
+    def test_normalize_search_token(self):
+        self.assertEqual(normalize_search_token("  DatabaseNotFound  "), "databasenotfound")
+        self.assertEqual(normalize_search_token("Quoted   String\tHere"), "quoted string here")
+
+    def test_escape_like_pattern(self):
+        self.assertEqual(escape_like_pattern("100%_done\\"), "100\\%\\_done\\\\")
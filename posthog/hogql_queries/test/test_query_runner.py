@@ -15,6 +15,7 @@ from posthog.schema import (
     HogQLQueryModifiers,
     MaterializationMode,
     PersonsOnEventsMode,
+    QueryTiming,
     TestBasicQueryResponse,
     TestCachedBasicQueryResponse,
 )
@@ -211,6 +212,51 @@ class TestQueryRunner(BaseTest):
             self.assertEqual(response.is_cached, True)
             mock_on_commit.assert_called_once()
 
+    @mock.patch("posthog.hogql_queries.query_runner.profile_queries")
+    def test_profiled_run_merges_query_log_timings_and_skips_cache(self, mock_profile_queries):
+        TestQueryRunner = self.setup_test_query_runner_class()
+        profile = mock_profile_queries.return_value.__enter__.return_value
+        profile.timings.return_value = [QueryTiming(k="./clickhouse/1_abc", t=1.2)]
+
+        runner = TestQueryRunner(
+            query={"some_attr": "bla"}, team=self.team, modifiers=HogQLQueryModifiers(profileQueries=True)
+        )
+        response = runner.run(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+
+        assert isinstance(response, TestCachedBasicQueryResponse)
+        profile.fetch.assert_called_once()
+        self.assertEqual(response.timings, [QueryTiming(k="./clickhouse/1_abc", t=1.2)])
+
+        # profiled responses aren't cached, and profiling never reads from the cache
+        response = runner.run(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+        self.assertIsInstance(response, TestCachedBasicQueryResponse)
+        self.assertEqual(response.is_cached, False)
+        self.assertEqual(profile.fetch.call_count, 2)
+
+    @mock.patch("posthog.hogql_queries.query_runner.profile_queries")
+    def test_profile_queries_modifier_is_ignored_for_non_staff(self, mock_profile_queries):
+        TestQueryRunner = self.setup_test_query_runner_class()
+
+        with self.settings(DEBUG=False, TEST=False):
+            runner = TestQueryRunner(
+                query={"some_attr": "bla"}, team=self.team, modifiers=HogQLQueryModifiers(profileQueries=True)
+            )
+            runner.run(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE, user=self.user)
+            mock_profile_queries.assert_not_called()
+            self.assertIsNone(runner.modifiers.profileQueries)
+
+            # cached, as the query wasn't profiled
+            response = runner.run(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE, user=self.user)
+            self.assertEqual(response.is_cached, True)
+
+            self.user.is_staff = True
+            self.user.save()
+            runner = TestQueryRunner(
+                query={"some_attr": "bla"}, team=self.team, modifiers=HogQLQueryModifiers(profileQueries=True)
+            )
+            runner.run(execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE, user=self.user)
+            mock_profile_queries.assert_called_once()
+
     @mock.patch("django.db.transaction.on_commit")
     def test_recent_cache_calculate_async_if_stale_and_blocking_on_miss(self, mock_on_commit):
         TestQueryRunner = self.setup_test_query_runner_class()
@@ -1,7 +1,8 @@
 import json
 from enum import StrEnum
+from itertools import islice
 from typing import Any, Optional
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 
 from django.conf import settings
 from kafka import KafkaConsumer as KC
@@ -16,10 +17,13 @@ from statshog.defaults.django import statsd
 from structlog import get_logger
 
 from posthog.client import sync_execute
+from posthog.clickhouse.client.escape import substitute_params
 from posthog.kafka_client import helper
 from posthog.utils import SingletonDecorator
 
 KAFKA_PRODUCER_RETRIES = 5
+# Maximum number of rows rendered into a single INSERT when `ClickhouseProducer.produce_batch` writes directly
+CLICKHOUSE_PRODUCER_MAX_ROWS_PER_INSERT = 10_000
 
 logger = get_logger(__name__)
 
@@ -269,3 +273,28 @@ class ClickhouseProducer:
             self.producer.produce(topic=topic, data=data)
         else:
             sync_execute(sql, data)
+
+    def produce_batch(
+        self, bulk_sql: str, values_sql: str, topic: str, rows: Iterable[dict[str, Any]], sync: bool = True
+    ) -> int:
+        """Produce many rows at once, returning how many were produced.
+
+        With Kafka, all messages are queued before a single flush (if `sync`), so that the producer can batch them.
+        Without Kafka, rows are inserted with `bulk_sql` (an `INSERT INTO table (columns) VALUES`), followed by
+        `values_sql` (a `(...)` row of placeholders) rendered for each of them.
+        """
+        if self.producer is not None:
+            futures = [self.producer.produce(topic=topic, data=data) for data in rows]
+            if sync and futures:
+                self.producer.flush()
+                for future in futures:
+                    if future.failed():
+                        raise future.exception
+            return len(futures)
+
+        row_count = 0
+        rows_iterator = iter(rows)
+        while chunk := list(islice(rows_iterator, CLICKHOUSE_PRODUCER_MAX_ROWS_PER_INSERT)):
+            sync_execute(f"{bulk_sql.strip()} {', '.join(substitute_params(values_sql, data) for data in chunk)}")
+            row_count += len(chunk)
+        return row_count
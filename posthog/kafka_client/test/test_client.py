@@ -1,9 +1,15 @@
 from unittest.mock import patch
 
 import kafka
-from django.test import TestCase, override_settings
+from django.test import SimpleTestCase, TestCase, override_settings
 
-from posthog.kafka_client.client import _KafkaProducer, build_kafka_consumer
+from posthog.kafka_client.client import (
+    CLICKHOUSE_PRODUCER_MAX_ROWS_PER_INSERT,
+    ClickhouseProducer,
+    _KafkaProducer,
+    build_kafka_consumer,
+)
+from posthog.models.person.sql import BULK_INSERT_PERSON_DISTINCT_ID2, BULK_INSERT_PERSON_DISTINCT_ID2_VALUES
 
 
 @override_settings(TEST=False)
@@ -75,3 +81,61 @@ class KafkaClientTestCase(TestCase):
             producer = _KafkaProducer(test=False)
         for key, value in expected_sasl_config.items():
             self.assertEqual(value, producer.producer.config[key])  # type: ignore
+
+
+class ClickhouseProducerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.rows = [
+            {"distinct_id": f"distinct-id-{i}", "person_id": f"person-{i}", "team_id": 1, "version": 0, "is_deleted": 0}
+            for i in range(3)
+        ]
+
+    @patch("posthog.kafka_client.client.sync_execute")
+    def test_produce_batch_without_kafka_is_one_insert(self, mock_sync_execute):
+        row_count = ClickhouseProducer().produce_batch(
+            bulk_sql=BULK_INSERT_PERSON_DISTINCT_ID2,
+            values_sql=BULK_INSERT_PERSON_DISTINCT_ID2_VALUES,
+            topic="test_topic",
+            rows=iter(self.rows),
+        )
+
+        self.assertEqual(row_count, 3)
+        mock_sync_execute.assert_called_once()
+        self.assertEqual(
+            mock_sync_execute.call_args[0][0],
+            "INSERT INTO person_distinct_id2 (distinct_id, person_id, team_id, is_deleted, version, _timestamp, _offset, _partition) VALUES "
+            "('distinct-id-0', 'person-0', 1, 0, 0, now(), 0, 0), "
+            "('distinct-id-1', 'person-1', 1, 0, 0, now(), 0, 0), "
+            "('distinct-id-2', 'person-2', 1, 0, 0, now(), 0, 0)",
+        )
+
+    @patch("posthog.kafka_client.client.sync_execute")
+    def test_produce_batch_without_kafka_bounds_insert_size(self, mock_sync_execute):
+        rows = ({**self.rows[0], "distinct_id": f"distinct-id-{i}"} for i in range(100_000))
+
+        row_count = ClickhouseProducer().produce_batch(
+            bulk_sql=BULK_INSERT_PERSON_DISTINCT_ID2,
+            values_sql=BULK_INSERT_PERSON_DISTINCT_ID2_VALUES,
+            topic="test_topic",
+            rows=rows,
+        )
+
+        self.assertEqual(row_count, 100_000)
+        self.assertEqual(mock_sync_execute.call_count, 100_000 // CLICKHOUSE_PRODUCER_MAX_ROWS_PER_INSERT)
+
+    @patch("posthog.kafka_client.client.sync_execute")
+    def test_produce_batch_with_kafka_flushes_once(self, mock_sync_execute):
+        producer = ClickhouseProducer()
+        producer.producer = _KafkaProducer(test=True)
+
+        with patch.object(producer.producer, "flush") as mock_flush:
+            row_count = producer.produce_batch(
+                bulk_sql=BULK_INSERT_PERSON_DISTINCT_ID2,
+                values_sql=BULK_INSERT_PERSON_DISTINCT_ID2_VALUES,
+                topic="test_topic",
+                rows=self.rows,
+            )
+
+        self.assertEqual(row_count, 3)
+        mock_flush.assert_called_once()
+        mock_sync_execute.assert_not_called()
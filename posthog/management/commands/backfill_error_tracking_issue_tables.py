@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Optional
+
+import structlog
+from django.core.management.base import BaseCommand
+
+from posthog.clickhouse.client.connection import Workload
+from posthog.clickhouse.client.execute import sync_execute
+from posthog.models.error_tracking.sql import (
+    ERROR_TRACKING_ISSUE_SEARCH_BACKFILL_SELECT_SQL,
+    ERROR_TRACKING_ISSUE_SEARCH_TABLE,
+    ERROR_TRACKING_ISSUE_STATS_BACKFILL_SELECT_SQL,
+    ERROR_TRACKING_ISSUE_STATS_TABLE,
+)
+
+logger = structlog.get_logger(__name__)
+
+BACKFILL_SELECT_SQL: dict[str, Callable[[str], str]] = {
+    ERROR_TRACKING_ISSUE_SEARCH_TABLE: ERROR_TRACKING_ISSUE_SEARCH_BACKFILL_SELECT_SQL,
+    ERROR_TRACKING_ISSUE_STATS_TABLE: ERROR_TRACKING_ISSUE_STATS_BACKFILL_SELECT_SQL,
+}
+
+SETTINGS = {
+    "max_execution_time": 7200  # 2 hours
+}
+
+
+def select_query(table: str, select_date: datetime, team_id: Optional[int] = None) -> str:
+    team_where = f"team_id = {team_id}" if team_id is not None else "true"
+    return BACKFILL_SELECT_SQL[table](
+        f"and(toStartOfDay(timestamp) = '{select_date.strftime('%Y-%m-%d')}', {team_where})"
+    )
+
+
+class Command(BaseCommand):
+    help = "Backfill the error tracking issue search and stats tables from $exception events."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--table", required=True, choices=list(BACKFILL_SELECT_SQL.keys()))
+        parser.add_argument(
+            "--start-date", required=True, type=str, help="first day to run backfill on (format YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--end-date", required=True, type=str, help="last day to run backfill, inclusive, on (format YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--live-run", action="store_true", help="actually execute INSERT queries (default is dry-run)"
+        )
+        parser.add_argument("--team-id", type=int, help="Team id (will do all teams if not set)")
+
+    def handle(
+        self, *, table: str, live_run: bool, start_date: str, end_date: str, team_id: Optional[int], **options
+    ):
+        logger.setLevel(logging.INFO)
+
+        start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
+        end_datetime = datetime.strptime(end_date, "%Y-%m-%d")
+        num_days = (end_datetime - start_datetime).days + 1
+
+        if not live_run:
+            logger.info(f"The first select query to run would be:\n{select_query(table, end_datetime, team_id)}")
+            return
+
+        for i in reversed(range(num_days)):
+            date = start_datetime + timedelta(days=i)
+            logger.info(f"Backfilling {table} for day {date.strftime('%Y-%m-%d')}")
+            sync_execute(
+                f"INSERT INTO writable_{table} {select_query(table, date, team_id)}",
+                workload=Workload.OFFLINE,
+                settings=SETTINGS,
+            )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+import structlog
+from django.core.management.base import BaseCommand
+
+from posthog.clickhouse.client.connection import Workload
+from posthog.clickhouse.client.execute import sync_execute
+from posthog.session_recordings.sql.session_replay_event_summary_sql import (
+    SESSION_REPLAY_EVENT_SUMMARY_BACKFILL_SELECT_SQL,
+    SESSION_REPLAY_EVENT_SUMMARY_TABLE,
+)
+
+logger = structlog.get_logger(__name__)
+
+SETTINGS = {
+    "max_execution_time": 7200  # 2 hours
+}
+
+
+def select_query(select_date: datetime, team_id: Optional[int] = None) -> str:
+    team_where = f"team_id = {team_id}" if team_id is not None else "true"
+    return SESSION_REPLAY_EVENT_SUMMARY_BACKFILL_SELECT_SQL(
+        f"and(toStartOfDay(timestamp) = '{select_date.strftime('%Y-%m-%d')}', {team_where})"
+    )
+
+
+class Command(BaseCommand):
+    help = "Backfill the per-session event summary used to filter the recordings list."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date", required=True, type=str, help="first day to run backfill on (format YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--end-date", required=True, type=str, help="last day to run backfill, inclusive, on (format YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--live-run", action="store_true", help="actually execute INSERT queries (default is dry-run)"
+        )
+        parser.add_argument("--team-id", type=int, help="Team id (will do all teams if not set)")
+
+    def handle(self, *, live_run: bool, start_date: str, end_date: str, team_id: Optional[int], **options):
+        logger.setLevel(logging.INFO)
+
+        start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
+        end_datetime = datetime.strptime(end_date, "%Y-%m-%d")
+        num_days = (end_datetime - start_datetime).days + 1
+
+        if not live_run:
+            logger.info(f"The first select query to run would be:\n{select_query(end_datetime, team_id)}")
+            return
+
+        for i in reversed(range(num_days)):
+            date = start_datetime + timedelta(days=i)
+            logger.info(f"Backfilling {SESSION_REPLAY_EVENT_SUMMARY_TABLE} for day {date.strftime('%Y-%m-%d')}")
+            sync_execute(
+                f"INSERT INTO writable_{SESSION_REPLAY_EVENT_SUMMARY_TABLE} {select_query(date, team_id)}",
+                workload=Workload.OFFLINE,
+                settings=SETTINGS,
+            )
@@ -0,0 +1,86 @@
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from posthog.models.feature_flag.feature_flag import (
+    FeatureFlag,
+    feature_flags_cache_key,
+    feature_flags_version_cache_key,
+    get_feature_flags_for_team_in_cache,
+    local_feature_flags_cache,
+    set_feature_flags_for_team_in_cache,
+)
+from posthog.models.feature_flag.flag_matching import FeatureFlagMatcher
+
+# Flags are only written to the cache under this team id, so no real team's flags are touched
+BENCHMARK_TEAM_ID = -1
+
+
+class Command(BaseCommand):
+    help = """
+        Measures how long it takes to load a team's flags from the flags cache and match them for one
+        distinct id, the way /decide does, both when the flags have to be parsed from the cache and when
+        the parsed flags can be reused. Person properties are passed in, so no database queries are made.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flags", type=int, default=300, help="Number of flags (default: 300)")
+        parser.add_argument("--iterations", type=int, default=1000, help="Number of requests (default: 1000)")
+
+    def handle(self, *args, **options):
+        feature_flags = [_benchmark_feature_flag(index) for index in range(options["flags"])]
+        set_feature_flags_for_team_in_cache(BENCHMARK_TEAM_ID, feature_flags)
+
+        try:
+            for label, reuse_parsed_flags in [("parsing flags", False), ("reusing parsed flags", True)]:
+                durations = []
+                for iteration in range(options["iterations"]):
+                    if not reuse_parsed_flags:
+                        local_feature_flags_cache.clear()
+                    start = time.perf_counter()
+                    all_feature_flags = get_feature_flags_for_team_in_cache(BENCHMARK_TEAM_ID)
+                    assert all_feature_flags is not None
+                    FeatureFlagMatcher(
+                        all_feature_flags,
+                        f"distinct_id_{iteration}",
+                        property_value_overrides={"email": f"user_{iteration}@posthog.com", "plan": "scale"},
+                    ).get_matches()
+                    durations.append(time.perf_counter() - start)
+
+                quantiles = statistics.quantiles(durations, n=100)
+                print(  # noqa: T201
+                    f"{label}: p50 {quantiles[49] * 1000:.2f} ms, p95 {quantiles[94] * 1000:.2f} ms, "
+                    f"p99 {quantiles[98] * 1000:.2f} ms over {len(durations)} requests with {len(feature_flags)} flags"
+                )
+        finally:
+            cache.delete_many(
+                [feature_flags_cache_key(BENCHMARK_TEAM_ID), feature_flags_version_cache_key(BENCHMARK_TEAM_ID)]
+            )
+            local_feature_flags_cache.clear()
+
+
+def _benchmark_feature_flag(index: int) -> FeatureFlag:
+    filters: dict = {
+        "groups": [
+            {
+                "properties": [
+                    {"key": "email", "value": "@posthog.com", "operator": "icontains", "type": "person"},
+                    {"key": "plan", "value": ["scale", "enterprise"], "operator": "exact", "type": "person"},
+                ],
+                "rollout_percentage": 50,
+            },
+            {"properties": [], "rollout_percentage": 10},
+        ],
+        "payloads": {"true": {"index": index}},
+    }
+    if index % 3 == 0:
+        filters["multivariate"] = {
+            "variants": [
+                {"key": "control", "rollout_percentage": 34},
+                {"key": "test", "rollout_percentage": 33},
+                {"key": "other", "rollout_percentage": 33},
+            ]
+        }
+    return FeatureFlag(id=index + 1, team_id=BENCHMARK_TEAM_ID, key=f"flag-{index}", filters=filters)
@@ -42,6 +42,14 @@ class Command(BaseCommand):
             default=500,
             help="Number of clusters (default: 500)",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="If specified, clusters are simulated across this many processes and events are streamed into ClickHouse "
+            "as they're simulated, for generating large datasets. Clusters are seeded individually in this mode, "
+            "so the output differs from the default mode, but is the same for a given seed regardless of worker count",
+        )
         parser.add_argument("--dry-run", action="store_true", help="Don't save simulation results")
         parser.add_argument(
             "--team-id",
@@ -85,18 +93,33 @@ class Command(BaseCommand):
             if existing_team_id
             else 0,
         )
-        print("Running simulation...")
-        matrix.simulate()
-        self.print_results(
-            matrix,
-            seed=seed,
-            duration=monotonic() - timer,
-            verbosity=options["verbosity"],
-        )
+        workers = options["workers"]
+        if workers is None:
+            print("Running simulation...")
+            matrix.simulate()
+            self.print_results(
+                matrix,
+                seed=seed,
+                duration=monotonic() - timer,
+                verbosity=options["verbosity"],
+            )
+        elif options["dry_run"]:
+            print(f"Running simulation across {workers} workers...")
+            event_count = 0
+            for simulated_cluster in matrix.simulate_in_parallel(workers):
+                event_count += sum(
+                    len(person.past_events) + len(person.future_events) for person in simulated_cluster.people
+                )
+            duration = monotonic() - timer
+            print(
+                f"Matrix: {matrix.PRODUCT_NAME}. Seed: {seed}.\n"
+                f"Simulated {event_count} events within {len(matrix.clusters)} clusters in {duration:.2f} s "
+                f"({event_count / duration:.0f} events/s)."
+            )
         if not options["dry_run"]:
             email = options["email"]
             password = options["password"]
-            matrix_manager = MatrixManager(matrix, print_steps=True)
+            matrix_manager = MatrixManager(matrix, print_steps=True, workers=workers)
             try:
                 if existing_team_id is not None:
                     if existing_team_id == 0:
@@ -9,14 +9,16 @@ from django.utils.timezone import now
 from posthog.client import sync_execute
 from posthog.kafka_client.client import KafkaProducer
 from posthog.models.group.group import Group
-from posthog.models.group.util import raw_create_group_ch
+from posthog.models.group.util import group_ch_row, raw_create_groups_ch
 from posthog.models.person import PersonDistinctId
 from posthog.models.person.person import Person, PersonOverride
 from posthog.models.person.util import (
-    _delete_ch_distinct_id,
-    create_person,
-    create_person_distinct_id,
+    _deleted_distinct_id_ch_row,
+    create_person_distinct_ids,
     create_person_override,
+    create_persons,
+    person_ch_row,
+    person_distinct_id_ch_row,
 )
 
 logger = structlog.get_logger(__name__)
@@ -90,6 +92,8 @@ def run_person_sync(team_id: int, live_run: bool, deletes: bool, sync: bool):
     total_pg = len(persons)
     logger.info(f"Got ${total_pg} in PG and ${len(ch_persons_to_version)} in CH")
 
+    # Updates are collected and then produced in bulk
+    person_rows = []
     for i, person in enumerate(persons):
         if i % (max(total_pg // 10, 1)) == 0 and i > 0:
             logger.info(f"Processed {i / total_pg * 100}%")
@@ -98,15 +102,15 @@ def run_person_sync(team_id: int, live_run: bool, deletes: bool, sync: bool):
         if ch_version is None or ch_version < pg_version:
             logger.info(f"Updating {person.uuid} to version {pg_version}")
             if live_run:
-                # Update ClickHouse via Kafka message
-                create_person(
-                    team_id=team_id,
-                    version=pg_version,
-                    uuid=str(person.uuid),
-                    properties=person.properties,
-                    is_identified=person.is_identified,
-                    created_at=person.created_at,
-                    sync=sync,
+                person_rows.append(
+                    person_ch_row(
+                        team_id=team_id,
+                        version=pg_version,
+                        uuid=str(person.uuid),
+                        properties=person.properties,
+                        is_identified=person.is_identified,
+                        created_at=person.created_at,
+                    )
                 )
         elif ch_version > pg_version:
             logger.info(
@@ -120,16 +124,21 @@ def run_person_sync(team_id: int, live_run: bool, deletes: bool, sync: bool):
             if uuid not in postgres_uuids:
                 logger.info(f"Deleting person with uuid={uuid}")
                 if live_run:
-                    create_person(
-                        uuid=str(uuid),
-                        team_id=team_id,
-                        properties={},
-                        version=int(version or 0)
-                        + 100,  # keep in sync with deletePerson in plugin-server/src/utils/db/db.ts
-                        is_deleted=True,
-                        sync=sync,
+                    person_rows.append(
+                        person_ch_row(
+                            uuid=str(uuid),
+                            team_id=team_id,
+                            properties={},
+                            version=int(version or 0)
+                            + 100,  # keep in sync with deletePerson in plugin-server/src/utils/db/db.ts
+                            is_deleted=True,
+                        )
                     )
 
+    if person_rows:
+        # Update ClickHouse via Kafka messages
+        create_persons(person_rows, sync=sync)
+
 
 def run_distinct_id_sync(team_id: int, live_run: bool, deletes: bool, sync: bool):
     logger.info("Running person distinct id table sync")
@@ -148,6 +157,8 @@ def run_distinct_id_sync(team_id: int, live_run: bool, deletes: bool, sync: bool
     total_pg = len(person_distinct_ids)
     logger.info(f"Got ${total_pg} in PG and ${len(ch_distinct_id_to_version)} in CH")
 
+    # Updates are collected and then produced in bulk
+    distinct_id_rows = []
     for i, person_distinct_id in enumerate(person_distinct_ids):
         if i % (max(total_pg // 10, 1)) == 0 and i > 0:
             logger.info(f"Processed {i / total_pg * 100}%")
@@ -156,14 +167,14 @@ def run_distinct_id_sync(team_id: int, live_run: bool, deletes: bool, sync: bool
         if ch_version is None or ch_version < pg_version:
             logger.info(f"Updating {person_distinct_id.distinct_id} to version {pg_version}")
             if live_run:
-                # Update ClickHouse via Kafka message
-                create_person_distinct_id(
-                    team_id=team_id,
-                    distinct_id=person_distinct_id.distinct_id,
-                    person_id=str(person_distinct_id.person.uuid),
-                    version=pg_version,
-                    is_deleted=False,
-                    sync=sync,
+                distinct_id_rows.append(
+                    person_distinct_id_ch_row(
+                        team_id=team_id,
+                        distinct_id=person_distinct_id.distinct_id,
+                        person_id=str(person_distinct_id.person.uuid),
+                        version=pg_version,
+                        is_deleted=False,
+                    )
                 )
         elif ch_version > pg_version:
             # This could be happening due to person deletions - check out fix_person_distinct_ids_after_delete management cmd.
@@ -180,7 +191,11 @@ def run_distinct_id_sync(team_id: int, live_run: bool, deletes: bool, sync: bool
             if distinct_id not in postgres_distinct_ids:
                 logger.info(f"Deleting distinct ID {distinct_id}")
                 if live_run:
-                    _delete_ch_distinct_id(team_id, UUID(int=0), distinct_id, version, sync=sync)
+                    distinct_id_rows.append(_deleted_distinct_id_ch_row(team_id, UUID(int=0), distinct_id, version))
+
+    if distinct_id_rows:
+        # Update ClickHouse via Kafka messages
+        create_person_distinct_ids(distinct_id_rows, sync=sync)
 
 
 def run_person_override_sync(team_id: int, live_run: bool, deletes: bool, sync: bool):
@@ -242,6 +257,8 @@ def run_group_sync(team_id: int, live_run: bool, sync: bool):
     total_pg = len(pg_groups)
     logger.info(f"Got ${total_pg} in PG and ${len(ch_groups)} in CH")
 
+    # Updates are collected and then produced in bulk
+    group_rows = []
     for i, pg_group in enumerate(pg_groups):
         if i % (max(total_pg // 10, 1)) == 0 and i > 0:
             logger.info(f"Processed {i / total_pg * 100}%")
@@ -251,16 +268,20 @@ def run_group_sync(team_id: int, live_run: bool, sync: bool):
                 f"Updating {pg_group['group_type_index']} - {pg_group['group_key']} with properties {pg_group['group_properties']} and created_at {pg_group['created_at']}"
             )
             if live_run:
-                # Update ClickHouse via Kafka message
-                raw_create_group_ch(
-                    team_id=team_id,
-                    group_type_index=pg_group["group_type_index"],
-                    group_key=pg_group["group_key"],
-                    properties=pg_group["group_properties"],
-                    created_at=pg_group["created_at"],
-                    sync=sync,
+                group_rows.append(
+                    group_ch_row(
+                        team_id=team_id,
+                        group_type_index=pg_group["group_type_index"],
+                        group_key=pg_group["group_key"],
+                        properties=pg_group["group_properties"],
+                        created_at=pg_group["created_at"],
+                    )
                 )
 
+    if group_rows:
+        # Update ClickHouse via Kafka messages
+        raw_create_groups_ch(group_rows, sync=sync)
+
 
 def should_update_group(ch_group, pg_group) -> bool:
     return json.dumps(pg_group["group_properties"]) != ch_group["properties"] or pg_group["created_at"].strftime(
@@ -139,8 +139,8 @@ class TestSyncPersonsToClickHouse(BaseTest, ClickhouseTestMixin):
         )
 
     @mock.patch(
-        f"{posthog.management.commands.sync_persons_to_clickhouse.__name__}.raw_create_group_ch",
-        wraps=posthog.management.commands.sync_persons_to_clickhouse.raw_create_group_ch,
+        f"{posthog.management.commands.sync_persons_to_clickhouse.__name__}.raw_create_groups_ch",
+        wraps=posthog.management.commands.sync_persons_to_clickhouse.raw_create_groups_ch,
     )
     def test_group_sync(self, mocked_ch_call):
         ts = datetime.now(UTC)
@@ -155,6 +155,7 @@ class TestSyncPersonsToClickHouse(BaseTest, ClickhouseTestMixin):
 
         run_group_sync(self.team.pk, live_run=True, sync=True)
         mocked_ch_call.assert_called_once()
+        self.assertEqual(len(mocked_ch_call.call_args[0][0]), 1)
 
         ch_groups = sync_execute(
             """
@@ -174,8 +175,8 @@ class TestSyncPersonsToClickHouse(BaseTest, ClickhouseTestMixin):
         mocked_ch_call.assert_called_once()
 
     @mock.patch(
-        f"{posthog.management.commands.sync_persons_to_clickhouse.__name__}.raw_create_group_ch",
-        wraps=posthog.management.commands.sync_persons_to_clickhouse.raw_create_group_ch,
+        f"{posthog.management.commands.sync_persons_to_clickhouse.__name__}.raw_create_groups_ch",
+        wraps=posthog.management.commands.sync_persons_to_clickhouse.raw_create_groups_ch,
     )
     def test_group_sync_updates_group(self, mocked_ch_call):
         group = create_group(
@@ -191,6 +192,7 @@ class TestSyncPersonsToClickHouse(BaseTest, ClickhouseTestMixin):
         ts_before = datetime.now(UTC)
         run_group_sync(self.team.pk, live_run=True, sync=True)
         mocked_ch_call.assert_called_once()
+        self.assertEqual(len(mocked_ch_call.call_args[0][0]), 1)
 
         ch_groups = sync_execute(
             """
@@ -221,8 +223,8 @@ class TestSyncPersonsToClickHouse(BaseTest, ClickhouseTestMixin):
         mocked_ch_call.assert_called_once()
 
     @mock.patch(
-        f"{posthog.management.commands.sync_persons_to_clickhouse.__name__}.raw_create_group_ch",
-        wraps=posthog.management.commands.sync_persons_to_clickhouse.raw_create_group_ch,
+        f"{posthog.management.commands.sync_persons_to_clickhouse.__name__}.raw_create_groups_ch",
+        wraps=posthog.management.commands.sync_persons_to_clickhouse.raw_create_groups_ch,
     )
     def test_group_sync_multiple_entries(self, mocked_ch_call):
         ts = datetime.now(UTC)
@@ -252,7 +254,8 @@ class TestSyncPersonsToClickHouse(BaseTest, ClickhouseTestMixin):
         )
 
         run_group_sync(self.team.pk, live_run=True, sync=True)
-        self.assertEqual(mocked_ch_call.call_count, 3)
+        mocked_ch_call.assert_called_once()
+        self.assertEqual(len(mocked_ch_call.call_args[0][0]), 3)
 
         ch_groups = sync_execute(
             """
@@ -272,7 +275,8 @@ class TestSyncPersonsToClickHouse(BaseTest, ClickhouseTestMixin):
 
         # second time it's a no-op
         run_group_sync(self.team.pk, live_run=True, sync=True)
-        self.assertEqual(mocked_ch_call.call_count, 3)
+        mocked_ch_call.assert_called_once()
+        self.assertEqual(len(mocked_ch_call.call_args[0][0]), 3)
 
     def test_live_run_everything(self):
         self.everything_test_run(True)
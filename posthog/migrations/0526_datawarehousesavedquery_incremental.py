@@ -0,0 +1,46 @@
+# Generated by Django 4.2.15 on 2024-11-20 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [("posthog", "0525_hog_function_transpiled")]
+
+    operations = [
+        migrations.AddField(
+            model_name="datawarehousesavedquery",
+            name="incremental_cursor_column",
+            field=models.CharField(
+                blank=True,
+                help_text="Column used to only materialize rows newer than the last run. If not set, every run is a full refresh.",
+                max_length=128,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="datawarehousesavedquery",
+            name="incremental_watermark",
+            field=models.CharField(
+                blank=True,
+                help_text="The largest value of the cursor column materialized so far (if any).",
+                max_length=128,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="datawarehousesavedquery",
+            name="full_refresh_interval",
+            field=models.DurationField(
+                blank=True,
+                help_text="How often an incremental SavedQuery should be fully refreshed instead (if ever).",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="datawarehousesavedquery",
+            name="last_full_refresh_at",
+            field=models.DateTimeField(
+                blank=True, help_text="The timestamp of this SavedQuery's last full refresh (if any).", null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,15 @@
+# Generated by Django 4.2.15 on 2024-11-21 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [("posthog", "0526_datawarehousesavedquery_incremental")]
+
+    operations = [
+        migrations.AddField(
+            model_name="alertconfiguration",
+            name="baseline",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
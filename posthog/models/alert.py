@@ -113,6 +113,8 @@ class AlertConfiguration(CreatedMetaFields, UUIDModel):
     next_check_at = models.DateTimeField(null=True, blank=True)
     # UTC time until when we shouldn't check alert/notify user
     snoozed_until = models.DateTimeField(null=True, blank=True)
+    # Rolling seasonal baseline of the insight values, kept up to date by the checks of anomaly alerts
+    baseline = models.JSONField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.name} (Team: {self.team})"
@@ -200,7 +200,7 @@ class Cohort(models.Model):
         }
 
     def calculate_people_ch(self, pending_version: int, *, initiating_user_id: Optional[int] = None):
-        from posthog.models.cohort.util import recalculate_cohortpeople
+        from posthog.models.cohort.util import recalculate_cohortpeople, recalculate_cohortpeople_incrementally
         from posthog.tasks.calculate_cohort import clear_stale_cohort
 
         logger.warn(
@@ -211,8 +211,17 @@ class Cohort(models.Model):
         )
         start_time = time.monotonic()
 
+        incremental = False
         try:
-            count = recalculate_cohortpeople(self, pending_version, initiating_user_id=initiating_user_id)
+            try:
+                count = recalculate_cohortpeople_incrementally(self, initiating_user_id=initiating_user_id)
+            except Exception:
+                # Rows already written to the current version don't matter, as the full rewrite uses a new one
+                logger.warning("cohort_incremental_calculation_failed", id=self.pk, exc_info=True)
+                count = None
+            incremental = count is not None
+            if not incremental:
+                count = recalculate_cohortpeople(self, pending_version, initiating_user_id=initiating_user_id)
             self.count = count
 
             self.last_calculation = timezone.now()
@@ -235,6 +244,17 @@ class Cohort(models.Model):
             self.is_calculating = False
             self.save()
 
+        if incremental:
+            # The changes were written to the current version, so there is nothing to switch to or clear
+            logger.warn(
+                "cohort_calculation_completed",
+                id=self.pk,
+                version=self.version,
+                incremental=True,
+                duration=(time.monotonic() - start_time),
+            )
+            return
+
         # Update filter to match pending version if still valid
         Cohort.objects.filter(pk=self.pk).filter(Q(version__lt=pending_version) | Q(version__isnull=True)).update(
             version=pending_version, count=count
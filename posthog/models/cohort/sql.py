@@ -49,6 +49,35 @@ WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s AND version < %(new_ve
 SETTINGS optimize_aggregation_in_order = 1, join_algorithm = 'auto'
 """
 
+# Persons who joined (is_member = 1) or left (is_member = 0) the cohort since the rows of %(version)s were written.
+# Selected in one pass over the cohort filter and the current rows, so that only the changes need writing.
+GET_COHORTPEOPLE_CHANGES = """
+SELECT person_id, max(in_cohort) AS is_member
+FROM (
+    SELECT id AS person_id, 1 AS in_cohort, 0 AS in_version
+    FROM (
+        {cohort_filter}
+    ) as person
+    UNION ALL
+    SELECT person_id, 0 AS in_cohort, 1 AS in_version
+    FROM cohortpeople
+    WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s AND version = %(version)s
+)
+GROUP BY person_id
+HAVING max(in_cohort) != max(in_version)
+LIMIT %(limit)s
+SETTINGS optimize_aggregation_in_order = 1, join_algorithm = 'auto'
+"""
+
+INSERT_COHORTPEOPLE = "INSERT INTO cohortpeople (person_id, cohort_id, team_id, sign, version) VALUES"
+
+# Readers select the rows of a version without summing signs, so rows of persons who left are deleted
+# rather than cancelled out, to stop them from being read right away
+DELETE_COHORTPEOPLE_BY_PERSON_IDS = """
+DELETE FROM cohortpeople
+WHERE team_id = %(team_id)s AND cohort_id = %(cohort_id)s AND version = %(version)s AND person_id IN %(person_ids)s
+"""
+
 # NOTE: Group by version id to ensure that signs are summed between corresponding rows.
 # Version filtering is not necessary as only positive rows of the latest version will be selected by sum(sign) > 0
 
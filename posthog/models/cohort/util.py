@@ -6,6 +6,7 @@ import structlog
 from dateutil import parser
 from django.conf import settings
 from django.utils import timezone
+from prometheus_client import Counter, Histogram
 from rest_framework.exceptions import ValidationError
 
 from posthog.hogql.resolver_utils import extract_select_queries
@@ -25,11 +26,14 @@ from posthog.models.async_deletion import AsyncDeletion, DeletionType
 from posthog.models.cohort.cohort import Cohort, CohortOrEmpty
 from posthog.models.cohort.sql import (
     CALCULATE_COHORT_PEOPLE_SQL,
+    DELETE_COHORTPEOPLE_BY_PERSON_IDS,
     GET_COHORT_SIZE_SQL,
+    GET_COHORTPEOPLE_CHANGES,
     GET_COHORTS_BY_PERSON_UUID,
     GET_PERSON_ID_BY_PRECALCULATED_COHORT_ID,
     GET_STATIC_COHORT_SIZE_SQL,
     GET_STATIC_COHORTPEOPLE_BY_PERSON_UUID,
+    INSERT_COHORTPEOPLE,
     RECALCULATE_COHORT_BY_ID,
     STALE_COHORTPEOPLE,
 )
@@ -48,6 +52,28 @@ TEMP_PRECALCULATED_MARKER = parser.parse("2021-06-07T15:00:00+00:00")
 
 logger = structlog.get_logger(__name__)
 
+COHORT_RECALCULATIONS_COUNTER = Counter(
+    "cohort_recalculations_total",
+    "Cohort recalculations, by whether only the changes or every member were written.",
+    labelnames=["mode"],
+)
+
+COHORT_RECALCULATION_CHURN_HISTOGRAM = Histogram(
+    "cohort_recalculation_churn",
+    "Persons who joined or left a cohort, per incremental recalculation.",
+    buckets=(0, 10, 100, 1_000, 10_000, 100_000, float("inf")),
+)
+
+# Persons who left are deleted this many at a time, so that the list of their ids stays well below max_query_size
+COHORT_DELETE_PERSONS_CHUNK_SIZE = 10_000
+
+RECALCULATE_COHORT_SETTINGS = {
+    "max_execution_time": 600,
+    "send_timeout": 600,
+    "receive_timeout": 600,
+    "optimize_on_insert": 0,
+}
+
 
 def format_person_query(cohort: Cohort, index: int, hogql_context: HogQLContext) -> tuple[str, dict[str, Any]]:
     if cohort.is_static:
@@ -370,14 +396,10 @@ def recalculate_cohortpeople(
             "team_id": cohort.team_id,
             "new_version": pending_version,
         },
-        settings={
-            "max_execution_time": 600,
-            "send_timeout": 600,
-            "receive_timeout": 600,
-            "optimize_on_insert": 0,
-        },
+        settings=RECALCULATE_COHORT_SETTINGS,
         workload=Workload.OFFLINE,
     )
+    COHORT_RECALCULATIONS_COUNTER.labels(mode="full").inc()
 
     count = get_cohort_size(cohort, override_version=pending_version)
 
@@ -393,6 +415,78 @@ def recalculate_cohortpeople(
     return count
 
 
+def recalculate_cohortpeople_incrementally(cohort: Cohort, *, initiating_user_id: Optional[int]) -> Optional[int]:
+    """
+    Recalculates the cohort by adding the persons who joined it to the rows of its current version, and deleting
+    the rows of the persons who left, instead of writing every member under a new version.
+
+    Returns None without writing anything if the cohort has no current version, or if more than
+    `COHORT_INCREMENTAL_RECALCULATION_MAX_CHANGES` persons joined or left, in which case it's cheaper to
+    recalculate it with `recalculate_cohortpeople`.
+    """
+    max_changes = settings.COHORT_INCREMENTAL_RECALCULATION_MAX_CHANGES
+    if not max_changes or cohort.version is None:
+        return None
+
+    hogql_context = HogQLContext(within_non_hogql_query=True, team_id=cohort.team_id)
+    cohort_query, cohort_params = format_person_query(cohort, 0, hogql_context)
+
+    tag_queries(kind="cohort_calculation", team_id=cohort.team_id, query_type="CohortsQuery")
+    if initiating_user_id:
+        tag_queries(user_id=initiating_user_id)
+
+    version_params = {"cohort_id": cohort.pk, "team_id": cohort.team_id, "version": cohort.version}
+    changes = sync_execute(
+        GET_COHORTPEOPLE_CHANGES.format(cohort_filter=cohort_query),
+        {**cohort_params, **hogql_context.values, **version_params, "limit": max_changes + 1},
+        settings=RECALCULATE_COHORT_SETTINGS,
+        workload=Workload.OFFLINE,
+    )
+
+    if len(changes) > max_changes:
+        logger.warn(
+            "Recalculating cohortpeople incrementally skipped, too many changes",
+            team_id=cohort.team_id,
+            cohort_id=cohort.pk,
+            max_changes=max_changes,
+        )
+        return None
+
+    joined = [person_id for person_id, is_member in changes if is_member]
+    left = [person_id for person_id, is_member in changes if not is_member]
+
+    if joined:
+        sync_execute(
+            INSERT_COHORTPEOPLE,
+            [(person_id, cohort.pk, cohort.team_id, 1, cohort.version) for person_id in joined],
+            workload=Workload.OFFLINE,
+        )
+    for chunk_start in range(0, len(left), COHORT_DELETE_PERSONS_CHUNK_SIZE):
+        sync_execute(
+            DELETE_COHORTPEOPLE_BY_PERSON_IDS,
+            {**version_params, "person_ids": left[chunk_start : chunk_start + COHORT_DELETE_PERSONS_CHUNK_SIZE]},
+            # wait for the rows to be deleted on every replica, as reads may go to any of them
+            settings={"mutations_sync": 2},
+            workload=Workload.OFFLINE,
+        )
+    COHORT_RECALCULATIONS_COUNTER.labels(mode="incremental").inc()
+    COHORT_RECALCULATION_CHURN_HISTOGRAM.observe(len(changes))
+
+    count = get_cohort_size(cohort)
+
+    logger.warn(
+        "Recalculating cohortpeople incrementally done",
+        team_id=cohort.team_id,
+        cohort_id=cohort.pk,
+        version=cohort.version,
+        joined=len(joined),
+        left=len(left),
+        size=count,
+    )
+
+    return count
+
+
 def clear_stale_cohortpeople(cohort: Cohort, before_version: int) -> None:
     if cohort.version and cohort.version > 0:
         stale_count_result = sync_execute(
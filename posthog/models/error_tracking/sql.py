@@ -1,6 +1,6 @@
 from posthog.clickhouse.indexes import index_by_kafka_timestamp
 from posthog.clickhouse.kafka_engine import KAFKA_COLUMNS_WITH_PARTITION, kafka_engine
-from posthog.clickhouse.table_engines import ReplacingMergeTree
+from posthog.clickhouse.table_engines import AggregatingMergeTree, Distributed, ReplacingMergeTree, ReplicationScheme
 from posthog.kafka_client.topics import KAFKA_ERROR_TRACKING_ISSUE_FINGERPRINT
 from posthog.settings import CLICKHOUSE_CLUSTER, CLICKHOUSE_DATABASE
 
@@ -77,3 +77,222 @@ WHERE version > 0 -- only store updated rows, not newly inserted ones
 TRUNCATE_ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE_SQL = (
     f"TRUNCATE TABLE IF EXISTS {ERROR_TRACKING_ISSUE_FINGERPRINT_OVERRIDES_TABLE} ON CLUSTER '{CLICKHOUSE_CLUSTER}'"
 )
+
+#
+# error_tracking_issue_search: one row per distinct (team_id, issue_id, search_text) tuple, populated at ingestion
+# time from $exception events. search_text is a normalized (lowercased, whitespace collapsed) concatenation of the
+# exception types, messages and stack frame locations, so searching an issue doesn't require reading raw
+# $exception_list JSON for every event. The ngram bloom filter lets ClickHouse skip granules for substring searches.
+#
+
+ERROR_TRACKING_ISSUE_SEARCH_TABLE = "error_tracking_issue_search"
+ERROR_TRACKING_ISSUE_SEARCH_DATA_TABLE = lambda: f"sharded_{ERROR_TRACKING_ISSUE_SEARCH_TABLE}"
+
+ERROR_TRACKING_ISSUE_SEARCH_TABLE_BASE_SQL = """
+CREATE TABLE IF NOT EXISTS {table_name} ON CLUSTER '{cluster}'
+(
+    team_id Int64,
+    issue_id UUID,
+    search_text String,
+    last_seen DateTime64(6, 'UTC')
+    {extra_fields}
+) ENGINE = {engine}
+"""
+
+ERROR_TRACKING_ISSUE_SEARCH_TABLE_ENGINE = lambda: ReplacingMergeTree(
+    ERROR_TRACKING_ISSUE_SEARCH_TABLE, replication_scheme=ReplicationScheme.SHARDED, ver="last_seen"
+)
+
+ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL = lambda: (
+    ERROR_TRACKING_ISSUE_SEARCH_TABLE_BASE_SQL
+    + """
+    PARTITION BY toYYYYMM(last_seen)
+    ORDER BY (team_id, issue_id, cityHash64(search_text))
+    """
+).format(
+    table_name=ERROR_TRACKING_ISSUE_SEARCH_DATA_TABLE(),
+    cluster=CLICKHOUSE_CLUSTER,
+    engine=ERROR_TRACKING_ISSUE_SEARCH_TABLE_ENGINE(),
+    extra_fields="""
+    , INDEX search_text_ngram_bf search_text TYPE ngrambf_v1(3, 65536, 2, 0) GRANULARITY 1
+    """,
+)
+
+# This table is responsible for writing to the sharded table, rows for the same issue end up on the same shard.
+WRITABLE_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL = lambda: ERROR_TRACKING_ISSUE_SEARCH_TABLE_BASE_SQL.format(
+    table_name=f"writable_{ERROR_TRACKING_ISSUE_SEARCH_TABLE}",
+    cluster=CLICKHOUSE_CLUSTER,
+    engine=Distributed(
+        data_table=ERROR_TRACKING_ISSUE_SEARCH_DATA_TABLE(),
+        sharding_key="cityHash64(issue_id)",
+    ),
+    extra_fields="",
+)
+
+# This table is responsible for reading from the sharded table on a cluster setting
+DISTRIBUTED_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL = lambda: ERROR_TRACKING_ISSUE_SEARCH_TABLE_BASE_SQL.format(
+    table_name=ERROR_TRACKING_ISSUE_SEARCH_TABLE,
+    cluster=CLICKHOUSE_CLUSTER,
+    engine=Distributed(
+        data_table=ERROR_TRACKING_ISSUE_SEARCH_DATA_TABLE(),
+        sharding_key="cityHash64(issue_id)",
+    ),
+    extra_fields="",
+)
+
+
+def error_tracking_search_text_expr(properties_column: str = "properties") -> str:
+    """ClickHouse expression building the normalized search text of an $exception event.
+
+    Must stay in sync with `normalize_search_token` in the error tracking query runner, which applies the same
+    normalization to the search tokens."""
+    return f"""lowerUTF8(trim(replaceRegexpAll(arrayStringConcat([
+        JSONExtractString({properties_column}, '$exception_type'),
+        JSONExtractString({properties_column}, '$exception_message'),
+        arrayStringConcat(arrayMap(exception -> concat(
+            JSONExtractString(exception, 'type'), ' ',
+            JSONExtractString(exception, 'value'), ' ',
+            arrayStringConcat(arrayMap(frame -> concat(
+                JSONExtractString(frame, 'filename'), ' ',
+                JSONExtractString(frame, 'function'), ' ',
+                JSONExtractString(frame, 'context_line')
+            ), JSONExtractArrayRaw(exception, 'stacktrace', 'frames')), ' ')
+        ), JSONExtractArrayRaw({properties_column}, '$exception_list')), ' ')
+    ], ' '), '\\\\s+', ' ')))"""
+
+
+ERROR_TRACKING_ISSUE_SEARCH_SELECT_SQL = (
+    lambda source_table, where="true": """
+SELECT
+    team_id,
+    toUUID(JSONExtractString(properties, '$exception_issue_id')) AS issue_id,
+    {search_text} AS search_text,
+    timestamp AS last_seen
+FROM {database}.{source_table}
+WHERE event = '$exception' AND isNotNull(toUUIDOrNull(JSONExtractString(properties, '$exception_issue_id'))) AND {where}
+""".format(
+        database=CLICKHOUSE_DATABASE,
+        source_table=source_table,
+        where=where,
+        search_text=error_tracking_search_text_expr(),
+    )
+)
+
+ERROR_TRACKING_ISSUE_SEARCH_MV_SQL = (
+    lambda: """
+CREATE MATERIALIZED VIEW IF NOT EXISTS {table_name}_mv ON CLUSTER '{cluster}'
+TO {database}.writable_{table_name}
+AS
+{select_sql}
+""".format(
+        table_name=ERROR_TRACKING_ISSUE_SEARCH_TABLE,
+        cluster=CLICKHOUSE_CLUSTER,
+        database=CLICKHOUSE_DATABASE,
+        select_sql=ERROR_TRACKING_ISSUE_SEARCH_SELECT_SQL("sharded_events"),
+    )
+)
+
+# Used to populate the table with exceptions ingested before the materialized view existed
+ERROR_TRACKING_ISSUE_SEARCH_BACKFILL_SELECT_SQL = lambda where: ERROR_TRACKING_ISSUE_SEARCH_SELECT_SQL("events", where)
+
+TRUNCATE_ERROR_TRACKING_ISSUE_SEARCH_TABLE_SQL = (
+    lambda: f"TRUNCATE TABLE IF EXISTS {ERROR_TRACKING_ISSUE_SEARCH_DATA_TABLE()} ON CLUSTER '{CLICKHOUSE_CLUSTER}'"
+)
+
+#
+# error_tracking_issue_stats: hourly aggregates per issue, maintained from $exception events at ingestion time.
+# Listing issues only needs to merge a handful of pre-aggregated rows per issue, instead of grouping every event.
+#
+
+ERROR_TRACKING_ISSUE_STATS_TABLE = "error_tracking_issue_stats"
+ERROR_TRACKING_ISSUE_STATS_DATA_TABLE = lambda: f"sharded_{ERROR_TRACKING_ISSUE_STATS_TABLE}"
+
+ERROR_TRACKING_ISSUE_STATS_TABLE_BASE_SQL = """
+CREATE TABLE IF NOT EXISTS {table_name} ON CLUSTER '{cluster}'
+(
+    team_id Int64,
+    issue_id UUID,
+    hour DateTime('UTC'),
+    occurrences AggregateFunction(uniq, UUID),
+    sessions AggregateFunction(uniq, String),
+    users AggregateFunction(uniq, String),
+    first_seen SimpleAggregateFunction(min, DateTime64(6, 'UTC')),
+    last_seen SimpleAggregateFunction(max, DateTime64(6, 'UTC'))
+) ENGINE = {engine}
+"""
+
+ERROR_TRACKING_ISSUE_STATS_TABLE_ENGINE = lambda: AggregatingMergeTree(
+    ERROR_TRACKING_ISSUE_STATS_TABLE, replication_scheme=ReplicationScheme.SHARDED
+)
+
+ERROR_TRACKING_ISSUE_STATS_TABLE_SQL = lambda: (
+    ERROR_TRACKING_ISSUE_STATS_TABLE_BASE_SQL
+    + """
+    PARTITION BY toYYYYMM(hour)
+    ORDER BY (team_id, hour, issue_id)
+    """
+).format(
+    table_name=ERROR_TRACKING_ISSUE_STATS_DATA_TABLE(),
+    cluster=CLICKHOUSE_CLUSTER,
+    engine=ERROR_TRACKING_ISSUE_STATS_TABLE_ENGINE(),
+)
+
+WRITABLE_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL = lambda: ERROR_TRACKING_ISSUE_STATS_TABLE_BASE_SQL.format(
+    table_name=f"writable_{ERROR_TRACKING_ISSUE_STATS_TABLE}",
+    cluster=CLICKHOUSE_CLUSTER,
+    engine=Distributed(
+        data_table=ERROR_TRACKING_ISSUE_STATS_DATA_TABLE(),
+        sharding_key="cityHash64(issue_id)",
+    ),
+)
+
+DISTRIBUTED_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL = lambda: ERROR_TRACKING_ISSUE_STATS_TABLE_BASE_SQL.format(
+    table_name=ERROR_TRACKING_ISSUE_STATS_TABLE,
+    cluster=CLICKHOUSE_CLUSTER,
+    engine=Distributed(
+        data_table=ERROR_TRACKING_ISSUE_STATS_DATA_TABLE(),
+        sharding_key="cityHash64(issue_id)",
+    ),
+)
+
+ERROR_TRACKING_ISSUE_STATS_SELECT_SQL = (
+    lambda source_table, where="true": """
+SELECT
+    team_id,
+    toUUID(JSONExtractString(properties, '$exception_issue_id')) AS issue_id,
+    toStartOfHour(timestamp) AS hour,
+    uniqState(uuid) AS occurrences,
+    uniqState(`$session_id`) AS sessions,
+    uniqState(distinct_id) AS users,
+    min(timestamp) AS first_seen,
+    max(timestamp) AS last_seen
+FROM {database}.{source_table}
+WHERE event = '$exception' AND isNotNull(toUUIDOrNull(JSONExtractString(properties, '$exception_issue_id'))) AND {where}
+GROUP BY team_id, issue_id, hour
+""".format(
+        database=CLICKHOUSE_DATABASE,
+        source_table=source_table,
+        where=where,
+    )
+)
+
+ERROR_TRACKING_ISSUE_STATS_MV_SQL = (
+    lambda: """
+CREATE MATERIALIZED VIEW IF NOT EXISTS {table_name}_mv ON CLUSTER '{cluster}'
+TO {database}.writable_{table_name}
+AS
+{select_sql}
+""".format(
+        table_name=ERROR_TRACKING_ISSUE_STATS_TABLE,
+        cluster=CLICKHOUSE_CLUSTER,
+        database=CLICKHOUSE_DATABASE,
+        select_sql=ERROR_TRACKING_ISSUE_STATS_SELECT_SQL("sharded_events"),
+    )
+)
+
+# Used to populate the table with exceptions ingested before the materialized view existed
+ERROR_TRACKING_ISSUE_STATS_BACKFILL_SELECT_SQL = lambda where: ERROR_TRACKING_ISSUE_STATS_SELECT_SQL("events", where)
+
+TRUNCATE_ERROR_TRACKING_ISSUE_STATS_TABLE_SQL = (
+    lambda: f"TRUNCATE TABLE IF EXISTS {ERROR_TRACKING_ISSUE_STATS_DATA_TABLE()} ON CLUSTER '{CLICKHOUSE_CLUSTER}'"
+)
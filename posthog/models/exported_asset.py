@@ -1,6 +1,6 @@
 import secrets
 from datetime import timedelta
-from typing import Optional
+from typing import IO, Optional
 
 import structlog
 from django.conf import settings
@@ -170,12 +170,46 @@ def save_content(exported_asset: ExportedAsset, content: bytes) -> None:
         save_content_to_exported_asset(exported_asset, content)
 
 
+def save_content_from_file(exported_asset: ExportedAsset, content_file: IO[bytes]) -> None:
+    """Like `save_content`, but uploads from a file so the content doesn't have to be held in memory."""
+    try:
+        if settings.OBJECT_STORAGE_ENABLED:
+            content_file.seek(0)
+            save_content_file_to_object_storage(exported_asset, content_file)
+            return
+    except ObjectStorageError as ose:
+        capture_exception(ose)
+        logger.error(
+            "exported_asset.object-storage-error",
+            exported_asset_id=exported_asset.id,
+            exception=ose,
+            exc_info=True,
+        )
+
+    content_file.seek(0)
+    save_content_to_exported_asset(exported_asset, content_file.read())
+
+
 def save_content_to_exported_asset(exported_asset: ExportedAsset, content: bytes) -> None:
     exported_asset.content = content
     exported_asset.save(update_fields=["content"])
 
 
 def save_content_to_object_storage(exported_asset: ExportedAsset, content: bytes) -> None:
+    object_path = get_content_object_path(exported_asset)
+    object_storage.write(object_path, content)
+    exported_asset.content_location = object_path
+    exported_asset.save(update_fields=["content_location"])
+
+
+def save_content_file_to_object_storage(exported_asset: ExportedAsset, content_file: IO[bytes]) -> None:
+    object_path = get_content_object_path(exported_asset)
+    object_storage.write_file(object_path, content_file)
+    exported_asset.content_location = object_path
+    exported_asset.save(update_fields=["content_location"])
+
+
+def get_content_object_path(exported_asset: ExportedAsset) -> str:
     path_parts: list[str] = [
         settings.OBJECT_STORAGE_EXPORTS_FOLDER,
         exported_asset.export_format.split("/")[1],
@@ -183,7 +217,4 @@ def save_content_to_object_storage(exported_asset: ExportedAsset, content: bytes
         f"task-{exported_asset.id}",
         str(UUIDT()),
     ]
-    object_path = "/".join(path_parts)
-    object_storage.write(object_path, content)
-    exported_asset.content_location = object_path
-    exported_asset.save(update_fields=["content_location"])
+    return "/".join(path_parts)
@@ -1,7 +1,11 @@
 import json
+import threading
+import uuid
+from collections import OrderedDict
+from functools import cached_property
 from django.http import HttpRequest
 import structlog
-from typing import Optional, cast
+from typing import Any, Optional, cast
 
 from django.core.cache import cache
 from django.db import models
@@ -21,6 +25,9 @@ from posthog.models.signals import mutable_receiver
 
 FIVE_DAYS = 60 * 60 * 24 * 5  # 5 days in seconds
 
+# How many teams' flags each process keeps parsed in memory, least recently used teams are dropped first
+FEATURE_FLAGS_LOCAL_CACHE_MAX_TEAMS = 1000
+
 logger = structlog.get_logger(__name__)
 
 
@@ -123,6 +130,42 @@ class FeatureFlag(models.Model):
             ENRICHED_DASHBOARD_INSIGHT_IDENTIFIER in tile.insight.name for tile in self.usage_dashboard.tiles.all()
         )
 
+    @cached_property
+    def _parsed_filters(self) -> dict[int, tuple[Any, Any]]:
+        return {}
+
+    def _get_parsed(self, source: Any, parse) -> Any:
+        # Keyed by the identity of the part of `filters` that was parsed, so that reassigning `filters` invalidates it
+        cached = self._parsed_filters.get(id(source))
+        if cached is None or cached[0] is not source:
+            cached = (source, parse(source))
+            self._parsed_filters[id(source)] = cached
+        return cached[1]
+
+    def get_condition_properties(self, condition: dict) -> list[Property]:
+        """
+        The properties of one of this flag's conditions (or super or holdout conditions).
+        Parsed once per flag instance, as flags from the flags cache are reused across requests.
+        """
+        from posthog.models.filters import Filter
+
+        if "groups" not in self.filters:
+            # :TRICKY: Conditions of legacy filters are rebuilt on every `get_filters` call, so can't be cached
+            return Filter(data=condition).property_groups.flat
+        return self._get_parsed(condition, lambda condition: Filter(data=condition).property_groups.flat)
+
+    def get_variant_lookup_table(self) -> list[dict]:
+        """
+        Contiguous sub-domains within [0, 1], one per variant.
+        By looking up a random hash value, you can find the associated variant key.
+        e.g. the first of two variants with 50% rollout percentage will have value_max: 0.5
+        and the second will have value_min: 0.5 and value_max: 1.0
+        """
+        variants = self.variants
+        if not variants:
+            return []
+        return self._get_parsed(variants, _variant_lookup_table)
+
     def get_filters(self):
         if "groups" in self.filters:
             return self.filters
@@ -399,6 +442,59 @@ class FeatureFlagOverride(models.Model):
         ]
 
 
+def _variant_lookup_table(variants: list[dict]) -> list[dict]:
+    lookup_table = []
+    value_min = 0
+    for variant in variants:
+        value_max = value_min + variant["rollout_percentage"] / 100
+        lookup_table.append({"value_min": value_min, "value_max": value_max, "key": variant["key"]})
+        value_min = value_max
+    return lookup_table
+
+
+def feature_flags_cache_key(team_id: int) -> str:
+    return f"team_feature_flags_{team_id}"
+
+
+def feature_flags_version_cache_key(team_id: int) -> str:
+    return f"team_feature_flags_version_{team_id}"
+
+
+class _LocalFeatureFlagsCache:
+    """
+    Flags parsed from the shared cache, kept per process and stamped with the version they were parsed at.
+    A new version is written to the shared cache whenever a team's flags change, so checking the version
+    is enough to know whether the parsed flags can be reused, without fetching or parsing the flags again.
+    """
+
+    def __init__(self, max_teams: int):
+        self.max_teams = max_teams
+        self._flags: OrderedDict[int, tuple[str, tuple[FeatureFlag, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, team_id: int, version: str) -> Optional[tuple[FeatureFlag, ...]]:
+        with self._lock:
+            cached = self._flags.get(team_id)
+            if cached is None or cached[0] != version:
+                return None
+            self._flags.move_to_end(team_id)
+            return cached[1]
+
+    def set(self, team_id: int, version: str, feature_flags: tuple[FeatureFlag, ...]) -> None:
+        with self._lock:
+            self._flags[team_id] = (version, feature_flags)
+            self._flags.move_to_end(team_id)
+            while len(self._flags) > self.max_teams:
+                self._flags.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._flags.clear()
+
+
+local_feature_flags_cache = _LocalFeatureFlagsCache(FEATURE_FLAGS_LOCAL_CACHE_MAX_TEAMS)
+
+
 def set_feature_flags_for_team_in_cache(
     team_id: int,
     feature_flags: Optional[list[FeatureFlag]] = None,
@@ -416,7 +512,14 @@ def set_feature_flags_for_team_in_cache(
     serialized_flags = MinimalFeatureFlagSerializer(all_feature_flags, many=True).data
 
     try:
-        cache.set(f"team_feature_flags_{team_id}", json.dumps(serialized_flags), FIVE_DAYS)
+        # A fresh version rather than a counter, so that an expired version can never be mistaken for an old one
+        cache.set_many(
+            {
+                feature_flags_cache_key(team_id): json.dumps(serialized_flags),
+                feature_flags_version_cache_key(team_id): uuid.uuid4().hex,
+            },
+            FIVE_DAYS,
+        )
     except Exception:
         # redis is unavailable
         logger.exception("Redis is unavailable")
@@ -426,22 +529,38 @@ def set_feature_flags_for_team_in_cache(
 
 
 def get_feature_flags_for_team_in_cache(team_id: int) -> Optional[list[FeatureFlag]]:
+    """
+    The flags of a team, parsed at most once per process for each version of the flags.
+    The returned flags may be shared with other requests, so they must not be modified.
+    """
     try:
-        flag_data = cache.get(f"team_feature_flags_{team_id}")
+        version = cache.get(feature_flags_version_cache_key(team_id))
+        if version is not None:
+            local_flags = local_feature_flags_cache.get(team_id, version)
+            if local_flags is not None:
+                return list(local_flags)
+
+        cached = cache.get_many([feature_flags_cache_key(team_id), feature_flags_version_cache_key(team_id)])
     except Exception:
         # redis is unavailable
         logger.exception("Redis is unavailable")
         return None
 
+    flag_data = cached.get(feature_flags_cache_key(team_id))
     if flag_data is not None:
         try:
             parsed_data = json.loads(flag_data)
-            return [FeatureFlag(**flag) for flag in parsed_data]
+            feature_flags = tuple(FeatureFlag(**flag) for flag in parsed_data)
         except Exception as e:
             logger.exception("Error parsing flags from cache")
             capture_exception(e)
             return None
 
+        version = cached.get(feature_flags_version_cache_key(team_id))
+        if version is not None:
+            local_feature_flags_cache.set(team_id, version, feature_flags)
+        return list(feature_flags)
+
     return None
 
 
@@ -1,4 +1,9 @@
+import atexit
+import os
+import threading
+from collections import defaultdict
 from typing import TYPE_CHECKING
+from prometheus_client import Counter
 from posthog.constants import FlagRequestType
 from posthog.helpers.dashboard_templates import (
     add_enriched_insights_to_feature_flag_dashboard,
@@ -19,6 +24,8 @@ if TYPE_CHECKING:
 
 REDIS_LOCK_TOKEN = "posthog:decide_analytics:lock"
 CACHE_BUCKET_SIZE = 60 * 2  # duration in seconds
+# Stops a flush interval of 0 (flush on every request) from making the periodic flush spin
+MIN_PERIODIC_FLUSH_INTERVAL_SECONDS = 0.1
 
 # :NOTE: When making changes here, make sure you run test_no_interference_between_different_types_of_new_incoming_increments
 # locally. It's not included in CI because of tricky patching freeze time in thread issues.
@@ -33,14 +40,114 @@ def get_team_request_key(team_id: int, request_type: FlagRequestType) -> str:
         raise ValueError(f"Unknown request type: {request_type}")
 
 
+REQUEST_COUNTS_BUFFERED_COUNTER = Counter(
+    "flag_request_counts_buffered_total",
+    "Flag requests counted in process, waiting to be written to redis.",
+    labelnames=["request_type"],
+)
+REQUEST_COUNTS_FLUSHED_COUNTER = Counter(
+    "flag_request_counts_flushed_total",
+    "Flag requests counted in process and written to redis.",
+    labelnames=["request_type"],
+)
+REQUEST_COUNTS_DROPPED_COUNTER = Counter(
+    "flag_request_counts_dropped_total",
+    "Flag requests counted in process that couldn't be written to redis.",
+    labelnames=["request_type"],
+)
+
+
+class RequestCountBuffer:
+    """
+    Adds up request counts per team, request type and time bucket in process, and writes them to the same redis hashes
+    that `capture_team_decide_usage` reads, with one pipelined HINCRBY per hash field,
+    instead of one round trip per request.
+
+    Besides the flushes triggered by requests, a daemon thread flushes the buffer every flush interval,
+    so that the counts of rarely hit workers aren't held back until their next request.
+    """
+
+    def __init__(self):
+        self._counts: defaultdict[tuple[str, FlagRequestType, str], int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flusher_pid: int | None = None
+        self._stop_flusher = threading.Event()
+
+    def increment(self, team_id: int, count: int, request_type: FlagRequestType) -> None:
+        if not settings.TEST:
+            self.start_periodic_flush()
+        time_bucket = str(int(time.time() / CACHE_BUCKET_SIZE))
+        key_name = get_team_request_key(team_id, request_type)
+        with self._lock:
+            self._counts[(key_name, request_type, time_bucket)] += count
+            since_last_flush = time.monotonic() - self._last_flush
+        # :TRICKY: A negative duration means the clock was swapped (e.g. frozen in tests), so flush rather than wait
+        flush_due = since_last_flush < 0 or since_last_flush >= settings.DECIDE_REQUEST_COUNTS_FLUSH_INTERVAL_SECONDS
+        REQUEST_COUNTS_BUFFERED_COUNTER.labels(request_type=request_type.value).inc(count)
+
+        if flush_due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(int)
+            self._last_flush = time.monotonic()
+        if not counts:
+            return
+
+        totals: defaultdict[FlagRequestType, int] = defaultdict(int)
+        for (_, request_type, _), count in counts.items():
+            totals[request_type] += count
+
+        try:
+            pipeline = get_client().pipeline(transaction=False)
+            for (key_name, _, time_bucket), count in counts.items():
+                pipeline.hincrby(key_name, time_bucket, count)
+            pipeline.execute()
+        except Exception as error:
+            for request_type, count in totals.items():
+                REQUEST_COUNTS_DROPPED_COUNTER.labels(request_type=request_type.value).inc(count)
+            capture_exception(error)
+            return
+
+        for request_type, count in totals.items():
+            REQUEST_COUNTS_FLUSHED_COUNTER.labels(request_type=request_type.value).inc(count)
+
+    def start_periodic_flush(self) -> None:
+        # Started by the first increment of each process rather than on import, as threads don't survive forking
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+        threading.Thread(target=self._flush_periodically, name="flag-request-counts-flush", daemon=True).start()
+
+    def stop_periodic_flush(self) -> None:
+        self._stop_flusher.set()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flusher.wait(
+            max(settings.DECIDE_REQUEST_COUNTS_FLUSH_INTERVAL_SECONDS, MIN_PERIODIC_FLUSH_INTERVAL_SECONDS)
+        ):
+            try:
+                self.flush()
+            except Exception as error:
+                capture_exception(error)
+
+
+request_count_buffer = RequestCountBuffer()
+# Don't lose the counts buffered since the last flush when the worker shuts down
+atexit.register(request_count_buffer.flush)
+
+
 def increment_request_count(
     team_id: int, count: int = 1, request_type: FlagRequestType = FlagRequestType.DECIDE
 ) -> None:
     try:
-        client = get_client()
-        time_bucket = str(int(time.time() / CACHE_BUCKET_SIZE))
-        key_name = get_team_request_key(team_id, request_type)
-        client.hincrby(key_name, time_bucket, count)
+        request_count_buffer.increment(team_id, count, request_type)
     except Exception as error:
         capture_exception(error)
 
@@ -1,7 +1,9 @@
-import hashlib
+from collections import defaultdict
+from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import StrEnum
 import time
+import numpy as np
 import structlog
 from typing import Literal, Optional, Union, cast
 
@@ -37,13 +39,16 @@ from .feature_flag import (
     get_feature_flags_for_team_in_cache,
     set_feature_flags_for_team_in_cache,
 )
+from .rollout_hashing import holdout_hash, rollout_hash, rollout_hashes
 
 logger = structlog.get_logger(__name__)
 
-__LONG_SCALE__ = float(0xFFFFFFFFFFFFFFF)
-
 FLAG_MATCHING_QUERY_TIMEOUT_MS = 300  # 300 ms. Any longer and we'll just error out.
 
+# Bulk evaluation queries persons for a whole batch of distinct ids at once, so gets more time per query
+BULK_FLAG_EVALUATION_BATCH_SIZE = 500
+BULK_FLAG_EVALUATION_QUERY_TIMEOUT_MS = 5000
+
 FLAG_EVALUATION_ERROR_COUNTER = Counter(
     "flag_evaluation_error_total",
     "Failed decide requests with reason.",
@@ -57,6 +62,11 @@ FLAG_HASH_KEY_WRITES_COUNTER = Counter(
 )
 
 
+BULK_FLAG_EVALUATION_DISTINCT_IDS_COUNTER = Counter(
+    "flag_bulk_evaluation_distinct_ids_total",
+    "Distinct ids flags were evaluated for in bulk.",
+)
+
 FLAG_CACHE_HIT_COUNTER = Counter(
     "flag_cache_hit_total",
     "Whether we could get all flags from the cache or not.",
@@ -133,6 +143,9 @@ class FlagsMatcherCache:
 
 class FeatureFlagMatcher:
     failed_to_fetch_conditions = False
+    # Some extra wiggle room here for timeouts because this depends on the number of flags as well,
+    # and not just the database query.
+    query_conditions_timeout_ms = FLAG_MATCHING_QUERY_TIMEOUT_MS * 2
 
     def __init__(
         self,
@@ -297,11 +310,12 @@ class FeatureFlagMatcher:
         )
 
     def get_matching_variant(self, feature_flag: FeatureFlag) -> Optional[str]:
-        for variant in self.variant_lookup_table(feature_flag):
-            if (
-                self.get_hash(feature_flag, salt="variant") >= variant["value_min"]
-                and self.get_hash(feature_flag, salt="variant") < variant["value_max"]
-            ):
+        lookup_table = self.variant_lookup_table(feature_flag)
+        if not lookup_table:
+            return None
+        variant_hash = self.get_hash(feature_flag, salt="variant")
+        for variant in lookup_table:
+            if variant_hash >= variant["value_min"] and variant_hash < variant["value_max"]:
                 return variant["key"]
         return None
 
@@ -380,7 +394,7 @@ class FeatureFlagMatcher:
     ) -> tuple[bool, FeatureFlagMatchReason]:
         rollout_percentage = condition.get("rollout_percentage")
         if len(condition.get("properties", [])) > 0:
-            properties = Filter(data=condition).property_groups.flat
+            properties = feature_flag.get_condition_properties(condition)
             if self.can_compute_locally(properties, feature_flag.aggregation_group_type_index):
                 # :TRICKY: If overrides are enough to determine if a condition is a match,
                 # we can skip checking the query.
@@ -447,32 +461,16 @@ class FeatureFlagMatcher:
 
         return self.query_conditions.get(key, False)
 
-    # Define contiguous sub-domains within [0, 1].
-    # By looking up a random hash value, you can find the associated variant key.
-    # e.g. the first of two variants with 50% rollout percentage will have value_max: 0.5
-    # and the second will have value_min: 0.5 and value_max: 1.0
     def variant_lookup_table(self, feature_flag: FeatureFlag):
-        lookup_table = []
-        value_min = 0
-        for variant in feature_flag.variants:
-            value_max = value_min + variant["rollout_percentage"] / 100
-            lookup_table.append({"value_min": value_min, "value_max": value_max, "key": variant["key"]})
-            value_min = value_max
-        return lookup_table
+        return feature_flag.get_variant_lookup_table()
 
     @cached_property
     def query_conditions(self) -> dict[str, bool]:
         try:
-            # Some extra wiggle room here for timeouts because this depends on the number of flags as well,
-            # and not just the database query.
-            with execute_with_timeout(FLAG_MATCHING_QUERY_TIMEOUT_MS * 2, DATABASE_FOR_FLAG_MATCHING):
+            with execute_with_timeout(self.query_conditions_timeout_ms, DATABASE_FOR_FLAG_MATCHING):
                 all_conditions: dict = {}
                 team_id = self.feature_flags[0].team_id
-                person_query: QuerySet = Person.objects.db_manager(DATABASE_FOR_FLAG_MATCHING).filter(
-                    team_id=team_id,
-                    persondistinctid__distinct_id=self.distinct_id,
-                    persondistinctid__team_id=team_id,
-                )
+                person_query: QuerySet = self._person_query(team_id)
                 basic_group_query: QuerySet = Group.objects.db_manager(DATABASE_FOR_FLAG_MATCHING).filter(
                     team_id=team_id
                 )
@@ -493,8 +491,7 @@ class FeatureFlagMatcher:
 
                 for existence_condition_key in self.has_pure_is_not_conditions:
                     if existence_condition_key == PERSON_KEY:
-                        person_exists = person_query.exists()
-                        all_conditions[f"{ENTITY_EXISTS_PREFIX}{PERSON_KEY}"] = person_exists
+                        all_conditions.update(self._person_exists_conditions(person_query))
                     else:
                         if existence_condition_key not in group_query_per_group_type_mapping:
                             continue
@@ -505,13 +502,12 @@ class FeatureFlagMatcher:
                         group_exists = group_query.exists()
                         all_conditions[f"{ENTITY_EXISTS_PREFIX}{existence_condition_key}"] = group_exists
 
-                def condition_eval(key, condition):
+                def condition_eval(key, condition, property_list):
                     team_id = self.feature_flags[0].team_id
                     expr = None
                     annotate_query = True
                     nonlocal person_query
 
-                    property_list = Filter(data=condition).property_groups.flat
                     properties_with_math_operators = get_all_properties_with_math_operators(
                         property_list, self.cohorts_cache, team_id
                     )
@@ -611,7 +607,7 @@ class FeatureFlagMatcher:
                         prop_key = (condition.get("properties") or [{}])[0].get("key")
                         if prop_key:
                             key = f"flag_{feature_flag.pk}_super_condition"
-                            condition_eval(key, condition)
+                            condition_eval(key, condition, feature_flag.get_condition_properties(condition))
 
                             is_set_key = f"flag_{feature_flag.pk}_super_condition_is_set"
                             is_set_condition = {
@@ -622,7 +618,9 @@ class FeatureFlagMatcher:
                                     }
                                 ]
                             }
-                            condition_eval(is_set_key, is_set_condition)
+                            condition_eval(
+                                is_set_key, is_set_condition, Filter(data=is_set_condition).property_groups.flat
+                            )
 
                     with start_span(
                         op="parse_feature_flag_conditions",
@@ -630,12 +628,10 @@ class FeatureFlagMatcher:
                     ):
                         for index, condition in enumerate(feature_flag.conditions):
                             key = f"flag_{feature_flag.pk}_condition_{index}"
-                            condition_eval(key, condition)
+                            condition_eval(key, condition, feature_flag.get_condition_properties(condition))
 
                 if len(person_fields) > 0:
-                    person_query = person_query.values(*person_fields)
-                    if len(person_query) > 0:
-                        all_conditions = {**all_conditions, **person_query[0]}
+                    all_conditions = {**all_conditions, **self._person_conditions(person_query, person_fields)}
 
                 for (
                     group_query,
@@ -657,6 +653,22 @@ class FeatureFlagMatcher:
             # Covers all cases like invalid JSON, invalid operator, invalid property name, invalid group input format, etc.
             raise
 
+    def _person_query(self, team_id: int) -> QuerySet:
+        return Person.objects.db_manager(DATABASE_FOR_FLAG_MATCHING).filter(
+            team_id=team_id,
+            persondistinctid__distinct_id=self.distinct_id,
+            persondistinctid__team_id=team_id,
+        )
+
+    def _person_exists_conditions(self, person_query: QuerySet) -> dict[str, bool]:
+        return {f"{ENTITY_EXISTS_PREFIX}{PERSON_KEY}": person_query.exists()}
+
+    def _person_conditions(self, person_query: QuerySet, person_fields: list[str]) -> dict[str, bool]:
+        person_query = person_query.values(*person_fields)
+        if len(person_query) > 0:
+            return person_query[0]
+        return {}
+
     def hashed_identifier(self, feature_flag: FeatureFlag) -> Optional[str]:
         """
         If aggregating by people, returns distinct_id.
@@ -683,18 +695,14 @@ class FeatureFlagMatcher:
     # uniformly distributed between 0 and 1, so if we want to show this feature to 20% of traffic
     # we can do _hash(key, identifier) < 0.2
     def get_hash(self, feature_flag: FeatureFlag, salt="") -> float:
-        hash_key = f"{feature_flag.key}.{self.hashed_identifier(feature_flag)}{salt}"
-        hash_val = int(hashlib.sha1(hash_key.encode("utf-8")).hexdigest()[:15], 16)
-        return hash_val / __LONG_SCALE__
+        return rollout_hash(feature_flag.key, self.hashed_identifier(feature_flag), salt)
 
     # This function takes a identifier and a feature flag and returns a float between 0 and 1.
     # Given the same identifier and key, it'll always return the same float. These floats are
     # uniformly distributed between 0 and 1, and are keyed only on user's distinct id / group key.
     # Thus, irrespective of the flag, the same user will always get the same value.
     def get_holdout_hash(self, feature_flag: FeatureFlag, salt="") -> float:
-        hash_key = f"holdout-{self.hashed_identifier(feature_flag)}{salt}"
-        hash_val = int(hashlib.sha1(hash_key.encode("utf-8")).hexdigest()[:15], 16)
-        return hash_val / __LONG_SCALE__
+        return holdout_hash(self.hashed_identifier(feature_flag), salt)
 
     def can_compute_locally(
         self,
@@ -968,6 +976,254 @@ def get_all_feature_flags(
     )
 
 
+class _BatchedConditionsMatcher(FeatureFlagMatcher):
+    """
+    Runs the condition queries of a matcher for a batch of distinct ids at once, using one person query for all of them.
+    Conditions that don't depend on the person, like group conditions, are shared by the whole batch.
+    """
+
+    query_conditions_timeout_ms = BULK_FLAG_EVALUATION_QUERY_TIMEOUT_MS
+
+    def __init__(
+        self,
+        feature_flags: list[FeatureFlag],
+        distinct_ids: list[str],
+        groups: dict[GroupTypeName, str],
+        cache: FlagsMatcherCache,
+        group_property_value_overrides: dict[str, dict[str, Union[str, int]]],
+        cohorts_cache: dict[int, CohortOrEmpty],
+    ):
+        super().__init__(
+            feature_flags,
+            distinct_ids[0],
+            groups,
+            cache,
+            group_property_value_overrides=group_property_value_overrides,
+            cohorts_cache=cohorts_cache,
+        )
+        self.distinct_ids = distinct_ids
+        self.person_conditions: dict[str, dict[str, bool]] = {distinct_id: {} for distinct_id in distinct_ids}
+
+    def _person_query(self, team_id: int) -> QuerySet:
+        return Person.objects.db_manager(DATABASE_FOR_FLAG_MATCHING).filter(
+            team_id=team_id,
+            persondistinctid__distinct_id__in=self.distinct_ids,
+            persondistinctid__team_id=team_id,
+        )
+
+    def _person_exists_conditions(self, person_query: QuerySet) -> dict[str, bool]:
+        existing_distinct_ids = set(person_query.values_list("persondistinctid__distinct_id", flat=True))
+        for distinct_id, conditions in self.person_conditions.items():
+            conditions[f"{ENTITY_EXISTS_PREFIX}{PERSON_KEY}"] = distinct_id in existing_distinct_ids
+        return {}
+
+    def _person_conditions(self, person_query: QuerySet, person_fields: list[str]) -> dict[str, bool]:
+        for row in person_query.values("persondistinctid__distinct_id", *person_fields):
+            distinct_id = row.pop("persondistinctid__distinct_id")
+            self.person_conditions[distinct_id].update(row)
+        return {}
+
+
+class _PrefetchedConditionsMatcher(FeatureFlagMatcher):
+    def __init__(
+        self,
+        *args,
+        query_conditions: Optional[dict[str, bool]],
+        batch_hashes: dict[tuple[str, str], np.ndarray],
+        batch_index: int,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._prefetched_query_conditions = query_conditions
+        # The batch the conditions were prefetched for failed, so anything depending on the database errors
+        self.failed_to_fetch_conditions = query_conditions is None
+        self.batch_hashes = batch_hashes
+        self.batch_index = batch_index
+
+    @property
+    def query_conditions(self) -> dict[str, bool]:
+        return self._prefetched_query_conditions or {}
+
+    def get_hash(self, feature_flag: FeatureFlag, salt="") -> float:
+        hashes = self.batch_hashes.get((feature_flag.key, salt))
+        if hashes is None:
+            return super().get_hash(feature_flag, salt)
+        return float(hashes[self.batch_index])
+
+
+def _rollout_hashes_for_batch(
+    feature_flags: list[FeatureFlag], distinct_ids: list[str], hash_key_overrides: dict[str, dict[str, str]]
+) -> dict[tuple[str, str], np.ndarray]:
+    """
+    Hashes the rollout and variant buckets of a batch of distinct ids for each flag at once,
+    keyed by flag key and salt, in the same order as `distinct_ids`.
+    """
+    batch_hashes: dict[tuple[str, str], np.ndarray] = {}
+    for feature_flag in feature_flags:
+        # Flags aggregated by groups hash the same group key for every distinct id
+        if feature_flag.aggregation_group_type_index is not None:
+            continue
+        identifiers = distinct_ids
+        if feature_flag.ensure_experience_continuity:
+            identifiers = [
+                hash_key_overrides.get(distinct_id, {}).get(feature_flag.key, distinct_id)
+                for distinct_id in distinct_ids
+            ]
+        batch_hashes[(feature_flag.key, "")] = rollout_hashes(feature_flag.key, identifiers)
+        if feature_flag.variants:
+            batch_hashes[(feature_flag.key, "variant")] = rollout_hashes(feature_flag.key, identifiers, "variant")
+    return batch_hashes
+
+
+def _uses_distinct_id_property(feature_flag: FeatureFlag) -> bool:
+    # :TRICKY: The distinct id is passed in as a person property override, which can't be shared by a batch
+    return any(
+        prop.get("key") == "distinct_id"
+        for condition in [*feature_flag.conditions, *feature_flag.super_conditions]
+        for prop in condition.get("properties") or []
+    )
+
+
+def get_feature_flag_hash_key_overrides_for_distinct_ids(
+    team_id: int, distinct_ids: list[str], using_database: str = "default"
+) -> dict[str, dict[str, str]]:
+    """Like `get_feature_flag_hash_key_overrides`, but for many unrelated distinct ids, with two queries in total."""
+    person_id_to_distinct_ids: dict[int, list[str]] = defaultdict(list)
+    for person_id, distinct_id in (
+        PersonDistinctId.objects.db_manager(using_database)
+        .filter(distinct_id__in=distinct_ids, team_id=team_id)
+        .values_list("person_id", "distinct_id")
+    ):
+        person_id_to_distinct_ids[person_id].append(distinct_id)
+
+    overrides: dict[str, dict[str, str]] = {distinct_id: {} for distinct_id in distinct_ids}
+    for person_id, feature_flag_key, hash_key in (
+        FeatureFlagHashKeyOverride.objects.db_manager(using_database)
+        .filter(person_id__in=list(person_id_to_distinct_ids.keys()), team_id=team_id)
+        .values_list("person_id", "feature_flag_key", "hash_key")
+    ):
+        for distinct_id in person_id_to_distinct_ids[person_id]:
+            overrides[distinct_id][feature_flag_key] = hash_key
+    return overrides
+
+
+# Return flags for each of the distinct ids, as they are evaluated
+def get_feature_flags_for_distinct_ids(
+    team_id: int,
+    distinct_ids: list[str],
+    groups: Optional[dict[GroupTypeName, str]] = None,
+    group_property_value_overrides: Optional[dict[str, dict[str, Union[str, int]]]] = None,
+    batch_size: int = BULK_FLAG_EVALUATION_BATCH_SIZE,
+) -> Iterator[tuple[str, dict[str, Union[str, bool]], dict[str, dict], dict[str, object], bool]]:
+    """
+    Evaluates all flags of the team for each distinct id, the same way `get_all_feature_flags` does for one,
+    but with the person conditions and hash key overrides of a whole batch of distinct ids loaded at once.
+    The same groups are used for every distinct id.
+    """
+    if groups is None:
+        groups = {}
+    _, group_property_value_overrides = add_local_person_and_group_properties(
+        None, groups, {}, group_property_value_overrides or {}
+    )
+
+    all_feature_flags = get_feature_flags_for_team_in_cache(team_id)
+    if all_feature_flags is None:
+        all_feature_flags = set_feature_flags_for_team_in_cache(team_id)
+
+    batched_flags = [flag for flag in all_feature_flags if not _uses_distinct_id_property(flag)]
+    per_distinct_id_flags = [flag for flag in all_feature_flags if _uses_distinct_id_property(flag)]
+    needs_hash_key_overrides = any(flag.ensure_experience_continuity for flag in all_feature_flags)
+
+    cache = FlagsMatcherCache(team_id)
+    cohorts_cache: dict[int, CohortOrEmpty] = {}
+    start_time = time.monotonic()
+
+    for batch_start in range(0, len(distinct_ids), batch_size):
+        batch = distinct_ids[batch_start : batch_start + batch_size]
+        if not all_feature_flags:
+            for distinct_id in batch:
+                yield distinct_id, {}, {}, {}, False
+            continue
+
+        hash_key_overrides: dict[str, dict[str, str]] = {}
+        if needs_hash_key_overrides:
+            try:
+                with execute_with_timeout(BULK_FLAG_EVALUATION_QUERY_TIMEOUT_MS, DATABASE_FOR_FLAG_MATCHING):
+                    hash_key_overrides = get_feature_flag_hash_key_overrides_for_distinct_ids(
+                        team_id, batch, DATABASE_FOR_FLAG_MATCHING
+                    )
+            except Exception as e:
+                handle_feature_flag_exception(e, "[Feature Flags] Error fetching hash key overrides in bulk")
+
+        shared_conditions: Optional[dict[str, bool]] = None
+        batch_matcher = None
+        if batched_flags:
+            batch_matcher = _BatchedConditionsMatcher(
+                batched_flags, batch, groups, cache, group_property_value_overrides, cohorts_cache
+            )
+            try:
+                shared_conditions = batch_matcher.query_conditions
+            except Exception as e:
+                handle_feature_flag_exception(e, "[Feature Flags] Error computing flags in bulk")
+
+        batch_hashes = _rollout_hashes_for_batch(batched_flags, batch, hash_key_overrides)
+
+        for batch_index, distinct_id in enumerate(batch):
+            property_value_overrides: dict[str, Union[str, int]] = {"distinct_id": distinct_id}
+            flag_values: dict[str, Union[str, bool]] = {}
+            flag_evaluation_reasons: dict[str, dict] = {}
+            flag_payloads: dict[str, object] = {}
+            errors = False
+
+            if batch_matcher is not None:
+                values, reasons, payloads, errors = _PrefetchedConditionsMatcher(
+                    batched_flags,
+                    distinct_id,
+                    groups,
+                    cache,
+                    hash_key_overrides.get(distinct_id, {}),
+                    property_value_overrides,
+                    group_property_value_overrides,
+                    cohorts_cache=cohorts_cache,
+                    query_conditions=None
+                    if shared_conditions is None
+                    else {**shared_conditions, **batch_matcher.person_conditions[distinct_id]},
+                    batch_hashes=batch_hashes,
+                    batch_index=batch_index,
+                ).get_matches()
+                flag_values.update(values)
+                flag_evaluation_reasons.update(reasons)
+                flag_payloads.update(payloads)
+
+            if per_distinct_id_flags:
+                values, reasons, payloads, per_distinct_id_errors = FeatureFlagMatcher(
+                    per_distinct_id_flags,
+                    distinct_id,
+                    groups,
+                    cache,
+                    hash_key_overrides.get(distinct_id, {}),
+                    property_value_overrides,
+                    group_property_value_overrides,
+                    cohorts_cache=cohorts_cache,
+                ).get_matches()
+                flag_values.update(values)
+                flag_evaluation_reasons.update(reasons)
+                flag_payloads.update(payloads)
+                errors = errors or per_distinct_id_errors
+
+            yield distinct_id, flag_values, flag_evaluation_reasons, flag_payloads, errors
+
+    duration = time.monotonic() - start_time
+    BULK_FLAG_EVALUATION_DISTINCT_IDS_COUNTER.inc(len(distinct_ids))
+    logger.info(
+        "bulk_flag_evaluation_finished",
+        team_id=team_id,
+        distinct_ids=len(distinct_ids),
+        flags=len(all_feature_flags),
+        distinct_ids_per_second=round(len(distinct_ids) / duration) if duration > 0 else None,
+    )
+
+
 def set_feature_flag_hash_key_overrides(team_id: int, distinct_ids: list[str], hash_key_override: str) -> bool:
     # As a product decision, the first override wins, i.e consistency matters for the first walkthrough.
     # Thus, we don't need to do upserts here.
@@ -0,0 +1,42 @@
+import hashlib
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+# The first 15 hex digits (60 bits) of the sha1 digest are used as the hash, scaled to a float between 0 and 1
+LONG_SCALE = float(0xFFFFFFFFFFFFFFF)
+
+SHA1_DIGEST_SIZE = 20
+
+
+# This function takes a identifier and a feature flag key and returns a float between 0 and 1.
+# Given the same identifier and key, it'll always return the same float. These floats are
+# uniformly distributed between 0 and 1, so if we want to show this feature to 20% of traffic
+# we can do rollout_hash(key, identifier) < 0.2
+def rollout_hash(flag_key: str, identifier: Optional[str], salt: str = "") -> float:
+    return _hash(f"{flag_key}.{identifier}{salt}")
+
+
+# Like rollout_hash, but keyed only on the identifier, so irrespective of the flag,
+# the same user will always get the same value.
+def holdout_hash(identifier: Optional[str], salt: str = "") -> float:
+    return _hash(f"holdout-{identifier}{salt}")
+
+
+def rollout_hashes(flag_key: str, identifiers: Sequence[Optional[str]], salt: str = "") -> np.ndarray:
+    """`rollout_hash` for many identifiers of the same flag at once, as an array of floats."""
+    return _hashes([f"{flag_key}.{identifier}{salt}" for identifier in identifiers])
+
+
+def _hash(hash_key: str) -> float:
+    hash_val = int(hashlib.sha1(hash_key.encode("utf-8")).hexdigest()[:15], 16)
+    return hash_val / LONG_SCALE
+
+
+def _hashes(hash_keys: list[str]) -> np.ndarray:
+    # hashlib has no batch API, but converting whole digests in numpy is cheaper than going through hex strings
+    digests = b"".join([hashlib.sha1(hash_key.encode("utf-8")).digest() for hash_key in hash_keys])
+    first_bytes = np.frombuffer(digests, dtype=np.uint8).reshape(-1, SHA1_DIGEST_SIZE)[:, :8]
+    hash_vals = np.ascontiguousarray(first_bytes).view(">u8").ravel() >> np.uint64(4)
+    return hash_vals / LONG_SCALE
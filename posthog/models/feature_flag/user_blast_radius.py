@@ -1,13 +1,19 @@
-from typing import Optional
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
 
+import numpy as np
+from django.core.cache import cache
 from rest_framework.exceptions import ValidationError
 
 from posthog.client import sync_execute
 from posthog.models.cohort import Cohort
+from posthog.models.feature_flag.rollout_hashing import rollout_hashes
 from posthog.models.filters import Filter
 from posthog.models.property import GroupTypeIndex
 from posthog.models.team.team import Team
-from posthog.queries.base import relative_date_parse_for_feature_flag_matching
+from posthog.models.property.property import Property
+from posthog.queries.base import match_property, relative_date_parse_for_feature_flag_matching
 from posthog.clickhouse.client.connection import Workload
 
 
@@ -103,3 +109,100 @@ def get_user_blast_radius(
     total_users = team.persons_seen_so_far
 
     return blast_radius, total_users
+
+
+# Estimates are made against a sample of persons, which is loaded from ClickHouse once and reused
+# while release conditions are edited
+BLAST_RADIUS_SAMPLE_SIZE = 10_000
+BLAST_RADIUS_SAMPLE_CACHE_TTL = 60 * 60
+
+# A person missing the property matches these operators, like in the person query
+MISSING_PROPERTY_MATCHING_OPERATORS = ("is_not_set", "is_not", "not_icontains", "not_regex")
+
+PERSON_SAMPLE_SQL = """
+SELECT id, argMax(properties, version) AS properties
+FROM person
+WHERE team_id = %(team_id)s
+GROUP BY id
+HAVING argMax(is_deleted, version) = 0
+ORDER BY cityHash64(id)
+LIMIT %(limit)s
+"""
+
+
+@dataclass
+class BlastRadiusEstimate:
+    users_affected: int
+    users_rolled_out: int
+    total_users: int
+    sample_size: int
+
+
+def get_person_sample(team: Team, sample_size: int = BLAST_RADIUS_SAMPLE_SIZE) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Returns the ids and properties of a deterministic sample of the team's persons, cached for an hour.
+    """
+    cache_key = f"feature_flag_blast_radius_sample_{team.pk}_{sample_size}"
+    sample = cache.get(cache_key)
+    if sample is None:
+        rows = sync_execute(
+            PERSON_SAMPLE_SQL,
+            {"team_id": team.pk, "limit": sample_size},
+            workload=Workload.OFFLINE,
+        )
+        sample = [(str(person_id), json.loads(properties)) for person_id, properties in rows]
+        cache.set(cache_key, sample, BLAST_RADIUS_SAMPLE_CACHE_TTL)
+    return sample
+
+
+def can_estimate_user_blast_radius(team: Team, feature_flag_condition: dict) -> bool:
+    # Cohorts and non-person properties can't be matched against the sampled person properties
+    return all(
+        property.type == "person" for property in Filter(data=feature_flag_condition, team=team).property_groups.flat
+    )
+
+
+def estimate_user_blast_radius(
+    team: Team,
+    feature_flag_condition: dict,
+    feature_flag_key: str = "",
+    sample_size: int = BLAST_RADIUS_SAMPLE_SIZE,
+) -> BlastRadiusEstimate:
+    """
+    Estimates the persons matching a release condition by matching its person properties against a sample of persons,
+    and scaling the result to all of the team's persons. Unlike `get_user_blast_radius`, the rollout percentage
+    is applied too, by hashing the sampled person ids the way flags hash distinct ids.
+    Check `can_estimate_user_blast_radius` first.
+    """
+    properties = Filter(data=feature_flag_condition, team=team).property_groups.flat
+    sample = get_person_sample(team, sample_size)
+    total_users = team.persons_seen_so_far
+    if not sample:
+        return BlastRadiusEstimate(users_affected=0, users_rolled_out=0, total_users=total_users, sample_size=0)
+
+    matches = np.array(
+        [
+            all(_match_sampled_property(property, person_properties) for property in properties)
+            for _, person_properties in sample
+        ]
+    )
+    rolled_out = matches
+    rollout_percentage = feature_flag_condition.get("rollout_percentage")
+    if rollout_percentage is not None:
+        # Hashes are uniformly distributed whatever the identifier, so person ids stand in for distinct ids
+        hashes = rollout_hashes(feature_flag_key, [person_id for person_id, _ in sample])
+        rolled_out = matches & (hashes <= rollout_percentage / 100)
+
+    scale = total_users / len(sample)
+    return BlastRadiusEstimate(
+        users_affected=round(int(matches.sum()) * scale),
+        users_rolled_out=round(int(rolled_out.sum()) * scale),
+        total_users=total_users,
+        sample_size=len(sample),
+    )
+
+
+def _match_sampled_property(property: Property, person_properties: dict[str, Any]) -> bool:
+    if property.key not in person_properties:
+        return (property.operator or "exact") in MISSING_PROPERTY_MATCHING_OPERATORS
+    return match_property(property, person_properties)
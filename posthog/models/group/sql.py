@@ -67,6 +67,15 @@ INSERT_GROUP_SQL = """
 INSERT INTO groups (group_type_index, group_key, team_id, group_properties, created_at, _timestamp, _offset) SELECT %(group_type_index)s, %(group_key)s, %(team_id)s, %(group_properties)s, %(created_at)s, %(_timestamp)s, 0
 """
 
+INSERT_GROUP_BULK_SQL = """
+INSERT INTO groups (group_type_index, group_key, team_id, group_properties, created_at, _timestamp, _offset) VALUES
+"""
+
+# One row of INSERT_GROUP_BULK_SQL, for the same data as INSERT_GROUP_SQL
+INSERT_GROUP_BULK_VALUES = (
+    "(%(group_type_index)s, %(group_key)s, %(team_id)s, %(group_properties)s, %(created_at)s, %(_timestamp)s, 0)"
+)
+
 GET_GROUP_IDS_BY_PROPERTY_SQL = """
 SELECT DISTINCT group_key
 FROM groups
@@ -1,6 +1,7 @@
 import datetime
 import json
-from typing import Optional, Union
+from collections.abc import Iterable
+from typing import Any, Optional, Union
 
 from zoneinfo import ZoneInfo
 from dateutil.parser import isoparse
@@ -10,7 +11,7 @@ from posthog.kafka_client.client import ClickhouseProducer
 from posthog.kafka_client.topics import KAFKA_GROUPS
 from posthog.models.filters.utils import GroupTypeIndex
 from posthog.models.group.group import Group
-from posthog.models.group.sql import INSERT_GROUP_SQL
+from posthog.models.group.sql import INSERT_GROUP_BULK_SQL, INSERT_GROUP_BULK_VALUES, INSERT_GROUP_SQL
 
 
 def raw_create_group_ch(
@@ -26,9 +27,32 @@ def raw_create_group_ch(
 
     DON'T USE DIRECTLY - `create_group` is the correct option,
     unless you specifically want to sync Postgres state from ClickHouse yourself."""
+    data = group_ch_row(team_id, group_type_index, group_key, properties, created_at, timestamp)
+    p = ClickhouseProducer()
+    p.produce(topic=KAFKA_GROUPS, sql=INSERT_GROUP_SQL, data=data, sync=sync)
+
+
+def raw_create_groups_ch(rows: Iterable[dict[str, Any]], sync: bool = False) -> int:
+    """Create many ClickHouse-only Group records at once, given rows built with `group_ch_row`.
+
+    DON'T USE DIRECTLY - see `raw_create_group_ch`."""
+    p = ClickhouseProducer()
+    return p.produce_batch(
+        topic=KAFKA_GROUPS, bulk_sql=INSERT_GROUP_BULK_SQL, values_sql=INSERT_GROUP_BULK_VALUES, rows=rows, sync=sync
+    )
+
+
+def group_ch_row(
+    team_id: int,
+    group_type_index: GroupTypeIndex,
+    group_key: str,
+    properties: dict,
+    created_at: datetime.datetime,
+    timestamp: Optional[datetime.datetime] = None,
+) -> dict[str, Any]:
     if timestamp is None:
         timestamp = now().astimezone(ZoneInfo("UTC"))
-    data = {
+    return {
         "group_type_index": group_type_index,
         "group_key": group_key,
         "team_id": team_id,
@@ -36,8 +60,6 @@ def raw_create_group_ch(
         "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
         "_timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
     }
-    p = ClickhouseProducer()
-    p.produce(topic=KAFKA_GROUPS, sql=INSERT_GROUP_SQL, data=data, sync=sync)
 
 
 def create_group(
@@ -390,6 +390,9 @@ INSERT_PERSON_BULK_SQL = """
 INSERT INTO person (id, created_at, team_id, properties, is_identified, _timestamp, _offset, is_deleted, version) VALUES
 """
 
+# One row of INSERT_PERSON_BULK_SQL, for the same data as INSERT_PERSON_SQL
+INSERT_PERSON_BULK_VALUES = "(%(id)s, %(created_at)s, %(team_id)s, %(properties)s, %(is_identified)s, %(_timestamp)s, 0, %(is_deleted)s, %(version)s)"
+
 INSERT_PERSON_DISTINCT_ID2 = """
 INSERT INTO person_distinct_id2 (distinct_id, person_id, team_id, is_deleted, version, _timestamp, _offset, _partition) SELECT %(distinct_id)s, %(person_id)s, %(team_id)s, %(is_deleted)s, %(version)s, now(), 0, 0 VALUES
 """
@@ -398,6 +401,11 @@ BULK_INSERT_PERSON_DISTINCT_ID2 = """
 INSERT INTO person_distinct_id2 (distinct_id, person_id, team_id, is_deleted, version, _timestamp, _offset, _partition) VALUES
 """
 
+# One row of BULK_INSERT_PERSON_DISTINCT_ID2, for the same data as INSERT_PERSON_DISTINCT_ID2
+BULK_INSERT_PERSON_DISTINCT_ID2_VALUES = (
+    "(%(distinct_id)s, %(person_id)s, %(team_id)s, %(is_deleted)s, %(version)s, now(), 0, 0)"
+)
+
 INSERT_PERSON_OVERRIDE = """
 INSERT INTO person_overrides (team_id, old_person_id, override_person_id, version, merged_at, oldest_event) SELECT %(team_id)s, %(old_person_id)s, %(override_person_id)s, %(version)s, %(merged_at)s, %(oldest_event)s VALUES
 """
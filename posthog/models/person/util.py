@@ -1,7 +1,8 @@
 import datetime
 import json
 from contextlib import ExitStack
-from typing import Optional, Union
+from collections.abc import Iterable
+from typing import Any, Optional, Union
 from uuid import UUID
 
 from zoneinfo import ZoneInfo
@@ -21,7 +22,9 @@ from posthog.kafka_client.topics import (
 from posthog.models.person import Person, PersonDistinctId
 from posthog.models.person.sql import (
     BULK_INSERT_PERSON_DISTINCT_ID2,
+    BULK_INSERT_PERSON_DISTINCT_ID2_VALUES,
     INSERT_PERSON_BULK_SQL,
+    INSERT_PERSON_BULK_VALUES,
     INSERT_PERSON_DISTINCT_ID2,
     INSERT_PERSON_OVERRIDE,
     INSERT_PERSON_SQL,
@@ -134,6 +137,40 @@ def create_person(
     timestamp: Optional[Union[datetime.datetime, str]] = None,
     created_at: Optional[datetime.datetime] = None,
 ) -> str:
+    data = person_ch_row(
+        team_id=team_id,
+        version=version,
+        uuid=uuid,
+        properties=properties,
+        is_identified=is_identified,
+        is_deleted=is_deleted,
+        timestamp=timestamp,
+        created_at=created_at,
+    )
+    p = ClickhouseProducer()
+    p.produce(topic=KAFKA_PERSON, sql=INSERT_PERSON_SQL, data=data, sync=sync)
+    return data["id"]
+
+
+def create_persons(rows: Iterable[dict[str, Any]], sync: bool = False) -> int:
+    """Create or update many ClickHouse persons at once, given rows built with `person_ch_row`."""
+    p = ClickhouseProducer()
+    return p.produce_batch(
+        topic=KAFKA_PERSON, bulk_sql=INSERT_PERSON_BULK_SQL, values_sql=INSERT_PERSON_BULK_VALUES, rows=rows, sync=sync
+    )
+
+
+def person_ch_row(
+    *,
+    team_id: int,
+    version: int,
+    uuid: Optional[str] = None,
+    properties: Optional[dict] = None,
+    is_identified: bool = False,
+    is_deleted: bool = False,
+    timestamp: Optional[Union[datetime.datetime, str]] = None,
+    created_at: Optional[datetime.datetime] = None,
+) -> dict[str, Any]:
     if properties is None:
         properties = {}
     if uuid:
@@ -154,7 +191,7 @@ def create_person(
     else:
         created_at = created_at.astimezone(ZoneInfo("UTC"))
 
-    data = {
+    return {
         "id": str(uuid),
         "team_id": team_id,
         "properties": json.dumps(properties),
@@ -164,9 +201,6 @@ def create_person(
         "version": version,
         "_timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
     }
-    p = ClickhouseProducer()
-    p.produce(topic=KAFKA_PERSON, sql=INSERT_PERSON_SQL, data=data, sync=sync)
-    return uuid
 
 
 def create_person_distinct_id(
@@ -181,17 +215,39 @@ def create_person_distinct_id(
     p.produce(
         topic=KAFKA_PERSON_DISTINCT_ID,
         sql=INSERT_PERSON_DISTINCT_ID2,
-        data={
-            "distinct_id": distinct_id,
-            "person_id": person_id,
-            "team_id": team_id,
-            "version": version,
-            "is_deleted": int(is_deleted),
-        },
+        data=person_distinct_id_ch_row(team_id, distinct_id, person_id, version=version, is_deleted=is_deleted),
         sync=sync,
     )
 
 
+def create_person_distinct_ids(rows: Iterable[dict[str, Any]], sync: bool = False) -> int:
+    """Create or update many ClickHouse person distinct IDs at once, given rows built with `person_distinct_id_ch_row`."""
+    p = ClickhouseProducer()
+    return p.produce_batch(
+        topic=KAFKA_PERSON_DISTINCT_ID,
+        bulk_sql=BULK_INSERT_PERSON_DISTINCT_ID2,
+        values_sql=BULK_INSERT_PERSON_DISTINCT_ID2_VALUES,
+        rows=rows,
+        sync=sync,
+    )
+
+
+def person_distinct_id_ch_row(
+    team_id: int,
+    distinct_id: str,
+    person_id: str,
+    version=0,
+    is_deleted: bool = False,
+) -> dict[str, Any]:
+    return {
+        "distinct_id": distinct_id,
+        "person_id": person_id,
+        "team_id": team_id,
+        "version": version,
+        "is_deleted": int(is_deleted),
+    }
+
+
 def create_person_override(
     team_id: int,
     old_person_uuid: str,
@@ -233,8 +289,13 @@ def delete_person(person: Person, sync: bool = False) -> None:
     # This is racy https://github.com/PostHog/posthog/issues/11590
     distinct_ids_to_version = _get_distinct_ids_with_version(person)
     _delete_person(person.team_id, person.uuid, int(person.version or 0), person.created_at, sync)
-    for distinct_id, version in distinct_ids_to_version.items():
-        _delete_ch_distinct_id(person.team_id, person.uuid, distinct_id, version, sync)
+    create_person_distinct_ids(
+        (
+            _deleted_distinct_id_ch_row(person.team_id, person.uuid, distinct_id, version)
+            for distinct_id, version in distinct_ids_to_version.items()
+        ),
+        sync=sync,
+    )
 
 
 def _delete_person(
@@ -264,11 +325,14 @@ def _get_distinct_ids_with_version(person: Person) -> dict[str, int]:
 
 
 def _delete_ch_distinct_id(team_id: int, uuid: UUID, distinct_id: str, version: int, sync: bool = False) -> None:
-    create_person_distinct_id(
+    create_person_distinct_ids([_deleted_distinct_id_ch_row(team_id, uuid, distinct_id, version)], sync=sync)
+
+
+def _deleted_distinct_id_ch_row(team_id: int, uuid: UUID, distinct_id: str, version: int) -> dict[str, Any]:
+    return person_distinct_id_ch_row(
         team_id=team_id,
         distinct_id=distinct_id,
         person_id=str(uuid),
         version=version + 100,
         is_deleted=True,
-        sync=sync,
     )
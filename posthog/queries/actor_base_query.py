@@ -297,7 +297,7 @@ def get_serialized_people(
     team: Team, people_ids: list[Any], value_per_actor_id: Optional[dict[str, float]] = None, distinct_id_limit=1000
 ) -> list[SerializedPerson]:
     persons_dict = PersonStrategy(team, ActorsQuery(), HogQLHasMorePaginator()).get_actors(
-        people_ids, order_by="created_at DESC, uuid"
+        people_ids, order_by="created_at DESC, uuid", distinct_id_limit=distinct_id_limit
     )
     from posthog.api.person import get_person_name_helper
 
@@ -312,9 +312,7 @@ def get_serialized_people(
             name=get_person_name_helper(
                 person_dict["id"], person_dict["properties"], person_dict["distinct_ids"], team
             ),
-            distinct_ids=person_dict["distinct_ids"]
-            if distinct_id_limit is None
-            else person_dict["distinct_ids"][:distinct_id_limit],
+            distinct_ids=person_dict["distinct_ids"],
             matched_recordings=[],
             value_at_data_point=value_per_actor_id[str(uuid)] if value_per_actor_id else None,
         )
@@ -54,6 +54,7 @@ class AlertConditionType(StrEnum):
     ABSOLUTE_VALUE = "absolute_value"
     RELATIVE_INCREASE = "relative_increase"
     RELATIVE_DECREASE = "relative_decrease"
+    ANOMALY = "anomaly"
 
 
 class AlertState(StrEnum):
@@ -2312,10 +2313,14 @@ class HogQLQueryModifiers(BaseModel):
     personsArgMaxVersion: Optional[PersonsArgMaxVersion] = None
     personsJoinMode: Optional[PersonsJoinMode] = None
     personsOnEventsMode: Optional[PersonsOnEventsMode] = None
+    profileQueries: Optional[bool] = None
     propertyGroupsMode: Optional[PropertyGroupsMode] = None
     s3TableUseInvalidColumns: Optional[bool] = None
     sessionTableVersion: Optional[SessionTableVersion] = None
+    useErrorTrackingIssueStats: Optional[bool] = None
+    useErrorTrackingSearchIndex: Optional[bool] = None
     useMaterializedViews: Optional[bool] = None
+    useReplayEventSummary: Optional[bool] = None
 
 
 class HogQLQueryResponse(BaseModel):
@@ -2480,6 +2485,10 @@ class QueryResponseAlternative1(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     offset: Optional[int] = None
     query_status: Optional[QueryStatus] = Field(
         default=None, description="Query status indicates whether next to the provided data, a query is still running."
@@ -2507,6 +2516,10 @@ class QueryResponseAlternative2(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     offset: int
     query_status: Optional[QueryStatus] = Field(
         default=None, description="Query status indicates whether next to the provided data, a query is still running."
@@ -2687,6 +2700,10 @@ class QueryResponseAlternative17(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     offset: Optional[int] = None
     query_status: Optional[QueryStatus] = Field(
         default=None, description="Query status indicates whether next to the provided data, a query is still running."
@@ -2714,6 +2731,10 @@ class QueryResponseAlternative18(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     offset: int
     query_status: Optional[QueryStatus] = Field(
         default=None, description="Query status indicates whether next to the provided data, a query is still running."
@@ -3494,6 +3515,10 @@ class ActorsQueryResponse(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     offset: int
     query_status: Optional[QueryStatus] = Field(
         default=None, description="Query status indicates whether next to the provided data, a query is still running."
@@ -3780,6 +3805,10 @@ class CachedActorsQueryResponse(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     next_allowed_client_refresh: AwareDatetime
     offset: int
     query_status: Optional[QueryStatus] = Field(
@@ -3879,6 +3908,10 @@ class CachedEventsQueryResponse(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     next_allowed_client_refresh: AwareDatetime
     offset: Optional[int] = None
     query_status: Optional[QueryStatus] = Field(
@@ -4452,6 +4485,10 @@ class Response(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     offset: Optional[int] = None
     query_status: Optional[QueryStatus] = Field(
         default=None, description="Query status indicates whether next to the provided data, a query is still running."
@@ -4479,6 +4516,10 @@ class Response1(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     offset: int
     query_status: Optional[QueryStatus] = Field(
         default=None, description="Query status indicates whether next to the provided data, a query is still running."
@@ -4910,6 +4951,10 @@ class EventsQueryResponse(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor to pass as `cursor` to fetch the next page, when the ordering allows seeking",
+    )
     offset: Optional[int] = None
     query_status: Optional[QueryStatus] = Field(
         default=None, description="Query status indicates whether next to the provided data, a query is still running."
@@ -5933,6 +5978,10 @@ class EventsQuery(BaseModel):
     actionId: Optional[int] = Field(default=None, description="Show events matching a given action")
     after: Optional[str] = Field(default=None, description="Only fetch events that happened after this timestamp")
     before: Optional[str] = Field(default=None, description="Only fetch events that happened before this timestamp")
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor returned as `nextCursor` by the previous page. Takes precedence over `offset`",
+    )
     event: Optional[str] = Field(default=None, description="Limit to events matching this string")
     filterTestAccounts: Optional[bool] = Field(default=None, description="Filter test accounts")
     fixedProperties: Optional[
@@ -6774,6 +6823,10 @@ class ActorsQuery(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor returned as `nextCursor` by the previous page. Takes precedence over `offset`",
+    )
     fixedProperties: Optional[
         list[Union[PersonPropertyFilter, CohortPropertyFilter, HogQLPropertyFilter, EmptyPropertyFilter]]
     ] = Field(
@@ -6790,6 +6843,10 @@ class ActorsQuery(BaseModel):
     )
     offset: Optional[int] = None
     orderBy: Optional[list[str]] = None
+    personProperties: Optional[list[str]] = Field(
+        default=None,
+        description="Only return these person properties on hydrated persons. Returns all properties by default",
+    )
     properties: Optional[
         list[Union[PersonPropertyFilter, CohortPropertyFilter, HogQLPropertyFilter, EmptyPropertyFilter]]
     ] = Field(
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+import structlog
+from django.conf import settings
+from prometheus_client import Counter
+
+logger = structlog.get_logger(__name__)
+
+BLOB_CACHE_REQUESTS_COUNTER = Counter(
+    "session_snapshots_blob_cache_requests",
+    "Requests for session recording blobs, by whether they could be served from the local blob cache",
+    labelnames=["result"],
+)
+
+BLOB_CACHE_BYTES_SAVED_COUNTER = Counter(
+    "session_snapshots_blob_cache_bytes_saved",
+    "Bytes of session recording blobs served from the local blob cache instead of object storage",
+)
+
+BLOB_CACHE_EVICTIONS_COUNTER = Counter(
+    "session_snapshots_blob_cache_evictions",
+    "Session recording blobs evicted from the local blob cache to stay within its size limit",
+)
+
+RANGE_HEADER_REGEX = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass(frozen=True)
+class CachedBlob:
+    content: bytes
+    etag: Optional[str] = None
+    cache_control: Optional[str] = None
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parses a single `bytes=start-end` range into an inclusive (start, end) tuple clamped to the content size.
+    Returns None when the whole content should be sent, e.g. for a missing or multipart range header.
+    """
+    if not range_header:
+        return None
+
+    match = RANGE_HEADER_REGEX.match(range_header.strip())
+    if not match:
+        # multiple ranges or other units, which we're allowed to ignore
+        return None
+
+    start, end = match.groups()
+    if start == "" and end == "":
+        return None
+
+    if start == "":
+        # suffix range, i.e. the last `end` bytes
+        suffix_length = int(end)
+        if suffix_length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - suffix_length, 0), size - 1
+
+    first_byte = int(start)
+    last_byte = size - 1 if end == "" else min(int(end), size - 1)
+    if first_byte >= size or last_byte < first_byte:
+        raise RangeNotSatisfiable()
+    return first_byte, last_byte
+
+
+class RecordingBlobCache:
+    """
+    A size bounded, least recently used cache of session recording blobs on local disk.
+
+    Blobs are immutable once written to object storage, so entries never need to be invalidated, only evicted.
+    The cache directory can be shared by all web workers on a host. Reads touch the entry's mtime,
+    and writes evict the least recently read entries until the cache is back within `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # a single blob shouldn't be able to flush most of the cache
+        self.max_blob_bytes = max_bytes // 4
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def get(self, key: str) -> Optional[CachedBlob]:
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(f"{path}.json") as metadata_file:
+                metadata = json.load(metadata_file)
+            with open(f"{path}.blob", "rb") as blob_file:
+                content = blob_file.read()
+            os.utime(f"{path}.blob")
+        except (OSError, ValueError):
+            return None
+
+        if len(content) != metadata.get("size"):
+            # a concurrent eviction or a partial write, treat it as a miss
+            return None
+
+        return CachedBlob(content=content, etag=metadata.get("etag"), cache_control=metadata.get("cache_control"))
+
+    def set(self, key: str, blob: CachedBlob) -> None:
+        if not self.enabled or len(blob.content) > self.max_blob_bytes:
+            return
+
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_atomically(f"{path}.blob", blob.content)
+            self._write_atomically(
+                f"{path}.json",
+                json.dumps(
+                    {"key": key, "size": len(blob.content), "etag": blob.etag, "cache_control": blob.cache_control}
+                ).encode("utf-8"),
+            )
+            self._evict()
+        except OSError:
+            logger.exception("session_recording_blob_cache_write_failed", key=key)
+
+    def _write_atomically(self, path: str, content: bytes) -> None:
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temporary_file:
+                temporary_file.write(content)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, str]] = []
+        total_bytes = 0
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if not entry.name.endswith(".blob"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path[: -len(".blob")]))
+                total_bytes += stat.st_size
+
+        if total_bytes <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            for suffix in (".blob", ".json"):
+                try:
+                    os.unlink(f"{path}{suffix}")
+                except FileNotFoundError:
+                    pass
+            BLOB_CACHE_EVICTIONS_COUNTER.inc()
+            total_bytes -= size
+            if total_bytes <= self.max_bytes:
+                break
+
+
+def get_recording_blob_cache() -> RecordingBlobCache:
+    return RecordingBlobCache(
+        directory=settings.SESSION_RECORDING_BLOB_CACHE_DIR,
+        max_bytes=settings.SESSION_RECORDING_BLOB_CACHE_MAX_BYTES,
+    )
@@ -0,0 +1,150 @@
+"""
+A compacted recording is a single file made of independently gzipped chunks of the recording's snapshot lines,
+stored alongside an index of each chunk's time range and byte offset.
+
+A player can load the index first and then fetch only the chunks around the playback position
+with a byte range request, instead of downloading every blob from the start of the recording.
+Chunks are cut at full snapshots wherever possible, so that a chunk marked as a keyframe can be played
+without loading any of the chunks before it.
+"""
+
+import gzip
+import json
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from posthog.session_recordings.session_recording_helpers import RRWEB_MAP_EVENT_TYPE
+
+
+COMPACTED_INDEX_VERSION = 1
+COMPACTED_DATA_FILE = "data"
+COMPACTED_INDEX_FILE = "index.json"
+
+# uncompressed size at which we start looking for a full snapshot to begin the next chunk at
+COMPACTED_CHUNK_TARGET_BYTES = 1024 * 1024
+# uncompressed size at which we start a new chunk even if we haven't seen a full snapshot
+COMPACTED_CHUNK_MAX_BYTES = 4 * COMPACTED_CHUNK_TARGET_BYTES
+
+GZIP_MAGIC_BYTES = b"\x1f\x8b"
+
+
+@dataclass(frozen=True)
+class CompactedChunk:
+    # timestamps are in milliseconds, like the time ranges in blob keys
+    start_timestamp: int
+    end_timestamp: int
+    offset: int
+    length: int
+    keyframe: bool
+
+    @property
+    def byte_range(self) -> tuple[int, int]:
+        return self.offset, self.offset + self.length - 1
+
+
+@dataclass(frozen=True)
+class CompactedIndex:
+    chunks: list[CompactedChunk]
+
+    @property
+    def start_timestamp(self) -> Optional[int]:
+        return self.chunks[0].start_timestamp if self.chunks else None
+
+    @property
+    def end_timestamp(self) -> Optional[int]:
+        return self.chunks[-1].end_timestamp if self.chunks else None
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {"version": COMPACTED_INDEX_VERSION, "chunks": [asdict(chunk) for chunk in self.chunks]}
+        ).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, content: bytes) -> "CompactedIndex":
+        index = json.loads(content)
+        if index.get("version") != COMPACTED_INDEX_VERSION:
+            raise ValueError(f"Unknown compacted recording index version {index.get('version')}")
+        return cls(chunks=[CompactedChunk(**chunk) for chunk in index["chunks"]])
+
+
+def decode_blob(content: bytes) -> bytes:
+    """Blobs are gzipped by ingestion, but are read back without their content-encoding being applied."""
+    if content.startswith(GZIP_MAGIC_BYTES):
+        return gzip.decompress(content)
+    return content
+
+
+def decode_chunk(content: bytes) -> bytes:
+    return gzip.decompress(content)
+
+
+def _line_details(line: bytes) -> tuple[Optional[int], Optional[int], bool]:
+    try:
+        events = json.loads(line).get("data") or []
+    except (ValueError, AttributeError):
+        return None, None, False
+
+    timestamps = [event["timestamp"] for event in events if isinstance(event, dict) and "timestamp" in event]
+    has_full_snapshot = any(
+        isinstance(event, dict) and event.get("type") == RRWEB_MAP_EVENT_TYPE.FullSnapshot for event in events
+    )
+    return (min(timestamps) if timestamps else None), (max(timestamps) if timestamps else None), has_full_snapshot
+
+
+def compact_blobs(blobs: Iterable[bytes]) -> tuple[bytes, CompactedIndex]:
+    """
+    Merges the decoded JSONL content of a recording's blobs, in order, into a compacted file and its index.
+    """
+    compacted = bytearray()
+    chunks: list[CompactedChunk] = []
+
+    lines: list[bytes] = []
+    size = 0
+    keyframe = False
+    start_timestamp: Optional[int] = None
+    end_timestamp: Optional[int] = None
+
+    def flush() -> None:
+        nonlocal lines, size
+        if not lines:
+            return
+        content = gzip.compress(b"".join(lines))
+        previous_end = chunks[-1].end_timestamp if chunks else 0
+        chunks.append(
+            CompactedChunk(
+                start_timestamp=start_timestamp if start_timestamp is not None else previous_end,
+                end_timestamp=end_timestamp if end_timestamp is not None else previous_end,
+                offset=len(compacted),
+                length=len(content),
+                keyframe=keyframe,
+            )
+        )
+        compacted.extend(content)
+        lines, size = [], 0
+
+    for blob in blobs:
+        for line in blob.splitlines(keepends=True):
+            if not line.strip():
+                continue
+            if not line.endswith(b"\n"):
+                line += b"\n"
+
+            line_start, line_end, has_full_snapshot = _line_details(line)
+            if (size >= COMPACTED_CHUNK_TARGET_BYTES and has_full_snapshot) or size >= COMPACTED_CHUNK_MAX_BYTES:
+                flush()
+
+            if not lines:
+                keyframe = has_full_snapshot
+                start_timestamp, end_timestamp = None, None
+
+            lines.append(line)
+            size += len(line)
+            if line_start is not None:
+                start_timestamp = line_start if start_timestamp is None else min(start_timestamp, line_start)
+            if line_end is not None:
+                end_timestamp = line_end if end_timestamp is None else max(end_timestamp, line_end)
+
+    flush()
+
+    return bytes(compacted), CompactedIndex(chunks=chunks)
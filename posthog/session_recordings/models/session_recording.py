@@ -153,6 +153,11 @@ class SessionRecording(UUIDModel):
         else:
             raise NotImplementedError(f"Unknown session replay object storage version {version}")
 
+    def build_compacted_storage_path(self) -> str:
+        # a sibling of the blob prefix, so that listing the recording's blobs never includes the compacted files
+        blob_prefix = self.object_storage_path or self.build_blob_lts_storage_path("2023-08-01")
+        return f"{blob_prefix.rstrip('/').rsplit('/', 1)[0]}/compacted"
+
     def build_blob_ingestion_storage_path(self, root_prefix: Optional[str] = None) -> str:
         root_prefix = root_prefix or settings.OBJECT_STORAGE_SESSION_RECORDING_BLOB_INGESTION_FOLDER
         return f"{root_prefix}/team_id/{self.team_id}/session_id/{self.session_id}/data"
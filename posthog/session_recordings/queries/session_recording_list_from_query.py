@@ -297,7 +297,9 @@ class SessionRecordingListFromQuery:
         optional_exprs: list[ast.Expr] = []
 
         # if in PoE mode then we should be pushing person property queries into here
-        events_sub_query = ReplayFiltersEventsSubQuery(self._team, self._query).get_query_for_session_id_matching()
+        events_sub_query = ReplayFiltersEventsSubQuery(
+            self._team, self._query, self._hogql_query_modifiers
+        ).get_query_for_session_id_matching()
         if events_sub_query:
             optional_exprs.append(
                 ast.CompareOperation(
@@ -640,10 +642,90 @@ class ReplayFiltersEventsSubQuery:
         use_poe = poe_is_active(self._team) and self.person_properties
 
         if self.entities or self.event_properties or self.group_properties or use_poe:
+            if self.use_event_summary:
+                return self._select_from_event_summary()
             return self._select_from_events(ast.Alias(alias="session_id", expr=ast.Field(chain=["$session_id"])))
         else:
             return None
 
+    @cached_property
+    def use_event_summary(self) -> bool:
+        # The per-session summary only knows which events happened in a session,
+        # so anything filtering on event, group or person properties has to go through the raw events
+        if not self._hogql_query_modifiers or not self._hogql_query_modifiers.useReplayEventSummary:
+            return False
+        if self.event_properties or self.group_properties or (poe_is_active(self._team) and self.person_properties):
+            return False
+        return all(
+            entity.kind == NodeKind.EVENTS_NODE and entity.event is not None and not entity.properties
+            for entity in self.entities
+        )
+
+    def _select_from_event_summary(self) -> ast.SelectQuery:
+        """
+        Matches sessions on event names using the hourly per-session summary instead of the events table.
+        The summary's date bounds are only precise to the hour, the recordings list still filters on the session's own start time.
+        """
+        hour = ast.Field(chain=["hour"])
+        exprs: list[ast.Expr] = [
+            ast.CompareOperation(
+                op=ast.CompareOperationOp.GtEq,
+                left=hour,
+                right=ast.Call(
+                    name="toStartOfHour",
+                    args=[ast.Constant(value=datetime.now() - timedelta(days=self.ttl_days))],
+                ),
+            ),
+            ast.CompareOperation(op=ast.CompareOperationOp.LtEq, left=hour, right=ast.Call(name="now", args=[])),
+        ]
+
+        if self._query.date_from:
+            exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.GtEq,
+                    left=hour,
+                    right=ast.Call(
+                        name="toStartOfHour",
+                        args=[ast.Constant(value=self.query_date_range.date_from() - timedelta(minutes=2))],
+                    ),
+                )
+            )
+
+        if self._query.date_to:
+            exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.LtEq,
+                    left=hour,
+                    right=ast.Constant(value=self.query_date_range.date_to()),
+                )
+            )
+
+        if self._query.session_ids:
+            exprs.append(
+                ast.CompareOperation(
+                    op=ast.CompareOperationOp.In,
+                    left=ast.Field(chain=["session_id"]),
+                    right=ast.Constant(value=self._query.session_ids),
+                )
+            )
+
+        (_, event_names) = self._event_predicates
+
+        return ast.SelectQuery(
+            select=[ast.Field(chain=["session_id"])],
+            select_from=ast.JoinExpr(table=ast.Field(chain=["raw_session_replay_event_summary"])),
+            where=ast.And(exprs=exprs),
+            group_by=[ast.Field(chain=["session_id"])],
+            having=ast.Call(
+                name="hasAll" if self.property_operand == PropertyOperatorType.AND else "hasAny",
+                args=[
+                    ast.Call(name="groupUniqArrayArray", args=[ast.Field(chain=["event_names"])]),
+                    # KLUDGE: sorting only so that snapshot tests are consistent
+                    ast.Constant(value=sorted(event_names)),
+                ],
+            ),
+        )
+
     def get_query_for_event_id_matching(self) -> ast.SelectQuery | ast.SelectSetQuery:
         return self._select_from_events(ast.Call(name="groupUniqArray", args=[ast.Field(chain=["uuid"])]))
 
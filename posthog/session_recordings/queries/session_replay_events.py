@@ -1,3 +1,4 @@
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -24,43 +25,101 @@ def seconds_until_midnight():
     return difference.seconds
 
 
+# ClickHouse handles a few hundred ids in an IN clause comfortably, larger lookups are split into several queries
+SESSION_LOOKUP_BATCH_SIZE = 500
+
+# sessions can outlive the team's TTL, e.g. if the team's plan changed, so existence checks fall back to this
+MAX_SESSION_EXISTENCE_DAYS = 370
+
+
+def existence_cache_key(session_id: str, team: Team) -> str:
+    return f"summarize_recording_existence_team_{team.pk}_id_{session_id}"
+
+
+def _batched(session_ids: list[str]) -> Iterator[list[str]]:
+    for start in range(0, len(session_ids), SESSION_LOOKUP_BATCH_SIZE):
+        yield session_ids[start : start + SESSION_LOOKUP_BATCH_SIZE]
+
+
 class SessionReplayEvents:
     def exists(self, session_id: str, team: Team) -> bool:
-        cache_key = f"summarize_recording_existence_team_{team.pk}_id_{session_id}"
-        cached_response = cache.get(cache_key)
-        if isinstance(cached_response, bool):
-            return cached_response
-
-        # Once we know that session exists we don't need to check again (until the end of the day since TTL might apply)
-        existence = self._check_exists_within_days(ttl_days(team), session_id, team) or self._check_exists_within_days(
-            370, session_id, team
-        )
+        return session_id in self.exists_many([session_id], team)
 
-        if existence:
+    def exists_many(self, session_ids: Iterable[str], team: Team, ttl_only: bool = False) -> set[str]:
+        """
+        Returns the given session ids that have replay events.
+
+        Sessions already known to exist are read from the cache, the rest are checked in batches,
+        first within the team's TTL and then, unless `ttl_only` is set, within `MAX_SESSION_EXISTENCE_DAYS`.
+        """
+        unique_session_ids = list(dict.fromkeys(session_ids))
+        if not unique_session_ids:
+            return set()
+
+        team_ttl_days = ttl_days(team)
+        cache_keys = {session_id: existence_cache_key(session_id, team) for session_id in unique_session_ids}
+        cached_responses = cache.get_many(list(cache_keys.values()))
+
+        existing: set[str] = set()
+        remaining: list[str] = []
+        for session_id, cache_key in cache_keys.items():
+            # the cache holds the number of days of the window the session was found in,
+            # so sessions only found outside the team's TTL aren't returned for TTL only lookups
+            found_within_days = cached_responses.get(cache_key)
+            if isinstance(found_within_days, int) and not isinstance(found_within_days, bool):
+                if not ttl_only or found_within_days <= team_ttl_days:
+                    existing.add(session_id)
+                    continue
+            remaining.append(session_id)
+
+        # the actors path clamps to the TTL relative to the app's clock, like the insight it lists recordings for
+        windows: list[tuple[int, Optional[datetime]]] = (
+            [(team_ttl_days, datetime.now(pytz.timezone("UTC")) - timedelta(days=team_ttl_days))]
+            if ttl_only
+            else [(team_ttl_days, None), (MAX_SESSION_EXISTENCE_DAYS, None)]
+        )
+        found: dict[str, int] = {}
+        for days, since in windows:
+            if not remaining:
+                break
+            for batch in _batched(remaining):
+                for session_id in self._check_exists_within_days(days, batch, team, since=since):
+                    found[session_id] = days
+            remaining = [session_id for session_id in remaining if session_id not in found]
+
+        if found:
+            # Once we know that session exists we don't need to check again (until the end of the day since TTL might apply)
             # let's be cautious and not cache non-existence
             # in case we manage to check existence just before the first event hits ClickHouse
             # that should be impossible but cache invalidation is hard etc etc
-            cache.set(cache_key, existence, timeout=seconds_until_midnight())
-        return existence
+            cache.set_many(
+                {cache_keys[session_id]: days for session_id, days in found.items()},
+                timeout=seconds_until_midnight(),
+            )
+
+        return existing | set(found)
 
     @staticmethod
-    def _check_exists_within_days(days: int, session_id: str, team: Team) -> bool:
+    def _check_exists_within_days(
+        days: int, session_ids: list[str], team: Team, since: Optional[datetime] = None
+    ) -> set[str]:
         result = sync_execute(
             """
-            SELECT count()
+            SELECT DISTINCT session_id
             FROM session_replay_events
             PREWHERE team_id = %(team_id)s
-            AND session_id = %(session_id)s
-            AND min_first_timestamp >= now() - INTERVAL %(days)s DAY
+            AND session_id IN %(session_ids)s
+            AND min_first_timestamp >= {since}
             AND min_first_timestamp <= now()
-            """,
+            """.format(since="%(since)s" if since else "now() - INTERVAL %(days)s DAY"),
             {
                 "team_id": team.pk,
-                "session_id": session_id,
+                "session_ids": session_ids,
+                "since": since,
                 "days": days,
             },
         )
-        return result[0][0] > 0
+        return {str(row[0]) for row in result}
 
     def get_metadata(
         self,
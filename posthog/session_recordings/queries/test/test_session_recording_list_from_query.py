@@ -15,7 +15,7 @@ from posthog.models import Cohort, GroupTypeMapping, Person
 from posthog.models.action import Action
 from posthog.models.group.util import create_group
 from posthog.models.team import Team
-from posthog.schema import RecordingsQuery
+from posthog.schema import HogQLQueryModifiers, RecordingsQuery
 from posthog.session_recordings.queries.session_recording_list_from_query import (
     SessionRecordingQueryResult,
 )
@@ -82,10 +82,12 @@ class TestSessionRecordingsListFromQuery(ClickhouseTestMixin, APIBaseTest):
             properties=properties,
         )
 
-    def _filter_recordings_by(self, recordings_filter: dict | None = None) -> SessionRecordingQueryResult:
+    def _filter_recordings_by(
+        self, recordings_filter: dict | None = None, hogql_query_modifiers: HogQLQueryModifiers | None = None
+    ) -> SessionRecordingQueryResult:
         the_query = RecordingsQuery.model_validate(query_as_params_to_dict(recordings_filter or {}))
         session_recording_list_instance = SessionRecordingListFromQuery(
-            query=the_query, team=self.team, hogql_query_modifiers=None
+            query=the_query, team=self.team, hogql_query_modifiers=hogql_query_modifiers
         )
         return session_recording_list_instance.run()
 
@@ -1226,6 +1228,57 @@ class TestSessionRecordingsListFromQuery(ClickhouseTestMixin, APIBaseTest):
         )
         assert len(session_recordings) == 1
 
+    def test_event_filter_from_event_summary(self):
+        session_id = f"test_event_filter_from_event_summary-{str(uuid4())}"
+        other_session_id = f"test_event_filter_from_event_summary-other-{str(uuid4())}"
+        user = "test_event_filter_from_event_summary-user"
+        Person.objects.create(team=self.team, distinct_ids=[user], properties={"email": "bla"})
+        for sid in [session_id, other_session_id]:
+            produce_replay_summary(
+                distinct_id=user,
+                session_id=sid,
+                first_timestamp=self.an_hour_ago,
+                team_id=self.team.id,
+            )
+        self.create_event(user, self.an_hour_ago, properties={"$session_id": session_id, "$window_id": "1"})
+        self.create_event(
+            user,
+            self.an_hour_ago,
+            properties={"$session_id": session_id, "$window_id": "1"},
+            event_name="new-event",
+        )
+        self.create_event(user, self.an_hour_ago, properties={"$session_id": other_session_id, "$window_id": "1"})
+
+        modifiers = HogQLQueryModifiers(useReplayEventSummary=True)
+        events = [
+            {"id": "$pageview", "type": "events", "order": 0, "name": "$pageview"},
+            {"id": "new-event", "type": "events", "order": 0, "name": "new-event"},
+        ]
+
+        (session_recordings, _, _) = self._filter_recordings_by({"events": events}, hogql_query_modifiers=modifiers)
+        assert [s["session_id"] for s in session_recordings] == [session_id]
+
+        (session_recordings, _, _) = self._filter_recordings_by(
+            {"events": events, "operand": "OR"}, hogql_query_modifiers=modifiers
+        )
+        assert sorted(s["session_id"] for s in session_recordings) == sorted([session_id, other_session_id])
+
+        # event property filters can't be answered from the summary, so they still read events
+        (session_recordings, _, _) = self._filter_recordings_by(
+            {
+                "events": [
+                    {
+                        "id": "$pageview",
+                        "type": "events",
+                        "name": "$pageview",
+                        "properties": [{"key": "$window_id", "value": ["2"], "operator": "exact", "type": "event"}],
+                    }
+                ]
+            },
+            hogql_query_modifiers=modifiers,
+        )
+        assert session_recordings == []
+
     @snapshot_clickhouse_queries
     @also_test_with_materialized_columns(["$session_id", "$browser"], person_properties=["email"])
     @freeze_time("2023-01-04")
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from posthog.models import Team
 from posthog.session_recordings.queries.session_replay_events import SessionReplayEvents
 from posthog.session_recordings.queries.test.session_replay_sql import (
@@ -71,3 +73,45 @@ class SessionReplayEventsQueries(ClickhouseTestMixin, APIBaseTest):
             recording_start_time=self.base_time + relativedelta(days=2),
         )
         assert metadata is None
+
+    @patch("posthog.session_recordings.queries.session_replay_events.SESSION_LOOKUP_BATCH_SIZE", 1)
+    def test_exists_many(self) -> None:
+        assert SessionReplayEvents().exists_many(["1", "2", "not a session"], team=self.team) == {"1", "2"}
+
+        # sessions known to exist are cached, so only the unknown session is queried again
+        with patch(
+            "posthog.session_recordings.queries.session_replay_events.sync_execute", return_value=[]
+        ) as mock_sync_execute:
+            assert SessionReplayEvents().exists_many(["1", "2", "not a session"], team=self.team) == {"1", "2"}
+        assert [call.args[1]["session_ids"] for call in mock_sync_execute.call_args_list] == [
+            ["not a session"],
+            ["not a session"],
+        ]
+        assert SessionReplayEvents().exists("1", team=self.team)
+
+    def test_exists_many_ttl_only_ignores_sessions_cached_outside_ttl(self) -> None:
+        old_time = now() - relativedelta(days=60)
+        produce_replay_summary(
+            session_id="old",
+            team_id=self.team.pk,
+            first_timestamp=old_time.isoformat(),
+            last_timestamp=old_time.isoformat(),
+            distinct_id="u1",
+        )
+
+        # found by the long range fallback, which caches it as existing
+        assert SessionReplayEvents().exists("old", team=self.team)
+        assert SessionReplayEvents().exists_many(["old", "1"], team=self.team, ttl_only=True) == {"1"}
+        assert SessionReplayEvents().exists("old", team=self.team)
+
+    def test_exists_ignores_sessions_starting_in_the_future(self) -> None:
+        future_time = now() + relativedelta(days=1)
+        produce_replay_summary(
+            session_id="future",
+            team_id=self.team.pk,
+            first_timestamp=future_time.isoformat(),
+            last_timestamp=future_time.isoformat(),
+            distinct_id="u1",
+        )
+
+        assert not SessionReplayEvents().exists("future", team=self.team)
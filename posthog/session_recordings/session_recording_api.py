@@ -38,6 +38,20 @@ from posthog.rate_limit import (
     PersonalApiKeyRateThrottle,
 )
 from posthog.schema import HogQLQueryModifiers, QueryTiming, RecordingsQuery
+from posthog.session_recordings.blob_cache import (
+    BLOB_CACHE_BYTES_SAVED_COUNTER,
+    BLOB_CACHE_REQUESTS_COUNTER,
+    CachedBlob,
+    RangeNotSatisfiable,
+    get_recording_blob_cache,
+    parse_range_header,
+)
+from posthog.session_recordings.compaction import (
+    COMPACTED_DATA_FILE,
+    COMPACTED_INDEX_FILE,
+    CompactedIndex,
+    decode_chunk,
+)
 from posthog.session_recordings.models.session_recording import SessionRecording
 from posthog.session_recordings.models.session_recording_event import (
     SessionRecordingViewed,
@@ -503,6 +517,9 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
         First without a source parameter to get a list of sources supported by the given session.
         And then once for each source in the returned list to get the actual snapshots.
 
+        Clients that pass `compacted=true` get a single compacted source for persisted recordings that have one.
+        They load its index with `source=compacted` and then each chunk they need with `source=compacted&chunk=N`.
+
         NB version 1 of this API has been deprecated and ClickHouse stored snapshots are no longer supported.
         """
 
@@ -536,13 +553,17 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
             SNAPSHOTS_BY_PERSONAL_API_KEY_COUNTER.labels(api_key=personal_api_key, source=source).inc()
 
         if not source:
-            return self._gather_session_recording_sources(recording)
+            return self._gather_session_recording_sources(
+                recording, allow_compacted=request.GET.get("compacted") == "true"
+            )
         elif source == "realtime":
             return self._send_realtime_snapshots_to_client(recording, request, event_properties)
         elif source == "blob":
             return self._stream_blob_to_client(recording, request, event_properties)
+        elif source == "compacted":
+            return self._send_compacted_to_client(recording, request, event_properties)
         else:
-            raise exceptions.ValidationError("Invalid source must be one of [realtime, blob]")
+            raise exceptions.ValidationError("Invalid source must be one of [realtime, blob, compacted]")
 
     def _maybe_report_recording_list_filters_changed(self, request: request.Request, team: Team):
         """
@@ -566,7 +587,7 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
                 team=team,
             )
 
-    def _gather_session_recording_sources(self, recording: SessionRecording) -> Response:
+    def _gather_session_recording_sources(self, recording: SessionRecording, allow_compacted: bool = False) -> Response:
         might_have_realtime = True
         newest_timestamp = None
         response_data = {}
@@ -574,6 +595,19 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
         blob_keys: list[str] | None = None
         blob_prefix = ""
 
+        compacted_index = self._load_compacted_index(recording) if allow_compacted else None
+        if compacted_index and compacted_index.chunks:
+            # a compacted recording is persisted, so it has no realtime source
+            response_data["sources"] = [
+                {
+                    "source": "compacted",
+                    "start_timestamp": datetime.fromtimestamp(compacted_index.chunks[0].start_timestamp / 1000, tz=UTC),
+                    "end_timestamp": datetime.fromtimestamp(compacted_index.chunks[-1].end_timestamp / 1000, tz=UTC),
+                    "blob_key": None,
+                }
+            ]
+            return Response(SessionRecordingSourcesSerializer(response_data).data)
+
         if recording.object_storage_path:
             blob_prefix = recording.object_storage_path
             blob_keys = object_storage.list_objects(cast(str, blob_prefix))
@@ -715,21 +749,26 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
         blob_key = request.GET.get("blob_key", "")
         self._validate_blob_key(blob_key)
 
-        # very short-lived pre-signed URL
-        with GENERATE_PRE_SIGNED_URL_HISTOGRAM.time():
-            if recording.object_storage_path:
-                if recording.storage_version == "2023-08-01":
-                    file_key = f"{recording.object_storage_path}/{blob_key}"
-                else:
-                    raise NotImplementedError(
-                        f"Unknown session replay object storage version {recording.storage_version}"
-                    )
+        if recording.object_storage_path:
+            if recording.storage_version == "2023-08-01":
+                file_key = f"{recording.object_storage_path}/{blob_key}"
             else:
-                blob_prefix = settings.OBJECT_STORAGE_SESSION_RECORDING_BLOB_INGESTION_FOLDER
-                file_key = f"{recording.build_blob_ingestion_storage_path(root_prefix=blob_prefix)}/{blob_key}"
-            url = object_storage.get_presigned_url(file_key, expiration=60)
-            if not url:
-                raise exceptions.NotFound("Snapshot file not found")
+                raise NotImplementedError(f"Unknown session replay object storage version {recording.storage_version}")
+        else:
+            blob_prefix = settings.OBJECT_STORAGE_SESSION_RECORDING_BLOB_INGESTION_FOLDER
+            file_key = f"{recording.build_blob_ingestion_storage_path(root_prefix=blob_prefix)}/{blob_key}"
+
+        # blobs are immutable, so popular recordings can be served from the local cache
+        # instead of fetching them from object storage for every viewer
+        blob_cache = get_recording_blob_cache()
+        cached_blob = blob_cache.get(file_key)
+
+        if not cached_blob:
+            # very short-lived pre-signed URL
+            with GENERATE_PRE_SIGNED_URL_HISTOGRAM.time():
+                url = object_storage.get_presigned_url(file_key, expiration=60)
+                if not url:
+                    raise exceptions.NotFound("Snapshot file not found")
 
         event_properties["source"] = "blob"
         event_properties["blob_key"] = blob_key
@@ -739,6 +778,19 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
             event_properties,
         )
 
+        if_none_match = request.headers.get("If-None-Match")
+
+        if cached_blob:
+            BLOB_CACHE_REQUESTS_COUNTER.labels(result="hit").inc()
+            BLOB_CACHE_BYTES_SAVED_COUNTER.inc(len(cached_blob.content))
+            if if_none_match and cached_blob.etag and ensure_not_weak(if_none_match) == cached_blob.etag:
+                response = HttpResponse(status=304)
+                response["ETag"] = cached_blob.etag
+                return response
+            return self._blob_response(request, cached_blob)
+
+        BLOB_CACHE_REQUESTS_COUNTER.labels(result="miss").inc()
+
         with STREAM_RESPONSE_TO_CLIENT_HISTOGRAM.time():
             # streams the file from S3 to the client
             # will not decompress the possibly large file because of `stream=True`
@@ -751,7 +803,6 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
             # object store will respect this and send back 304 if the file hasn't changed,
             # and we don't need to send the large file over the wire
 
-            if_none_match = request.headers.get("If-None-Match")
             headers = {}
             if if_none_match:
                 headers["If-None-Match"] = ensure_not_weak(if_none_match)
@@ -759,24 +810,141 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
             with stream_from(url=url, headers=headers) as streaming_response:
                 streaming_response.raise_for_status()
 
-                response = HttpResponse(content=streaming_response.raw, status=streaming_response.status_code)
-
                 etag = streaming_response.headers.get("ETag")
+
+                if streaming_response.status_code == 200:
+                    blob = CachedBlob(
+                        # iterating the raw response decodes the object's content-encoding, reading it would not
+                        content=b"".join(streaming_response.raw),
+                        etag=ensure_not_weak(etag) if etag else None,
+                        cache_control=streaming_response.headers.get("Cache-Control"),
+                    )
+                    blob_cache.set(file_key, blob)
+                    return self._blob_response(request, blob)
+
+                response = HttpResponse(content=streaming_response.raw, status=streaming_response.status_code)
                 if etag:
                     response["ETag"] = ensure_not_weak(etag)
-
-                # blobs are immutable, _really_ we can cache forever
-                # but let's cache for an hour since people won't re-watch too often
-                # we're setting cache control and ETag which might be considered overkill,
-                # but it helps avoid network latency from the client to PostHog, then to object storage, and back again
-                # when a client has a fresh copy
                 response["Cache-Control"] = streaming_response.headers.get("Cache-Control") or "max-age=3600"
-
                 response["Content-Type"] = "application/json"
                 response["Content-Disposition"] = "inline"
 
                 return response
 
+    @staticmethod
+    def _load_compacted_index(recording: SessionRecording) -> Optional[CompactedIndex]:
+        if not recording.object_storage_path:
+            return None
+
+        index_key = f"{recording.build_compacted_storage_path()}/{COMPACTED_INDEX_FILE}"
+        blob_cache = get_recording_blob_cache()
+        cached_index = blob_cache.get(index_key)
+        if not cached_index:
+            # most recordings are never compacted, listing lets us check without logging a failed read
+            if not object_storage.list_objects(index_key):
+                return None
+            content = object_storage.read_bytes(index_key)
+            if content is None:
+                return None
+            cached_index = CachedBlob(content=content)
+            blob_cache.set(index_key, cached_index)
+
+        return CompactedIndex.from_json(cached_index.content)
+
+    def _send_compacted_to_client(
+        self, recording: SessionRecording, request: request.Request, event_properties: dict
+    ) -> HttpResponse:
+        compacted_index = self._load_compacted_index(recording)
+        if not compacted_index:
+            raise exceptions.NotFound("Compacted recording not found")
+
+        chunk = request.GET.get("chunk")
+
+        event_properties["source"] = "compacted"
+        event_properties["chunk"] = chunk
+        posthoganalytics.capture(
+            self._distinct_id_from_request(request),
+            "session recording snapshots v2 loaded",
+            event_properties,
+        )
+
+        if chunk is None:
+            # the index is small enough to send whole, the player uses it to pick the chunks to load
+            response = JsonResponse(
+                {
+                    "chunks": [
+                        {
+                            "chunk": chunk_index,
+                            "start_timestamp": compacted_chunk.start_timestamp,
+                            "end_timestamp": compacted_chunk.end_timestamp,
+                            "keyframe": compacted_chunk.keyframe,
+                        }
+                        for chunk_index, compacted_chunk in enumerate(compacted_index.chunks)
+                    ]
+                }
+            )
+            response["Cache-Control"] = "max-age=3600"
+            return response
+
+        if not chunk.isdigit() or int(chunk) >= len(compacted_index.chunks):
+            raise exceptions.ValidationError(f"Invalid chunk: {chunk}")
+
+        data_key = f"{recording.build_compacted_storage_path()}/{COMPACTED_DATA_FILE}"
+        cache_key = f"{data_key}/{chunk}"
+        blob_cache = get_recording_blob_cache()
+        cached_chunk = blob_cache.get(cache_key)
+
+        if cached_chunk:
+            BLOB_CACHE_REQUESTS_COUNTER.labels(result="hit").inc()
+            BLOB_CACHE_BYTES_SAVED_COUNTER.inc(len(cached_chunk.content))
+        else:
+            BLOB_CACHE_REQUESTS_COUNTER.labels(result="miss").inc()
+            with STREAM_RESPONSE_TO_CLIENT_HISTOGRAM.time():
+                content = object_storage.read_bytes(data_key, byte_range=compacted_index.chunks[int(chunk)].byte_range)
+            if content is None:
+                raise exceptions.NotFound("Snapshot file not found")
+            cached_chunk = CachedBlob(content=decode_chunk(content))
+            blob_cache.set(cache_key, cached_chunk)
+
+        return self._blob_response(request, cached_chunk)
+
+    @staticmethod
+    def _blob_response(request: request.Request, blob: CachedBlob) -> HttpResponse:
+        """
+        Sends the blob, or the single byte range the client asked for,
+        so that players can fetch just the part of a recording they seek to.
+        """
+        size = len(blob.content)
+        try:
+            byte_range = parse_range_header(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range is None:
+            response = HttpResponse(content=blob.content, status=200)
+        else:
+            first_byte, last_byte = byte_range
+            response = HttpResponse(content=blob.content[first_byte : last_byte + 1], status=206)
+            response["Content-Range"] = f"bytes {first_byte}-{last_byte}/{size}"
+
+        response["Accept-Ranges"] = "bytes"
+        if blob.etag:
+            response["ETag"] = blob.etag
+
+        # blobs are immutable, _really_ we can cache forever
+        # but let's cache for an hour since people won't re-watch too often
+        # we're setting cache control and ETag which might be considered overkill,
+        # but it helps avoid network latency from the client to PostHog, then to object storage, and back again
+        # when a client has a fresh copy
+        response["Cache-Control"] = blob.cache_control or "max-age=3600"
+
+        response["Content-Type"] = "application/json"
+        response["Content-Disposition"] = "inline"
+
+        return response
+
     def _send_realtime_snapshots_to_client(
         self, recording: SessionRecording, request: request.Request, event_properties: dict
     ) -> HttpResponse | Response:
@@ -1039,7 +1207,9 @@ def safely_read_modifiers_overrides(distinct_id: str, team: Team) -> HogQLQueryM
         # )
         modifier_overrides = (flags_n_bags or {}).get("featureFlagPayloads", {}).get(flag_key, None)
         if modifier_overrides:
-            modifiers.optimizeJoinedFilters = json.loads(modifier_overrides).get("optimizeJoinedFilters", None)
+            overrides = json.loads(modifier_overrides)
+            modifiers.optimizeJoinedFilters = overrides.get("optimizeJoinedFilters", None)
+            modifiers.useReplayEventSummary = overrides.get("useReplayEventSummary", None)
     except:
         # be extra safe
         pass
@@ -0,0 +1,108 @@
+from django.conf import settings
+
+from posthog.clickhouse.table_engines import (
+    AggregatingMergeTree,
+    Distributed,
+    ReplicationScheme,
+)
+
+"""
+session_replay_event_summary: which events happened in each session, per hour, maintained from events at ingestion time.
+
+Filtering the recordings list by event name only needs to merge a handful of rows per session,
+instead of grouping every event in the date range by $session_id.
+The replay metrics for the session (duration, activity, console counts) are already in session_replay_events.
+"""
+
+SESSION_REPLAY_EVENT_SUMMARY_TABLE = "session_replay_event_summary"
+SESSION_REPLAY_EVENT_SUMMARY_DATA_TABLE = lambda: f"sharded_{SESSION_REPLAY_EVENT_SUMMARY_TABLE}"
+
+SESSION_REPLAY_EVENT_SUMMARY_TABLE_BASE_SQL = """
+CREATE TABLE IF NOT EXISTS {table_name} ON CLUSTER '{cluster}'
+(
+    team_id Int64,
+    session_id VARCHAR,
+    hour DateTime('UTC'),
+    event_names SimpleAggregateFunction(groupUniqArrayArray, Array(String)),
+    event_count SimpleAggregateFunction(sum, Int64),
+    first_timestamp SimpleAggregateFunction(min, DateTime64(6, 'UTC')),
+    last_timestamp SimpleAggregateFunction(max, DateTime64(6, 'UTC'))
+) ENGINE = {engine}
+"""
+
+SESSION_REPLAY_EVENT_SUMMARY_TABLE_ENGINE = lambda: AggregatingMergeTree(
+    SESSION_REPLAY_EVENT_SUMMARY_TABLE, replication_scheme=ReplicationScheme.SHARDED
+)
+
+SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL = lambda: (
+    SESSION_REPLAY_EVENT_SUMMARY_TABLE_BASE_SQL
+    + """
+    PARTITION BY toYYYYMM(hour)
+    ORDER BY (team_id, hour, session_id)
+    """
+).format(
+    table_name=SESSION_REPLAY_EVENT_SUMMARY_DATA_TABLE(),
+    cluster=settings.CLICKHOUSE_CLUSTER,
+    engine=SESSION_REPLAY_EVENT_SUMMARY_TABLE_ENGINE(),
+)
+
+WRITABLE_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL = lambda: SESSION_REPLAY_EVENT_SUMMARY_TABLE_BASE_SQL.format(
+    table_name=f"writable_{SESSION_REPLAY_EVENT_SUMMARY_TABLE}",
+    cluster=settings.CLICKHOUSE_CLUSTER,
+    engine=Distributed(
+        data_table=SESSION_REPLAY_EVENT_SUMMARY_DATA_TABLE(),
+        sharding_key="sipHash64(session_id)",
+    ),
+)
+
+DISTRIBUTED_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL = lambda: SESSION_REPLAY_EVENT_SUMMARY_TABLE_BASE_SQL.format(
+    table_name=SESSION_REPLAY_EVENT_SUMMARY_TABLE,
+    cluster=settings.CLICKHOUSE_CLUSTER,
+    engine=Distributed(
+        data_table=SESSION_REPLAY_EVENT_SUMMARY_DATA_TABLE(),
+        sharding_key="sipHash64(session_id)",
+    ),
+)
+
+SESSION_REPLAY_EVENT_SUMMARY_SELECT_SQL = (
+    lambda source_table, where="true": """
+SELECT
+    team_id,
+    `$session_id` AS session_id,
+    toStartOfHour(timestamp) AS hour,
+    groupUniqArray(event) AS event_names,
+    count() AS event_count,
+    min(timestamp) AS first_timestamp,
+    max(timestamp) AS last_timestamp
+FROM {database}.{source_table}
+WHERE notEmpty(`$session_id`) AND {where}
+GROUP BY team_id, session_id, hour
+""".format(
+        database=settings.CLICKHOUSE_DATABASE,
+        source_table=source_table,
+        where=where,
+    )
+)
+
+SESSION_REPLAY_EVENT_SUMMARY_MV_SQL = (
+    lambda: """
+CREATE MATERIALIZED VIEW IF NOT EXISTS {table_name}_mv ON CLUSTER '{cluster}'
+TO {database}.writable_{table_name}
+AS
+{select_sql}
+""".format(
+        table_name=SESSION_REPLAY_EVENT_SUMMARY_TABLE,
+        cluster=settings.CLICKHOUSE_CLUSTER,
+        database=settings.CLICKHOUSE_DATABASE,
+        select_sql=SESSION_REPLAY_EVENT_SUMMARY_SELECT_SQL("sharded_events"),
+    )
+)
+
+# Used to populate the table with events ingested before the materialized view existed
+SESSION_REPLAY_EVENT_SUMMARY_BACKFILL_SELECT_SQL = lambda where: SESSION_REPLAY_EVENT_SUMMARY_SELECT_SQL(
+    "events", where
+)
+
+TRUNCATE_SESSION_REPLAY_EVENT_SUMMARY_TABLE_SQL = lambda: (
+    f"TRUNCATE TABLE IF EXISTS {SESSION_REPLAY_EVENT_SUMMARY_DATA_TABLE()} ON CLUSTER '{settings.CLICKHOUSE_CLUSTER}'"
+)
@@ -1,3 +1,4 @@
+from io import BytesIO
 from unittest.mock import Mock
 
 
@@ -12,7 +13,7 @@ def setup_stream_from(headers: dict | None = None) -> Mock:
     # Setup status code and content if necessary
     streaming_interaction.status_code = 200
     streaming_interaction.content = b"Example content"
-    streaming_interaction.raw = b"Example content"
+    streaming_interaction.raw = BytesIO(b"Example content")
 
     # Setup headers and the .get method for headers
     streaming_interaction.headers = headers
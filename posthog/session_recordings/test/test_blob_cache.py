@@ -0,0 +1,80 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from posthog.session_recordings.blob_cache import (
+    CachedBlob,
+    RangeNotSatisfiable,
+    RecordingBlobCache,
+    parse_range_header,
+)
+
+
+@pytest.mark.parametrize(
+    "range_header,expected",
+    [
+        (None, None),
+        ("", None),
+        ("bytes=0-4", (0, 4)),
+        ("bytes=5-", (5, 9)),
+        ("bytes=-3", (7, 9)),
+        ("bytes=-30", (0, 9)),
+        ("bytes=8-100", (8, 9)),
+        ("bytes=0-1,4-5", None),
+        ("lines=0-4", None),
+    ],
+)
+def test_parse_range_header(range_header, expected):
+    assert parse_range_header(range_header, 10) == expected
+
+
+@pytest.mark.parametrize("range_header", ["bytes=10-", "bytes=5-4", "bytes=-0"])
+def test_parse_range_header_not_satisfiable(range_header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range_header(range_header, 10)
+
+
+def test_blob_cache_round_trip(tmp_path: Path):
+    cache = RecordingBlobCache(directory=str(tmp_path), max_bytes=100)
+
+    assert cache.get("session_recordings/a/1-2") is None
+
+    cache.set("session_recordings/a/1-2", CachedBlob(content=b"blob", etag='"etag"', cache_control="max-age=10"))
+
+    assert cache.get("session_recordings/a/1-2") == CachedBlob(
+        content=b"blob", etag='"etag"', cache_control="max-age=10"
+    )
+
+
+def test_blob_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = RecordingBlobCache(directory=str(tmp_path), max_bytes=100)
+
+    cache.set("first", CachedBlob(content=b"1" * 25))
+    cache.set("second", CachedBlob(content=b"2" * 25))
+    cache.set("third", CachedBlob(content=b"3" * 25))
+    # make "first" the oldest entry, then read it so that "second" is the least recently used
+    for index, key in enumerate(["first", "second", "third"]):
+        os.utime(f"{cache._path(key)}.blob", (time.time() - 100 + index, time.time() - 100 + index))
+    assert cache.get("first") is not None
+
+    cache.set("fourth", CachedBlob(content=b"4" * 25))
+    cache.set("fifth", CachedBlob(content=b"5" * 25))
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+    assert cache.get("fourth") is not None
+    assert cache.get("fifth") is not None
+
+
+def test_blob_cache_skips_large_blobs_and_can_be_disabled(tmp_path: Path):
+    cache = RecordingBlobCache(directory=str(tmp_path), max_bytes=100)
+    cache.set("large", CachedBlob(content=b"x" * 26))
+    assert cache.get("large") is None
+
+    disabled_cache = RecordingBlobCache(directory=str(tmp_path), max_bytes=0)
+    disabled_cache.set("small", CachedBlob(content=b"x"))
+    assert disabled_cache.get("small") is None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,74 @@
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+
+from posthog.session_recordings.compaction import (
+    CompactedIndex,
+    compact_blobs,
+    decode_blob,
+    decode_chunk,
+)
+
+
+def _line(timestamp: int, event_type: int = 3, padding: int = 0) -> bytes:
+    event = {"type": event_type, "timestamp": timestamp, "data": {"padding": "x" * padding}}
+    return json.dumps({"window_id": "w", "data": [event]}).encode("utf-8") + b"\n"
+
+
+@patch("posthog.session_recordings.compaction.COMPACTED_CHUNK_TARGET_BYTES", 200)
+@patch("posthog.session_recordings.compaction.COMPACTED_CHUNK_MAX_BYTES", 800)
+def test_compaction_splits_chunks_at_full_snapshots():
+    first_blob = _line(1000, event_type=2) + _line(1100, padding=200) + _line(1200)
+    second_blob = _line(1300, event_type=2) + _line(1400)
+
+    compacted, index = compact_blobs([first_blob, second_blob])
+
+    assert [(chunk.start_timestamp, chunk.end_timestamp, chunk.keyframe) for chunk in index.chunks] == [
+        (1000, 1200, True),
+        (1300, 1400, True),
+    ]
+    assert b"".join(decode_chunk(compacted[chunk.offset : chunk.offset + chunk.length]) for chunk in index.chunks) == (
+        first_blob + second_blob
+    )
+    # the chunks are gzip members, so the whole file is also valid gzip
+    assert gzip.decompress(compacted) == first_blob + second_blob
+
+
+@patch("posthog.session_recordings.compaction.COMPACTED_CHUNK_TARGET_BYTES", 100)
+@patch("posthog.session_recordings.compaction.COMPACTED_CHUNK_MAX_BYTES", 250)
+def test_compaction_forces_a_split_without_full_snapshots():
+    lines = [_line(1000 + i, padding=200) for i in range(3)]
+
+    compacted, index = compact_blobs([b"".join(lines)])
+
+    assert [(chunk.start_timestamp, chunk.keyframe) for chunk in index.chunks] == [
+        (1000, False),
+        (1001, False),
+        (1002, False),
+    ]
+    first_byte, last_byte = index.chunks[1].byte_range
+    assert decode_chunk(compacted[first_byte : last_byte + 1]) == lines[1]
+
+
+def test_compaction_skips_blank_lines_and_keeps_unparseable_ones():
+    compacted, index = compact_blobs([_line(1000) + b"\n\nnot json", _line(900)])
+
+    assert len(index.chunks) == 1
+    assert (index.start_timestamp, index.end_timestamp) == (900, 1000)
+    assert gzip.decompress(compacted) == _line(1000) + b"not json\n" + _line(900)
+
+
+def test_compacted_index_round_trip():
+    _, index = compact_blobs([_line(1000, event_type=2), _line(2000)])
+
+    assert CompactedIndex.from_json(index.to_json()) == index
+
+    with pytest.raises(ValueError):
+        CompactedIndex.from_json(b'{"version": 0, "chunks": []}')
+
+
+def test_decode_blob():
+    assert decode_blob(gzip.compress(b"content")) == b"content"
+    assert decode_blob(b"content") == b"content"
@@ -1,4 +1,5 @@
 import json
+import tempfile
 import time
 import uuid
 from datetime import UTC, datetime, timedelta
@@ -20,6 +21,7 @@ from posthog.models.filters.session_recordings_filter import SessionRecordingsFi
 from posthog.models.property import Property
 from posthog.models.team import Team
 from posthog.schema import RecordingsQuery, LogEntryPropertyFilter
+from posthog.session_recordings.compaction import compact_blobs
 from posthog.session_recordings.models.session_recording_event import (
     SessionRecordingViewed,
 )
@@ -856,6 +858,7 @@ class TestSessionRecordings(APIBaseTest, ClickhouseTestMixin, QueryMatchingTest)
         # default headers if the object store does nothing
         assert response.headers.__dict__ == {
             "_store": {
+                "accept-ranges": ("Accept-Ranges", "bytes"),
                 "content-type": ("Content-Type", "application/json"),
                 "cache-control": ("Cache-Control", "max-age=3600"),
                 "content-disposition": ("Content-Disposition", "inline"),
@@ -959,6 +962,137 @@ class TestSessionRecordings(APIBaseTest, ClickhouseTestMixin, QueryMatchingTest)
         assert mock_get_session_recording.call_count == 1
         assert _mock_exists.call_count == 1
 
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.SessionRecording.get_or_build")
+    @patch("posthog.session_recordings.session_recording_api.object_storage.get_presigned_url")
+    @patch(
+        "posthog.session_recordings.session_recording_api.stream_from",
+        return_value=setup_stream_from({"ETag": '"the-etag"'}),
+    )
+    def test_serves_session_recording_blobs_from_cache_with_ranges(
+        self,
+        mock_stream_from,
+        mock_presigned_url,
+        mock_get_session_recording,
+        _mock_exists,
+    ) -> None:
+        session_id = str(uuid.uuid4())
+        blob_key = f"1682608337071"
+        url = f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/?source=blob&blob_key={blob_key}"
+        mock_get_session_recording.return_value = SessionRecording(session_id=session_id, team=self.team, deleted=False)
+        mock_presigned_url.return_value = "https://test.com/"
+
+        with (
+            tempfile.TemporaryDirectory() as cache_dir,
+            self.settings(SESSION_RECORDING_BLOB_CACHE_DIR=cache_dir, SESSION_RECORDING_BLOB_CACHE_MAX_BYTES=1024),
+        ):
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == b"Example content"
+
+            response = self.client.get(url, HTTP_RANGE="bytes=8-14")
+            assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+            assert response.content == b"content"
+            assert response.headers.get("content-range") == "bytes 8-14/15"
+            assert response.headers.get("etag") == '"the-etag"'
+
+            response = self.client.get(url, HTTP_RANGE="bytes=20-")
+            assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+            assert response.headers.get("content-range") == "bytes */15"
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH='W/"the-etag"')
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        # only the first request went to object storage
+        assert mock_presigned_url.call_count == 1
+        assert mock_stream_from.call_count == 1
+
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.object_storage.read_bytes")
+    @patch("posthog.session_recordings.session_recording_api.object_storage.list_objects")
+    def test_can_load_compacted_recording_by_chunk(self, mock_list_objects, mock_read_bytes, _mock_exists) -> None:
+        session_id = str(uuid.uuid4())
+        recording = SessionRecording.objects.create(
+            team=self.team,
+            session_id=session_id,
+            storage_version="2023-08-01",
+            object_storage_path=f"session_recordings_lts/team_id/{self.team.pk}/session_id/{session_id}/data",
+        )
+        compacted_prefix = recording.build_compacted_storage_path()
+        first_line = b'{"window_id": "w", "data": [{"type": 2, "timestamp": 1682608337071}]}\n'
+        second_line = b'{"window_id": "w", "data": [{"type": 2, "timestamp": 1682608397071}]}\n'
+        with (
+            patch("posthog.session_recordings.compaction.COMPACTED_CHUNK_TARGET_BYTES", 1),
+            patch("posthog.session_recordings.compaction.COMPACTED_CHUNK_MAX_BYTES", 1),
+        ):
+            compacted, index = compact_blobs([first_line, second_line])
+
+        mock_list_objects.return_value = [f"{compacted_prefix}/index.json"]
+
+        def read_bytes(file_name, byte_range=None):
+            if file_name == f"{compacted_prefix}/index.json":
+                return index.to_json()
+            assert file_name == f"{compacted_prefix}/data"
+            return compacted[byte_range[0] : byte_range[1] + 1]
+
+        mock_read_bytes.side_effect = read_bytes
+        url = f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/"
+
+        response = self.client.get(f"{url}?compacted=true")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "sources": [
+                {
+                    "source": "compacted",
+                    "start_timestamp": "2023-04-27T15:12:17.071000Z",
+                    "end_timestamp": "2023-04-27T15:13:17.071000Z",
+                    "blob_key": None,
+                }
+            ]
+        }
+
+        response = self.client.get(f"{url}?source=compacted")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "chunks": [
+                {"chunk": 0, "start_timestamp": 1682608337071, "end_timestamp": 1682608337071, "keyframe": True},
+                {"chunk": 1, "start_timestamp": 1682608397071, "end_timestamp": 1682608397071, "keyframe": True},
+            ]
+        }
+
+        response = self.client.get(f"{url}?source=compacted&chunk=1")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == second_line
+
+        response = self.client.get(f"{url}?source=compacted&chunk=2")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.object_storage.list_objects")
+    def test_compacted_source_is_not_found_for_recordings_without_one(self, mock_list_objects, _mock_exists) -> None:
+        session_id = str(uuid.uuid4())
+        SessionRecording.objects.create(
+            team=self.team,
+            session_id=session_id,
+            storage_version="2023-08-01",
+            object_storage_path=f"session_recordings_lts/team_id/{self.team.pk}/session_id/{session_id}/data",
+        )
+        mock_list_objects.return_value = None
+
+        response = self.client.get(
+            f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/?source=compacted"
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     @parameterized.expand(
         [
             (
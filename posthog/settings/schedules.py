@@ -3,6 +3,12 @@ from posthog.settings.utils import get_from_env
 
 USE_PRECALCULATED_CH_COHORT_PEOPLE = not TEST
 
+# Cohorts are recalculated by writing only the persons who joined or left since the last calculation,
+# unless more than this many did, in which case every member is written under a new version. Use 0 to always do that.
+COHORT_INCREMENTAL_RECALCULATION_MAX_CHANGES = get_from_env(
+    "COHORT_INCREMENTAL_RECALCULATION_MAX_CHANGES", 100_000, type_cast=int
+)
+
 # Schedules to recalculate cohorts. Follows crontab syntax.
 CALCULATE_COHORTS_DAY_SCHEDULE = get_from_env(
     "CALCULATE_COHORTS_DAY_SCHEDULE",
@@ -16,6 +22,9 @@ CALCULATE_COHORTS_NIGHT_SCHEDULE = get_from_env(
 )
 CALCULATE_X_PARALLEL_COHORTS_DURING_NIGHT = get_from_env("CALCULATE_X_PARALLEL_COHORTS_DURING_NIGHT", 5, type_cast=int)
 
+# Maximum number of cohorts of one team that are calculated at once by the cohort schedules
+CALCULATE_COHORTS_MAX_CONCURRENT_PER_TEAM = get_from_env("CALCULATE_COHORTS_MAX_CONCURRENT_PER_TEAM", 2, type_cast=int)
+
 ACTION_EVENT_MAPPING_INTERVAL_SECONDS = get_from_env("ACTION_EVENT_MAPPING_INTERVAL_SECONDS", 300, type_cast=int)
 
 # Schedule to syncronize insight cache states on. Follows crontab syntax.
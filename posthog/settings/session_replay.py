@@ -1,4 +1,8 @@
+import os
+import tempfile
+
 from posthog.settings import get_from_env, get_list
+from posthog.settings.base_variables import TEST
 from posthog.utils import str_to_bool
 
 # TRICKY: we saw unusual memory usage behavior in EU clickhouse cluster
@@ -39,3 +43,13 @@ SESSION_REPLAY_RRWEB_SCRIPT = get_from_env("SESSION_REPLAY_RRWEB_SCRIPT", None,
 # a list of teams that are allowed to use the SESSION_REPLAY_RRWEB_SCRIPT
 # can be a comma separated list of team ids or '*' to allow all teams
 SESSION_REPLAY_RRWEB_SCRIPT_ALLOWED_TEAMS = get_list(get_from_env("SESSION_REPLAY_RRWEB_SCRIPT_ALLOWED_TEAMS", ""))
+
+# immutable recording blobs are cached on local disk, so popular recordings aren't fetched from object storage
+# for every viewer. The directory can be shared by all web workers on a host. Set the max size to 0 to disable it,
+# which is the default in tests so they always exercise object storage
+SESSION_RECORDING_BLOB_CACHE_DIR = get_from_env(
+    "SESSION_RECORDING_BLOB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "posthog-session-recording-blobs")
+)
+SESSION_RECORDING_BLOB_CACHE_MAX_BYTES = get_from_env(
+    "SESSION_RECORDING_BLOB_CACHE_MAX_BYTES", 0 if TEST else 512 * 1024 * 1024, type_cast=int
+)
@@ -39,3 +39,10 @@ CLICKHOUSE_MAX_BLOCK_SIZE_OVERRIDES: dict[int, int] = dict(
     [map(int, o.split(":")) for o in os.getenv("CLICKHOUSE_MAX_BLOCK_SIZE_OVERRIDES", "").split(",") if o]  # type: ignore
 )
 CLICKHOUSE_OFFLINE_5MIN_CLUSTER_HOST: str | None = os.getenv("CLICKHOUSE_OFFLINE_5MIN_CLUSTER_HOST", None)
+
+# Maximum number of data modeling models materialized concurrently in a single run
+DATA_MODELING_MAX_CONCURRENT_MODELS: int = get_from_env("DATA_MODELING_MAX_CONCURRENT_MODELS", 4, type_cast=int)
+# ClickHouse memory budget shared by all models materialized concurrently in a single run
+DATA_MODELING_MAX_MEMORY_USAGE: int = get_from_env(
+    "DATA_MODELING_MAX_MEMORY_USAGE", 100 * 1000 * 1000 * 1000, type_cast=int
+)
@@ -40,6 +40,10 @@ DECIDE_SKIP_POSTGRES_FLAGS = get_from_env("DECIDE_SKIP_POSTGRES_FLAGS", False, t
 
 DECIDE_BILLING_SAMPLING_RATE = get_from_env("DECIDE_BILLING_SAMPLING_RATE", 0.1, type_cast=float)
 DECIDE_BILLING_ANALYTICS_TOKEN = get_from_env("DECIDE_BILLING_ANALYTICS_TOKEN", None, type_cast=str, optional=True)
+# Request counts are buffered in each process and written to redis at most this often. 0 writes every increment.
+DECIDE_REQUEST_COUNTS_FLUSH_INTERVAL_SECONDS = get_from_env(
+    "DECIDE_REQUEST_COUNTS_FLUSH_INTERVAL_SECONDS", 0 if TEST else 5, type_cast=float
+)
 
 # temporary, used for safe rollout of defaulting people into anonymous events / process_persons: identified_only
 DEFAULT_IDENTIFIED_ONLY_TEAM_ID_MIN: int = get_from_env("DEFAULT_IDENTIFIED_ONLY_TEAM_ID_MIN", 1000000, type_cast=int)
@@ -1,5 +1,5 @@
 import abc
-from typing import Optional, Union
+from typing import IO, Optional, Union
 
 import structlog
 from boto3 import client
@@ -34,7 +34,7 @@ class ObjectStorageClient(metaclass=abc.ABCMeta):
         pass
 
     @abc.abstractmethod
-    def read_bytes(self, bucket: str, key: str) -> Optional[bytes]:
+    def read_bytes(self, bucket: str, key: str, byte_range: Optional[tuple[int, int]] = None) -> Optional[bytes]:
         pass
 
     @abc.abstractmethod
@@ -45,6 +45,10 @@ class ObjectStorageClient(metaclass=abc.ABCMeta):
     def write(self, bucket: str, key: str, content: Union[str, bytes], extras: dict | None) -> None:
         pass
 
+    @abc.abstractmethod
+    def write_file(self, bucket: str, key: str, file: IO[bytes], extras: dict | None) -> None:
+        pass
+
     @abc.abstractmethod
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         """
@@ -66,7 +70,7 @@ class UnavailableStorage(ObjectStorageClient):
     def read(self, bucket: str, key: str) -> Optional[str]:
         pass
 
-    def read_bytes(self, bucket: str, key: str) -> Optional[bytes]:
+    def read_bytes(self, bucket: str, key: str, byte_range: Optional[tuple[int, int]] = None) -> Optional[bytes]:
         pass
 
     def tag(self, bucket: str, key: str, tags: dict[str, str]) -> None:
@@ -75,6 +79,9 @@ class UnavailableStorage(ObjectStorageClient):
     def write(self, bucket: str, key: str, content: Union[str, bytes], extras: dict | None) -> None:
         pass
 
+    def write_file(self, bucket: str, key: str, file: IO[bytes], extras: dict | None) -> None:
+        pass
+
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         pass
 
@@ -127,10 +134,16 @@ class ObjectStorage(ObjectStorageClient):
         else:
             return None
 
-    def read_bytes(self, bucket: str, key: str) -> Optional[bytes]:
+    def read_bytes(self, bucket: str, key: str, byte_range: Optional[tuple[int, int]] = None) -> Optional[bytes]:
         s3_response = {}
         try:
-            s3_response = self.aws_client.get_object(Bucket=bucket, Key=key)
+            if byte_range:
+                # inclusive first and last byte, as in an HTTP Range header
+                s3_response = self.aws_client.get_object(
+                    Bucket=bucket, Key=key, Range=f"bytes={byte_range[0]}-{byte_range[1]}"
+                )
+            else:
+                s3_response = self.aws_client.get_object(Bucket=bucket, Key=key)
             return s3_response["Body"].read()
         except Exception as e:
             logger.exception(
@@ -170,6 +183,15 @@ class ObjectStorage(ObjectStorageClient):
             capture_exception(e)
             raise ObjectStorageError("write failed") from e
 
+    def write_file(self, bucket: str, key: str, file: IO[bytes], extras: dict | None) -> None:
+        """Upload the contents of a file object, using a multipart upload if it's large enough."""
+        try:
+            self.aws_client.upload_fileobj(Fileobj=file, Bucket=bucket, Key=key, ExtraArgs=extras)
+        except Exception as e:
+            logger.exception("object_storage.write_file_failed", bucket=bucket, file_name=key, error=e)
+            capture_exception(e)
+            raise ObjectStorageError("write failed") from e
+
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         try:
             source_objects = self.list_objects(bucket, source_prefix) or []
@@ -227,6 +249,15 @@ def write(file_name: str, content: Union[str, bytes], extras: dict | None = None
     )
 
 
+def write_file(file_name: str, file: IO[bytes], extras: dict | None = None, bucket: str | None = None) -> None:
+    return object_storage_client().write_file(
+        bucket=bucket or settings.OBJECT_STORAGE_BUCKET,
+        key=file_name,
+        file=file,
+        extras=extras,
+    )
+
+
 def tag(file_name: str, tags: dict[str, str]) -> None:
     return object_storage_client().tag(bucket=settings.OBJECT_STORAGE_BUCKET, key=file_name, tags=tags)
 
@@ -235,8 +266,10 @@ def read(file_name: str, bucket: str | None = None) -> Optional[str]:
     return object_storage_client().read(bucket=bucket or settings.OBJECT_STORAGE_BUCKET, key=file_name)
 
 
-def read_bytes(file_name: str) -> Optional[bytes]:
-    return object_storage_client().read_bytes(bucket=settings.OBJECT_STORAGE_BUCKET, key=file_name)
+def read_bytes(file_name: str, byte_range: Optional[tuple[int, int]] = None) -> Optional[bytes]:
+    return object_storage_client().read_bytes(
+        bucket=settings.OBJECT_STORAGE_BUCKET, key=file_name, byte_range=byte_range
+    )
 
 
 def list_objects(prefix: str) -> Optional[list[str]]:
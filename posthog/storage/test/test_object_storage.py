@@ -13,6 +13,7 @@ from posthog.settings import (
 from posthog.storage.object_storage import (
     health_check,
     read,
+    read_bytes,
     write,
     get_presigned_url,
     list_objects,
@@ -60,6 +61,13 @@ class TestStorage(APIBaseTest):
             write(file_name, b"my content")
             self.assertEqual(read(file_name), "my content")
 
+    def test_can_read_a_byte_range(self) -> None:
+        with self.settings(OBJECT_STORAGE_ENABLED=True):
+            file_name = f"{TEST_BUCKET}/test_can_read_a_byte_range/{uuid.uuid4()}"
+            write(file_name, b"my content")
+            self.assertEqual(read_bytes(file_name, byte_range=(3, 6)), b"cont")
+            self.assertEqual(read_bytes(file_name), b"my content")
+
     def test_can_generate_presigned_url_for_existing_file(self) -> None:
         with self.settings(OBJECT_STORAGE_ENABLED=True):
             session_id = str(uuid.uuid4())
@@ -0,0 +1,133 @@
+"""
+Rolling seasonal baselines for anomaly alerts.
+
+For every series of the insight, the baseline keeps an exponentially weighted mean and variance of the values seen in
+each season bucket (the hour of the week for hourly trends, the day of the week for daily trends). Each check folds in
+only the intervals completed since the previous check, so history is only queried when the baseline is first built.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from posthog.schema import IntervalType
+
+# Once a bucket has this many samples, older values keep losing weight instead of every value counting equally
+BASELINE_WINDOW = 8
+# Buckets with fewer samples than this are not evaluated
+BASELINE_MIN_SAMPLES = 3
+# Stops baselines with (nearly) no variance from flagging every small change
+BASELINE_MIN_RELATIVE_STDDEV = 0.05
+BASELINE_MIN_STDDEV = 1e-9
+
+# How many intervals of history to build a new baseline from
+BASELINE_HISTORY_INTERVALS = {
+    IntervalType.HOUR: 24 * 7 * 4,
+    IntervalType.DAY: 7 * 8,
+    IntervalType.WEEK: 12,
+    IntervalType.MONTH: 12,
+}
+
+INTERVAL_LENGTHS = {
+    IntervalType.HOUR: timedelta(hours=1),
+    IntervalType.DAY: timedelta(days=1),
+    IntervalType.WEEK: timedelta(weeks=1),
+    IntervalType.MONTH: timedelta(days=28),
+}
+
+
+@dataclass
+class BucketStats:
+    n: int = 0
+    mean: float = 0.0
+    variance: float = 0.0
+
+    def add(self, value: float) -> None:
+        # Until the window is full this is Welford's algorithm for the (population) variance
+        self.n = min(self.n + 1, BASELINE_WINDOW)
+        alpha = 1 / self.n
+        delta = value - self.mean
+        self.mean += alpha * delta
+        self.variance = (1 - alpha) * (self.variance + alpha * delta * delta)
+
+    @property
+    def stddev(self) -> float:
+        return max(math.sqrt(self.variance), BASELINE_MIN_RELATIVE_STDDEV * abs(self.mean), BASELINE_MIN_STDDEV)
+
+    def z_score(self, value: float) -> Optional[float]:
+        if self.n < BASELINE_MIN_SAMPLES:
+            return None
+        return (value - self.mean) / self.stddev
+
+
+@dataclass
+class SeasonalBaseline:
+    fingerprint: str
+    interval: IntervalType
+    # Start of the newest interval folded into the baseline, formatted like the `days` of trend results
+    last_interval: Optional[str] = None
+    # Result of evaluating the newest interval, reported again until the next interval completes
+    last_value: Optional[float] = None
+    last_breaches: list[str] = field(default_factory=list)
+    series: dict[str, dict[str, BucketStats]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, data: Optional[dict[str, Any]], fingerprint: str, interval: IntervalType) -> "SeasonalBaseline":
+        """Loads the stored baseline, or starts a new one if the insight or its interval changed since."""
+        if not data or data.get("fingerprint") != fingerprint or data.get("interval") != interval:
+            return cls(fingerprint=fingerprint, interval=interval)
+        return cls(
+            fingerprint=fingerprint,
+            interval=interval,
+            last_interval=data.get("last_interval"),
+            last_value=data.get("last_value"),
+            last_breaches=data.get("last_breaches", []),
+            series={
+                label: {bucket: BucketStats(**stats) for bucket, stats in buckets.items()}
+                for label, buckets in data.get("series", {}).items()
+            },
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "interval": self.interval,
+            "last_interval": self.last_interval,
+            "last_value": self.last_value,
+            "last_breaches": self.last_breaches,
+            "series": {
+                label: {
+                    bucket: {"n": stats.n, "mean": stats.mean, "variance": stats.variance}
+                    for bucket, stats in buckets.items()
+                }
+                for label, buckets in self.series.items()
+            },
+        }
+
+    def intervals_to_fetch(self, now: datetime) -> int:
+        """
+        How many intervals back the trend has to be calculated to update the baseline. `now` is the naive local time
+        in the team's timezone, like the `days` of trend results.
+        """
+        history = BASELINE_HISTORY_INTERVALS[self.interval]
+        if self.last_interval is None:
+            return history
+        missed = (now - datetime.fromisoformat(self.last_interval)) / INTERVAL_LENGTHS[self.interval]
+        return max(2, min(history, math.ceil(missed) + 1))
+
+    def is_new(self, interval: str) -> bool:
+        return self.last_interval is None or interval > self.last_interval
+
+    def stats(self, label: str, interval: str) -> BucketStats:
+        return self.series.setdefault(label, {}).setdefault(self._bucket(interval), BucketStats())
+
+    def _bucket(self, interval: str) -> str:
+        start = datetime.fromisoformat(interval)
+        match self.interval:
+            case IntervalType.HOUR:
+                return str(start.weekday() * 24 + start.hour)
+            case IntervalType.DAY:
+                return str(start.weekday())
+            case _:
+                return "all"
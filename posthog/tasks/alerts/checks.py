@@ -30,6 +30,7 @@ from django.db.models import Q, F
 from collections import defaultdict
 from posthog.tasks.alerts.utils import (
     AlertEvaluationResult,
+    InsightCalculations,
     calculation_interval_to_order,
     send_notifications_for_breaches,
     send_notifications_for_errors,
@@ -187,7 +188,7 @@ def check_alerts_task() -> None:
         )
         .filter(Q(snoozed_until__isnull=True) | Q(snoozed_until__lt=now))
         .order_by(F("next_check_at").asc(nulls_first=True))
-        .only("id", "team", "calculation_interval")
+        .only("id", "team", "insight", "calculation_interval")
     )
 
     sorted_alerts = sorted(
@@ -197,13 +198,19 @@ def check_alerts_task() -> None:
         ),
     )
 
-    grouped_by_team = defaultdict(list)
+    # Alerts watching the same insight are checked together, so that the insight is only calculated once
+    grouped_by_team: dict[int, dict[int, list[str]]] = defaultdict(lambda: defaultdict(list))
     for alert in sorted_alerts:
-        grouped_by_team[alert.team].append(alert.id)
+        grouped_by_team[alert.team_id][alert.insight_id].append(str(alert.id))
 
-    for alert_ids in grouped_by_team.values():
+    for alert_ids_by_insight in grouped_by_team.values():
         # We chain the task execution to prevent queries *for a single team* running at the same time
-        chain(*(check_alert_task.si(str(alert_id)).set(expires=expire_after) for alert_id in alert_ids))()
+        chain(
+            *(
+                check_alerts_for_insight_task.si(alert_ids).set(expires=expire_after)
+                for alert_ids in alert_ids_by_insight.values()
+            )
+        )()
 
 
 @shared_task(
@@ -221,7 +228,39 @@ def check_alert_task(alert_id: str) -> None:
         check_alert(alert_id, capture_ph_event)
 
 
-def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwargs: None) -> None:
+@shared_task(
+    ignore_result=True,
+    queue=CeleryQueue.ALERTS.value,
+    autoretry_for=(CHQueryErrorTooManySimultaneousQueries,),
+    retry_backoff=1,
+    retry_backoff_max=10,
+    max_retries=3,
+    expires=60 * 60,
+)
+def check_alerts_for_insight_task(alert_ids: list[str]) -> None:
+    """
+    Checks alerts watching the same insight, sharing the insight calculations between them.
+    """
+    calculations = InsightCalculations()
+    first_error: Exception | None = None
+
+    with ph_us_client() as capture_ph_event:
+        for alert_id in alert_ids:
+            try:
+                check_alert(alert_id, capture_ph_event, calculations)
+            except Exception as err:
+                # Check the remaining alerts before raising, alerts already checked are skipped if the task is retried
+                first_error = first_error or err
+
+    if first_error is not None:
+        raise first_error
+
+
+def check_alert(
+    alert_id: str,
+    capture_ph_event: Callable = lambda *args, **kwargs: None,
+    calculations: InsightCalculations | None = None,
+) -> None:
     try:
         alert = AlertConfiguration.objects.get(id=alert_id, enabled=True)
     except AlertConfiguration.DoesNotExist:
@@ -264,7 +303,7 @@ def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwar
     alert.save()
 
     try:
-        check_alert_and_notify_atomically(alert, capture_ph_event)
+        check_alert_and_notify_atomically(alert, capture_ph_event, calculations)
     except Exception as err:
         ALERT_CHECK_ERROR_COUNTER.inc()
         user = cast(User, alert.created_by)
@@ -301,7 +340,9 @@ def check_alert(alert_id: str, capture_ph_event: Callable = lambda *args, **kwar
 
 
 @transaction.atomic
-def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_event: Callable) -> None:
+def check_alert_and_notify_atomically(
+    alert: AlertConfiguration, capture_ph_event: Callable, calculations: InsightCalculations | None = None
+) -> None:
     """
     Computes insight results, checks alert for breaches and notifies user.
     Only commits updates to alert state if all of the above complete successfully.
@@ -328,7 +369,7 @@ def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_even
 
     # 1. Evaluate insight and get alert value
     try:
-        alert_evaluation_result = check_alert_for_insight(alert)
+        alert_evaluation_result = check_alert_for_insight(alert, calculations)
         value = alert_evaluation_result.value
         breaches = alert_evaluation_result.breaches
     except CHQueryErrorTooManySimultaneousQueries:
@@ -383,7 +424,9 @@ def check_alert_and_notify_atomically(alert: AlertConfiguration, capture_ph_even
         raise
 
 
-def check_alert_for_insight(alert: AlertConfiguration) -> AlertEvaluationResult:
+def check_alert_for_insight(
+    alert: AlertConfiguration, calculations: InsightCalculations | None = None
+) -> AlertEvaluationResult:
     """
     Matches insight type with alert checking logic
     """
@@ -400,7 +443,7 @@ def check_alert_for_insight(alert: AlertConfiguration) -> AlertEvaluationResult:
         match kind:
             case "TrendsQuery":
                 query = TrendsQuery.model_validate(query)
-                return check_trends_alert(alert, insight, query)
+                return check_trends_alert(alert, insight, query, calculations)
             case _:
                 raise NotImplementedError(f"AlertCheckError: Alerts for {query.kind} are not supported yet")
 
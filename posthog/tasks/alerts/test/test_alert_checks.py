@@ -6,10 +6,12 @@ from freezegun import freeze_time
 from posthog.models.alert import AlertCheck
 from posthog.models.instance_setting import set_instance_setting
 from posthog.tasks.alerts.utils import send_notifications_for_breaches
-from posthog.tasks.alerts.checks import check_alert
+from posthog.tasks.alerts.checks import check_alert, check_alerts_for_insight_task
 from posthog.test.base import APIBaseTest, _create_event, flush_persons_and_events, ClickhouseDestroyTablesMixin
 from posthog.api.test.dashboards import DashboardAPI
 from posthog.schema import ChartDisplayType, EventsNode, TrendsQuery, TrendsFilter, AlertState
+from posthog.api.services.query import ExecutionMode
+from posthog.caching.calculate_results import calculate_for_query_based_insight
 from posthog.tasks.test.utils_email_tests import mock_email_messages
 from posthog.models import AlertConfiguration
 
@@ -389,3 +391,64 @@ class TestAlertChecks(APIBaseTest, ClickhouseDestroyTablesMixin):
         assert mock_send_notifications_for_breaches.call_count == 1
         second_check = AlertCheck.objects.filter(alert_configuration=self.alert["id"]).latest("created_at")
         assert first_check.id == second_check.id
+
+    def test_alerts_on_the_same_insight_share_the_calculation(
+        self, mock_send_notifications_for_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        self.set_thresholds(lower=1)
+        other_alert = self.client.post(
+            f"/api/projects/{self.team.id}/alerts",
+            data={
+                "name": "other alert",
+                "insight": self.insight["id"],
+                "subscribed_users": [self.user.id],
+                "calculation_interval": "daily",
+                "config": {"type": "TrendsAlertConfig", "series_index": 0},
+                "condition": {"type": "absolute_value"},
+                "threshold": {"configuration": {"type": "absolute", "bounds": {"upper": 5}}},
+            },
+        ).json()
+
+        with patch(
+            "posthog.tasks.alerts.trends.calculate_for_query_based_insight", wraps=calculate_for_query_based_insight
+        ) as mock_calculate_for_query_based_insight:
+            check_alerts_for_insight_task([self.alert["id"], other_alert["id"]])
+
+        execution_modes = [
+            call.kwargs["execution_mode"] for call in mock_calculate_for_query_based_insight.call_args_list
+        ]
+        # At most one lookup in the cache and one calculation, for both alerts
+        assert execution_modes.count(ExecutionMode.CACHE_ONLY_NEVER_CALCULATE) == 1
+        assert execution_modes.count(ExecutionMode.CALCULATE_BLOCKING_ALWAYS) <= 1
+
+        assert AlertCheck.objects.get(alert_configuration=self.alert["id"]).state == AlertState.FIRING
+        assert AlertCheck.objects.get(alert_configuration=other_alert["id"]).state == AlertState.NOT_FIRING
+        assert mock_send_notifications_for_breaches.call_count == 1
+
+    def test_alert_reuses_fresh_cached_insight_results(
+        self, mock_send_notifications_for_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        self.set_thresholds(upper=0)
+        check_alert(self.alert["id"])
+        assert (
+            AlertCheck.objects.filter(alert_configuration=self.alert["id"]).latest("created_at").calculated_value == 0
+        )
+
+        with freeze_time("2024-06-02T07:55:00.000Z"):
+            _create_event(team=self.team, event="$pageview", distinct_id="1")
+            flush_persons_and_events()
+
+        # Refreshed less than an hour ago for a daily alert, so the cached results are used
+        with freeze_time("2024-06-02T09:00:00.000Z"):
+            AlertConfiguration.objects.filter(pk=self.alert["id"]).update(next_check_at=None)
+            check_alert(self.alert["id"])
+            check = AlertCheck.objects.filter(alert_configuration=self.alert["id"]).latest("created_at")
+            assert check.calculated_value == 0
+            assert check.state == AlertState.NOT_FIRING
+
+        with freeze_time("2024-06-02T10:00:00.000Z"):
+            AlertConfiguration.objects.filter(pk=self.alert["id"]).update(next_check_at=None)
+            check_alert(self.alert["id"])
+            check = AlertCheck.objects.filter(alert_configuration=self.alert["id"]).latest("created_at")
+            assert check.calculated_value == 1
+            assert check.state == AlertState.FIRING
@@ -0,0 +1,102 @@
+from datetime import datetime
+from unittest import TestCase
+
+import pytest
+
+from posthog.schema import IntervalType
+from posthog.tasks.alerts.anomaly import (
+    BASELINE_HISTORY_INTERVALS,
+    BASELINE_WINDOW,
+    BucketStats,
+    SeasonalBaseline,
+)
+
+
+class TestBucketStats(TestCase):
+    def test_matches_mean_and_variance_until_window_is_full(self):
+        stats = BucketStats()
+        values = [4.0, 8.0, 6.0, 2.0]
+        for value in values:
+            stats.add(value)
+
+        mean = sum(values) / len(values)
+        assert stats.n == len(values)
+        assert stats.mean == pytest.approx(mean)
+        assert stats.variance == pytest.approx(sum((value - mean) ** 2 for value in values) / len(values))
+
+    def test_forgets_old_values_once_window_is_full(self):
+        stats = BucketStats()
+        for _ in range(BASELINE_WINDOW):
+            stats.add(100.0)
+        for _ in range(BASELINE_WINDOW * 10):
+            stats.add(10.0)
+
+        assert stats.n == BASELINE_WINDOW
+        assert stats.mean == pytest.approx(10.0, rel=0.01)
+
+    def test_z_score(self):
+        stats = BucketStats()
+        stats.add(10.0)
+        stats.add(12.0)
+        # not enough samples yet
+        assert stats.z_score(100.0) is None
+
+        stats.add(14.0)
+        assert stats.z_score(12.0) == pytest.approx(0.0)
+        assert stats.z_score(12.0 + 3 * stats.stddev) == pytest.approx(3.0)
+
+    def test_constant_values_use_minimum_stddev(self):
+        stats = BucketStats()
+        for _ in range(5):
+            stats.add(100.0)
+
+        # 5% of the mean instead of 0, so that a small change isn't an anomaly
+        assert stats.z_score(104.0) == pytest.approx(0.8)
+
+
+class TestSeasonalBaseline(TestCase):
+    def test_round_trips_through_json(self):
+        baseline = SeasonalBaseline(fingerprint="abc", interval=IntervalType.DAY)
+        for day, value in [("2024-06-03", 5.0), ("2024-06-04", 7.0), ("2024-06-10", 6.0)]:
+            baseline.stats("signed_up", day).add(value)
+        baseline.last_interval = "2024-06-10"
+        baseline.last_value = 4.5
+        baseline.last_breaches = ["breach"]
+
+        loaded = SeasonalBaseline.load(baseline.to_dict(), "abc", IntervalType.DAY)
+
+        assert loaded == baseline
+        # both Mondays share the same bucket
+        assert loaded.stats("signed_up", "2024-06-17").n == 2
+
+    def test_resets_when_query_or_interval_changes(self):
+        baseline = SeasonalBaseline(fingerprint="abc", interval=IntervalType.DAY, last_interval="2024-06-10")
+        baseline.stats("signed_up", "2024-06-10").add(1.0)
+
+        assert SeasonalBaseline.load(baseline.to_dict(), "def", IntervalType.DAY).series == {}
+        assert SeasonalBaseline.load(baseline.to_dict(), "abc", IntervalType.WEEK).last_interval is None
+        assert SeasonalBaseline.load(None, "abc", IntervalType.DAY).last_interval is None
+
+    def test_hourly_buckets_by_hour_of_week(self):
+        baseline = SeasonalBaseline(fingerprint="abc", interval=IntervalType.HOUR)
+        baseline.stats("signed_up", "2024-06-03 08:00:00").add(1.0)
+
+        assert baseline.stats("signed_up", "2024-06-10 08:00:00").n == 1
+        assert baseline.stats("signed_up", "2024-06-10 09:00:00").n == 0
+        assert baseline.stats("signed_up", "2024-06-11 08:00:00").n == 0
+
+    def test_intervals_to_fetch(self):
+        now = datetime(2024, 6, 4, 8, 55)
+
+        baseline = SeasonalBaseline(fingerprint="abc", interval=IntervalType.HOUR)
+        assert baseline.intervals_to_fetch(now) == BASELINE_HISTORY_INTERVALS[IntervalType.HOUR]
+
+        # the 07:00 interval is the only one completed since
+        baseline.last_interval = "2024-06-04 06:00:00"
+        assert baseline.intervals_to_fetch(now) == 4
+
+        baseline.last_interval = "2024-01-01 00:00:00"
+        assert baseline.intervals_to_fetch(now) == BASELINE_HISTORY_INTERVALS[IntervalType.HOUR]
+
+        daily = SeasonalBaseline(fingerprint="abc", interval=IntervalType.DAY, last_interval="2024-06-02")
+        assert daily.intervals_to_fetch(now) == 4
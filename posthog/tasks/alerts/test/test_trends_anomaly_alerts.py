@@ -0,0 +1,221 @@
+from typing import Optional, Any
+from unittest.mock import ANY, MagicMock, patch
+import dateutil
+
+
+import dateutil.relativedelta
+import pytest
+from freezegun import freeze_time
+
+from posthog.models.alert import AlertCheck
+from posthog.models.instance_setting import set_instance_setting
+from posthog.tasks.alerts.checks import check_alert
+from posthog.test.base import APIBaseTest, _create_event, flush_persons_and_events, ClickhouseDestroyTablesMixin
+from posthog.api.test.dashboards import DashboardAPI
+from posthog.schema import (
+    ChartDisplayType,
+    EventsNode,
+    TrendsQuery,
+    TrendsFilter,
+    IntervalType,
+    InsightDateRange,
+    BaseMathType,
+    AlertState,
+    AlertCalculationInterval,
+    AlertConditionType,
+    InsightThresholdType,
+)
+from posthog.models import AlertConfiguration
+
+# Tuesday
+FROZEN_TIME = dateutil.parser.parse("2024-06-04T08:55:00.000Z")
+
+
+@freeze_time(FROZEN_TIME)
+@patch("posthog.tasks.alerts.checks.send_notifications_for_errors")
+@patch("posthog.tasks.alerts.checks.send_notifications_for_breaches")
+class TestTimeSeriesTrendsAnomalyAlerts(APIBaseTest, ClickhouseDestroyTablesMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        set_instance_setting("EMAIL_HOST", "fake_host")
+        set_instance_setting("EMAIL_ENABLED", True)
+
+        self.dashboard_api = DashboardAPI(self.client, self.team, self.assertEqual)
+
+    def create_alert(
+        self,
+        insight: dict,
+        lower: Optional[float] = None,
+        upper: Optional[float] = None,
+        calculation_interval: AlertCalculationInterval = AlertCalculationInterval.DAILY,
+    ) -> dict:
+        alert = self.client.post(
+            f"/api/projects/{self.team.id}/alerts",
+            data={
+                "name": "alert name",
+                "insight": insight["id"],
+                "subscribed_users": [self.user.id],
+                "config": {
+                    "type": "TrendsAlertConfig",
+                    "series_index": 0,
+                },
+                "condition": {"type": AlertConditionType.ANOMALY},
+                "calculation_interval": calculation_interval,
+                "threshold": {
+                    "configuration": {
+                        "type": InsightThresholdType.ABSOLUTE,
+                        "bounds": {"lower": lower, "upper": upper},
+                    }
+                },
+            },
+        ).json()
+
+        return alert
+
+    def create_time_series_trend_insight(self, display: ChartDisplayType) -> dict[str, Any]:
+        query_dict = TrendsQuery(
+            series=[
+                EventsNode(
+                    event="signed_up",
+                    math=BaseMathType.TOTAL,
+                ),
+            ],
+            trendsFilter=TrendsFilter(display=display),
+            interval=IntervalType.DAY,
+            dateRange=InsightDateRange(date_from="-14d"),
+        ).model_dump()
+
+        insight = self.dashboard_api.create_insight(
+            data={
+                "name": "insight",
+                "query": query_dict,
+            }
+        )[1]
+
+        return insight
+
+    def create_sign_ups(self, weeks_ago: int, count: int) -> None:
+        # on Mondays, which all end up in the same bucket of the baseline
+        monday = FROZEN_TIME - dateutil.relativedelta.relativedelta(days=1, weeks=weeks_ago)
+        with freeze_time(monday):
+            for i in range(count):
+                _create_event(team=self.team, event="signed_up", distinct_id=f"{weeks_ago}_{i}")
+            flush_persons_and_events()
+
+    def test_anomaly_upper_threshold_breached(self, mock_send_breaches: MagicMock, mock_send_errors: MagicMock) -> None:
+        insight = self.create_time_series_trend_insight(ChartDisplayType.ACTIONS_LINE_GRAPH)
+        # alert if sign ups are more than 3 standard deviations above the usual value
+        alert = self.create_alert(insight, lower=-3, upper=3)
+
+        # the baseline is built from 8 weeks of history
+        for weeks_ago in range(1, 8):
+            self.create_sign_ups(weeks_ago, 1)
+        self.create_sign_ups(0, 5)
+
+        check_alert(alert["id"])
+
+        updated_alert = AlertConfiguration.objects.get(pk=alert["id"])
+        assert updated_alert.state == AlertState.FIRING
+        assert updated_alert.baseline is not None
+        assert updated_alert.baseline["last_interval"] == "2024-06-03"
+
+        alert_check = AlertCheck.objects.filter(alert_configuration=alert["id"]).latest("created_at")
+        # the value of Mondays doesn't vary, so the minimum stddev of 5% of the mean (1) applies
+        assert alert_check.calculated_value == pytest.approx(80)
+        assert alert_check.state == AlertState.FIRING
+        assert alert_check.error is None
+
+        mock_send_breaches.assert_called_once_with(
+            ANY,
+            [
+                "The insight value (signed_up) for previous day (5) is 80.0 standard deviations above its usual value (1.00), more than upper threshold (3.0)"
+            ],
+        )
+
+    def test_anomaly_keeps_firing_until_next_interval_completes(
+        self, mock_send_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        insight = self.create_time_series_trend_insight(ChartDisplayType.ACTIONS_LINE_GRAPH)
+        alert = self.create_alert(insight, lower=-3, upper=3, calculation_interval=AlertCalculationInterval.HOURLY)
+
+        for weeks_ago in range(1, 8):
+            self.create_sign_ups(weeks_ago, 1)
+        self.create_sign_ups(0, 5)
+
+        check_alert(alert["id"])
+
+        # the day being evaluated hasn't changed since the previous check
+        with freeze_time(FROZEN_TIME + dateutil.relativedelta.relativedelta(hours=1, minutes=1)):
+            check_alert(alert["id"])
+
+        updated_alert = AlertConfiguration.objects.get(pk=alert["id"])
+        assert updated_alert.state == AlertState.FIRING
+        assert updated_alert.baseline["last_interval"] == "2024-06-03"
+
+        alert_checks = AlertCheck.objects.filter(alert_configuration=alert["id"]).order_by("created_at")
+        assert len(alert_checks) == 2
+        assert alert_checks[1].calculated_value == pytest.approx(80)
+        assert alert_checks[1].state == AlertState.FIRING
+        assert mock_send_breaches.call_count == 2
+
+    def test_anomaly_bounds_are_magnitudes(self, mock_send_breaches: MagicMock, mock_send_errors: MagicMock) -> None:
+        insight = self.create_time_series_trend_insight(ChartDisplayType.ACTIONS_LINE_GRAPH)
+        # a positive lower bound still means 3 standard deviations below the usual value
+        alert = self.create_alert(insight, lower=3, upper=3)
+
+        for weeks_ago in range(0, 8):
+            self.create_sign_ups(weeks_ago, 1)
+
+        check_alert(alert["id"])
+
+        updated_alert = AlertConfiguration.objects.get(pk=alert["id"])
+        assert updated_alert.state == AlertState.NOT_FIRING
+        mock_send_breaches.assert_not_called()
+
+    def test_anomaly_baseline_updated_incrementally(
+        self, mock_send_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        insight = self.create_time_series_trend_insight(ChartDisplayType.ACTIONS_LINE_GRAPH)
+        alert = self.create_alert(insight, lower=-3, upper=3)
+
+        for weeks_ago in range(0, 8):
+            self.create_sign_ups(weeks_ago, 1)
+
+        check_alert(alert["id"])
+
+        updated_alert = AlertConfiguration.objects.get(pk=alert["id"])
+        assert updated_alert.state == AlertState.NOT_FIRING
+        assert updated_alert.baseline["last_interval"] == "2024-06-03"
+
+        with freeze_time(FROZEN_TIME + dateutil.relativedelta.relativedelta(days=1)):
+            with patch("posthog.tasks.alerts.trends._date_range_override_for_intervals") as mock_override:
+                mock_override.return_value = {"date_from": "-4d"}
+                check_alert(alert["id"])
+
+            # only the days since the previous check are calculated, not the whole history
+            mock_override.assert_called_once_with(ANY, last_x_intervals=4)
+
+        updated_alert = AlertConfiguration.objects.get(pk=alert["id"])
+        assert updated_alert.state == AlertState.NOT_FIRING
+        assert updated_alert.baseline["last_interval"] == "2024-06-04"
+
+        alert_check = AlertCheck.objects.filter(alert_configuration=alert["id"]).latest("created_at")
+        # no sign ups on any Tuesday
+        assert alert_check.calculated_value == 0
+        assert alert_check.error is None
+
+    def test_anomaly_not_supported_for_non_time_series(
+        self, mock_send_breaches: MagicMock, mock_send_errors: MagicMock
+    ) -> None:
+        insight = self.create_time_series_trend_insight(ChartDisplayType.BOLD_NUMBER)
+        alert = self.create_alert(insight, upper=3)
+
+        check_alert(alert["id"])
+
+        updated_alert = AlertConfiguration.objects.get(pk=alert["id"])
+        assert updated_alert.state == AlertState.ERRORED
+
+        alert_check = AlertCheck.objects.filter(alert_configuration=alert["id"]).latest("created_at")
+        assert alert_check.error is not None
+        assert "Anomaly alerts not supported for non time series trends" in alert_check.error["message"]
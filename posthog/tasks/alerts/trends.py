@@ -1,10 +1,15 @@
+import hashlib
+import json
+from datetime import datetime
 from typing import Optional, cast
+from zoneinfo import ZoneInfo
 
 from posthog.api.services.query import ExecutionMode
 from posthog.caching.calculate_results import calculate_for_query_based_insight
 
 from posthog.models import AlertConfiguration, Insight
 from posthog.schema import (
+    AlertCalculationInterval,
     TrendsQuery,
     IntervalType,
     TrendsAlertConfig,
@@ -16,9 +21,12 @@ from posthog.schema import (
 )
 from posthog.caching.fetch_from_cache import InsightResult
 from typing import TypedDict, NotRequired
+from posthog.tasks.alerts.anomaly import BASELINE_HISTORY_INTERVALS, SeasonalBaseline
 from posthog.tasks.alerts.utils import (
     AlertEvaluationResult,
+    InsightCalculations,
     NON_TIME_SERIES_DISPLAY_TYPES,
+    alert_calculation_interval_to_max_cache_age,
 )
 
 
@@ -42,7 +50,12 @@ class TrendResult(TypedDict):
     filter: dict
 
 
-def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: TrendsQuery) -> AlertEvaluationResult:
+def check_trends_alert(
+    alert: AlertConfiguration,
+    insight: Insight,
+    query: TrendsQuery,
+    calculations: Optional[InsightCalculations] = None,
+) -> AlertEvaluationResult:
     if "type" in alert.config and alert.config["type"] == "TrendsAlertConfig":
         config = TrendsAlertConfig.model_validate(alert.config)
     else:
@@ -74,13 +87,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
                 # depending on the alert calculation interval
                 filters_override = _date_range_override_for_intervals(query, last_x_intervals=2)
 
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
-                user=None,
-                filters_override=filters_override,
-            )
+            calculation_result = _calculate_insight(alert, insight, query, filters_override, calculations)
 
             if not calculation_result.result:
                 raise RuntimeError(f"No results found for insight with alert id = {alert.id}")
@@ -134,13 +141,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
             # and then compare the previous interval with value for the interval before previous
             filters_overrides = _date_range_override_for_intervals(query, last_x_intervals=3)
 
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
-                user=None,
-                filters_override=filters_overrides,
-            )
+            calculation_result = _calculate_insight(alert, insight, query, filters_overrides, calculations)
 
             results_to_evaluate = []
 
@@ -202,13 +203,7 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
             # and then compare the previous interval with value for the interval before previous
             filters_overrides = _date_range_override_for_intervals(query, last_x_intervals=3)
 
-            calculation_result = calculate_for_query_based_insight(
-                insight,
-                team=alert.team,
-                execution_mode=ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
-                user=None,
-                filters_override=filters_overrides,
-            )
+            calculation_result = _calculate_insight(alert, insight, query, filters_overrides, calculations)
 
             results_to_evaluate = []
 
@@ -263,10 +258,144 @@ def check_trends_alert(alert: AlertConfiguration, insight: Insight, query: Trend
 
             return AlertEvaluationResult(value=(decrease if not has_breakdown else None), breaches=breaches)
 
+        case AlertConditionType.ANOMALY:
+            if is_non_time_series:
+                raise ValueError(f"Anomaly alerts not supported for non time series trends")
+
+            if query.interval not in BASELINE_HISTORY_INTERVALS:
+                raise ValueError(f"Anomaly alerts not supported for interval {query.interval}")
+
+            interval = cast(IntervalType, query.interval)
+            baseline = SeasonalBaseline.load(alert.baseline, _baseline_fingerprint(insight, query), interval)
+
+            # only the intervals completed since the previous check need to be calculated,
+            # history is only needed to build a new baseline
+            now = datetime.now(ZoneInfo(alert.team.timezone)).replace(tzinfo=None)
+            filters_overrides = _date_range_override_for_intervals(
+                query, last_x_intervals=baseline.intervals_to_fetch(now)
+            )
+
+            calculation_result = _calculate_insight(alert, insight, query, filters_overrides, calculations)
+
+            results_to_evaluate = []
+
+            if has_breakdown:
+                # for breakdowns, we need to check all values in calculation_result.result
+                breakdown_results = calculation_result.result
+                results_to_evaluate.extend(breakdown_results)
+            else:
+                # for non breakdowns, we pick the series (config.series_index) from calculation_result.result
+                selected_series_result = _pick_series_result(config, calculation_result)
+                results_to_evaluate.append(selected_series_result)
+
+            z_score = None
+            breaches = []
+            last_interval = baseline.last_interval
+            evaluated = False
+
+            for result in results_to_evaluate:
+                # the current interval hasn't completed yet, so it's left out of the baseline
+                completed = [
+                    (day, value) for day, value in zip(result["days"][:-1], result["data"][:-1]) if baseline.is_new(day)
+                ]
+                if not completed:
+                    continue
+
+                # the previous interval is compared with the baseline of the intervals before it
+                *earlier, (prev_interval, prev_interval_value) = completed
+                for day, value in earlier:
+                    baseline.stats(result["label"], day).add(value)
+
+                stats = baseline.stats(result["label"], prev_interval)
+                result_z_score = stats.z_score(prev_interval_value)
+                mean = stats.mean
+                stats.add(prev_interval_value)
+                last_interval = max(last_interval or prev_interval, prev_interval)
+                evaluated = True
+
+                if result_z_score is None:
+                    continue
+
+                if not breaches:
+                    # keep updating the baseline of every series even after a breach
+                    z_score = result_z_score
+                    breaches = _validate_anomaly_bounds(
+                        threshold.bounds, result_z_score, prev_interval_value, mean, interval, result["label"]
+                    )
+
+            if evaluated:
+                baseline.last_interval = last_interval
+                baseline.last_value = z_score if breaches or not has_breakdown else None
+                baseline.last_breaches = breaches
+            alert.baseline = baseline.to_dict()
+
+            # when no interval has completed since the previous check, e.g. for hourly checks of a daily trend,
+            # the newest completed interval is what the alert is still about
+            return AlertEvaluationResult(value=baseline.last_value, breaches=baseline.last_breaches)
+
         case _:
             raise NotImplementedError(f"Unsupported alert condition type: {condition.type}")
 
 
+def _calculate_insight(
+    alert: AlertConfiguration,
+    insight: Insight,
+    query: TrendsQuery,
+    filters_override: Optional[dict],
+    calculations: Optional[InsightCalculations],
+) -> InsightResult:
+    def calculate() -> InsightResult:
+        cached_result = calculate_for_query_based_insight(
+            insight,
+            team=alert.team,
+            execution_mode=ExecutionMode.CACHE_ONLY_NEVER_CALCULATE,
+            user=None,
+            filters_override=filters_override,
+        )
+        if cached_result.last_refresh is not None and cached_result.last_refresh >= _fresh_since(alert, query):
+            return cached_result
+
+        return calculate_for_query_based_insight(
+            insight,
+            team=alert.team,
+            execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS,
+            user=None,
+            filters_override=filters_override,
+        )
+
+    if calculations is None:
+        return calculate()
+    return calculations.get_or_calculate(insight, filters_override, calculate)
+
+
+def _fresh_since(alert: AlertConfiguration, query: TrendsQuery) -> datetime:
+    """
+    Cached results can be used if they were refreshed recently enough for the alert's interval, and after the
+    previous interval of the trend completed (so that its value is final).
+    """
+    now = datetime.now(ZoneInfo(alert.team.timezone))
+    max_cache_age = alert_calculation_interval_to_max_cache_age(
+        cast(AlertCalculationInterval, alert.calculation_interval)
+    )
+
+    match query.interval:
+        case IntervalType.MINUTE:
+            current_interval_start = now.replace(second=0, microsecond=0)
+        case IntervalType.HOUR:
+            current_interval_start = now.replace(minute=0, second=0, microsecond=0)
+        case _:
+            # Weeks and months start at the start of a day too, so this is stricter than needed for them
+            current_interval_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    return max(now - max_cache_age, current_interval_start)
+
+
+def _baseline_fingerprint(insight: Insight, query: TrendsQuery) -> str:
+    """Changes whenever the insight's query does, so that the baseline is rebuilt from its new values."""
+    query_json = json.dumps(query.model_dump(mode="json", exclude_none=True), sort_keys=True)
+    return hashlib.md5(f"{insight.pk}:{query_json}".encode()).hexdigest()
+
+
 def _is_non_time_series_trend(query: TrendsQuery) -> bool:
     return bool(query.trendsFilter and query.trendsFilter.display in NON_TIME_SERIES_DISPLAY_TYPES)
 
@@ -349,3 +478,30 @@ def _validate_bounds(
         ]
 
     return []
+
+
+def _validate_anomaly_bounds(
+    bounds: InsightsThresholdBounds | None,
+    z_score: float,
+    value: float,
+    mean: float,
+    interval_type: IntervalType,
+    series: str,
+) -> list[str]:
+    """
+    The bounds of anomaly alerts are how many standard deviations the value may be below (lower) or above (upper)
+    the baseline's mean, so their sign is ignored.
+    """
+    if not bounds:
+        return []
+
+    if bounds.lower is not None and z_score < -abs(bounds.lower):
+        return [
+            f"The insight value ({series}) for previous {interval_type} ({value}) is {abs(z_score):.1f} standard deviations below its usual value ({mean:.2f}), more than lower threshold ({abs(bounds.lower)})"
+        ]
+    if bounds.upper is not None and z_score > abs(bounds.upper):
+        return [
+            f"The insight value ({series}) for previous {interval_type} ({value}) is {z_score:.1f} standard deviations above its usual value ({mean:.2f}), more than upper threshold ({abs(bounds.upper)})"
+        ]
+
+    return []
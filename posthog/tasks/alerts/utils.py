@@ -1,10 +1,15 @@
+from collections.abc import Callable
+from datetime import timedelta
+import json
+
 from dateutil.relativedelta import relativedelta
 
 from django.utils import timezone
 import structlog
 
 from posthog.email import EmailMessage
-from posthog.models import AlertConfiguration
+from posthog.caching.fetch_from_cache import InsightResult
+from posthog.models import AlertConfiguration, Insight
 from posthog.schema import (
     ChartDisplayType,
     NodeKind,
@@ -56,6 +61,49 @@ def alert_calculation_interval_to_relativedelta(alert_calculation_interval: Aler
             raise ValueError(f"Invalid alert calculation interval: {alert_calculation_interval}")
 
 
+def alert_calculation_interval_to_max_cache_age(alert_calculation_interval: AlertCalculationInterval) -> timedelta:
+    """
+    How old cached insight results can be for an alert check to use them instead of recalculating the insight.
+    Well below the interval, so that the results cached by the previous check of the alert never qualify.
+    """
+    match alert_calculation_interval:
+        case AlertCalculationInterval.HOURLY:
+            return timedelta(minutes=5)
+        case AlertCalculationInterval.DAILY:
+            return timedelta(hours=1)
+        case AlertCalculationInterval.WEEKLY:
+            return timedelta(hours=6)
+        case AlertCalculationInterval.MONTHLY:
+            return timedelta(days=1)
+        case _:
+            raise ValueError(f"Invalid alert calculation interval: {alert_calculation_interval}")
+
+
+class InsightCalculations:
+    """
+    Insight results calculated during one check cycle, keyed by insight and filters override, so that alerts watching
+    the same insight (with different thresholds or subscribers) share a single calculation.
+    Failed calculations are remembered too, so a failing insight isn't recalculated for each of its alerts.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[tuple[int, str], InsightResult | Exception] = {}
+
+    def get_or_calculate(
+        self, insight: Insight, filters_override: dict | None, calculate: Callable[[], InsightResult]
+    ) -> InsightResult:
+        key = (insight.pk, json.dumps(filters_override, sort_keys=True))
+        if key not in self._results:
+            try:
+                self._results[key] = calculate()
+            except Exception as err:
+                self._results[key] = err
+        result = self._results[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
 def send_notifications_for_breaches(alert: AlertConfiguration, breaches: list[str]) -> None:
     subject = f"PostHog alert {alert.name} is firing"
     campaign_key = f"alert-firing-notification-{alert.id}-{timezone.now().timestamp()}"
@@ -1,40 +1,69 @@
 import time
+from collections import defaultdict
 from typing import Any, Optional
 
 import structlog
 from celery import shared_task
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.db.models import F, ExpressionWrapper, DurationField, Q
 from django.utils import timezone
-from prometheus_client import Gauge
-from sentry_sdk import set_tag
+from prometheus_client import Gauge, Histogram
+from sentry_sdk import capture_exception, set_tag
 
 from datetime import timedelta
 
 from posthog.api.monitoring import Feature
 from posthog.models import Cohort
 from posthog.models.cohort import get_and_update_pending_version
-from posthog.models.cohort.util import clear_stale_cohortpeople
+from posthog.models.cohort.cohort import CohortOrEmpty
+from posthog.models.cohort.util import clear_stale_cohortpeople, get_dependent_cohorts, sort_cohorts_topologically
 from posthog.models.user import User
+from posthog.redis import get_client
 
 COHORT_RECALCULATIONS_BACKLOG_GAUGE = Gauge(
     "cohort_recalculations_backlog",
     "Number of cohorts that are waiting to be calculated",
 )
 
+COHORT_RECALCULATIONS_DEFERRED_GAUGE = Gauge(
+    "cohort_recalculations_deferred",
+    "Number of stale cohorts not started in the last run because their team was at its concurrency limit",
+)
+
 COHORT_STALENESS_HOURS_GAUGE = Gauge(
     "cohort_staleness_hours",
     "Cohort's count of hours since last calculation",
 )
 
+COHORT_CALCULATION_DURATION_HISTOGRAM = Histogram(
+    "cohort_calculation_duration_seconds",
+    "Time taken to calculate a cohort",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, float("inf")),
+)
+
 logger = structlog.get_logger(__name__)
 
 MAX_AGE_MINUTES = 15
 
+# Stale cohorts considered per run, as a multiple of the cohorts started, so that teams at their
+# concurrency limit don't hold back the cohorts of other teams
+STALE_COHORTS_LOOKAHEAD = 4
+
+# Cohorts started by the scheduler count against their team's limit until they finish,
+# or until this long after they were started, in case their task was lost
+IN_FLIGHT_COHORTS_KEY = "calculate_cohorts_in_flight:{team_id}"
+IN_FLIGHT_COHORTS_TTL_SECONDS = 60 * 60
+
+BEHAVIORAL_INTERVAL_DAYS = {"day": 1, "week": 7, "month": 31, "year": 365}
+
 
 def calculate_cohorts(parallel_count: int) -> None:
     """
-    Calculates maximum N cohorts in parallel.
+    Calculates maximum N cohorts in parallel, starting with the stalest ones.
+
+    Cohorts are planned per team: no team gets more than `CALCULATE_COHORTS_MAX_CONCURRENT_PER_TEAM` cohorts
+    calculating at once, and the team's cohorts are split into batches by `plan_cohort_calculations`.
 
     Args:
         parallel_count: Maximum number of cohorts to calculate in parallel.
@@ -49,7 +78,7 @@ def calculate_cohorts(parallel_count: int) -> None:
         output_field=DurationField(),
     )
 
-    for cohort in (
+    stale_cohorts = (
         Cohort.objects.filter(
             deleted=False,
             is_calculating=False,
@@ -62,10 +91,37 @@ def calculate_cohorts(parallel_count: int) -> None:
             | Q(last_error_at__isnull=True)  # backwards compatability cohorts before last_error_at was introduced
         )
         .exclude(is_static=True)
-        .order_by(F("last_calculation").asc(nulls_first=True))[0:parallel_count]
-    ):
-        cohort = Cohort.objects.filter(pk=cohort.pk).get()
-        update_cohort(cohort, initiating_user=None)
+        .order_by(F("last_calculation").asc(nulls_first=True))[0 : parallel_count * STALE_COHORTS_LOOKAHEAD]
+    )
+
+    in_flight_by_team: dict[int, set[int]] = {}
+    cohorts_by_team: dict[int, list[Cohort]] = defaultdict(list)
+    started = 0
+    deferred = 0
+    for cohort in stale_cohorts:
+        if started >= parallel_count:
+            break
+        if cohort.team_id not in in_flight_by_team:
+            in_flight_by_team[cohort.team_id] = get_in_flight_cohort_ids(cohort.team_id)
+        in_flight = in_flight_by_team[cohort.team_id]
+        if cohort.pk in in_flight:
+            # Still calculating since an earlier run
+            continue
+        if len(in_flight) + len(cohorts_by_team[cohort.team_id]) >= settings.CALCULATE_COHORTS_MAX_CONCURRENT_PER_TEAM:
+            deferred += 1
+            continue
+        cohorts_by_team[cohort.team_id].append(cohort)
+        started += 1
+
+    for team_id, cohorts in cohorts_by_team.items():
+        mark_cohorts_in_flight(team_id, [cohort.pk for cohort in cohorts])
+        for batch in plan_cohort_calculations(cohorts):
+            if len(batch) == 1:
+                update_cohort(batch[0], initiating_user=None)
+            else:
+                update_cohorts(batch)
+
+    COHORT_RECALCULATIONS_DEFERRED_GAUGE.set(deferred)
 
     # update gauge
     backlog = (
@@ -86,6 +142,98 @@ def update_cohort(cohort: Cohort, *, initiating_user: Optional[User]) -> None:
     calculate_cohort_ch.delay(cohort.id, pending_version, initiating_user.id if initiating_user else None)
 
 
+def update_cohorts(cohorts: list[Cohort]) -> None:
+    """Calculates the cohorts one after another in a single task, in the given order."""
+    pending_versions = [(cohort.id, get_and_update_pending_version(cohort)) for cohort in cohorts]
+    calculate_cohorts_ch.delay(pending_versions)
+
+
+def plan_cohort_calculations(cohorts: list[Cohort]) -> list[list[Cohort]]:
+    """
+    Splits the cohorts of one team into batches, each calculated one cohort after another in a single task.
+
+    Cohorts that reference each other go in the same batch, ordered so that a cohort is calculated after the
+    cohorts it references. Behavioral cohorts that look back over the same window of events also go in the same
+    batch, so that the events they scan are read back to back. Every other cohort gets a batch of its own.
+    """
+    cohorts_by_id = {cohort.pk: cohort for cohort in cohorts}
+    seen_cohorts_cache: dict[int, CohortOrEmpty] = dict(cohorts_by_id)
+
+    batch_roots = {cohort_id: cohort_id for cohort_id in cohorts_by_id}
+
+    def find(cohort_id: int) -> int:
+        while batch_roots[cohort_id] != cohort_id:
+            batch_roots[cohort_id] = batch_roots[batch_roots[cohort_id]]
+            cohort_id = batch_roots[cohort_id]
+        return cohort_id
+
+    def merge(cohort_id: int, other_cohort_id: int) -> None:
+        batch_roots[find(other_cohort_id)] = find(cohort_id)
+
+    cohort_ids_by_window: dict[str, list[int]] = defaultdict(list)
+    for cohort in cohorts:
+        for dependency in get_dependent_cohorts(cohort, seen_cohorts_cache=seen_cohorts_cache):
+            if dependency.pk in cohorts_by_id:
+                merge(cohort.pk, dependency.pk)
+        window = _behavioral_events_window(cohort)
+        if window is not None:
+            cohort_ids_by_window[window].append(cohort.pk)
+    for cohort_ids in cohort_ids_by_window.values():
+        for cohort_id in cohort_ids[1:]:
+            merge(cohort_ids[0], cohort_id)
+
+    batches: dict[int, set[int]] = defaultdict(set)
+    for cohort_id in cohorts_by_id:
+        batches[find(cohort_id)].add(cohort_id)
+
+    return [
+        # the sort includes referenced cohorts that aren't being calculated, which are left out
+        [
+            cohorts_by_id[cohort_id]
+            for cohort_id in sort_cohorts_topologically(batch, seen_cohorts_cache)
+            if cohort_id in batch
+        ]
+        for batch in batches.values()
+    ]
+
+
+def _behavioral_events_window(cohort: Cohort) -> Optional[str]:
+    """The widest window of events the behavioral filters of the cohort look back over, if it has any."""
+    days: list[int] = []
+    explicit_datetimes: list[str] = []
+    for prop in cohort.properties.flat:
+        if prop.type != "behavioral":
+            continue
+        if prop.explicit_datetime:
+            explicit_datetimes.append(str(prop.explicit_datetime))
+        elif prop.time_value is not None and prop.time_interval in BEHAVIORAL_INTERVAL_DAYS:
+            days.append(int(prop.time_value) * BEHAVIORAL_INTERVAL_DAYS[prop.time_interval])
+    if explicit_datetimes:
+        return min(explicit_datetimes)
+    if days:
+        return f"{max(days)} days"
+    return None
+
+
+def get_in_flight_cohort_ids(team_id: int) -> set[int]:
+    key = IN_FLIGHT_COHORTS_KEY.format(team_id=team_id)
+    redis_client = get_client()
+    redis_client.zremrangebyscore(key, "-inf", time.time())
+    return {int(cohort_id) for cohort_id in redis_client.zrange(key, 0, -1)}
+
+
+def mark_cohorts_in_flight(team_id: int, cohort_ids: list[int]) -> None:
+    key = IN_FLIGHT_COHORTS_KEY.format(team_id=team_id)
+    expires_at = time.time() + IN_FLIGHT_COHORTS_TTL_SECONDS
+    redis_client = get_client()
+    redis_client.zadd(key, {str(cohort_id): expires_at for cohort_id in cohort_ids})
+    redis_client.expire(key, IN_FLIGHT_COHORTS_TTL_SECONDS)
+
+
+def clear_cohort_in_flight(cohort: Cohort) -> None:
+    get_client().zrem(IN_FLIGHT_COHORTS_KEY.format(team_id=cohort.team_id), str(cohort.pk))
+
+
 @shared_task(ignore_result=True)
 def clear_stale_cohort(cohort_id: int, before_version: int) -> None:
     cohort: Cohort = Cohort.objects.get(pk=cohort_id)
@@ -105,7 +253,28 @@ def calculate_cohort_ch(cohort_id: int, pending_version: int, initiating_user_id
         staleness_hours = (timezone.now() - cohort.last_calculation).total_seconds() / 3600
     COHORT_STALENESS_HOURS_GAUGE.set(staleness_hours)
 
-    cohort.calculate_people_ch(pending_version, initiating_user_id=initiating_user_id)
+    start_time = time.monotonic()
+    try:
+        cohort.calculate_people_ch(pending_version, initiating_user_id=initiating_user_id)
+    finally:
+        COHORT_CALCULATION_DURATION_HISTOGRAM.observe(time.monotonic() - start_time)
+        clear_cohort_in_flight(cohort)
+
+
+@shared_task(ignore_result=True, max_retries=1)
+def calculate_cohorts_ch(pending_versions: list[tuple[int, int]]) -> None:
+    """
+    Calculates a batch of cohorts planned by `plan_cohort_calculations`, in order. A cohort failing to calculate
+    doesn't stop the rest of the batch, as cohorts referencing it can still use its previous version.
+    """
+    for cohort_id, pending_version in pending_versions:
+        try:
+            calculate_cohort_ch(cohort_id, pending_version)
+        except Cohort.DoesNotExist:
+            continue
+        except Exception as e:
+            # calculate_people_ch has recorded the error on the cohort
+            capture_exception(e)
 
 
 @shared_task(ignore_result=True, max_retries=1)
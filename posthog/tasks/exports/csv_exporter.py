@@ -1,7 +1,9 @@
+import csv
 import datetime
 import io
-from typing import Any, Optional
-from collections.abc import Generator
+import tempfile
+from typing import IO, Any, Optional
+from collections.abc import Callable, Generator, Iterable
 from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlunparse
 
 from pydantic import BaseModel
@@ -15,7 +17,7 @@ from requests.exceptions import HTTPError
 from posthog.api.services.query import process_query_dict
 from posthog.hogql_queries.query_runner import ExecutionMode
 from posthog.jwt import PosthogJwtAudience, encode_jwt
-from posthog.models.exported_asset import ExportedAsset, save_content
+from posthog.models.exported_asset import ExportedAsset, save_content, save_content_from_file
 from posthog.utils import absolute_uri
 from .ordered_csv_renderer import OrderedCsvRenderer
 from ..exporter import (
@@ -25,7 +27,13 @@ from ..exporter import (
     EXPORT_TIMER,
 )
 from ...exceptions import QuerySizeExceeded
-from ...hogql.constants import CSV_EXPORT_LIMIT, CSV_EXPORT_BREAKDOWN_LIMIT_INITIAL, CSV_EXPORT_BREAKDOWN_LIMIT_LOW
+from ...hogql.constants import (
+    CSV_EXPORT_LIMIT,
+    CSV_EXPORT_BREAKDOWN_LIMIT_INITIAL,
+    CSV_EXPORT_BREAKDOWN_LIMIT_LOW,
+    get_default_limit_for_context,
+    get_max_limit_for_context,
+)
 from ...hogql.query import LimitContext
 
 logger = structlog.get_logger(__name__)
@@ -33,6 +41,12 @@ logger = structlog.get_logger(__name__)
 RESULT_LIMIT_KEYS = ("distinct_ids",)
 RESULT_LIMIT_LENGTH = 10
 
+# Queries that support limit and offset, so they can be exported page by page
+STREAMING_EXPORT_QUERY_KINDS = ("EventsQuery", "ActorsQuery")
+STREAMING_EXPORT_PAGE_SIZE = 10_000
+# Exports are spooled in memory up to this size, and to disk beyond it
+STREAMING_EXPORT_SPOOL_MAX_SIZE_BYTES = 1024 * 1024 * 10  # 10MB
+
 
 # SUPPORTED CSV TYPES
 
@@ -294,6 +308,106 @@ def get_from_hogql_query(exported_asset: ExportedAsset, limit: int, resource: di
         return
 
 
+def get_pages_from_hogql_query(exported_asset: ExportedAsset, resource: dict) -> Generator[list[Any], None, None]:
+    """Yield the rows of a paginated query one page at a time, up to the export limit."""
+    query = resource.get("source")
+    assert query is not None
+
+    max_rows = get_max_limit_for_context(LimitContext.EXPORT)
+    remaining = min(max_rows, query.get("limit") or get_default_limit_for_context(LimitContext.EXPORT))
+    offset = query.get("offset") or 0
+
+    while remaining > 0:
+        page_size = min(STREAMING_EXPORT_PAGE_SIZE, remaining)
+        query_response = process_query_dict(
+            team=exported_asset.team,
+            query_json={**query, "limit": page_size, "offset": offset},
+            limit_context=LimitContext.EXPORT,
+            execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS,
+        )
+        if isinstance(query_response, BaseModel):
+            query_response = query_response.model_dump(by_alias=True)
+
+        page = list(_convert_response_to_csv_data(query_response))
+        if not page:
+            return
+
+        yield page
+
+        returned = len(query_response.get("results") or [])
+        offset += returned
+        remaining -= returned
+
+        if not query_response.get("hasMore") or returned == 0:
+            return
+
+
+def _iter_table_rows(pages: Iterable[list[Any]], columns: list[str]) -> Generator[list[Any], None, None]:
+    """Turn pages of rows into a table, header first, like `OrderedCsvRenderer` does for a single list of rows.
+
+    The header is worked out from the first page, as we can't look ahead at the rest without holding them in memory.
+    """
+    renderer = OrderedCsvRenderer()
+    header: Optional[list[str]] = None
+
+    for page in pages:
+        if header is None:
+            first_page_header = list(columns) if columns else None
+            if not first_page_header and not any(isinstance(x, dict | list) for x in page[0].values()):
+                first_page_header = list(page[0].keys())
+
+            table = renderer.tablize(page, header=first_page_header)
+            header = next(table)
+            yield header
+        else:
+            table = renderer.tablize(page, header=header)
+            next(table)
+
+        yield from table
+
+    if header is None:
+        # If we have no rows, that means we couldn't convert anything, so put something to avoid confusion
+        yield from renderer.tablize([{"error": "No data available or unable to format for export."}])
+
+
+def _export_to_file(
+    exported_asset: ExportedAsset, write_rows: Callable[[Iterable[list[Any]], IO[bytes]], None]
+) -> None:
+    resource = exported_asset.export_context
+    pages = get_pages_from_hogql_query(exported_asset, resource)
+
+    with tempfile.SpooledTemporaryFile(max_size=STREAMING_EXPORT_SPOOL_MAX_SIZE_BYTES) as output:
+        write_rows(_iter_table_rows(pages, resource.get("columns", [])), output)
+        save_content_from_file(exported_asset, output)
+
+
+def _write_csv_rows(rows: Iterable[list[Any]], output: IO[bytes]) -> None:
+    text_output = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    writer = csv.writer(text_output)
+    for row in rows:
+        writer.writerow(row)
+
+    text_output.flush()
+    text_output.detach()
+
+
+def _write_excel_rows(rows: Iterable[list[Any]], output: IO[bytes]) -> None:
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+
+    for row in rows:
+        worksheet.append(
+            [value if value is None or isinstance(value, str | int | float | bool) else str(value) for value in row]
+        )
+
+    workbook.save(output)
+
+
+def _is_streaming_export(exported_asset: ExportedAsset) -> bool:
+    source = exported_asset.export_context.get("source")
+    return isinstance(source, dict) and source.get("kind") in STREAMING_EXPORT_QUERY_KINDS
+
+
 def _export_to_dict(exported_asset: ExportedAsset, limit: int) -> Any:
     resource = exported_asset.export_context
 
@@ -326,6 +440,10 @@ def _export_to_dict(exported_asset: ExportedAsset, limit: int) -> Any:
 
 
 def _export_to_csv(exported_asset: ExportedAsset, limit: int) -> None:
+    if _is_streaming_export(exported_asset):
+        _export_to_file(exported_asset, _write_csv_rows)
+        return
+
     renderer, all_csv_rows, render_context = _export_to_dict(exported_asset, limit)
 
     rendered_csv_content = renderer.render(all_csv_rows, renderer_context=render_context)
@@ -333,6 +451,10 @@ def _export_to_csv(exported_asset: ExportedAsset, limit: int) -> None:
 
 
 def _export_to_excel(exported_asset: ExportedAsset, limit: int) -> None:
+    if _is_streaming_export(exported_asset):
+        _export_to_file(exported_asset, _write_excel_rows)
+        return
+
     output = io.BytesIO()
 
     workbook = Workbook()
@@ -505,6 +505,80 @@ class TestCSVExporter(APIBaseTest):
             self.assertEqual(first_row[1], "$pageview")
             self.assertEqual(first_row[4], str(self.team.pk))
 
+    @patch("posthog.hogql.constants.MAX_SELECT_RETURNED_ROWS", 10)
+    @patch("posthog.tasks.exports.csv_exporter.STREAMING_EXPORT_PAGE_SIZE", 4)
+    @patch("posthog.models.exported_asset.UUIDT")
+    def test_csv_exporter_events_query_in_pages(self, mocked_uuidt: Any) -> None:
+        random_uuid = f"RANDOM_TEST_ID::{UUIDT()}"
+        for i in range(15):
+            _create_event(
+                event="$pageview",
+                distinct_id=random_uuid,
+                team=self.team,
+                timestamp=now() - relativedelta(hours=1, minutes=i),
+                properties={"prop": i},
+            )
+        flush_persons_and_events()
+
+        exported_asset = ExportedAsset(
+            team=self.team,
+            export_format=ExportedAsset.ExportFormat.CSV,
+            export_context={
+                "source": {
+                    "kind": "EventsQuery",
+                    "select": ["event", "properties.prop"],
+                    "where": [f"distinct_id = '{random_uuid}'"],
+                    "orderBy": ["timestamp DESC"],
+                }
+            },
+        )
+        exported_asset.save()
+        mocked_uuidt.return_value = "a-guid"
+
+        with self.settings(OBJECT_STORAGE_ENABLED=True, OBJECT_STORAGE_EXPORTS_FOLDER="Test-Exports"):
+            csv_exporter.export_tabular(exported_asset)
+            content = object_storage.read(exported_asset.content_location)
+
+        lines = (content or "").split("\r\n")
+        self.assertEqual(lines[0], "event,properties.prop")
+        self.assertEqual(lines[1:-1], [f"$pageview,{i}" for i in range(10)])
+        self.assertEqual(lines[-1], "")
+
+    @patch("posthog.hogql.constants.MAX_SELECT_RETURNED_ROWS", 10)
+    @patch("posthog.tasks.exports.csv_exporter.STREAMING_EXPORT_PAGE_SIZE", 4)
+    def test_excel_exporter_events_query_in_pages(self) -> None:
+        random_uuid = f"RANDOM_TEST_ID::{UUIDT()}"
+        for i in range(6):
+            _create_event(
+                event="$pageview",
+                distinct_id=random_uuid,
+                team=self.team,
+                timestamp=now() - relativedelta(hours=1, minutes=i),
+                properties={"prop": i},
+            )
+        flush_persons_and_events()
+
+        exported_asset = ExportedAsset(
+            team=self.team,
+            export_format=ExportedAsset.ExportFormat.XLSX,
+            export_context={
+                "source": {
+                    "kind": "EventsQuery",
+                    "select": ["event", "properties.prop"],
+                    "where": [f"distinct_id = '{random_uuid}'"],
+                    "orderBy": ["timestamp DESC"],
+                }
+            },
+        )
+        exported_asset.save()
+
+        with self.settings(OBJECT_STORAGE_ENABLED=False):
+            csv_exporter.export_tabular(exported_asset)
+
+        wb = load_workbook(filename=BytesIO(exported_asset.content))
+        data = list(wb.active.iter_rows(values_only=True))
+        assert data == [("event", "properties.prop")] + [("$pageview", str(i)) for i in range(6)]
+
     @patch("posthog.hogql.constants.MAX_SELECT_RETURNED_ROWS", 10)
     @patch("posthog.models.exported_asset.UUIDT")
     def test_csv_exporter_funnels_query(self, mocked_uuidt: Any, MAX_SELECT_RETURNED_ROWS: int = 10) -> None:
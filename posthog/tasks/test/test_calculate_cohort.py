@@ -7,6 +7,7 @@ from freezegun import freeze_time
 
 from posthog.models.cohort import Cohort
 from posthog.models.person import Person
+from posthog.models.team import Team
 from posthog.tasks.calculate_cohort import calculate_cohort_from_list, calculate_cohorts, MAX_AGE_MINUTES
 from posthog.test.base import APIBaseTest
 
@@ -91,4 +92,82 @@ def calculate_cohort_test_factory(event_factory: Callable, person_factory: Calla
             calculate_cohorts(5)
             self.assertEqual(patch_update_cohort.call_count, 2)
 
+        @patch("posthog.tasks.calculate_cohort.update_cohort")
+        def test_calculate_cohorts_limits_cohorts_per_team(self, patch_update_cohort: MagicMock) -> None:
+            other_team = Team.objects.create(organization=self.organization)
+            for team in [self.team, self.team, self.team, other_team]:
+                Cohort.objects.create(
+                    last_calculation=timezone.now() - relativedelta(minutes=MAX_AGE_MINUTES + 1),
+                    team_id=team.pk,
+                )
+
+            with self.settings(CALCULATE_COHORTS_MAX_CONCURRENT_PER_TEAM=2):
+                calculate_cohorts(5)
+
+                self.assertEqual(
+                    sorted(call.args[0].team_id for call in patch_update_cohort.call_args_list),
+                    sorted([self.team.pk, self.team.pk, other_team.pk]),
+                )
+
+                # the cohorts started above haven't finished yet, so nothing else can start
+                patch_update_cohort.reset_mock()
+                calculate_cohorts(5)
+
+                self.assertEqual(patch_update_cohort.call_count, 0)
+
+        @patch("posthog.tasks.calculate_cohort.update_cohorts")
+        @patch("posthog.tasks.calculate_cohort.update_cohort")
+        def test_calculate_cohorts_batches_dependent_and_behavioral_cohorts(
+            self, patch_update_cohort: MagicMock, patch_update_cohorts: MagicMock
+        ) -> None:
+            stale = timezone.now() - relativedelta(minutes=MAX_AGE_MINUTES + 1)
+            behavioral_filters = {
+                "properties": {
+                    "type": "AND",
+                    "values": [
+                        {
+                            "key": "$pageview",
+                            "event_type": "events",
+                            "time_value": 30,
+                            "time_interval": "day",
+                            "value": "performed_event",
+                            "type": "behavioral",
+                        }
+                    ],
+                }
+            }
+            referenced_cohort = Cohort.objects.create(
+                team_id=self.team.pk,
+                last_calculation=stale - relativedelta(minutes=1),
+                groups=[{"properties": [{"key": "email", "value": "posthog.com", "type": "person"}]}],
+            )
+            referencing_cohort = Cohort.objects.create(
+                team_id=self.team.pk,
+                last_calculation=stale - relativedelta(minutes=2),
+                groups=[{"properties": [{"key": "id", "value": referenced_cohort.pk, "type": "cohort"}]}],
+            )
+            behavioral_cohort = Cohort.objects.create(
+                team_id=self.team.pk, last_calculation=stale, filters=behavioral_filters
+            )
+            other_behavioral_cohort = Cohort.objects.create(
+                team_id=self.team.pk, last_calculation=stale, filters=behavioral_filters
+            )
+            unrelated_cohort = Cohort.objects.create(
+                team_id=self.team.pk,
+                last_calculation=stale,
+                groups=[{"properties": [{"key": "email", "value": "example.com", "type": "person"}]}],
+            )
+
+            with self.settings(CALCULATE_COHORTS_MAX_CONCURRENT_PER_TEAM=10):
+                calculate_cohorts(10)
+
+            self.assertEqual([call.args[0] for call in patch_update_cohort.call_args_list], [unrelated_cohort])
+            batches = sorted(
+                (call.args[0] for call in patch_update_cohorts.call_args_list), key=lambda batch: batch[0].pk
+            )
+            self.assertEqual(len(batches), 2)
+            # cohorts are calculated after the cohorts they reference
+            self.assertEqual(batches[0], [referenced_cohort, referencing_cohort])
+            self.assertCountEqual(batches[1], [behavioral_cohort, other_behavioral_cohort])
+
     return TestCalculateCohort
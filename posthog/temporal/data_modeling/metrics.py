@@ -0,0 +1,26 @@
+from temporalio import activity
+from temporalio.common import MetricCounter, MetricHistogram
+
+
+def get_rows_materialized_metric() -> MetricCounter:
+    return activity.metric_meter().create_counter(
+        "data_modeling_rows_materialized", "Number of rows materialized by data modeling."
+    )
+
+
+def get_bytes_materialized_metric() -> MetricCounter:
+    return activity.metric_meter().create_counter(
+        "data_modeling_bytes_materialized", "Number of bytes materialized by data modeling."
+    )
+
+
+def get_model_wait_time_metric() -> MetricHistogram:
+    return activity.metric_meter().create_histogram(
+        "data_modeling_model_wait_time", "Time a model spent waiting to be materialized.", unit="ms"
+    )
+
+
+def get_model_run_time_metric() -> MetricHistogram:
+    return activity.metric_meter().create_histogram(
+        "data_modeling_model_run_time", "Time spent materializing a model.", unit="ms"
+    )
@@ -1,12 +1,15 @@
 import asyncio
 import collections
 import collections.abc
+import contextlib
 import dataclasses
 import datetime as dt
 import enum
+import heapq
 import itertools
 import json
 import re
+import time
 import typing
 import uuid
 
@@ -14,6 +17,8 @@ import dlt
 import dlt.common.data_types as dlt_data_types
 import dlt.common.schema.typing as dlt_typing
 import dlt.extract
+import pyarrow as pa
+import pyarrow.compute as pc
 import structlog
 import temporalio.activity
 import temporalio.common
@@ -23,13 +28,27 @@ from deltalake import DeltaTable
 from django.conf import settings
 from dlt.common.libs.deltalake import get_delta_tables
 
-from posthog.hogql.constants import HogQLGlobalSettings, LimitContext
+from posthog.clickhouse.client.escape import substitute_params
+from posthog.hogql import ast
+from posthog.hogql.constants import HogQLGlobalSettings, LimitContext, get_default_limit_for_context
+from posthog.hogql.context import HogQLContext
 from posthog.hogql.database.database import create_hogql_database
-from posthog.hogql.query import execute_hogql_query
+from posthog.hogql.escape_sql import escape_clickhouse_identifier
+from posthog.hogql.modifiers import create_default_modifiers_for_team
+from posthog.hogql.parser import parse_select
+from posthog.hogql.printer import print_ast
+from posthog.hogql.resolver_utils import extract_select_queries
 from posthog.models import Team
 from posthog.settings.base_variables import TEST
 from posthog.temporal.batch_exports.base import PostHogWorkflow
+from posthog.temporal.common.clickhouse import get_client
 from posthog.temporal.common.heartbeat import Heartbeater
+from posthog.temporal.data_modeling.metrics import (
+    get_bytes_materialized_metric,
+    get_model_run_time_metric,
+    get_model_wait_time_metric,
+    get_rows_materialized_metric,
+)
 from posthog.warehouse.models import DataWarehouseModelPath, DataWarehouseSavedQuery
 from posthog.warehouse.util import database_sync_to_async
 from posthog.warehouse.data_load.create_table import create_table_from_saved_query
@@ -65,6 +84,18 @@ CLICKHOUSE_DLT_MAPPING: dict[str, dlt_data_types.TDataType] = {
     "Decimal": "decimal",
 }
 
+# ClickHouse either can't output these types as Arrow or outputs them as plain integers,
+# so we convert them to an equivalent type with a native Arrow representation.
+CLICKHOUSE_ARROW_CONVERSIONS: dict[str, str] = {
+    "UUID": "toString({column})",
+    "DateTime": "toDateTime64({column}, 0, 'UTC')",
+    "DateTime32": "toDateTime64({column}, 0, 'UTC')",
+    "Date": "toDate32({column})",
+}
+
+# Incremental runs append small files, so only compact them once there are enough of them.
+INCREMENTAL_COMPACTION_MIN_FILES = 100
+
 
 class EmptyHogQLResponseColumnsError(Exception):
     def __init__(self):
@@ -105,10 +136,13 @@ class RunDagActivityInputs:
             We require the DAG to be represented as a dictionary of model labels to
             `ModelNode` instances, as this is useful for the algorithm that
             `run_dag_activity` executes. See it for more details.
+        full_refresh: Whether to fully refresh incremental models instead of only
+            materializing their new rows.
     """
 
     team_id: int
     dag: DAG
+    full_refresh: bool = False
 
 
 class ModelStatus(enum.StrEnum):
@@ -132,6 +166,74 @@ Results = collections.namedtuple("Results", ("completed", "failed", "ancestor_fa
 NullablePattern = re.compile(r"Nullable\((.*)\)")
 
 
+class ModelScheduler:
+    """Limit how many models are materialized concurrently.
+
+    When all slots are taken, models wait for one to be released, and the model with the
+    highest priority is the next one to get it. Ties are broken in arrival order.
+
+    Attributes:
+        max_concurrent: The maximum number of models that can hold a slot at the same time.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self._available = max_concurrent
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int = 0) -> collections.abc.AsyncIterator[None]:
+        if self._available > 0 and not self._waiters:
+            self._available -= 1
+        else:
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (-priority, next(self._counter), future))
+
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # We were handed a slot right as we got cancelled, so pass it on.
+                    self._release()
+                raise
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self._available += 1
+
+
+def get_critical_path_lengths(dag: DAG) -> dict[str, int]:
+    """Return the length of the longest path of selected models starting from each model.
+
+    Models on longer paths gate more work further down the DAG, so we use these lengths to
+    prioritize them when not all ready models can run at the same time.
+    """
+    lengths: dict[str, int] = {}
+
+    def visit(label: str) -> int:
+        if label not in lengths:
+            node = dag[label]
+            lengths[label] = int(node.selected) + max((visit(child) for child in node.children), default=0)
+        return lengths[label]
+
+    for label in dag:
+        visit(label)
+
+    return lengths
+
+
 @temporalio.activity.defn
 async def run_dag_activity(inputs: RunDagActivityInputs) -> Results:
     """A Temporal activity to run a data modeling DAG.
@@ -163,6 +265,12 @@ async def run_dag_activity(inputs: RunDagActivityInputs) -> Results:
           descendants of the model that just failed to the ancestor failed set.
     6. If the number of models in the completed, failed, and ancestor failed sets is equal
        to the total number of models passed to this activity, exit the loop. Else, goto 5.
+
+    Independent branches of the DAG run concurrently, but at most
+    `settings.DATA_MODELING_MAX_CONCURRENT_MODELS` models are materialized at the same time,
+    each with an equal share of `settings.DATA_MODELING_MAX_MEMORY_USAGE` as its ClickHouse
+    memory limit. When more models are ready than can run, models on the longest path of
+    pending models go first.
     """
     completed = set()
     ancestor_failed = set()
@@ -177,6 +285,9 @@ async def run_dag_activity(inputs: RunDagActivityInputs) -> Results:
         raise asyncio.QueueEmpty()
 
     running_tasks = set()
+    scheduler = ModelScheduler(settings.DATA_MODELING_MAX_CONCURRENT_MODELS)
+    max_memory_usage = settings.DATA_MODELING_MAX_MEMORY_USAGE // scheduler.max_concurrent
+    priorities = get_critical_path_lengths(inputs.dag)
 
     async with Heartbeater():
         while True:
@@ -185,7 +296,17 @@ async def run_dag_activity(inputs: RunDagActivityInputs) -> Results:
             match message:
                 case QueueMessage(status=ModelStatus.READY, label=label):
                     model = inputs.dag[label]
-                    task = asyncio.create_task(handle_model_ready(model, inputs.team_id, queue))
+                    task = asyncio.create_task(
+                        handle_model_ready(
+                            model,
+                            inputs.team_id,
+                            queue,
+                            full_refresh=inputs.full_refresh,
+                            scheduler=scheduler,
+                            priority=priorities[label],
+                            max_memory_usage=max_memory_usage,
+                        )
+                    )
                     running_tasks.add(task)
                     task.add_done_callback(running_tasks.discard)
 
@@ -247,7 +368,15 @@ async def put_models_in_queue(models: collections.abc.Iterable[ModelNode], queue
             tg.create_task(queue.put(QueueMessage(status=ModelStatus.READY, label=model.label)))
 
 
-async def handle_model_ready(model: ModelNode, team_id: int, queue: asyncio.Queue[QueueMessage]) -> None:
+async def handle_model_ready(
+    model: ModelNode,
+    team_id: int,
+    queue: asyncio.Queue[QueueMessage],
+    full_refresh: bool = False,
+    scheduler: ModelScheduler | None = None,
+    priority: int = 0,
+    max_memory_usage: int | None = None,
+) -> None:
     """Handle a model that is ready to run by materializing.
 
     After materializing is done, we can report back to the execution queue the result. If
@@ -258,11 +387,30 @@ async def handle_model_ready(model: ModelNode, team_id: int, queue: asyncio.Queu
         model: The model we are trying to run.
         team_id: The ID of the team who owns this model.
         queue: The execution queue where we will report back results.
+        full_refresh: Whether to fully refresh the model if it's incremental.
+        scheduler: If set, wait for a slot in this scheduler before materializing.
+        priority: The priority of the model when waiting for a slot.
+        max_memory_usage: The ClickHouse memory limit for the model's query.
     """
     try:
         if model.selected is True:
             team = await database_sync_to_async(Team.objects.get)(id=team_id)
-            await materialize_model(model.label, team)
+
+            queued_at = time.monotonic()
+            async with scheduler.slot(priority) if scheduler is not None else contextlib.nullcontext():
+                started_at = time.monotonic()
+                await materialize_model(model.label, team, full_refresh=full_refresh, max_memory_usage=max_memory_usage)
+            finished_at = time.monotonic()
+
+            await logger.ainfo(
+                "Model %s waited %.2f seconds and ran for %.2f seconds",
+                model.label,
+                started_at - queued_at,
+                finished_at - started_at,
+            )
+            if temporalio.activity.in_activity():
+                get_model_wait_time_metric().record(int((started_at - queued_at) * 1000))
+                get_model_run_time_metric().record(int((finished_at - started_at) * 1000))
     except Exception as err:
         await logger.aexception("Failed to materialize model %s due to error: %s", model.label, str(err))
         await queue.put(QueueMessage(status=ModelStatus.FAILED, label=model.label))
@@ -273,14 +421,23 @@ async def handle_model_ready(model: ModelNode, team_id: int, queue: asyncio.Queu
         queue.task_done()
 
 
-async def materialize_model(model_label: str, team: Team) -> tuple[str, DeltaTable]:
+async def materialize_model(
+    model_label: str, team: Team, full_refresh: bool = False, max_memory_usage: int | None = None
+) -> tuple[str, DeltaTable]:
     """Materialize a given model by running its query in a dlt pipeline.
 
+    Models with an incremental cursor column only materialize rows with a cursor value
+    greater than the last run's watermark, which are appended to the existing delta table.
+    As downstream models select from their parents' delta tables, any downstream models
+    that are incremental themselves will only pick up the newly appended rows.
+
     Arguments:
         model_label: A label representing the ID or the name of the model to materialize.
             If it's a valid UUID, then we will assume it's the ID, otherwise we'll assume
             it is the model's name.
         team: The team the model belongs to.
+        full_refresh: Whether to recompute the whole model, even if it's incremental.
+        max_memory_usage: If set, the ClickHouse memory limit for the model's query.
     """
     filter_params: dict[str, str | uuid.UUID] = {}
     try:
@@ -300,14 +457,7 @@ async def materialize_model(model_label: str, team: Team) -> tuple[str, DeltaTab
 
     table_columns: dlt_typing.TTableSchemaColumns = {}
     for column_name, column_info in query_columns.items():
-        clickhouse_type = column_info["clickhouse"]
-        nullable = False
-
-        if nullable_match := re.match(NullablePattern, clickhouse_type):
-            clickhouse_type = nullable_match.group(1)
-            nullable = True
-
-        clickhouse_type = re.sub(r"\(.+\)+", "", clickhouse_type)
+        clickhouse_type, nullable = parse_clickhouse_type(column_info["clickhouse"])
 
         data_type: dlt_data_types.TDataType = CLICKHOUSE_DLT_MAPPING[clickhouse_type]
         column_schema: dlt_typing.TColumnSchema = {
@@ -316,7 +466,31 @@ async def materialize_model(model_label: str, team: Team) -> tuple[str, DeltaTab
         }
         table_columns[column_name] = column_schema
 
-    hogql_query = saved_query.query["query"]
+    run_at = dt.datetime.now(dt.UTC)
+    is_full_refresh = should_full_refresh(saved_query, run_at, force=full_refresh)
+    select_query = parse_select(saved_query.query["query"])
+    cursor_column = saved_query.incremental_cursor_column
+
+    if is_full_refresh:
+        write_disposition: dlt_typing.TWriteDisposition = "replace"
+    else:
+        assert cursor_column is not None and saved_query.incremental_watermark is not None
+
+        write_disposition = "append"
+        watermark = parse_watermark(saved_query.incremental_watermark, query_columns[cursor_column]["clickhouse"])
+        select_query = ast.SelectQuery(
+            select=[ast.Field(chain=["*"])],
+            select_from=ast.JoinExpr(table=select_query),
+            where=ast.CompareOperation(
+                op=ast.CompareOperationOp.Gt,
+                left=ast.Field(chain=[cursor_column]),
+                right=ast.Constant(value=watermark),
+            ),
+        )
+
+    clickhouse_query = await database_sync_to_async(get_arrow_stream_query)(
+        select_query, team, query_columns, max_memory_usage=max_memory_usage
+    )
 
     destination = get_dlt_destination()
     pipeline = dlt.pipeline(
@@ -324,47 +498,200 @@ async def materialize_model(model_label: str, team: Team) -> tuple[str, DeltaTab
         destination=destination,
         dataset_name=f"team_{team.pk}_model_{model_label}",
     )
-    _ = await asyncio.to_thread(pipeline.run, hogql_table(hogql_query, team, saved_query.name, table_columns))
+
+    stats = MaterializationStats(cursor_column=cursor_column)
+    start = time.monotonic()
+    _ = await asyncio.to_thread(
+        pipeline.run,
+        hogql_table(clickhouse_query, team, saved_query.name, table_columns, stats, write_disposition),
+    )
+    elapsed = time.monotonic() - start
+
+    await logger.ainfo(
+        "Streamed %s rows (%s bytes) for model %s in %.2f seconds (%.0f rows/s)",
+        stats.rows,
+        stats.bytes,
+        model_label,
+        elapsed,
+        stats.rows / elapsed if elapsed > 0 else 0,
+    )
+    if temporalio.activity.in_activity():
+        get_rows_materialized_metric().add(stats.rows)
+        get_bytes_materialized_metric().add(stats.bytes)
 
     tables = get_delta_tables(pipeline)
 
     for table in tables.values():
-        table.optimize.compact()
-        table.vacuum(retention_hours=24, enforce_retention_duration=False, dry_run=False)
+        if is_full_refresh or len(table.file_uris()) >= INCREMENTAL_COMPACTION_MIN_FILES:
+            table.optimize.compact()
+            table.vacuum(retention_hours=24, enforce_retention_duration=False, dry_run=False)
 
         file_uris = table.file_uris()
 
         prepare_s3_files_for_querying(saved_query.folder_path, saved_query.name, file_uris)
 
+    update_fields = []
+    if cursor_column is not None and stats.max_cursor is not None:
+        saved_query.incremental_watermark = format_watermark(stats.max_cursor)
+        update_fields.append("incremental_watermark")
+    if is_full_refresh:
+        saved_query.last_full_refresh_at = run_at
+        update_fields.append("last_full_refresh_at")
+
+    await database_sync_to_async(saved_query.save)(update_fields=update_fields)
+
     key, delta_table = tables.popitem()
     return (key, delta_table)
 
 
-@dlt.source(max_table_nesting=0)
-def hogql_table(query: str, team: Team, table_name: str, table_columns: dlt_typing.TTableSchemaColumns):
-    """A dlt source representing a HogQL table given by a HogQL query."""
+def should_full_refresh(saved_query: DataWarehouseSavedQuery, now: dt.datetime, force: bool = False) -> bool:
+    """Return whether a model should be fully refreshed, or can be incrementally materialized instead."""
+    if force or saved_query.incremental_cursor_column is None or saved_query.incremental_watermark is None:
+        return True
 
-    async def get_hogql_rows():
-        settings = HogQLGlobalSettings(max_execution_time=60 * 10)  # 10 mins, same as the /query endpoint async workers
+    if saved_query.full_refresh_interval is None:
+        return False
 
-        response = await asyncio.to_thread(
-            execute_hogql_query, query, team, settings=settings, limit_context=LimitContext.SAVED_QUERY
-        )
+    return (
+        saved_query.last_full_refresh_at is None
+        or now - saved_query.last_full_refresh_at >= saved_query.full_refresh_interval
+    )
 
-        if not response.columns:
-            raise EmptyHogQLResponseColumnsError()
 
-        columns: list[str] = response.columns
+def parse_watermark(watermark: str, clickhouse_type: str) -> typing.Any:
+    """Parse a watermark stored by `format_watermark` into a value comparable with the cursor column."""
+    base_type, _ = parse_clickhouse_type(clickhouse_type)
 
-        for row in response.results:
-            yield dict(zip(columns, row))
+    if base_type.startswith("DateTime"):
+        return dt.datetime.fromisoformat(watermark)
+    if base_type.startswith("Date"):
+        return dt.date.fromisoformat(watermark)
+    if base_type.startswith(("Int", "UInt")):
+        return int(watermark)
+    if base_type.startswith("Float"):
+        return float(watermark)
+    return watermark
+
+
+def format_watermark(value: typing.Any) -> str:
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    return str(value)
+
+
+def parse_clickhouse_type(clickhouse_type: str) -> tuple[str, bool]:
+    """Return the base type name of a ClickHouse type, and whether it is nullable."""
+    nullable = False
+
+    if nullable_match := re.match(NullablePattern, clickhouse_type):
+        clickhouse_type = nullable_match.group(1)
+        nullable = True
+
+    return re.sub(r"\(.+\)+", "", clickhouse_type), nullable
+
+
+def get_arrow_stream_query(
+    select_query: ast.SelectQuery | ast.SelectSetQuery,
+    team: Team,
+    query_columns: dict[str, dict[str, typing.Any]],
+    max_memory_usage: int | None = None,
+) -> str:
+    """Print a model's HogQL query as a ClickHouse query that outputs its results in Arrow format.
+
+    Columns are selected by the names ClickHouse gives them, which are the names stored in the
+    saved query's columns. Any column types without a native Arrow representation are converted.
+    """
+    if not query_columns:
+        raise EmptyHogQLResponseColumnsError()
+
+    # Same limits as `execute_hogql_query` applies to saved queries
+    for one_query in extract_select_queries(select_query):
+        if one_query.limit is None:
+            one_query.limit = ast.Constant(value=get_default_limit_for_context(LimitContext.SAVED_QUERY))
+
+    context = HogQLContext(
+        team_id=team.pk,
+        team=team,
+        enable_select_queries=True,
+        limit_top_select=False,
+        modifiers=create_default_modifiers_for_team(team),
+    )
+    clickhouse_sql = print_ast(select_query, context=context, dialect="clickhouse")
+    clickhouse_sql = substitute_params(clickhouse_sql, context.values)
+
+    replacements = []
+    for column_name, column_info in query_columns.items():
+        clickhouse_type, _ = parse_clickhouse_type(column_info["clickhouse"])
+
+        if conversion := CLICKHOUSE_ARROW_CONVERSIONS.get(clickhouse_type):
+            column = escape_clickhouse_identifier(column_name)
+            replacements.append(f"{conversion.format(column=column)} AS {column}")
+
+    replace = f" REPLACE ({', '.join(replacements)})" if replacements else ""
+    # The settings go on the outer query, as settings of a subquery don't apply to the query as a whole,
+    # and limits like max_ast_elements are checked for the whole query
+    query_settings = {
+        **HogQLGlobalSettings(max_execution_time=60 * 10).model_dump(exclude_none=True),
+        **({"max_memory_usage": int(max_memory_usage)} if max_memory_usage is not None else {}),
+    }
+    settings_clause = ", ".join(
+        f"{key}={int(value) if isinstance(value, bool) else value}" for key, value in query_settings.items()
+    )
+    return f"SELECT *{replace} FROM ({clickhouse_sql}) SETTINGS {settings_clause} FORMAT ArrowStream"
+
+
+@dataclasses.dataclass
+class MaterializationStats:
+    """Throughput of a model's materialization, updated as record batches are streamed.
+
+    If the model is incremental, we also keep track of the largest cursor value seen.
+    """
+
+    rows: int = 0
+    bytes: int = 0
+    cursor_column: str | None = None
+    max_cursor: typing.Any = None
+
+    def update(self, record_batch: pa.RecordBatch) -> None:
+        self.rows += record_batch.num_rows
+        self.bytes += record_batch.nbytes
+
+        if self.cursor_column is None or record_batch.num_rows == 0:
+            return
+
+        batch_max = pc.max(record_batch.column(self.cursor_column)).as_py()
+        if batch_max is not None and (self.max_cursor is None or batch_max > self.max_cursor):
+            self.max_cursor = batch_max
+
+
+@dlt.source(max_table_nesting=0)
+def hogql_table(
+    query: str,
+    team: Team,
+    table_name: str,
+    table_columns: dlt_typing.TTableSchemaColumns,
+    stats: MaterializationStats,
+    write_disposition: dlt_typing.TWriteDisposition = "replace",
+):
+    """A dlt source representing a HogQL table given by a HogQL query.
+
+    The query must already be printed as ClickHouse SQL in Arrow format (see `get_arrow_stream_query`),
+    so that record batches go straight to the Delta writer without holding the whole result in memory.
+    """
+
+    async def get_hogql_rows():
+        async with get_client(team_id=team.pk) as client:
+            async for record_batch in client.astream_query_as_arrow(query):
+                stats.update(record_batch)
+
+                yield pa.Table.from_batches([record_batch])
 
     yield dlt.resource(
         get_hogql_rows,
         name="hogql_table",
         table_name=table_name,
         table_format="delta",
-        write_disposition="replace",
+        write_disposition=write_disposition,
         columns=table_columns,
     )
 
@@ -626,10 +953,13 @@ class RunWorkflowInputs:
     Attributes:
         team_id: The ID of the team we are running this for.
         select: A list of model selectors to define the models to run.
+        full_refresh: Whether to fully refresh incremental models instead of only
+            materializing their new rows.
     """
 
     team_id: int
     select: list[Selector] = dataclasses.field(default_factory=list)
+    full_refresh: bool = False
 
 
 @temporalio.workflow.defn(name="data-modeling-run")
@@ -674,7 +1004,9 @@ class RunWorkflow(PostHogWorkflow):
             ),
         )
 
-        run_model_activity_inputs = RunDagActivityInputs(team_id=inputs.team_id, dag=dag)
+        run_model_activity_inputs = RunDagActivityInputs(
+            team_id=inputs.team_id, dag=dag, full_refresh=inputs.full_refresh
+        )
         results = await temporalio.workflow.execute_activity(
             run_dag_activity,
             run_model_activity_inputs,
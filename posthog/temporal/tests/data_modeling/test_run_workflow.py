@@ -6,6 +6,7 @@ import uuid
 
 import aioboto3
 import dlt
+import pyarrow as pa
 import pytest
 import pytest_asyncio
 import temporalio.common
@@ -24,6 +25,7 @@ from posthog.temporal.data_modeling.run_workflow import (
     BuildDagActivityInputs,
     ModelNode,
     CreateTableActivityInputs,
+    ModelScheduler,
     RunDagActivityInputs,
     RunWorkflow,
     RunWorkflowInputs,
@@ -31,9 +33,11 @@ from posthog.temporal.data_modeling.run_workflow import (
     build_dag_activity,
     create_table_activity,
     finish_run_activity,
+    get_critical_path_lengths,
     get_dlt_destination,
     materialize_model,
     run_dag_activity,
+    should_full_refresh,
     start_run_activity,
 )
 from posthog.temporal.tests.utils.events import generate_test_events_in_clickhouse
@@ -98,6 +102,53 @@ async def test_run_dag_activity_activity_materialize_mocked(activity_environment
     assert results.completed == set(dag.keys())
 
 
+async def test_model_scheduler_limits_concurrency_and_prioritizes():
+    """Test the scheduler never exceeds its concurrency and hands out slots by priority."""
+    scheduler = ModelScheduler(max_concurrent=2)
+    running = 0
+    max_running = 0
+    started = []
+    release = asyncio.Event()
+
+    async def run(label: str, priority: int):
+        nonlocal running, max_running
+
+        async with scheduler.slot(priority):
+            running += 1
+            max_running = max(max_running, running)
+            started.append(label)
+            await release.wait()
+            running -= 1
+
+    async with asyncio.TaskGroup() as tg:
+        for label, priority in (("a", 0), ("b", 0), ("low", 1), ("high", 3), ("medium", 2)):
+            tg.create_task(run(label, priority))
+            await asyncio.sleep(0)
+
+        release.set()
+
+    assert max_running == 2
+    assert started == ["a", "b", "high", "medium", "low"]
+
+
+def test_get_critical_path_lengths():
+    dag = {
+        "events": ModelNode(label="events", children={"my_events_model", "my_other_model"}),
+        "my_events_model": ModelNode(
+            label="my_events_model", children={"my_joined_model"}, parents={"events"}, selected=True
+        ),
+        "my_joined_model": ModelNode(label="my_joined_model", parents={"my_events_model"}, selected=True),
+        "my_other_model": ModelNode(label="my_other_model", parents={"events"}, selected=True),
+    }
+
+    assert get_critical_path_lengths(dag) == {
+        "events": 2,
+        "my_events_model": 2,
+        "my_joined_model": 1,
+        "my_other_model": 1,
+    }
+
+
 async def test_create_table_activity(activity_environment, ateam):
     query = """\
     select
@@ -346,6 +397,154 @@ async def test_materialize_model(ateam, bucket_name, minio_client, pageview_even
     assert sorted(table.to_pylist(), key=lambda d: (d["distinct_id"], d["timestamp"])) == expected_events
 
 
+async def test_materialize_model_converts_arrow_incompatible_types(ateam, bucket_name, minio_client, pageview_events):
+    """Test types without a native Arrow representation are converted when streaming a model."""
+    query = """\
+    select
+      uuid as uuid,
+      toDateTime(timestamp) as timestamp,
+      toDate(timestamp) as date
+    from events
+    where event = '$pageview'
+    """
+    saved_query = await DataWarehouseSavedQuery.objects.acreate(
+        team=ateam,
+        name="my_model",
+        query={"query": query, "kind": "HogQLQuery"},
+    )
+
+    with (
+        override_settings(
+            BUCKET_URL=f"s3://{bucket_name}",
+            AIRBYTE_BUCKET_KEY=settings.OBJECT_STORAGE_ACCESS_KEY_ID,
+            AIRBYTE_BUCKET_SECRET=settings.OBJECT_STORAGE_SECRET_ACCESS_KEY,
+            AIRBYTE_BUCKET_REGION="us-east-1",
+            AIRBYTE_BUCKET_DOMAIN="objectstorage:19000",
+        ),
+        unittest.mock.patch.object(AwsCredentials, "to_session_credentials", mock_to_session_credentials),
+        unittest.mock.patch.object(
+            AwsCredentials, "to_object_store_rs_credentials", mock_to_object_store_rs_credentials
+        ),
+    ):
+        _, delta_table = await materialize_model(saved_query.id.hex, ateam)
+
+    table = delta_table.to_pyarrow_table(columns=["uuid", "timestamp", "date"])
+    events, _ = pageview_events
+    expected_events = sorted(
+        [
+            {
+                "uuid": event["uuid"],
+                "timestamp": dt.datetime.fromisoformat(event["timestamp"]).replace(tzinfo=dt.UTC, microsecond=0),
+                "date": dt.datetime.fromisoformat(event["timestamp"]).date(),
+            }
+            for event in events
+        ],
+        key=lambda d: d["uuid"],
+    )
+
+    assert pa.types.is_string(table.schema.field("uuid").type)
+    assert pa.types.is_timestamp(table.schema.field("timestamp").type)
+    assert pa.types.is_date(table.schema.field("date").type)
+    assert sorted(table.to_pylist(), key=lambda d: d["uuid"]) == expected_events
+
+
+async def test_materialize_model_incrementally(ateam, bucket_name, minio_client, pageview_events):
+    """Test an incremental model only appends rows newer than its watermark."""
+    query = """\
+    select
+      event as event,
+      distinct_id as distinct_id,
+      timestamp as timestamp
+    from events
+    where event = '$pageview'
+    """
+    saved_query = await DataWarehouseSavedQuery.objects.acreate(
+        team=ateam,
+        name="my_model",
+        query={"query": query, "kind": "HogQLQuery"},
+        incremental_cursor_column="timestamp",
+    )
+    events, _ = pageview_events
+    max_timestamp = max(dt.datetime.fromisoformat(event["timestamp"]).replace(tzinfo=dt.UTC) for event in events)
+
+    with (
+        override_settings(
+            BUCKET_URL=f"s3://{bucket_name}",
+            AIRBYTE_BUCKET_KEY=settings.OBJECT_STORAGE_ACCESS_KEY_ID,
+            AIRBYTE_BUCKET_SECRET=settings.OBJECT_STORAGE_SECRET_ACCESS_KEY,
+            AIRBYTE_BUCKET_REGION="us-east-1",
+            AIRBYTE_BUCKET_DOMAIN="objectstorage:19000",
+        ),
+        unittest.mock.patch.object(AwsCredentials, "to_session_credentials", mock_to_session_credentials),
+        unittest.mock.patch.object(
+            AwsCredentials, "to_object_store_rs_credentials", mock_to_object_store_rs_credentials
+        ),
+    ):
+        _, delta_table = await materialize_model(saved_query.id.hex, ateam)
+
+        await saved_query.arefresh_from_db()
+        assert saved_query.incremental_watermark is not None
+        assert dt.datetime.fromisoformat(saved_query.incremental_watermark) == max_timestamp
+        assert saved_query.last_full_refresh_at is not None
+        assert delta_table.to_pyarrow_table().num_rows == len(events)
+
+        # Nothing is newer than the watermark, so nothing should be appended
+        _, delta_table = await materialize_model(saved_query.id.hex, ateam)
+
+        await saved_query.arefresh_from_db()
+        assert dt.datetime.fromisoformat(saved_query.incremental_watermark) == max_timestamp
+        assert delta_table.to_pyarrow_table().num_rows == len(events)
+
+        # Rewind the watermark to have some rows appended again
+        saved_query.incremental_watermark = (max_timestamp - dt.timedelta(hours=12)).isoformat()
+        await saved_query.asave()
+        _, delta_table = await materialize_model(saved_query.id.hex, ateam)
+
+    newer_events = [
+        event
+        for event in events
+        if dt.datetime.fromisoformat(event["timestamp"]).replace(tzinfo=dt.UTC) > max_timestamp - dt.timedelta(hours=12)
+    ]
+    assert delta_table.to_pyarrow_table().num_rows == len(events) + len(newer_events)
+
+
+@pytest.mark.parametrize(
+    "cursor_column,watermark,full_refresh_interval,last_full_refresh_at,force,expected",
+    [
+        (None, None, None, None, False, True),
+        ("timestamp", None, None, None, False, True),
+        ("timestamp", "2024-01-01T00:00:00+00:00", None, None, False, False),
+        ("timestamp", "2024-01-01T00:00:00+00:00", None, None, True, True),
+        ("timestamp", "2024-01-01T00:00:00+00:00", dt.timedelta(days=1), None, False, True),
+        (
+            "timestamp",
+            "2024-01-01T00:00:00+00:00",
+            dt.timedelta(days=1),
+            dt.datetime(2024, 1, 1, 12, tzinfo=dt.UTC),
+            False,
+            False,
+        ),
+        (
+            "timestamp",
+            "2024-01-01T00:00:00+00:00",
+            dt.timedelta(days=1),
+            dt.datetime(2023, 12, 31, tzinfo=dt.UTC),
+            False,
+            True,
+        ),
+    ],
+)
+def test_should_full_refresh(cursor_column, watermark, full_refresh_interval, last_full_refresh_at, force, expected):
+    saved_query = DataWarehouseSavedQuery(
+        incremental_cursor_column=cursor_column,
+        incremental_watermark=watermark,
+        full_refresh_interval=full_refresh_interval,
+        last_full_refresh_at=last_full_refresh_at,
+    )
+
+    assert should_full_refresh(saved_query, dt.datetime(2024, 1, 2, tzinfo=dt.UTC), force=force) is expected
+
+
 @pytest_asyncio.fixture
 async def saved_queries(ateam):
     parent_query = """\
@@ -5,14 +5,16 @@ from unittest.mock import patch
 
 from django.core.cache import cache
 from django.db import IntegrityError, connection
-from django.test import TransactionTestCase
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from freezegun import freeze_time
 import pytest
 
 from posthog.api.test.test_feature_flag import QueryTimeoutWrapper
 from posthog.models import Cohort, FeatureFlag, GroupTypeMapping, Person
-from posthog.models.feature_flag import get_feature_flags_for_team_in_cache
+from posthog.models.feature_flag import get_feature_flags_for_team_in_cache, set_feature_flags_for_team_in_cache
+from posthog.models.feature_flag.feature_flag import _LocalFeatureFlagsCache
 from posthog.models.feature_flag.flag_matching import (
     FeatureFlagHashKeyOverride,
     FeatureFlagMatch,
@@ -21,8 +23,10 @@ from posthog.models.feature_flag.flag_matching import (
     FlagsMatcherCache,
     get_all_feature_flags,
     get_feature_flag_hash_key_overrides,
+    get_feature_flags_for_distinct_ids,
     set_feature_flag_hash_key_overrides,
 )
+from posthog.models.feature_flag.rollout_hashing import rollout_hashes
 from posthog.models.group import Group
 from posthog.models.organization import Organization
 from posthog.models.team import Team
@@ -745,6 +749,64 @@ class TestModelCache(BaseTest):
         assert cached_flags is not None
         self.assertEqual(0, len(cached_flags))
 
+    def test_parsed_flags_are_reused_until_the_flags_change(self):
+        flag = FeatureFlag.objects.create(
+            team=self.team,
+            key="test-flag",
+            created_by=self.user,
+            filters={
+                "groups": [{"properties": [{"key": "email", "value": "tim@posthog.com"}], "rollout_percentage": 50}],
+                "multivariate": {
+                    "variants": [
+                        {"key": "first", "rollout_percentage": 50},
+                        {"key": "second", "rollout_percentage": 50},
+                    ]
+                },
+            },
+        )
+
+        cached_flags = get_feature_flags_for_team_in_cache(self.team.pk)
+        assert cached_flags is not None
+        condition = cached_flags[0].conditions[0]
+        properties = cached_flags[0].get_condition_properties(condition)
+        self.assertEqual([(property.key, property.value) for property in properties], [("email", "tim@posthog.com")])
+        self.assertEqual(
+            cached_flags[0].get_variant_lookup_table(),
+            [
+                {"value_min": 0, "value_max": 0.5, "key": "first"},
+                {"value_min": 0.5, "value_max": 1.0, "key": "second"},
+            ],
+        )
+
+        with patch("posthog.models.feature_flag.feature_flag.json.loads") as mock_loads:
+            reused_flags = get_feature_flags_for_team_in_cache(self.team.pk)
+            mock_loads.assert_not_called()
+        assert reused_flags is not None
+        self.assertIs(reused_flags[0], cached_flags[0])
+        self.assertIs(reused_flags[0].get_condition_properties(condition), properties)
+
+        flag.key = "new-key"
+        flag.save()
+
+        updated_flags = get_feature_flags_for_team_in_cache(self.team.pk)
+        assert updated_flags is not None
+        self.assertIsNot(updated_flags[0], cached_flags[0])
+        self.assertEqual(updated_flags[0].key, "new-key")
+
+    def test_local_flags_cache_evicts_least_recently_used_teams(self):
+        local_cache = _LocalFeatureFlagsCache(max_teams=2)
+        flags = (FeatureFlag(key="flag"),)
+
+        local_cache.set(1, "v1", flags)
+        local_cache.set(2, "v1", flags)
+        assert local_cache.get(1, "v1") is flags
+        local_cache.set(3, "v1", flags)
+
+        assert local_cache.get(1, "v1") is flags
+        assert local_cache.get(1, "v2") is None
+        assert local_cache.get(2, "v1") is None
+        assert local_cache.get(3, "v1") is flags
+
 
 class TestFeatureFlagMatcher(BaseTest, QueryMatchingTest):
     maxDiff = None
@@ -6045,6 +6107,136 @@ class TestFeatureFlagHashKeyOverrides(BaseTest, QueryMatchingTest):
     "posthog.models.feature_flag.flag_matching.postgres_healthcheck.is_connected",
     return_value=True,
 )
+class TestBulkFeatureFlagEvaluation(BaseTest):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        GroupTypeMapping.objects.create(
+            team=self.team, project_id=self.team.project_id, group_type="organization", group_type_index=0
+        )
+        Group.objects.create(
+            team=self.team,
+            group_type_index=0,
+            group_key="posthog",
+            group_properties={"plan": "scale"},
+            version=1,
+        )
+        FeatureFlag.objects.create(
+            team=self.team,
+            key="email-flag",
+            created_by=self.user,
+            filters={
+                "groups": [
+                    {
+                        "properties": [
+                            {"key": "email", "value": "posthog.com", "operator": "icontains", "type": "person"}
+                        ],
+                        "rollout_percentage": None,
+                    }
+                ]
+            },
+        )
+        FeatureFlag.objects.create(
+            team=self.team,
+            key="not-set-flag",
+            created_by=self.user,
+            filters={
+                "groups": [{"properties": [{"key": "email", "operator": "is_not_set", "type": "person"}]}],
+            },
+        )
+        FeatureFlag.objects.create(
+            team=self.team,
+            key="multivariate-flag",
+            created_by=self.user,
+            ensure_experience_continuity=True,
+            filters={
+                "groups": [{"properties": [], "rollout_percentage": 70}],
+                "multivariate": {
+                    "variants": [
+                        {"key": "control", "rollout_percentage": 50},
+                        {"key": "test", "rollout_percentage": 50},
+                    ]
+                },
+                "payloads": {"test": {"color": "blue"}},
+            },
+        )
+        FeatureFlag.objects.create(
+            team=self.team,
+            key="distinct-id-flag",
+            created_by=self.user,
+            filters={
+                "groups": [
+                    {
+                        "properties": [
+                            {"key": "distinct_id", "value": "example_id_3", "type": "person"},
+                            {"key": "email", "operator": "is_set", "type": "person"},
+                        ]
+                    }
+                ]
+            },
+        )
+        FeatureFlag.objects.create(
+            team=self.team,
+            key="group-flag",
+            created_by=self.user,
+            filters={
+                "aggregation_group_type_index": 0,
+                "groups": [{"properties": [{"key": "plan", "value": "scale", "type": "group", "group_type_index": 0}]}],
+            },
+        )
+
+        for index in range(6):
+            Person.objects.create(
+                team=self.team,
+                distinct_ids=[f"example_id_{index}", f"other_id_{index}"],
+                properties={"email": f"user_{index}@{'posthog.com' if index % 2 else 'example.com'}"},
+            )
+        Person.objects.create(team=self.team, distinct_ids=["no_email_id"], properties={})
+
+        self.distinct_ids = [
+            *[f"example_id_{index}" for index in range(6)],
+            "other_id_3",
+            "no_email_id",
+            "never_seen_id",
+        ]
+        set_feature_flag_hash_key_overrides(self.team.pk, ["example_id_1", "other_id_1"], "hash_key_override")
+
+    def test_bulk_evaluation_matches_single_evaluation(self):
+        groups = {"organization": "posthog"}
+
+        results = list(get_feature_flags_for_distinct_ids(self.team.pk, self.distinct_ids, groups, batch_size=4))
+
+        self.assertEqual([result[0] for result in results], self.distinct_ids)
+        for distinct_id, flags, reasons, payloads, errors in results:
+            self.assertEqual(
+                (flags, reasons, payloads, errors),
+                get_all_feature_flags(self.team.pk, distinct_id, groups),
+                distinct_id,
+            )
+        self.assertEqual(results[3][1]["distinct-id-flag"], True)
+        self.assertEqual(results[1][1]["email-flag"], True)
+        self.assertEqual(results[7][1]["not-set-flag"], True)
+        self.assertEqual(results[8][1]["not-set-flag"], True)
+
+    def test_bulk_evaluation_queries_do_not_depend_on_number_of_distinct_ids(self):
+        # flags using the distinct_id property are evaluated one distinct id at a time
+        FeatureFlag.objects.filter(team=self.team, key="distinct-id-flag").delete()
+        set_feature_flags_for_team_in_cache(self.team.pk)
+        groups = {"organization": "posthog"}
+
+        with CaptureQueriesContext(connection) as few_distinct_ids_queries:
+            list(get_feature_flags_for_distinct_ids(self.team.pk, self.distinct_ids[:2], groups))
+        with CaptureQueriesContext(connection) as all_distinct_ids_queries:
+            list(get_feature_flags_for_distinct_ids(self.team.pk, self.distinct_ids, groups))
+
+        self.assertEqual(len(few_distinct_ids_queries), len(all_distinct_ids_queries))
+
+        with CaptureQueriesContext(connection) as batched_queries:
+            list(get_feature_flags_for_distinct_ids(self.team.pk, self.distinct_ids, groups, batch_size=3))
+
+        self.assertGreater(len(batched_queries), len(all_distinct_ids_queries))
+
+
 class TestHashKeyOverridesRaceConditions(TransactionTestCase, QueryMatchingTest):
     def setUp(self) -> None:
         return super().setUp()
@@ -8503,3 +8695,32 @@ class TestFeatureFlagMatcherConsistency(BaseTest):
                     feature_flag_match,
                     FeatureFlagMatch(False, None, FeatureFlagMatchReason.OUT_OF_ROLLOUT_BOUND, 0),
                 )
+
+
+class TestRolloutHashing(SimpleTestCase):
+    def test_batched_hashes_match_matcher_hashes(self):
+        feature_flag = FeatureFlag(
+            id=1,
+            team_id=1,
+            key="multivariate-flag",
+            filters={
+                "groups": [{"properties": [], "rollout_percentage": 55}],
+                "multivariate": {
+                    "variants": [
+                        {"key": "first-variant", "rollout_percentage": 50},
+                        {"key": "second-variant", "rollout_percentage": 20},
+                        {"key": "third-variant", "rollout_percentage": 30},
+                    ]
+                },
+            },
+        )
+        distinct_ids = [f"distinct_id_{i}" for i in range(1000)]
+
+        hashes = rollout_hashes(feature_flag.key, distinct_ids)
+        variant_hashes = rollout_hashes(feature_flag.key, distinct_ids, "variant")
+        for index, distinct_id in enumerate(distinct_ids):
+            matcher = FeatureFlagMatcher([feature_flag], distinct_id)
+            self.assertEqual(hashes[index], matcher.get_hash(feature_flag))
+            self.assertEqual(variant_hashes[index], matcher.get_hash(feature_flag, salt="variant"))
+
+        self.assertEqual(len(rollout_hashes(feature_flag.key, [])), 0)
@@ -11,11 +11,14 @@ from posthog.models.feature_flag.flag_analytics import (
     find_flags_with_enriched_analytics,
     increment_request_count,
     capture_team_decide_usage,
+    request_count_buffer,
+    RequestCountBuffer,
 )
 from posthog.models.team.team import Team
 from posthog.test.base import BaseTest, QueryMatchingTest, snapshot_postgres_queries_context
 from posthog import redis
 import datetime
+import time
 import concurrent.futures
 from posthog.test.base import _create_event, flush_persons_and_events
 
@@ -69,6 +72,73 @@ class TestFeatureFlagAnalytics(BaseTest, QueryMatchingTest):
             )
             self.assertEqual(client.hgetall(f"posthog:decide_requests:other"), {})
 
+    @patch("posthog.models.feature_flag.flag_analytics.CACHE_BUCKET_SIZE", 10)
+    def test_increment_request_count_buffers_requests_until_flushed(self):
+        team_id = 3
+        client = redis.get_client()
+
+        with (
+            freeze_time("2022-05-07 12:23:07") as frozen_datetime,
+            self.settings(DECIDE_REQUEST_COUNTS_FLUSH_INTERVAL_SECONDS=60),
+        ):
+            request_count_buffer.flush()
+            for _ in range(10):
+                increment_request_count(team_id)
+                increment_request_count(team_id, 1, FlagRequestType.LOCAL_EVALUATION)
+            frozen_datetime.tick(datetime.timedelta(seconds=5))
+            increment_request_count(team_id, 5)
+
+            self.assertEqual(client.hgetall(f"posthog:decide_requests:{team_id}"), {})
+
+            with patch.object(client, "pipeline", wraps=client.pipeline) as mock_pipeline:
+                frozen_datetime.tick(datetime.timedelta(seconds=60))
+                increment_request_count(team_id)
+                mock_pipeline.assert_called_once()
+
+            self.assertEqual(
+                client.hgetall(f"posthog:decide_requests:{team_id}"),
+                {b"165192618": b"10", b"165192619": b"5", b"165192625": b"1"},
+            )
+            self.assertEqual(client.hgetall(f"posthog:local_evaluation_requests:{team_id}"), {b"165192618": b"10"})
+
+    def test_request_count_buffer_drops_counts_when_redis_is_unavailable(self):
+        request_count_buffer.flush()
+
+        with (
+            self.settings(DECIDE_REQUEST_COUNTS_FLUSH_INTERVAL_SECONDS=60),
+            patch("posthog.models.feature_flag.flag_analytics.get_client", side_effect=Exception("redis is down")),
+            patch("posthog.models.feature_flag.flag_analytics.REQUEST_COUNTS_DROPPED_COUNTER") as mock_dropped,
+        ):
+            increment_request_count(3, 4)
+            request_count_buffer.flush()
+
+            mock_dropped.labels.assert_called_once_with(request_type="decide")
+            mock_dropped.labels.return_value.inc.assert_called_once_with(4)
+
+        # the dropped counts aren't retried
+        request_count_buffer.flush()
+        self.assertEqual(redis.get_client().hgetall("posthog:decide_requests:3"), {})
+
+    def test_request_count_buffer_flushes_periodically_without_requests(self):
+        buffer = RequestCountBuffer()
+        client = redis.get_client()
+
+        with self.settings(DECIDE_REQUEST_COUNTS_FLUSH_INTERVAL_SECONDS=60):
+            buffer.increment(3, 4, FlagRequestType.DECIDE)
+        self.assertEqual(client.hgetall("posthog:decide_requests:3"), {})
+
+        with self.settings(DECIDE_REQUEST_COUNTS_FLUSH_INTERVAL_SECONDS=0.1):
+            buffer.start_periodic_flush()
+            try:
+                for _ in range(50):
+                    if client.hgetall("posthog:decide_requests:3"):
+                        break
+                    time.sleep(0.1)
+            finally:
+                buffer.stop_periodic_flush()
+
+        self.assertEqual(list(client.hgetall("posthog:decide_requests:3").values()), [b"4"])
+
     @patch("posthog.models.feature_flag.flag_analytics.CACHE_BUCKET_SIZE", 10)
     def test_capture_team_decide_usage(self):
         mock_capture = MagicMock()
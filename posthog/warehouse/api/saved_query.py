@@ -48,8 +48,21 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
             "columns",
             "status",
             "last_run_at",
+            "incremental_cursor_column",
+            "incremental_watermark",
+            "full_refresh_interval",
+            "last_full_refresh_at",
+        ]
+        read_only_fields = [
+            "id",
+            "created_by",
+            "created_at",
+            "columns",
+            "status",
+            "last_run_at",
+            "incremental_watermark",
+            "last_full_refresh_at",
         ]
-        read_only_fields = ["id", "created_by", "created_at", "columns", "status", "last_run_at"]
 
     def get_columns(self, view: DataWarehouseSavedQuery) -> list[SerializedField]:
         team_id = self.context["team_id"]
@@ -98,6 +111,8 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
         except Exception as err:
             raise serializers.ValidationError(str(err))
 
+        self.validate_incremental_cursor_column_in_columns(view)
+
         with transaction.atomic():
             view.save()
 
@@ -113,6 +128,13 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
 
     def update(self, instance: Any, validated_data: Any) -> Any:
         with transaction.atomic():
+            if any(
+                key in validated_data and validated_data[key] != getattr(instance, key)
+                for key in ("query", "incremental_cursor_column")
+            ):
+                # Previously materialized rows no longer match the model, so the next run must be a full refresh
+                validated_data["incremental_watermark"] = None
+
             view: DataWarehouseSavedQuery = super().update(instance, validated_data)
 
             try:
@@ -125,6 +147,8 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
             except Exception as err:
                 raise serializers.ValidationError(str(err))
 
+            self.validate_incremental_cursor_column_in_columns(view)
+
             view.save()
 
             try:
@@ -134,6 +158,12 @@ class DataWarehouseSavedQuerySerializer(serializers.ModelSerializer):
 
         return view
 
+    def validate_incremental_cursor_column_in_columns(self, view: DataWarehouseSavedQuery) -> None:
+        if view.incremental_cursor_column and view.incremental_cursor_column not in (view.columns or {}):
+            raise serializers.ValidationError(
+                f"Incremental cursor column {view.incremental_cursor_column} is not a column of the query"
+            )
+
     def validate_query(self, query):
         team_id = self.context["team_id"]
 
@@ -202,6 +232,7 @@ class DataWarehouseSavedQueryViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewS
         """Run this saved query."""
         ancestors = request.data.get("ancestors", 0)
         descendants = request.data.get("descendants", 0)
+        full_refresh = request.data.get("full_refresh", False)
 
         saved_query = self.get_object()
 
@@ -210,6 +241,7 @@ class DataWarehouseSavedQueryViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewS
         inputs = RunWorkflowInputs(
             team_id=saved_query.team_id,
             select=[Selector(label=saved_query.id.hex, ancestors=ancestors, descendants=descendants)],
+            full_refresh=full_refresh,
         )
         workflow_id = f"data-modeling-run-{saved_query.id.hex}"
         saved_query.status = DataWarehouseSavedQuery.Status.RUNNING
@@ -132,6 +132,44 @@ class TestSavedQuery(APIBaseTest):
             ],
         )
 
+    def test_incremental_cursor_column(self):
+        response = self.client.post(
+            f"/api/projects/{self.team.id}/warehouse_saved_queries/",
+            {
+                "name": "event_view",
+                "query": {
+                    "kind": "HogQLQuery",
+                    "query": "select event as event, timestamp as timestamp from events LIMIT 100",
+                },
+                "incremental_cursor_column": "timestamp",
+            },
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        saved_query = DataWarehouseSavedQuery.objects.get(id=response.json()["id"])
+        self.assertEqual(saved_query.incremental_cursor_column, "timestamp")
+
+        saved_query.incremental_watermark = "2024-01-01T00:00:00+00:00"
+        saved_query.save()
+
+        response = self.client.patch(
+            f"/api/projects/{self.team.id}/warehouse_saved_queries/{saved_query.id}",
+            {
+                "query": {
+                    "kind": "HogQLQuery",
+                    "query": "select distinct_id as distinct_id, timestamp as timestamp from events LIMIT 100",
+                },
+            },
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        saved_query.refresh_from_db()
+        self.assertIsNone(saved_query.incremental_watermark)
+
+        response = self.client.patch(
+            f"/api/projects/{self.team.id}/warehouse_saved_queries/{saved_query.id}",
+            {"incremental_cursor_column": "event"},
+        )
+        self.assertEqual(response.status_code, 400, response.content)
+
     def test_nested_view(self):
         saved_query_1_response = self.client.post(
             f"/api/projects/{self.team.id}/warehouse_saved_queries/",
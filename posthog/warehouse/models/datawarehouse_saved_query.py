@@ -69,6 +69,28 @@ class DataWarehouseSavedQuery(CreatedMetaFields, UUIDModel, DeletedMetaFields):
         help_text="The timestamp of this SavedQuery's last run (if any).",
     )
     table = models.ForeignKey("posthog.DataWarehouseTable", on_delete=models.SET_NULL, null=True, blank=True)
+    incremental_cursor_column = models.CharField(
+        max_length=128,
+        null=True,
+        blank=True,
+        help_text="Column used to only materialize rows newer than the last run. If not set, every run is a full refresh.",
+    )
+    incremental_watermark = models.CharField(
+        max_length=128,
+        null=True,
+        blank=True,
+        help_text="The largest value of the cursor column materialized so far (if any).",
+    )
+    full_refresh_interval = models.DurationField(
+        null=True,
+        blank=True,
+        help_text="How often an incremental SavedQuery should be fully refreshed instead (if ever).",
+    )
+    last_full_refresh_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="The timestamp of this SavedQuery's last full refresh (if any).",
+    )
 
     class Meta:
         constraints = [